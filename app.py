@@ -1,11 +1,12 @@
 """
 Flask Web Application for Embodied Pulse
 """
-from flask import Flask, render_template, jsonify, request
+from flask import Flask, render_template, jsonify, request, Response
 import json
 import os
 import threading
 import logging
+import time
 from datetime import datetime
 
 # 尝试加载.env文件
@@ -20,14 +21,14 @@ except ImportError:
     pass  # python-dotenv未安装，跳过
 except Exception as e:
     pass  # 加载失败，跳过
-from daily_arxiv import load_config, demo, get_daily_papers
-from models import init_db, get_session, Paper
-from sqlalchemy import func, or_, and_, desc
+from models import init_db, get_session, Paper, PaperAuthor
+from sqlalchemy import func, or_, and_, desc, exists
 from jobs_models import get_jobs_session, Job
 from datasets_models import get_datasets_session, Dataset
 from news_models import get_news_session, News
 from bilibili_client import BilibiliClient, format_number, format_timestamp
 from bilibili_models import get_bilibili_session, BilibiliUp, BilibiliVideo
+from serializers import FIELD_SET_NAMES, fetch_dicts
 from taxonomy import (
     CATEGORY_DISPLAY,
     CATEGORY_ORDER,
@@ -57,13 +58,9 @@ if not os.path.exists(STATIC_DIR):
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# 记录路径信息（用于调试）
-logger.info(f"Flask应用初始化 - 文件路径: {__file__}")
-logger.info(f"BASE_DIR: {BASE_DIR}")
-logger.info(f"TEMPLATE_DIR: {TEMPLATE_DIR}")
-logger.info(f"STATIC_DIR: {STATIC_DIR}")
-logger.info(f"模板目录存在: {os.path.exists(TEMPLATE_DIR)}")
-logger.info(f"静态目录存在: {os.path.exists(STATIC_DIR)}")
+# 记录路径信息（用于调试，目录存在性已在上面检查）
+logger.debug(f"Flask应用初始化 - 文件路径: {__file__}")
+logger.debug(f"TEMPLATE_DIR: {TEMPLATE_DIR}, STATIC_DIR: {STATIC_DIR}")
 
 app = Flask(__name__, 
             template_folder=TEMPLATE_DIR,
@@ -75,12 +72,32 @@ from database import init_db
 init_db(app)
 logger.info("✅ Flask-SQLAlchemy数据库已初始化")
 
+# 请求级性能指标（按路由的耗时/数据库查询/响应大小，管理端 /api/admin/metrics 导出）
+from request_metrics import init_request_metrics, record_cache_lookup
+init_request_metrics(app)
+
+# SQL 查询分析（QUERY_PROFILER=true 时启用，记录疑似 N+1 和慢查询执行计划）
+from query_profiler import init_query_profiler
+init_query_profiler(app)
+
+# 响应压缩（br/gzip，超过 COMPRESS_MIN_BYTES 的文本/JSON 响应，流式响应逐块压缩）
+from response_compression import init_response_compression
+init_response_compression(app)
+
 # 注册认证系统蓝图
 app.register_blueprint(auth_bp)
 app.register_blueprint(user_bp)
 app.register_blueprint(admin_bp)
 logger.info("✅ 认证系统蓝图已注册")
 
+# 带哈希文件名的预压缩静态资源（python static_assets.py build 后生效）
+from static_assets import init_static_assets
+init_static_assets(app)
+
+# 首屏数据批量接口 /api/bootstrap（并发调用首页各模块接口，一次返回）
+from bootstrap_api import bootstrap_bp, clear_section_cache
+app.register_blueprint(bootstrap_bp)
+
 # 标签体系由 taxonomy.py 提供，避免多处定义
 
 # 验证模板目录配置
@@ -88,40 +105,8 @@ if not os.path.exists(app.template_folder):
     logger.error(f"Flask模板目录不存在: {app.template_folder}")
     raise FileNotFoundError(f"Flask模板目录不存在: {app.template_folder}")
 
-# 全局变量存储抓取状态
-fetch_status = {
-    'running': False,
-    'progress': 0,
-    'total': 0,
-    'current_keyword': '',
-    'message': '',
-    'last_update': None
-}
-# 线程锁，保护fetch_status的更新
-fetch_status_lock = threading.Lock()
-
-# 全局变量存储新闻抓取状态
-news_fetch_status = {
-    'running': False,
-    'progress': 0,
-    'total': 0,
-    'message': '',
-    'last_update': None
-}
-# 线程锁，保护news_fetch_status的更新
-news_fetch_status_lock = threading.Lock()
-
-# 全局变量存储Semantic Scholar更新状态
-semantic_update_status = {
-    'running': False,
-    'progress': 0,
-    'total': 0,
-    'current_paper': '',
-    'message': '',
-    'last_update': None
-}
-# 线程锁，保护semantic_update_status的更新
-semantic_update_status_lock = threading.Lock()
+# 抓取/更新任务由 worker.py 在独立进程中执行，Web 进程只负责入队，状态统一从任务表读取
+from task_queue import enqueue_task, get_latest_task, task_status, task_revision, wait_for_task_change
 
 # Bilibili数据缓存
 bilibili_cache = {
@@ -133,41 +118,15 @@ bilibili_cache = {
 bilibili_cache_lock = threading.Lock()
 BILIBILI_CACHE_DURATION = 600  # 缓存10分钟（600秒），force=1 时跳过缓存
 
-# Bilibili数据更新任务状态（用于管理后台）
-bilibili_fetch_status = {
-    'running': False,
-    'progress': 0,
-    'message': '',
-    'last_update': ''
-}
-bilibili_fetch_status_lock = threading.Lock()
-
-# 全局定时任务调度器（用于Gunicorn启动时自动启动）
-scheduler = None
-
-# 初始化定时任务调度器的函数（适用于Gunicorn等生产环境）
+# 初始化后台任务worker的函数（适用于Gunicorn等生产环境）
 def init_scheduler():
-    """初始化定时任务调度器（适用于Gunicorn等生产环境）"""
-    global scheduler
-    if scheduler is not None:
-        logger.info("定时任务调度器已存在，跳过重复初始化")
-        return scheduler  # 已经启动，直接返回
-    
-    auto_fetch_enabled = os.getenv('AUTO_FETCH_ENABLED', 'false').lower() == 'true'
-    if auto_fetch_enabled:
-        logger.info("=" * 60)
-        logger.info("检测到 AUTO_FETCH_ENABLED=true，正在启动定时任务...")
-        logger.info("=" * 60)
-        scheduler = start_scheduler()
-        if scheduler:
-            logger.info("✅ 定时任务调度器已启动（适用于Gunicorn等生产环境）")
-            logger.info("=" * 60)
-        else:
-            logger.warning("⚠️  定时任务调度器启动失败（需要安装 APScheduler）")
-        return scheduler
-    else:
-        logger.info("ℹ️  自动定时抓取未启用（设置 AUTO_FETCH_ENABLED=true 启用）")
-        return None
+    """
+    启动后台任务worker子进程（定时任务调度器在worker中运行，见 worker.py）
+    设置 EMBEDDED_WORKER=false 时不启动，改由独立的 worker 服务执行
+    """
+    from worker import start_embedded_worker
+    return start_embedded_worker()
+
 
 def load_papers_data(json_path='./docs/cv-arxiv-daily.json', use_db=True):
     """加载论文数据（优先使用数据库）"""
@@ -242,16 +201,28 @@ def parse_paper_entry(entry_str):
 
 
 def build_nested_papers(papers):
-    """将论文列表组织为扁平化分类结构（新版）"""
+    """将论文列表（serializers.fetch_dicts 返回的 dict）组织为扁平化分类结构（新版）"""
     flat = {}
-    for paper in papers:
-        norm_cat = normalize_category(paper.category)
-        paper_dict = paper.to_dict()
+    for paper_dict in papers:
+        norm_cat = normalize_category(paper_dict['category'])
         paper_dict['category'] = norm_cat  # 使用规范化后的标签
         flat.setdefault(norm_cat, []).append(paper_dict)
     return flat
 
 
+def requested_field_set(default='detail'):
+    """请求参数 fields 指定的字段集（list/card/detail，见 serializers），不合法时返回 None"""
+    fields = request.args.get('fields', default) or default
+    return fields if fields in FIELD_SET_NAMES else None
+
+
+def invalid_field_set_response():
+    return jsonify({
+        'success': False,
+        'error': f"fields 参数只能是: {', '.join(FIELD_SET_NAMES)}"
+    }), 400
+
+
 def build_nested_stats_from_papers(papers):
     """从论文列表构建嵌套统计"""
     flat_counts = {}
@@ -526,13 +497,20 @@ def get_paper_stats():
 
 @app.route('/api/papers')
 def get_papers():
-    """获取论文列表API（使用数据库）"""
+    """获取论文列表API（使用数据库）
+
+    参数:
+        fields: 字段集 list/card/detail（默认 detail，与 Paper.to_dict() 一致）
+    """
+    fields = requested_field_set()
+    if fields is None:
+        return invalid_field_set_response()
     session = None
     try:
         session = get_session()
         
-        # 从数据库查询所有论文
-        papers = session.query(Paper).order_by(Paper.publish_date.desc()).all()
+        # 从数据库查询所有论文（只查询字段集需要的列，不构建 ORM 对象）
+        papers = fetch_dicts(session, Paper, fields, order_by=[Paper.publish_date.desc()])
         
         # 获取最后更新时间（数据库中最新的updated_at）
         last_update_query = session.query(func.max(Paper.updated_at)).scalar()
@@ -689,31 +667,25 @@ def get_trends():
             recent_start = end_date - timedelta(days=7)
             previous_start = end_date - timedelta(days=14)
             
-            for category in CATEGORY_ORDER:
-                recent_count = trends_data[category]['total'] if category in trends_data else 0
-                # 计算最近7天的数量
-                recent_papers = session.query(Paper).filter(
-                    Paper.category == category
-                ).filter(
-                    or_(
-                        and_(Paper.publish_date.isnot(None), Paper.publish_date >= recent_start, Paper.publish_date <= end_date),
-                        and_(Paper.publish_date.is_(None), 
-                             func.date(Paper.created_at) >= recent_start, 
-                             func.date(Paper.created_at) <= end_date)
-                    )
-                ).count()
-                
-                # 计算之前7天的数量
-                previous_papers = session.query(Paper).filter(
-                    Paper.category == category
-                ).filter(
+            def count_by_category(range_start, range_end):
+                """[range_start, range_end) 内各类别的论文数（一次分组查询，不再按类别逐个统计）"""
+                rows = session.query(Paper.category, func.count(Paper.id)).filter(
                     or_(
-                        and_(Paper.publish_date.isnot(None), Paper.publish_date >= previous_start, Paper.publish_date < recent_start),
-                        and_(Paper.publish_date.is_(None), 
-                             func.date(Paper.created_at) >= previous_start, 
-                             func.date(Paper.created_at) < recent_start)
+                        and_(Paper.publish_date.isnot(None), Paper.publish_date >= range_start, Paper.publish_date < range_end),
+                        and_(Paper.publish_date.is_(None),
+                             func.date(Paper.created_at) >= range_start,
+                             func.date(Paper.created_at) < range_end)
                     )
-                ).count()
+                ).group_by(Paper.category).all()
+                return dict(rows)
+
+            # 最近7天（含今天）与之前7天的数量
+            recent_counts = count_by_category(recent_start, end_date + timedelta(days=1))
+            previous_counts = count_by_category(previous_start, recent_start)
+
+            for category in CATEGORY_ORDER:
+                recent_papers = recent_counts.get(category, 0)
+                previous_papers = previous_counts.get(category, 0)
                 
                 if previous_papers > 0:
                     growth_rate = ((recent_papers - previous_papers) / previous_papers) * 100
@@ -938,7 +910,10 @@ def get_stats():
 
 @app.route('/api/jobs')
 def get_jobs():
-    """获取招聘信息列表API"""
+    """获取招聘信息列表API（fields: 字段集 list/card/detail，默认 detail）"""
+    fields = requested_field_set()
+    if fields is None:
+        return invalid_field_set_response()
     session = None
     try:
         session = get_jobs_session()
@@ -947,45 +922,21 @@ def get_jobs():
         limit = request.args.get('limit', type=int, default=20)
         offset = request.args.get('offset', type=int, default=0)
         
-        # 查询所有招聘信息
-        all_jobs = session.query(Job).all()
-        
-        # 转换为字典列表
-        jobs_list = [job.to_dict() for job in all_jobs]
-        
-        # 按日期排序（从近到远）
-        # update_date格式: "2025.9.8" 或 "2025.10.1"
-        def parse_date(date_str):
-            """将日期字符串转换为可比较的元组"""
-            if not date_str:
-                return (0, 0, 0)  # 空日期排最后
-            try:
-                parts = date_str.split('.')
-                if len(parts) == 3:
-                    year = int(parts[0])
-                    month = int(parts[1])
-                    day = int(parts[2])
-                    return (year, month, day)
-                else:
-                    return (0, 0, 0)
-            except:
-                return (0, 0, 0)
-        
-        # 按日期从近到远排序（最新的在前）
-        jobs_list.sort(key=lambda x: parse_date(x.get('update_date', '')), reverse=True)
-        
-        # 应用分页
-        total_count = len(jobs_list)
-        jobs_list = jobs_list[offset:offset + limit]
+        # 排序、分页都交给数据库：按 update_day 从近到远，空日期排最后
+        # update_day 由 update_date（如"2025.9.8"）解析而来，见 migrate_add_job_update_day.py
+        total_count = session.query(func.count(Job.id)).scalar()
+        jobs_list = fetch_dicts(session, Job, fields, order_by=[
+            Job.update_day.is_(None),
+            desc(Job.update_day),
+            Job.id
+        ], offset=offset, limit=limit)
         
-        # 检查是否有今天新增的岗位
+        # 检查是否有今天新增的岗位（EXISTS，命中即停）
         from datetime import date
-        today = date.today()
-        has_new_today = False
-        for job in all_jobs:
-            if job.created_at and job.created_at.date() == today:
-                has_new_today = True
-                break
+        today_start = datetime.combine(date.today(), datetime.min.time())
+        has_new_today = session.query(
+            exists().where(Job.created_at >= today_start)
+        ).scalar()
         
         return jsonify({
             'success': True,
@@ -1083,10 +1034,12 @@ def get_bilibili():
                 now < bilibili_cache['expires_at']):
                 # 缓存有效，直接返回缓存数据
                 logger.info("使用Bilibili缓存数据")
+                record_cache_lookup('bilibili', hit=True)
                 cached_data = bilibili_cache['data']
                 return jsonify(cached_data)
         
         # 缓存无效或不存在，重新获取数据
+        record_cache_lookup('bilibili', hit=False)
         logger.info("Bilibili缓存已过期或不存在，重新获取数据")
         client = BilibiliClient()
         
@@ -1252,11 +1205,13 @@ def get_all_bilibili():
                     # 验证数据格式：data字段必须是数组
                     if isinstance(cached_data.get('data'), list):
                         logger.info(f"使用B站所有数据缓存（剩余{int(cache_expires_at - now_ts)}秒）")
+                        record_cache_lookup('bilibili_all', hit=True)
                         return jsonify(cached_data)
                     else:
                         logger.warning("缓存数据格式错误（不是数组），清除缓存并重新获取")
                         bilibili_cache['all_data'] = None
                         bilibili_cache['all_expires_at'] = None
+            record_cache_lookup('bilibili_all', hit=False)
 
         session = get_bilibili_session()
         all_data = []
@@ -1265,24 +1220,8 @@ def get_all_bilibili():
         # 排序：逐际动力(1172054289)始终在第一位，其他按UID排序
         LIMX_UID = 1172054289
         
-        # 直接SQL查询检查（调试）
-        from sqlalchemy import text
-        direct_result = session.execute(text("""
-            SELECT uid, name, videos_count, views_count, views_formatted 
-            FROM bilibili_ups 
-            WHERE uid = :uid AND is_active = true
-        """), {"uid": LIMX_UID})
-        direct_row = direct_result.fetchone()
-        if direct_row:
-            logger.info(f"DEBUG_直接SQL查询逐际动力: uid={direct_row[0]}, name={direct_row[1]}, videos_count={direct_row[2]}, views_count={direct_row[3]}")
-        
         ups = session.query(BilibiliUp).filter_by(is_active=True).all()
         
-        # 调试：检查查询到的UP主数据
-        for up in ups:
-            if up.uid == LIMX_UID:
-                logger.info(f"DEBUG_ORM查询逐际动力: uid={up.uid}, name={up.name}, videos_count={up.videos_count}, views_count={up.views_count}")
-        
         # 分离逐际动力和其他UP主
         limx_up = None
         other_ups = []
@@ -1309,35 +1248,14 @@ def get_all_bilibili():
         
         for up in ups:
             try:
-                # 刷新UP主对象，确保数据是最新的
-                session.refresh(up)
-                
-                # 获取该UP主的视频（按发布时间倒序，最多200条）
-                videos_query = session.query(BilibiliVideo).filter_by(
-                    uid=up.uid,
-                    is_deleted=False
-                ).order_by(BilibiliVideo.pubdate_raw.desc()).limit(200)
-                
-                videos = videos_query.all()
-                
-                # 转换为字典格式
-                formatted_videos = []
-                for video in videos:
-                    formatted_videos.append({
-                        'bvid': video.bvid,
-                        'title': video.title or '',
-                        'pic': video.pic or '',
-                        # 修复：实时格式化play字段，不依赖可能过时的play_formatted
-                        'play': format_number(video.play) if video.play else '0',
-                        'play_raw': video.play or 0,
-                        'favorites': video.favorites_formatted or '0',
-                        'video_review': video.video_review_formatted or '0',
-                        'pubdate': format_timestamp(video.pubdate_raw) if video.pubdate_raw else '',
-                        'pubdate_raw': video.pubdate_raw or 0,
-                        'description': video.description or '',
-                        'length': video.length or '',
-                        'url': video.url or f"https://www.bilibili.com/video/{video.bvid}"
-                    })
+                # 该UP主的视频（按发布时间倒序，最多200条），字段集 card 即前端卡片格式
+                # （UP主刚由本会话查询出来，不需要再 refresh）
+                formatted_videos = fetch_dicts(
+                    session, BilibiliVideo, 'card',
+                    BilibiliVideo.uid == up.uid,
+                    BilibiliVideo.is_deleted == False,
+                    order_by=[BilibiliVideo.pubdate_raw.desc()], limit=200
+                )
                 
                 # 构建user_stat（确保正确处理）
                 # ✅ 修复：如果数据库值为0，尝试从视频表计算
@@ -1363,11 +1281,6 @@ def get_all_bilibili():
                 
                 likes_val = up.likes_formatted or (format_number(up.likes_count) if up.likes_count else '0')
                 
-                # 调试日志（临时）
-                if up.name == '逐际动力':
-                    logger.info(f"DEBUG_逐际动力: videos_count={up.videos_count}, views_count={up.views_count}, views_formatted={up.views_formatted!r}")
-                    logger.info(f"DEBUG_逐际动力计算结果: videos_val={videos_val!r}, views_val={views_val!r}")
-                
                 # 构建响应数据
                 card_data = {
                     'user_info': {
@@ -1648,14 +1561,47 @@ def get_bilibili_monthly_stats():
             'error': str(e)
         }), 500
 
+@app.route('/api/bilibili/videos/<bvid>/history')
+def get_bilibili_video_history(bvid):
+    """单个视频的播放量/评论数/收藏数时间序列（附增量和播放速度），数据来自 bilibili_video_stats"""
+    session = None
+    try:
+        from video_stats_history import stat_series
+        days = request.args.get('days', type=int, default=30)
+        since_ts = int(datetime.now().timestamp()) - days * 86400 if days and days > 0 else None
+
+        session = get_bilibili_session()
+        points = stat_series(session, bvid, since_ts=since_ts)
+        for point in points:
+            point['time'] = format_timestamp(point['ts'])
+        return jsonify({
+            'success': True,
+            'bvid': bvid,
+            'days': days,
+            'data': points,
+            'total': len(points),
+        })
+    except Exception as e:
+        logger.error(f"获取视频统计历史失败: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+    finally:
+        if session is not None:
+            session.close()
+
 @app.route('/api/authors/ranking')
 def get_author_ranking():
-    """获取活跃作者排行榜"""
+    """获取活跃作者排行榜
+
+    基于作者索引表 paper_authors（见 migrate_add_paper_authors.py）：一次 GROUP BY 取前 N 名，
+    只为前 N 名查询论文列表和上一周期的数量，耗时取决于时间窗口内的论文数。
+    """
     session = None
     try:
         from datetime import date, timedelta
         from collections import defaultdict
-        import re
         
         session = get_session()
         
@@ -1668,102 +1614,71 @@ def get_author_ranking():
         # 计算日期范围
         today = date.today()
         start_date = today - timedelta(days=days)
+        prev_start_date = start_date - timedelta(days=days)
         
-        # 构建查询（时间范围内的所有论文，后续按新标签过滤）
-        papers = session.query(Paper).filter(
-            or_(
-                and_(Paper.publish_date.isnot(None), Paper.publish_date >= start_date, Paper.publish_date <= today),
-                and_(Paper.publish_date.is_(None), 
-                     func.date(Paper.created_at) >= start_date, 
-                     func.date(Paper.created_at) <= today)
+        def in_window(start, end):
+            """发布日期在 [start, end) 内，没有发布日期的按入库日期"""
+            return or_(
+                and_(Paper.publish_date.isnot(None), Paper.publish_date >= start, Paper.publish_date < end),
+                and_(Paper.publish_date.is_(None),
+                     func.date(Paper.created_at) >= start,
+                     func.date(Paper.created_at) < end)
             )
-        ).all()
-        
-        # 统计作者论文数量
-        author_count = defaultdict(lambda: {'count': 0, 'papers': []})
         
-        for paper in papers:
-            norm_cat = normalize_category(paper.category)
-            if normalized_filter and norm_cat != normalized_filter:
-                continue
-            if not paper.authors:
-                continue
-            
-            # 解析作者列表（可能是逗号分隔的字符串）
-            authors_str = paper.authors.strip()
-            if not authors_str:
-                continue
-            
-            # 分割作者（处理各种分隔符）
-            authors = re.split(r'[,，;；]', authors_str)
-            
-            for author in authors:
-                author = author.strip()
-                if not author or len(author) < 2:  # 过滤太短的名称
-                    continue
-                
-                # 移除常见的后缀（如"Team", "et al."等）
-                author = re.sub(r'\s+(Team|et al\.?|等)$', '', author, flags=re.IGNORECASE)
-                author = author.strip()
-                
-                if not author or len(author) < 2:
-                    continue
-                
-                author_count[author]['count'] += 1
-                author_count[author]['papers'].append({
-                    'id': paper.id,
-                    'title': paper.title,
-                    'date': paper.publish_date.strftime('%Y-%m-%d') if paper.publish_date else '',
-                    'category': norm_cat,
-                    'pdf_url': paper.pdf_url,
-                    'code_url': paper.code_url,
-                })
-        
-        # 转换为列表并排序
-        author_list = []
-        for author, data in author_count.items():
-            author_list.append({
-                'author': author,
-                'count': data['count'],
-                'papers': sorted(data['papers'], key=lambda x: x['date'], reverse=True)
-            })
+        current_window = in_window(start_date, today + timedelta(days=1))
+        filters = []
+        if normalized_filter:
+            # 类别按新标签归一化后比较：先找出归一化到该标签的原始类别值
+            raw_categories = [
+                cat for (cat,) in session.query(Paper.category).distinct()
+                if normalize_category(cat) == normalized_filter
+            ]
+            category_conditions = [Paper.category.in_([cat for cat in raw_categories if cat is not None])]
+            if None in raw_categories:
+                category_conditions.append(Paper.category.is_(None))
+            filters.append(or_(*category_conditions))
+        
+        def author_query(*columns):
+            return session.query(*columns).join(Paper, Paper.id == PaperAuthor.paper_id).filter(*filters)
         
         # 按论文数量排序，取top N
-        author_list.sort(key=lambda x: x['count'], reverse=True)
-        author_list = author_list[:limit]
+        paper_count = func.count(PaperAuthor.paper_id)
+        top_authors = author_query(PaperAuthor.author_norm, paper_count).filter(
+            current_window
+        ).group_by(PaperAuthor.author_norm).order_by(
+            paper_count.desc(), PaperAuthor.author_norm
+        ).limit(limit).all()
+        names = [author for author, _ in top_authors]
+        
+        # 只为前 N 名作者查询论文列表
+        author_papers = defaultdict(list)
+        if names:
+            rows = author_query(
+                PaperAuthor.author_norm, Paper.id, Paper.title, Paper.publish_date,
+                Paper.category, Paper.pdf_url, Paper.code_url
+            ).filter(current_window, PaperAuthor.author_norm.in_(names)).order_by(Paper.id).all()
+            for author, paper_id, title, publish_date, paper_category, pdf_url, code_url in rows:
+                author_papers[author].append({
+                    'id': paper_id,
+                    'title': title,
+                    'date': publish_date.strftime('%Y-%m-%d') if publish_date else '',
+                    'category': normalize_category(paper_category),
+                    'pdf_url': pdf_url,
+                    'code_url': code_url,
+                })
         
-        # 计算环比（与上一个周期对比）
-        prev_start_date = start_date - timedelta(days=days)
-        prev_query = session.query(Paper).filter(
-            or_(
-                and_(Paper.publish_date.isnot(None), Paper.publish_date >= prev_start_date, Paper.publish_date < start_date),
-                and_(Paper.publish_date.is_(None), 
-                     func.date(Paper.created_at) >= prev_start_date, 
-                     func.date(Paper.created_at) < start_date)
-            )
-        )
-        prev_papers = prev_query.all()
+        author_list = [{
+            'author': author,
+            'count': count,
+            'papers': sorted(author_papers[author], key=lambda x: x['date'], reverse=True)
+        } for author, count in top_authors]
         
-        # 统计上一个周期的作者数量
-        prev_author_count = defaultdict(int)
-        for paper in prev_papers:
-            norm_cat = normalize_category(paper.category)
-            if normalized_filter and norm_cat != normalized_filter:
-                continue
-            if not paper.authors:
-                continue
-            authors_str = paper.authors.strip()
-            if not authors_str:
-                continue
-            authors = re.split(r'[,，;；]', authors_str)
-            for author in authors:
-                author = author.strip()
-                if not author or len(author) < 2:
-                    continue
-                author = re.sub(r'\s+(Team|et al\.?|等)$', '', author, flags=re.IGNORECASE)
-                author = author.strip()
-                if author and len(author) >= 2:
-                    prev_author_count[author] += 1
+        # 计算环比（与上一个周期对比，只统计前 N 名作者）
+        prev_author_count = {}
+        if names:
+            prev_author_count = dict(author_query(PaperAuthor.author_norm, paper_count).filter(
+                in_window(prev_start_date, start_date), PaperAuthor.author_norm.in_(names)
+            ).group_by(PaperAuthor.author_norm).all())
         
         # 计算环比增长率
         for author_data in author_list:
@@ -1805,7 +1720,10 @@ def get_author_ranking():
 
 @app.route('/api/news')
 def get_news():
-    """获取新闻信息列表API"""
+    """获取新闻信息列表API（fields: 字段集 list/card/detail，默认 detail）"""
+    fields = requested_field_set()
+    if fields is None:
+        return invalid_field_set_response()
     session = None
     try:
         session = get_news_session()
@@ -1819,31 +1737,25 @@ def get_news():
         from datetime import datetime, timedelta
         twenty_four_hours_ago = datetime.now() - timedelta(hours=24)
         
-        # 构建查询
-        query = session.query(News)
-        
         # 只显示24小时内的新闻
         # 优先使用published_at，如果没有则使用created_at
-        query = query.filter(
+        criteria = [
             or_(
                 and_(News.published_at.isnot(None), News.published_at >= twenty_four_hours_ago),
                 and_(News.published_at.is_(None), News.created_at >= twenty_four_hours_ago)
             )
-        )
+        ]
         
         # 按平台筛选
         if platform:
-            query = query.filter(News.platform == platform)
+            criteria.append(News.platform == platform)
         
         # 查询新闻信息，按创建时间倒序排列（最新的新闻在前面）
         # 优先使用created_at（刷新时间），确保显示最新刷新的新闻
-        news = query.order_by(
+        news_list = fetch_dicts(session, News, fields, *criteria, order_by=[
             desc(News.created_at),
             desc(News.published_at)
-        ).limit(limit).offset(offset).all()
-        
-        # 转换为字典列表
-        news_list = [item.to_dict() for item in news]
+        ], limit=limit, offset=offset)
         
         # 获取24小时内的总数
         from datetime import datetime, timedelta
@@ -1874,314 +1786,231 @@ def get_news():
         if session:
             session.close()
 
-# 刷新任务状态（全局变量）
-refresh_status = {
-    'running': False,
-    'papers': {'status': 'idle', 'message': ''},
-    'jobs': {'status': 'idle', 'message': ''},
-    'news': {'status': 'idle', 'message': ''}
+# 论文增量抓取与全量抓取互斥，状态接口取两者中最近的一次
+PAPER_TASK_TYPES = ['fetch_papers', 'full_fetch_papers']
+# 一键刷新：入队一个 refresh_all 任务，按阶段刷新以下数据源（见 refresh_pipeline.py）；
+# 刷新项 -> 读取状态的任务类型（单独触发的抓取任务与一键刷新取最近的一次）
+REFRESH_TASKS = {
+    'papers': PAPER_TASK_TYPES + ['refresh_all'],
+    'jobs': ['fetch_jobs', 'refresh_all'],
+    'news': ['fetch_news', 'refresh_all'],
+}
+# 状态接口长轮询的最长等待时间（秒），需小于gunicorn的worker超时
+LONG_POLL_MAX_WAIT = float(os.getenv('LONG_POLL_MAX_WAIT', '20'))
+# 任务状态 -> 一键刷新接口的状态
+REFRESH_STATE_MAP = {
+    'queued': 'pending',
+    'running': 'running',
+    'success': 'success',
+    'error': 'error',
 }
-refresh_status_lock = threading.Lock()
+
+
+# 本进程已清理过首屏缓存的最近一次刷新任务ID
+_last_published_task_id = 0
+
+
+def publish_refreshed(task):
+    """
+    刷新任务写入新数据后清理本进程的首屏数据缓存（每个任务只清理一次，其他进程的缓存按有效期过期）
+    单独的抓取任务以成功为准；一键刷新以发布标记为准（部分数据源失败时，已写入的数据同样需要发布）
+    """
+    global _last_published_task_id
+    published = task['state'] == 'success' or task['counters'].get('published')
+    if published and task['id'] > _last_published_task_id:
+        _last_published_task_id = task['id']
+        clear_section_cache()
+
+
+def build_refresh_status():
+    """汇总一键刷新各项最近一次任务的状态"""
+    status = {'running': False}
+    revisions = []
+    for item, status_types in REFRESH_TASKS.items():
+        task = get_latest_task(status_types)
+        revisions.append(task_revision(task))
+        if not task:
+            status[item] = {'status': 'idle', 'message': ''}
+            continue
+        publish_refreshed(task)
+        state = REFRESH_STATE_MAP.get(task['state'], 'idle')
+        status[item] = {'status': state, 'message': task['message'] or task['error']}
+        if state in ('pending', 'running'):
+            status['running'] = True
+    status['revision'] = '|'.join(revisions)
+    return status
+
 
 @app.route('/api/refresh-all', methods=['POST'])
 def refresh_all_data():
-    """一键刷新所有数据：论文、招聘、新闻（异步执行）"""
-    import threading
-    from fetch_jobs import fetch_and_save_jobs
-    from fetch_news import fetch_and_save_news
-    
-    global refresh_status
-    
-    with refresh_status_lock:
-        if refresh_status['running']:
-            return jsonify({
-                'success': True,
-                'message': '刷新任务已在运行中',
-                'status': refresh_status
-            })
-        
-        refresh_status['running'] = True
-        refresh_status['papers'] = {'status': 'pending', 'message': '等待刷新...'}
-        refresh_status['jobs'] = {'status': 'pending', 'message': '等待刷新...'}
-        refresh_status['news'] = {'status': 'pending', 'message': '等待刷新...'}
-    
-    def refresh_papers():
-        """刷新论文数据 - 使用fetch_new_data.py中的fetch_papers函数"""
-        global refresh_status
-        try:
-            with refresh_status_lock:
-                refresh_status['papers'] = {'status': 'running', 'message': '正在刷新论文...'}
-            logger.info("=" * 60)
-            logger.info("开始刷新论文数据...")
-            logger.info("=" * 60)
-            
-            # 检查必要的模块是否可以导入
-            try:
-                from fetch_new_data import fetch_papers
-                logger.info("论文抓取模块导入成功")
-            except ImportError as e:
-                raise ImportError(f"无法导入论文抓取模块: {str(e)}，请检查fetch_new_data.py文件是否存在")
-            
-            # 检查配置文件是否存在
-            config_path = 'config.yaml'
-            if not os.path.exists(config_path):
-                raise FileNotFoundError(f"配置文件不存在: {config_path}")
-            logger.info(f"配置文件检查通过: {config_path}")
-            
-            logger.info("开始执行论文抓取...")
-            fetch_papers()
-            
-            with refresh_status_lock:
-                refresh_status['papers'] = {'status': 'success', 'message': '论文刷新完成'}
-            logger.info("=" * 60)
-            logger.info("论文数据刷新完成")
-            logger.info("=" * 60)
-        except FileNotFoundError as e:
-            error_msg = f"配置文件不存在: {str(e)}"
-            with refresh_status_lock:
-                refresh_status['papers'] = {'status': 'error', 'message': error_msg}
-            logger.error("=" * 60)
-            logger.error(f"论文数据刷新失败: {error_msg}")
-            logger.error("=" * 60)
-            import traceback
-            logger.error(traceback.format_exc())
-        except ImportError as e:
-            error_msg = f"导入模块失败: {str(e)}，请检查依赖是否安装"
-            with refresh_status_lock:
-                refresh_status['papers'] = {'status': 'error', 'message': error_msg}
-            logger.error("=" * 60)
-            logger.error(f"论文数据刷新失败: {error_msg}")
-            logger.error("=" * 60)
-            import traceback
-            logger.error(traceback.format_exc())
-        except Exception as e:
-            error_msg = f"刷新失败: {str(e)}"
-            with refresh_status_lock:
-                refresh_status['papers'] = {'status': 'error', 'message': error_msg}
-            logger.error("=" * 60)
-            logger.error(f"论文数据刷新失败: {error_msg}")
-            logger.error("=" * 60)
-            import traceback
-            logger.error(traceback.format_exc())
-        finally:
-            # 确保在所有情况下都检查并更新running状态
-            with refresh_status_lock:
-                # 检查所有任务是否都完成
-                papers_done = refresh_status.get('papers', {}).get('status', 'idle') in ['success', 'error']
-                jobs_done = refresh_status.get('jobs', {}).get('status', 'idle') in ['success', 'error']
-                news_done = refresh_status.get('news', {}).get('status', 'idle') in ['success', 'error']
-                if papers_done and jobs_done and news_done:
-                    refresh_status['running'] = False
-    
-    def refresh_jobs():
-        """刷新招聘数据 - 使用fetch_jobs.py中的fetch_and_save_jobs函数"""
-        global refresh_status
-        try:
-            with refresh_status_lock:
-                refresh_status['jobs'] = {'status': 'running', 'message': '正在刷新招聘信息...'}
-            logger.info("=" * 60)
-            logger.info("开始刷新招聘数据...")
-            logger.info("=" * 60)
-            
-            # 检查必要的模块是否可以导入
-            try:
-                from fetch_jobs import fetch_and_save_jobs
-                logger.info("招聘信息抓取模块导入成功")
-            except ImportError as e:
-                raise ImportError(f"无法导入招聘信息抓取模块: {str(e)}，请检查fetch_jobs.py文件是否存在")
-            
-            logger.info("开始执行招聘信息抓取...")
-            fetch_and_save_jobs()
-            
-            with refresh_status_lock:
-                refresh_status['jobs'] = {'status': 'success', 'message': '招聘信息刷新完成'}
-            logger.info("=" * 60)
-            logger.info("招聘数据刷新完成")
-            logger.info("=" * 60)
-        except ImportError as e:
-            error_msg = f"模块导入失败: {str(e)}"
-            with refresh_status_lock:
-                refresh_status['jobs'] = {'status': 'error', 'message': error_msg}
-            logger.error("=" * 60)
-            logger.error(f"招聘数据刷新失败: {error_msg}")
-            logger.error("=" * 60)
-            import traceback
-            logger.error(traceback.format_exc())
-        except Exception as e:
-            error_msg = f"刷新失败: {str(e)}"
-            with refresh_status_lock:
-                refresh_status['jobs'] = {'status': 'error', 'message': error_msg}
-            logger.error("=" * 60)
-            logger.error(f"招聘数据刷新失败: {error_msg}")
-            logger.error("=" * 60)
-            import traceback
-            logger.error(traceback.format_exc())
-        finally:
-            # 确保在所有情况下都检查并更新running状态
-            with refresh_status_lock:
-                # 检查所有任务是否都完成
-                papers_done = refresh_status.get('papers', {}).get('status', 'idle') in ['success', 'error']
-                jobs_done = refresh_status.get('jobs', {}).get('status', 'idle') in ['success', 'error']
-                news_done = refresh_status.get('news', {}).get('status', 'idle') in ['success', 'error']
-                if papers_done and jobs_done and news_done:
-                    refresh_status['running'] = False
-    
-    def refresh_news():
-        """刷新新闻数据 - 使用fetch_news.py中的fetch_and_save_news函数"""
-        global refresh_status
-        try:
-            with refresh_status_lock:
-                refresh_status['news'] = {'status': 'running', 'message': '正在刷新新闻...'}
-            logger.info("=" * 60)
-            logger.info("开始刷新新闻数据...")
-            logger.info("=" * 60)
-            
-            # 检查必要的模块是否可以导入
-            try:
-                from fetch_news import fetch_and_save_news
-                logger.info("新闻抓取模块导入成功")
-            except ImportError as e:
-                raise ImportError(f"无法导入新闻抓取模块: {str(e)}，请检查fetch_news.py文件是否存在")
-            
-            # 检查数据库连接
-            session = None
-            try:
-                from news_models import init_news_db, get_news_session
-                init_news_db()
-                session = get_news_session()
-                logger.info("新闻数据库连接正常")
-            except Exception as e:
-                logger.warning(f"新闻数据库初始化警告: {e}")
-            finally:
-                if session:
-                    session.close()
-            
-            logger.info("开始执行新闻抓取...")
-            fetch_and_save_news()
-            
-            with refresh_status_lock:
-                refresh_status['news'] = {'status': 'success', 'message': '新闻刷新完成'}
-            logger.info("=" * 60)
-            logger.info("新闻数据刷新完成")
-            logger.info("=" * 60)
-        except ImportError as e:
-            error_msg = f"模块导入失败: {str(e)}"
-            with refresh_status_lock:
-                refresh_status['news'] = {'status': 'error', 'message': error_msg}
-            logger.error("=" * 60)
-            logger.error(f"新闻数据刷新失败: {error_msg}")
-            logger.error("=" * 60)
-            import traceback
-            logger.error(traceback.format_exc())
-        except Exception as e:
-            error_msg = f"刷新失败: {str(e)}"
-            with refresh_status_lock:
-                refresh_status['news'] = {'status': 'error', 'message': error_msg}
-            logger.error("=" * 60)
-            logger.error(f"新闻数据刷新失败: {error_msg}")
-            logger.error("=" * 60)
-            import traceback
-            logger.error(traceback.format_exc())
-        finally:
-            # 确保在所有情况下都检查并更新running状态
-            with refresh_status_lock:
-                # 检查所有任务是否都完成
-                papers_done = refresh_status.get('papers', {}).get('status', 'idle') in ['success', 'error']
-                jobs_done = refresh_status.get('jobs', {}).get('status', 'idle') in ['success', 'error']
-                news_done = refresh_status.get('news', {}).get('status', 'idle') in ['success', 'error']
-                if papers_done and jobs_done and news_done:
-                    refresh_status['running'] = False
-    
-    # 在后台线程中执行刷新任务（避免阻塞）
-    paper_thread = threading.Thread(target=refresh_papers, daemon=True)
-    jobs_thread = threading.Thread(target=refresh_jobs, daemon=True)
-    news_thread = threading.Thread(target=refresh_news, daemon=True)
-    
-    paper_thread.start()
-    jobs_thread.start()
-    news_thread.start()
-    
-    # 立即返回，不等待完成
-    with refresh_status_lock:
-        status_copy = refresh_status.copy()
-    
-    return jsonify({
-        'success': True,
-        'message': '刷新任务已启动',
-        'status': status_copy
-    })
+    """
+    一键刷新所有数据：论文、招聘、新闻（写入任务表，由worker异步执行）
+    同时触发多次只会有一个 refresh_all 任务排队/运行，后来的请求直接返回该任务的状态
+    """
+    try:
+        _, created = enqueue_task('refresh_all', source='api')
+
+        return jsonify({
+            'success': True,
+            'message': '刷新任务已启动' if created else '刷新任务已在运行中',
+            'status': build_refresh_status()
+        })
+    except Exception as e:
+        logger.error(f"启动刷新任务失败: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'启动刷新任务失败: {str(e)}'
+        }), 500
 
 @app.route('/api/refresh-status', methods=['GET'])
 def get_refresh_status():
     """获取刷新任务状态"""
-    global refresh_status
-    with refresh_status_lock:
-        status_copy = refresh_status.copy()
-        
-        # 检查是否所有任务都完成
-        # 确保所有任务都有状态，且都不是 'running' 或 'pending'
-        papers_done = status_copy.get('papers', {}).get('status', 'idle') in ['success', 'error']
-        jobs_done = status_copy.get('jobs', {}).get('status', 'idle') in ['success', 'error']
-        news_done = status_copy.get('news', {}).get('status', 'idle') in ['success', 'error']
-        
-        all_done = papers_done and jobs_done and news_done
-        
-        if all_done and status_copy.get('running', False):
-            # 所有任务完成，重置running状态
-            status_copy['running'] = False
-            refresh_status['running'] = False  # 同步更新全局状态
-            logger.info(f"所有刷新任务完成: papers={status_copy.get('papers', {}).get('status')}, jobs={status_copy.get('jobs', {}).get('status')}, news={status_copy.get('news', {}).get('status')}")
-    
-    return jsonify(status_copy)
+    return jsonify(build_refresh_status())
+
+def load_task_status(task_types, current_key=None):
+    """
+    读取任务状态，支持长轮询
+    请求参数 since 为上次返回的 revision，wait 为最长等待秒数；
+    状态未变化时最多等待 wait 秒再返回，避免前端高频轮询
+    """
+    since = request.args.get('since', '').strip()
+    try:
+        wait = min(max(float(request.args.get('wait', 0)), 0), LONG_POLL_MAX_WAIT)
+    except ValueError:
+        wait = 0
+    task = wait_for_task_change(task_types, since, wait) if since and wait else get_latest_task(task_types)
+    return task_status(task, current_key=current_key)
+
+# ==================== 任务进度推送（SSE） ====================
+
+# SSE 心跳间隔（秒），防止代理/负载均衡器关闭空闲连接
+SSE_HEARTBEAT_SECONDS = float(os.getenv('SSE_HEARTBEAT_SECONDS', '15'))
+# 单个 SSE 连接的最长持续时间（秒），到期后浏览器按 retry 自动重连并带上 Last-Event-ID
+SSE_STREAM_SECONDS = float(os.getenv('SSE_STREAM_SECONDS', '300'))
+# 浏览器断线重连间隔（毫秒）
+SSE_RETRY_MS = 3000
+# 同一进程内所有连接共享状态快照的时间（秒），连接再多也只按该频率查询任务表
+TASK_SNAPSHOT_TTL = 1.0
+
+_snapshot_cache = {}
+_snapshot_lock = threading.Lock()
+
+# 推送流名称 -> 状态读取函数（返回的状态需带 revision）
+TASK_EVENT_STREAMS = {
+    'papers': lambda: task_status(get_latest_task(PAPER_TASK_TYPES), current_key='current_keyword'),
+    'news': lambda: task_status(get_latest_task('fetch_news')),
+    'jobs': lambda: task_status(get_latest_task('fetch_jobs')),
+    'refresh': build_refresh_status,
+}
+
+
+def get_task_snapshot(stream, loader):
+    """读取任务状态快照（进程内缓存 TASK_SNAPSHOT_TTL 秒）"""
+    with _snapshot_lock:
+        cached = _snapshot_cache.get(stream)
+        if cached and time.monotonic() - cached[0] < TASK_SNAPSHOT_TTL:
+            record_cache_lookup('task_snapshot', hit=True)
+            return cached[1]
+    record_cache_lookup('task_snapshot', hit=False)
+    status = loader()
+    with _snapshot_lock:
+        _snapshot_cache[stream] = (time.monotonic(), status)
+    return status
+
+
+def _sse_stream_seconds():
+    """
+    当前 worker 上 SSE 连接可保持的时间
+    gevent worker 下连接只占一个协程，可以长时间保持；sync worker 下每个连接独占一个 worker，
+    且受 gunicorn timeout 限制，只保持一个长轮询周期
+    """
+    try:
+        from gevent import monkey
+        if monkey.is_module_patched('socket'):
+            return SSE_STREAM_SECONDS
+    except ImportError:
+        pass
+    return min(SSE_STREAM_SECONDS, LONG_POLL_MAX_WAIT)
+
+
+def task_event_response(stream, loader):
+    """
+    任务状态推送（Server-Sent Events）
+    每个事件是完整的状态快照，id 为状态 revision；断线重连时浏览器带上 Last-Event-ID，
+    与当前状态一致则不重复推送，否则立即推送最新状态（中间的进度无需补发）。
+    请求头不接受 text/event-stream 时退化为普通 JSON 响应，支持 ?since=&wait= 长轮询
+    """
+    last_event_id = request.headers.get('Last-Event-ID') or request.args.get('since', '')
+    if 'text/event-stream' not in request.headers.get('Accept', ''):
+        try:
+            wait = min(max(float(request.args.get('wait', 0)), 0), LONG_POLL_MAX_WAIT)
+        except ValueError:
+            wait = 0
+        deadline = time.monotonic() + wait
+        status = get_task_snapshot(stream, loader)
+        while last_event_id and status['revision'] == last_event_id and time.monotonic() < deadline:
+            time.sleep(TASK_SNAPSHOT_TTL)
+            status = get_task_snapshot(stream, loader)
+        return jsonify(status)
+
+    stream_seconds = _sse_stream_seconds()
+
+    def generate():
+        last_revision = last_event_id
+        deadline = time.monotonic() + stream_seconds
+        last_sent = time.monotonic()
+        yield f"retry: {SSE_RETRY_MS}\n\n"
+        try:
+            while True:
+                status = get_task_snapshot(stream, loader)
+                if status['revision'] != last_revision:
+                    last_revision = status['revision']
+                    last_sent = time.monotonic()
+                    data = json.dumps(status, ensure_ascii=False)
+                    yield f"id: {last_revision}\nevent: status\ndata: {data}\n\n"
+                elif time.monotonic() - last_sent >= SSE_HEARTBEAT_SECONDS:
+                    last_sent = time.monotonic()
+                    yield ": heartbeat\n\n"
+                if time.monotonic() >= deadline:
+                    return
+                time.sleep(TASK_SNAPSHOT_TTL)
+        except Exception as e:
+            # 出错时结束本次连接，由浏览器自动重连
+            logger.error(f"任务状态推送失败（{stream}）: {e}")
+
+    response = Response(generate(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # 关闭nginx缓冲，事件立即送达
+    return response
+
+
+@app.route('/api/task-events/<stream>')
+def task_events(stream):
+    """
+    任务进度推送（SSE）：papers/news/jobs/refresh
+    浏览器使用 EventSource 订阅，不支持时可带 ?since=&wait= 以普通请求长轮询
+    """
+    loader = TASK_EVENT_STREAMS.get(stream)
+    if loader is None:
+        return jsonify({'success': False, 'message': f'未知的推送流: {stream}'}), 404
+    return task_event_response(stream, loader)
 
 @app.route('/api/fetch-status')
 def get_fetch_status():
-    """获取论文抓取状态"""
-    # 使用锁保护读取，并在这里做一次“兜底纠错”
-    # 场景：某些情况下底层进度已经到达 total，但 running 标志未及时置为 False，
-    # 会导致前端一直显示“正在抓取 General-Robot (24/24)...”
-    with fetch_status_lock:
-        # 先拷贝一份当前状态
-        status_copy = fetch_status.copy()
-
-        # 如果发现 progress >= total 且 total > 0，但 running 仍为 True，则在这里自动纠正
-        try:
-            running = bool(status_copy.get('running'))
-            total = int(status_copy.get('total', 0) or 0)
-            progress = int(status_copy.get('progress', 0) or 0)
-        except Exception:
-            running = status_copy.get('running', False)
-            total = status_copy.get('total', 0) or 0
-            progress = status_copy.get('progress', 0) or 0
-
-        if running and total > 0 and progress >= total:
-            logger.warning(
-                f"检测到抓取进度已完成但running仍为True，自动纠正状态：progress={progress}, total={total}, "
-                f"current_keyword={status_copy.get('current_keyword')}"
-            )
-            fetch_status['running'] = False
-            fetch_status['message'] = '抓取完成！（由进度自动纠正状态）'
-            fetch_status['current_keyword'] = ''
-            fetch_status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            # 重新拷贝一份修正后的状态
-            status_copy = fetch_status.copy()
-
-    # 添加调试日志
-    if status_copy.get('running'):
-        logger.debug(f"返回抓取状态: {status_copy}")
-    return jsonify(status_copy)
+    """获取论文抓取状态（增量抓取与全量抓取共用，支持 ?since=&wait= 长轮询）"""
+    return jsonify(load_task_status(PAPER_TASK_TYPES, current_key='current_keyword'))
 
 @app.route('/api/fetch-news-status')
 def get_news_fetch_status():
-    """获取新闻抓取状态"""
-    # 使用锁保护读取
-    with news_fetch_status_lock:
-        status_copy = news_fetch_status.copy()
-    return jsonify(status_copy)
+    """获取新闻抓取状态（支持 ?since=&wait= 长轮询）"""
+    return jsonify(load_task_status('fetch_news'))
 
 @app.route('/api/search')
 def search_papers():
-    """搜索论文"""
+    """搜索论文（fields: 字段集 list/card/detail，默认 detail）"""
+    fields = requested_field_set()
+    if fields is None:
+        return invalid_field_set_response()
     session = None
     try:
         query = request.args.get('q', '').strip()
@@ -2194,23 +2023,16 @@ def search_papers():
         
         session = get_session()
         
-        # 构建查询（全局搜索，不受类别限制）
-        papers_query = session.query(Paper)
-        
-        # 按关键词搜索（标题、作者或摘要）
-        if query:
-            papers_query = papers_query.filter(
-                or_(
-                    Paper.title.contains(query),
-                    Paper.authors.contains(query),
-                    Paper.abstract.contains(query)
-                )
-            )
-        
-        # 排序和限制
-        papers = papers_query.order_by(Paper.publish_date.desc()).limit(100).all()
-        
-        result = [paper.to_dict() for paper in papers]
+        # 全局搜索（不受类别限制），按关键词搜索标题、作者或摘要，排序和限制
+        result = fetch_dicts(
+            session, Paper, fields,
+            or_(
+                Paper.title.contains(query),
+                Paper.authors.contains(query),
+                Paper.abstract.contains(query)
+            ),
+            order_by=[Paper.publish_date.desc()], limit=100
+        )
         
         return jsonify({
             'success': True,
@@ -2229,735 +2051,44 @@ def search_papers():
         if session:
             session.close()
 
-@app.route('/api/fetch', methods=['POST'])
-def trigger_fetch():
-    """触发论文抓取 - 通过命令行执行 python3 fetch_new_data.py --papers"""
-    global fetch_status
-    from datetime import datetime, timedelta  # 在函数开头导入，确保整个函数可用
-    
-    # 使用锁保护整个检查-设置过程，确保原子性操作
-    with fetch_status_lock:
-        # 检查状态，如果running为True但last_update超过10分钟，认为任务已卡死，重置状态
-        if fetch_status['running']:
-            last_update_str = fetch_status.get('last_update', '')
-            if last_update_str:
-                try:
-                    last_update = datetime.strptime(last_update_str, '%Y-%m-%d %H:%M:%S')
-                    if datetime.now() - last_update > timedelta(minutes=10):
-                        logger.warning("检测到抓取任务可能已卡死，重置状态")
-                        fetch_status['running'] = False
-                        fetch_status['progress'] = 0
-                        fetch_status['current_keyword'] = ''
-                        fetch_status['message'] = '检测到任务可能已卡死，已重置状态'
-                    else:
-                        # 任务正在运行，拒绝新请求
-                        logger.info(f"拒绝新的抓取请求：任务正在运行中（{last_update.strftime('%Y-%m-%d %H:%M:%S')}）")
-                        return jsonify({
-                            'success': False,
-                            'message': '抓取任务正在运行中，请稍候...',
-                            'status': fetch_status.copy()
-                        }), 400
-                except Exception as e:
-                    # 如果解析失败，重置状态
-                    logger.warning(f"无法解析last_update时间，重置状态: {e}")
-                    fetch_status['running'] = False
-                    fetch_status['progress'] = 0
-                    fetch_status['current_keyword'] = ''
-            else:
-                # 如果没有last_update，重置状态
-                logger.warning("没有last_update信息，重置状态")
-                fetch_status['running'] = False
-                fetch_status['progress'] = 0
-                fetch_status['current_keyword'] = ''
-        
-        # 原子性设置running状态，防止并发问题
-        # 在锁内检查并设置，确保不会有多个任务同时启动
-        if fetch_status['running']:
-            # 如果检查后状态仍然是running，说明确实有任务在运行
-            return jsonify({
-                'success': False,
-                'message': '抓取任务正在运行中，请稍候...',
-                'status': fetch_status.copy()
-            }), 400
-        
-        # 设置running状态（在锁内，确保原子性）
-        fetch_status['running'] = True
-        fetch_status['message'] = '准备启动抓取任务...'
-        fetch_status['progress'] = 0
-        fetch_status['total'] = 0
-        fetch_status['current_keyword'] = ''
-        fetch_status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    
-    # 简化版：不需要配置参数，直接执行脚本
-    # 脚本内部已配置好所有参数（max_results=100, days_back=14等）
-    
-    def fetch_task():
-        """后台抓取任务 - 直接调用 fetch_new_data.fetch_papers() 函数"""
-        global fetch_status
-        from datetime import datetime  # 在函数内部导入，避免作用域问题
-        
-        try:
-            # 注意：running状态已经在trigger_fetch中设置，这里只需要更新消息
-            with fetch_status_lock:
-                fetch_status['message'] = '开始抓取论文...'
-                fetch_status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            logger.info("=" * 60)
-            logger.info("开始抓取论文数据（通过/api/fetch接口）...")
-            logger.info("=" * 60)
-            
-            # 直接导入并调用 fetch_papers 函数，传递 fetch_status 和 fetch_status_lock
-            # 这样可以实时更新状态，而不需要解析 stdout
-            from fetch_new_data import fetch_papers
-            
-            logger.info("调用 fetch_papers() 函数...")
-            
-            # 调用函数，传递状态更新参数
-            fetch_papers(fetch_status=fetch_status, fetch_status_lock=fetch_status_lock)
-            
-            # 任务完成，更新状态
-            with fetch_status_lock:
-                fetch_status['message'] = '抓取完成！'
-                fetch_status['running'] = False  # 关键：标记任务已完成
-                fetch_status['current_keyword'] = ''
-                fetch_status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            logger.info("=" * 60)
-            logger.info("论文数据抓取完成")
-            logger.info("=" * 60)
-            
-        except FileNotFoundError as e:
-            error_msg = f"配置文件不存在: {str(e)}"
-            logger.error("=" * 60)
-            logger.error(f"论文数据抓取失败: {error_msg}")
-            logger.error("=" * 60)
-            import traceback
-            logger.error(traceback.format_exc())
-            with fetch_status_lock:
-                fetch_status['message'] = error_msg
-                fetch_status['running'] = False
-                fetch_status['progress'] = 0
-                fetch_status['current_keyword'] = ''
-                fetch_status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        except ImportError as e:
-            error_msg = f"导入模块失败: {str(e)}，请检查依赖是否安装"
-            logger.error("=" * 60)
-            logger.error(f"论文数据抓取失败: {error_msg}")
-            logger.error("=" * 60)
-            import traceback
-            logger.error(traceback.format_exc())
-            with fetch_status_lock:
-                fetch_status['message'] = error_msg
-                fetch_status['running'] = False
-                fetch_status['progress'] = 0
-                fetch_status['current_keyword'] = ''
-                fetch_status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        except Exception as e:
-            error_msg = f"抓取失败: {str(e)}"
-            logger.error("=" * 60)
-            logger.error(f"论文数据抓取失败: {error_msg}")
-            logger.error("=" * 60)
-            import traceback
-            logger.error(traceback.format_exc())
-            with fetch_status_lock:
-                fetch_status['message'] = error_msg
-                fetch_status['running'] = False
-                fetch_status['progress'] = 0
-                fetch_status['current_keyword'] = ''
-                fetch_status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        finally:
-            # 确保在所有情况下都重置running状态
-            with fetch_status_lock:
-                if fetch_status.get('running', False):
-                    # 如果还在运行状态，说明可能异常退出，重置状态
-                    fetch_status['running'] = False
-                    fetch_status['progress'] = 0
-                    fetch_status['current_keyword'] = ''
-                    if not fetch_status.get('last_update'):
-                        fetch_status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    
-    # 在后台线程中运行
-    thread = threading.Thread(target=fetch_task)
-    thread.daemon = True
-    thread.start()
-    
-    # 立即返回，不等待完成
-    with fetch_status_lock:
-        status_copy = fetch_status.copy()
-    
+def enqueue_and_respond(task_type, started_message, running_message, params=None, source='api', current_key=None):
+    """
+    任务入队并返回与原接口一致的响应
+    同类任务已在排队或运行时返回400
+    """
+    try:
+        task, created = enqueue_task(task_type, params, source=source)
+    except Exception as e:
+        logger.error(f"任务入队失败（{task_type}）: {e}")
+        return jsonify({
+            'success': False,
+            'message': f'启动任务失败: {str(e)}'
+        }), 500
+
+    status = task_status(task, current_key=current_key)
+    if not created:
+        logger.info(f"拒绝新的{task_type}请求：任务 #{task['id']} 正在{task['state']}")
+        return jsonify({
+            'success': False,
+            'message': running_message,
+            'status': status
+        }), 400
     return jsonify({
         'success': True,
-        'message': '抓取任务已启动',
-        'status': status_copy
+        'message': started_message,
+        'status': status
     })
 
+@app.route('/api/fetch', methods=['POST'])
+def trigger_fetch():
+    """触发论文抓取（写入任务表，由worker执行 fetch_new_data.fetch_papers）"""
+    return enqueue_and_respond('fetch_papers', '抓取任务已启动', '抓取任务正在运行中，请稍候...',
+                               current_key='current_keyword')
+
 @app.route('/api/fetch-news', methods=['POST'])
 def trigger_fetch_news():
-    """触发新闻抓取 - 通过命令行执行 python3 fetch_new_data.py --news"""
-    global news_fetch_status
-    
-    with news_fetch_status_lock:
-        if news_fetch_status['running']:
-            return jsonify({
-                'success': False,
-                'message': '新闻抓取任务正在运行中，请稍候...'
-            }), 400
-    
-    def fetch_news_task():
-        """后台新闻抓取任务 - 通过命令行执行 python3 fetch_new_data.py --news"""
-        global news_fetch_status
-        import subprocess
-        import sys
-        
-        try:
-            with news_fetch_status_lock:
-                news_fetch_status['running'] = True
-                news_fetch_status['message'] = '开始抓取新闻...'
-                news_fetch_status['progress'] = 0
-                news_fetch_status['total'] = 1  # 新闻抓取是单步任务
-                news_fetch_status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            logger.info("=" * 60)
-            logger.info("开始抓取新闻数据（通过/api/fetch-news接口）...")
-            logger.info("=" * 60)
-            
-            # 获取脚本路径
-            script_path = os.path.join(os.path.dirname(__file__), 'fetch_new_data.py')
-            if not os.path.exists(script_path):
-                raise FileNotFoundError(f"脚本文件不存在: {script_path}")
-            
-            # 使用字符串命令执行：python3 fetch_new_data.py --news
-            command = f"python3 {script_path} --news"
-            logger.info(f"执行命令: {command}")
-            
-            # 通过subprocess执行命令，实时捕获输出
-            process = subprocess.Popen(
-                command,
-                shell=True,  # 使用shell执行字符串命令
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,  # 行缓冲
-                universal_newlines=True
-            )
-            
-            # 实时读取输出并更新进度
-            for line in process.stdout:
-                line = line.strip()
-                if line:
-                    logger.info(f"新闻抓取输出: {line}")
-                    
-                    # 更新状态消息
-                    if '开始抓取新新闻' in line or '开始抓取' in line:
-                        with news_fetch_status_lock:
-                            news_fetch_status['message'] = '正在抓取新闻...'
-                            news_fetch_status['progress'] = 0
-                    
-                    # 如果检测到完成信息
-                    if '新闻抓取完成' in line or '✅' in line:
-                        with news_fetch_status_lock:
-                            news_fetch_status['message'] = '新闻抓取完成！'
-                            news_fetch_status['progress'] = 1
-            
-            # 等待进程完成
-            return_code = process.wait()
-            
-            if return_code != 0:
-                raise Exception(f"新闻抓取脚本执行失败，返回码: {return_code}")
-            
-            with news_fetch_status_lock:
-                news_fetch_status['message'] = '新闻抓取完成！'
-                news_fetch_status['progress'] = 1
-                news_fetch_status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            logger.info("=" * 60)
-            logger.info("新闻数据抓取完成")
-            logger.info("=" * 60)
-            
-        except FileNotFoundError as e:
-            error_msg = f"脚本文件不存在: {str(e)}"
-            logger.error("=" * 60)
-            logger.error(f"新闻数据抓取失败: {error_msg}")
-            logger.error("=" * 60)
-            import traceback
-            logger.error(traceback.format_exc())
-            with news_fetch_status_lock:
-                news_fetch_status['message'] = error_msg
-                news_fetch_status['running'] = False
-                news_fetch_status['progress'] = 0
-                news_fetch_status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        except Exception as e:
-            error_msg = f"抓取失败: {str(e)}"
-            logger.error("=" * 60)
-            logger.error(f"新闻数据抓取失败: {error_msg}")
-            logger.error("=" * 60)
-            import traceback
-            logger.error(traceback.format_exc())
-            with news_fetch_status_lock:
-                news_fetch_status['message'] = error_msg
-                news_fetch_status['running'] = False
-                news_fetch_status['progress'] = 0
-                news_fetch_status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        finally:
-            with news_fetch_status_lock:
-                if news_fetch_status['running']:  # 如果还没被设置为False
-                    news_fetch_status['running'] = False
-                    news_fetch_status['progress'] = 0
-                    if not news_fetch_status.get('last_update'):
-                        news_fetch_status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    
-    # 在后台线程中运行
-    thread = threading.Thread(target=fetch_news_task)
-    thread.daemon = True
-    thread.start()
-    
-    # 立即返回，不等待完成
-    with news_fetch_status_lock:
-        status_copy = news_fetch_status.copy()
-    
-    return jsonify({
-        'success': True,
-        'message': '新闻抓取任务已启动',
-        'status': status_copy
-    })
-
-def start_scheduler():
-    """启动定时任务调度器"""
-    try:
-        from apscheduler.schedulers.background import BackgroundScheduler
-        from apscheduler.triggers.cron import CronTrigger
-        
-        scheduler = BackgroundScheduler()
-        
-        def scheduled_fetch():
-            """定时抓取论文任务 - 使用fetch_new_data.fetch_papers()函数"""
-            global fetch_status
-            if fetch_status['running']:
-                logger.info("定时抓取任务跳过：已有任务正在运行")
-                return
-            
-            try:
-                logger.info("=" * 60)
-                logger.info("开始执行定时论文抓取任务...")
-                logger.info("=" * 60)
-                
-                # 使用统一的函数调用方式（与手动刷新一致）
-                from fetch_new_data import fetch_papers
-                fetch_papers()
-                
-                logger.info("=" * 60)
-                logger.info("定时论文抓取任务完成")
-                logger.info("=" * 60)
-            except Exception as e:
-                logger.error("=" * 60)
-                logger.error(f"定时论文抓取任务失败: {e}")
-                logger.error("=" * 60)
-                import traceback
-                logger.error(traceback.format_exc())
-        
-        def scheduled_fetch_jobs():
-            """定时抓取招聘信息任务"""
-            try:
-                logger.info("开始执行定时招聘信息抓取任务...")
-                from fetch_jobs import fetch_and_save_jobs
-                fetch_and_save_jobs()
-                logger.info("定时招聘信息抓取任务完成")
-            except Exception as e:
-                logger.error(f"定时招聘信息抓取任务失败: {e}")
-        
-        # 配置论文抓取定时任务（每小时执行一次）
-        # 支持通过环境变量自定义，格式：用分号分隔多个cron表达式，如 "0 * * * *"
-        # 如果环境变量未设置，默认每小时执行一次
-        schedule_cron = os.getenv('AUTO_FETCH_SCHEDULE', '0 * * * *')  # 默认每小时整点执行
-        
-        # 解析 cron 表达式（支持多个，用分号分隔）
-        if schedule_cron:
-            cron_list = schedule_cron.split(';')
-            for idx, cron_expr in enumerate(cron_list):
-                cron_expr = cron_expr.strip()
-                if not cron_expr:
-                    continue
-                parts = cron_expr.split()
-                if len(parts) == 5:
-                    minute, hour, day, month, weekday = parts
-                    job_id = f'hourly_fetch_papers_{idx}'
-                    job_name = f'每小时论文抓取_{idx+1}'
-                    scheduler.add_job(
-                        scheduled_fetch,
-                        trigger=CronTrigger(
-                            minute=minute,
-                            hour=hour,
-                            day=day,
-                            month=month,
-                            day_of_week=weekday
-                        ),
-                        id=job_id,
-                        name=job_name,
-                        replace_existing=True
-                    )
-                    logger.info(f"定时任务已配置 ({job_name}): {cron_expr}")
-        
-        # 配置全量抓取定时任务（每天凌晨2点执行，避免与关键词抓取冲突）
-        try:
-            def scheduled_full_fetch():
-                """定时全量抓取论文任务 - 使用宽泛关键词查询"""
-                global fetch_status
-                if fetch_status['running']:
-                    logger.info("全量抓取任务跳过：已有任务正在运行")
-                    return
-                
-                try:
-                    logger.info("=" * 60)
-                    logger.info("开始执行定时全量论文抓取任务...")
-                    logger.info("=" * 60)
-                    
-                    from scripts.full_fetch_papers import fetch_full_papers
-                    fetch_full_papers(days_back=3, max_results_per_query=100)
-                    
-                    logger.info("=" * 60)
-                    logger.info("定时全量论文抓取任务完成")
-                    logger.info("=" * 60)
-                except Exception as e:
-                    logger.error("=" * 60)
-                    logger.error(f"定时全量论文抓取任务失败: {e}")
-                    logger.error("=" * 60)
-                    import traceback
-                    logger.error(traceback.format_exc())
-            
-            # 每天凌晨2点执行全量抓取（避免与关键词抓取和Semantic Scholar更新冲突）
-            full_fetch_schedule = os.getenv('AUTO_FETCH_FULL_SCHEDULE', '0 2 * * *')
-            if full_fetch_schedule:
-                parts = full_fetch_schedule.split()
-                if len(parts) == 5:
-                    minute, hour, day, month, weekday = parts
-                    scheduler.add_job(
-                        scheduled_full_fetch,
-                        trigger=CronTrigger(
-                            minute=minute,
-                            hour=hour,
-                            day=day,
-                            month=month,
-                            day_of_week=weekday
-                        ),
-                        id='daily_full_fetch_papers',
-                        name='每天全量论文抓取',
-                        replace_existing=True
-                    )
-                    logger.info(f"全量抓取定时任务已配置: {full_fetch_schedule}")
-        except Exception as e:
-            logger.warning(f"配置全量抓取定时任务失败: {e}")
-            import traceback
-            logger.warning(traceback.format_exc())
-        
-        # 配置招聘信息抓取定时任务（使用cron表达式，可选）
-        try:
-            # 支持通过环境变量自定义招聘信息抓取时间（cron表达式）
-            # 如果未设置，默认每小时整点执行
-            jobs_schedule_cron = os.getenv('AUTO_FETCH_JOBS_SCHEDULE', os.getenv('AUTO_FETCH_SCHEDULE', '0 * * * *'))
-            
-            # 解析 cron 表达式（支持多个，用分号分隔）
-            if jobs_schedule_cron:
-                cron_list = jobs_schedule_cron.split(';')
-                for idx, cron_expr in enumerate(cron_list):
-                    cron_expr = cron_expr.strip()
-                    if not cron_expr:
-                        continue
-                    parts = cron_expr.split()
-                    if len(parts) == 5:
-                        minute, hour, day, month, weekday = parts
-                        job_id = f'hourly_fetch_jobs_{idx}'
-                        job_name = f'招聘信息抓取_{idx+1}'
-                        scheduler.add_job(
-                            scheduled_fetch_jobs,
-                            trigger=CronTrigger(
-                                minute=minute,
-                                hour=hour,
-                                day=day,
-                                month=month,
-                                day_of_week=weekday
-                            ),
-                            id=job_id,
-                            name=job_name,
-                            replace_existing=True
-                        )
-                        logger.info(f"招聘信息抓取定时任务已配置 ({job_name}): {cron_expr}")
-        except Exception as e:
-            logger.warning(f"配置招聘信息抓取定时任务失败: {e}")
-            import traceback
-            logger.warning(traceback.format_exc())
-        
-        # 配置新闻信息抓取定时任务（使用cron表达式）
-        try:
-            def scheduled_fetch_news():
-                """定时抓取新闻信息任务"""
-                try:
-                    logger.info("=" * 60)
-                    logger.info("开始执行定时新闻信息抓取任务...")
-                    logger.info("=" * 60)
-                    from fetch_news import fetch_and_save_news
-                    fetch_and_save_news()
-                    logger.info("=" * 60)
-                    logger.info("定时新闻信息抓取任务完成")
-                    logger.info("=" * 60)
-                except Exception as e:
-                    logger.error("=" * 60)
-                    logger.error(f"定时新闻信息抓取任务失败: {e}")
-                    logger.error("=" * 60)
-                    import traceback
-                    logger.error(traceback.format_exc())
-            
-            # 支持通过环境变量自定义新闻抓取的cron表达式
-            # 格式：分钟 小时 日 月 星期，如 "0 * * * *" 表示每小时整点执行
-            # 如果环境变量未设置，默认每小时整点执行
-            news_schedule_cron = os.getenv('AUTO_FETCH_NEWS_SCHEDULE', '0 * * * *')  # 默认每小时整点执行
-            
-            # 解析 cron 表达式（支持多个，用分号分隔）
-            if news_schedule_cron:
-                cron_list = news_schedule_cron.split(';')
-                for idx, cron_expr in enumerate(cron_list):
-                    cron_expr = cron_expr.strip()
-                    if not cron_expr:
-                        continue
-                    parts = cron_expr.split()
-                    if len(parts) == 5:
-                        minute, hour, day, month, weekday = parts
-                        job_id = f'hourly_fetch_news_{idx}'
-                        job_name = f'新闻信息抓取_{idx+1}'
-                        scheduler.add_job(
-                            scheduled_fetch_news,
-                            trigger=CronTrigger(
-                                minute=minute,
-                                hour=hour,
-                                day=day,
-                                month=month,
-                                day_of_week=weekday
-                            ),
-                            id=job_id,
-                            name=job_name,
-                            replace_existing=True
-                        )
-                        logger.info(f"新闻信息抓取定时任务已配置 ({job_name}): {cron_expr}")
-        except Exception as e:
-            logger.warning(f"配置新闻信息抓取定时任务失败: {e}")
-            import traceback
-            logger.warning(traceback.format_exc())
-        
-        # 配置B站数据抓取定时任务（每6小时执行一次，避免触发风控）
-        try:
-            def scheduled_fetch_bilibili():
-                """定时抓取B站数据任务"""
-                try:
-                    logger.info("=" * 60)
-                    logger.info("开始执行定时B站数据抓取任务...")
-                    logger.info("=" * 60)
-                    from fetch_bilibili_data import fetch_all_bilibili_data
-                    # 使用较长的延迟避免触发风控
-                    fetch_all_bilibili_data(video_count=50, delay_between_requests=2.0)
-                    logger.info("=" * 60)
-                    logger.info("定时B站数据抓取任务完成")
-                    logger.info("=" * 60)
-                except Exception as e:
-                    logger.error("=" * 60)
-                    logger.error(f"定时B站数据抓取任务失败: {e}")
-                    logger.error("=" * 60)
-                    import traceback
-                    logger.error(traceback.format_exc())
-            
-            # 支持通过环境变量自定义B站数据抓取的cron表达式
-            # 格式：分钟 小时 日 月 星期，如 "0 */6 * * *" 表示每6小时执行一次
-            # 如果环境变量未设置，默认每6小时执行一次（避免触发风控）
-            bilibili_schedule_cron = os.getenv('AUTO_FETCH_BILIBILI_SCHEDULE', '0 */6 * * *')  # 默认每6小时执行
-            
-            # 解析 cron 表达式（支持多个，用分号分隔）
-            if bilibili_schedule_cron:
-                cron_list = bilibili_schedule_cron.split(';')
-                for idx, cron_expr in enumerate(cron_list):
-                    cron_expr = cron_expr.strip()
-                    if not cron_expr:
-                        continue
-                    parts = cron_expr.split()
-                    if len(parts) == 5:
-                        minute, hour, day, month, weekday = parts
-                        job_id = f'hourly_fetch_bilibili_{idx}'
-                        job_name = f'B站数据抓取_{idx+1}'
-                        scheduler.add_job(
-                            scheduled_fetch_bilibili,
-                            trigger=CronTrigger(
-                                minute=minute,
-                                hour=hour,
-                                day=day,
-                                month=month,
-                                day_of_week=weekday
-                            ),
-                            id=job_id,
-                            name=job_name,
-                            replace_existing=True
-                        )
-                        logger.info(f"B站数据抓取定时任务已配置 ({job_name}): {cron_expr}")
-        except Exception as e:
-            logger.warning(f"配置B站数据抓取定时任务失败: {e}")
-            import traceback
-            logger.warning(traceback.format_exc())
-        
-        # 配置Semantic Scholar数据更新定时任务（支持增量更新）
-        try:
-            # 每天凌晨3点：更新最近30天的论文（增量更新）
-            def scheduled_update_recent_semantic_scholar():
-                """定时更新最近30天的Semantic Scholar数据（增量更新）"""
-                try:
-                    logger.info("开始执行定时Semantic Scholar数据更新任务（最近30天，增量更新）...")
-                    from scripts.improve_semantic_update import update_recent_papers
-                    update_limit = int(os.getenv('SEMANTIC_UPDATE_LIMIT', 200))
-                    update_recent_papers(days=30, limit=update_limit)
-                    logger.info("定时Semantic Scholar数据更新任务完成")
-                except Exception as e:
-                    logger.error(f"定时Semantic Scholar数据更新任务失败: {e}")
-                    import traceback
-                    logger.error(traceback.format_exc())
-            
-            # 每周日凌晨3点：更新最近90天的论文（增量更新）
-            def scheduled_update_weekly_semantic_scholar():
-                """定时更新最近90天的Semantic Scholar数据（增量更新）"""
-                try:
-                    logger.info("开始执行定时Semantic Scholar数据更新任务（最近90天，增量更新）...")
-                    from scripts.improve_semantic_update import update_recent_papers
-                    update_recent_papers(days=90, limit=500)
-                    logger.info("定时Semantic Scholar数据更新任务完成")
-                except Exception as e:
-                    logger.error(f"定时Semantic Scholar数据更新任务失败: {e}")
-                    import traceback
-                    logger.error(traceback.format_exc())
-            
-            # 每月1日凌晨3点：更新所有论文（增量更新）
-            def scheduled_update_monthly_semantic_scholar():
-                """定时更新所有论文的Semantic Scholar数据（增量更新）"""
-                try:
-                    logger.info("开始执行定时Semantic Scholar数据更新任务（所有论文，增量更新）...")
-                    from scripts.improve_semantic_update import update_all_papers_incremental
-                    update_all_papers_incremental(limit=1000, skip_recent=True)
-                    logger.info("定时Semantic Scholar数据更新任务完成")
-                except Exception as e:
-                    logger.error(f"定时Semantic Scholar数据更新任务失败: {e}")
-                    import traceback
-                    logger.error(traceback.format_exc())
-            
-            update_limit = int(os.getenv('SEMANTIC_UPDATE_LIMIT', 200))
-            
-            # 每天凌晨3点：更新最近30天的论文
-            scheduler.add_job(
-                scheduled_update_recent_semantic_scholar,
-                trigger=CronTrigger(hour=3, minute=0),
-                id='daily_update_semantic_scholar_recent',
-                name='每天Semantic Scholar数据更新（最近30天）',
-                replace_existing=True
-            )
-            
-            # 每周日凌晨3点：更新最近90天的论文
-            scheduler.add_job(
-                scheduled_update_weekly_semantic_scholar,
-                trigger=CronTrigger(day_of_week=6, hour=3, minute=0),  # 周日 = 6
-                id='weekly_update_semantic_scholar',
-                name='每周Semantic Scholar数据更新（最近90天）',
-                replace_existing=True
-            )
-            
-            # 每月1日凌晨3点：更新所有论文
-            scheduler.add_job(
-                scheduled_update_monthly_semantic_scholar,
-                trigger=CronTrigger(day=1, hour=3, minute=0),
-                id='monthly_update_semantic_scholar',
-                name='每月Semantic Scholar数据更新（所有论文）',
-                replace_existing=True
-            )
-            
-            logger.info(f"Semantic Scholar数据更新定时任务已配置:")
-            logger.info(f"  - 每天凌晨3点：更新最近30天的论文（每次{update_limit}篇）")
-            logger.info(f"  - 每周日凌晨3点：更新最近90天的论文（每次500篇）")
-            logger.info(f"  - 每月1日凌晨3点：更新所有论文（每次1000篇，跳过7天内已更新的）")
-        except Exception as e:
-            logger.warning(f"配置Semantic Scholar数据更新定时任务失败: {e}")
-            import traceback
-            logger.error(traceback.format_exc())
-        
-        # 配置视频播放量更新定时任务（每天凌晨2点执行）
-        try:
-            def scheduled_update_video_play_counts():
-                """定时更新视频播放量任务"""
-                try:
-                    logger.info("=" * 60)
-                    logger.info("开始执行定时视频播放量更新任务...")
-                    logger.info("=" * 60)
-                    
-                    # 导入更新函数（直接导入，避免路径问题）
-                    import sys
-                    import os
-                    base_dir = os.path.dirname(os.path.abspath(__file__))
-                    scripts_path = os.path.join(base_dir, 'scripts')
-                    if scripts_path not in sys.path:
-                        sys.path.insert(0, scripts_path)
-                    
-                    # 动态导入，避免启动时出错
-                    try:
-                        from update_video_play_counts import update_video_play_counts
-                        # 只更新最近7天未更新的视频（增量更新，避免触发风控）
-                        update_video_play_counts(force_update=False)
-                    except ImportError as e:
-                        logger.error(f"无法导入 update_video_play_counts: {e}")
-                        raise
-                    
-                    logger.info("=" * 60)
-                    logger.info("定时视频播放量更新任务完成")
-                    logger.info("=" * 60)
-                except Exception as e:
-                    logger.error("=" * 60)
-                    logger.error(f"定时视频播放量更新任务失败: {e}")
-                    logger.error("=" * 60)
-                    import traceback
-                    logger.error(traceback.format_exc())
-            
-            # 支持通过环境变量自定义更新频率
-            # 格式：分钟 小时 日 月 星期，如 "0 2 * * *" 表示每天凌晨2点执行
-            # 如果环境变量未设置，默认每天凌晨2点执行
-            video_plays_schedule_cron = os.getenv('AUTO_UPDATE_VIDEO_PLAYS_SCHEDULE', '0 2 * * *')  # 默认每天凌晨2点
-            
-            # 检查是否启用
-            video_plays_enabled = os.getenv('AUTO_UPDATE_VIDEO_PLAYS_ENABLED', 'true').lower() == 'true'
-            
-            if video_plays_enabled:
-                # 解析 cron 表达式
-                parts = video_plays_schedule_cron.split()
-                if len(parts) == 5:
-                    minute, hour, day, month, weekday = parts
-                    scheduler.add_job(
-                        scheduled_update_video_play_counts,
-                        trigger=CronTrigger(
-                            minute=minute,
-                            hour=hour,
-                            day=day,
-                            month=month,
-                            day_of_week=weekday
-                        ),
-                        id='daily_update_video_play_counts',
-                        name='视频播放量更新（定时）',
-                        replace_existing=True
-                    )
-                    logger.info(f"视频播放量更新定时任务已配置: {video_plays_schedule_cron}")
-                else:
-                    logger.warning(f"视频播放量更新定时任务配置无效: {video_plays_schedule_cron}")
-            else:
-                logger.info("视频播放量自动更新未启用（设置 AUTO_UPDATE_VIDEO_PLAYS_ENABLED=true 启用）")
-        except Exception as e:
-            logger.warning(f"配置视频播放量更新定时任务失败: {e}")
-            import traceback
-            logger.warning(traceback.format_exc())
-        
-        scheduler.start()
-        return scheduler
-    except ImportError:
-        logger.warning("APScheduler 未安装，定时任务功能不可用")
-        logger.warning("安装命令: pip install apscheduler")
-        return None
-    except Exception as e:
-        logger.error(f"启动定时任务失败: {e}")
-        return None
+    """触发新闻抓取（写入任务表，由worker执行 fetch_news.fetch_and_save_news）"""
+    return enqueue_and_respond('fetch_news', '新闻抓取任务已启动', '新闻抓取任务正在运行中，请稍候...')
 
 if __name__ == '__main__':
     # 确保加载.env文件
@@ -2976,16 +2107,11 @@ if __name__ == '__main__':
         port = int(os.getenv('PORT', 5001))
         print(f"访问地址: http://localhost:{port}")
         
-        # 启动定时任务（如果启用）
-        auto_fetch_enabled = os.getenv('AUTO_FETCH_ENABLED', 'false').lower() == 'true'
-        if auto_fetch_enabled:
-            scheduler = start_scheduler()
-            if scheduler:
-                print("✅ 自动定时抓取已启用")
-            else:
-                print("⚠️  自动定时抓取未启用（需要安装 APScheduler）")
+        # 启动后台任务worker（定时任务在worker中运行，需 AUTO_FETCH_ENABLED=true）
+        if init_scheduler():
+            print("✅ 后台任务worker已启动")
         else:
-            print("ℹ️  自动定时抓取未启用（设置 AUTO_FETCH_ENABLED=true 启用）")
+            print("ℹ️  后台任务worker未启动（EMBEDDED_WORKER=false，请单独运行 python worker.py）")
         
         print("按 Ctrl+C 停止服务器")
         print("=" * 50)
@@ -3000,6 +2126,7 @@ if __name__ == '__main__':
         app.run(debug=True, host='0.0.0.0', port=port, use_reloader=False)  # 禁用reloader避免定时任务重复启动
     except KeyboardInterrupt:
         print("\n正在关闭服务器...")
-        if 'scheduler' in locals() and scheduler:
-            scheduler.shutdown()
+    finally:
+        from worker import stop_embedded_worker
+        stop_embedded_worker()
 
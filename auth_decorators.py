@@ -74,7 +74,7 @@ def login_required(f):
         request.current_user = user
         request.token_payload = payload
         
-        logger.info(f"用户认证成功 - user_id: {user_id}, name: {user.name}")
+        logger.debug(f"用户认证成功 - user_id: {user_id}, name: {user.name}")
         
         return f(*args, **kwargs)
     
@@ -172,7 +172,7 @@ def admin_required(f):
         request.current_user = user
         request.token_payload = payload
         
-        logger.info(f"管理员认证成功 - user_id: {user_id}, role: {role}")
+        logger.debug(f"管理员认证成功 - user_id: {user_id}, role: {role}")
         
         return f(*args, **kwargs)
     
@@ -248,7 +248,7 @@ def super_admin_required(f):
         request.current_user = user
         request.token_payload = payload
         
-        logger.info(f"超级管理员认证成功 - user_id: {user_id}")
+        logger.debug(f"超级管理员认证成功 - user_id: {user_id}")
         
         return f(*args, **kwargs)
     
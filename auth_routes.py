@@ -1625,133 +1625,15 @@ def get_papers_stats():
 @admin_required
 def trigger_fetch_arxiv():
     """
-    触发从ArXiv API拉取新论文
+    触发从ArXiv API拉取新论文（写入任务表，由worker执行）
     
     POST /api/admin/papers/fetch-arxiv
     """
-    try:
-        # 导入app模块中的全局变量
-        import app
-        import threading
-        from datetime import datetime, timedelta
-        
-        with app.fetch_status_lock:
-            # 检查状态，如果running为True但last_update超过10分钟，认为任务已卡死，重置状态
-            if app.fetch_status['running']:
-                last_update_str = app.fetch_status.get('last_update', '')
-                if last_update_str:
-                    try:
-                        last_update = datetime.strptime(last_update_str, '%Y-%m-%d %H:%M:%S')
-                        if datetime.now() - last_update > timedelta(minutes=10):
-                            logger.warning("检测到抓取任务可能已卡死，重置状态")
-                            app.fetch_status['running'] = False
-                            app.fetch_status['progress'] = 0
-                            app.fetch_status['current_keyword'] = ''
-                            app.fetch_status['message'] = '检测到任务可能已卡死，已重置状态'
-                        else:
-                            # 任务正在运行，拒绝新请求
-                            logger.info(f"拒绝新的抓取请求：任务正在运行中")
-                            return jsonify({
-                                'success': False,
-                                'message': '抓取任务正在运行中，请稍候...',
-                                'status': app.fetch_status.copy()
-                            }), 400
-                    except Exception as e:
-                        logger.warning(f"无法解析last_update时间，重置状态: {e}")
-                        app.fetch_status['running'] = False
-                        app.fetch_status['progress'] = 0
-                        app.fetch_status['current_keyword'] = ''
-                else:
-                    logger.warning("没有last_update信息，重置状态")
-                    app.fetch_status['running'] = False
-                    app.fetch_status['progress'] = 0
-                    app.fetch_status['current_keyword'] = ''
-            
-            # 原子性设置running状态
-            if app.fetch_status['running']:
-                return jsonify({
-                    'success': False,
-                    'message': '抓取任务正在运行中，请稍候...',
-                    'status': app.fetch_status.copy()
-                }), 400
-            
-            # 设置running状态
-            app.fetch_status['running'] = True
-            app.fetch_status['message'] = '准备启动抓取任务...'
-            app.fetch_status['progress'] = 0
-            app.fetch_status['total'] = 0
-            app.fetch_status['current_keyword'] = ''
-            app.fetch_status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        def fetch_task():
-            """后台抓取任务"""
-            try:
-                with app.fetch_status_lock:
-                    app.fetch_status['message'] = '开始抓取论文...'
-                    app.fetch_status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                
-                logger.info("=" * 60)
-                logger.info("开始抓取论文数据（通过管理端API）...")
-                logger.info("=" * 60)
-                
-                from fetch_new_data import fetch_papers
-                fetch_papers(fetch_status=app.fetch_status, fetch_status_lock=app.fetch_status_lock)
-                
-                with app.fetch_status_lock:
-                    app.fetch_status['message'] = '抓取完成！'
-                    app.fetch_status['running'] = False
-                    app.fetch_status['current_keyword'] = ''
-                    app.fetch_status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                
-                logger.info("=" * 60)
-                logger.info("论文数据抓取完成")
-                logger.info("=" * 60)
-                
-            except Exception as e:
-                error_msg = f"抓取失败: {str(e)}"
-                logger.error("=" * 60)
-                logger.error(f"论文数据抓取失败: {error_msg}")
-                logger.error("=" * 60)
-                import traceback
-                logger.error(traceback.format_exc())
-                with app.fetch_status_lock:
-                    app.fetch_status['message'] = error_msg
-                    app.fetch_status['running'] = False
-                    app.fetch_status['progress'] = 0
-                    app.fetch_status['current_keyword'] = ''
-                    app.fetch_status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            finally:
-                with app.fetch_status_lock:
-                    if app.fetch_status.get('running', False):
-                        app.fetch_status['running'] = False
-                        app.fetch_status['progress'] = 0
-                        app.fetch_status['current_keyword'] = ''
-                        if not app.fetch_status.get('last_update'):
-                            app.fetch_status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        # 在后台线程中运行
-        thread = threading.Thread(target=fetch_task)
-        thread.daemon = True
-        thread.start()
-        
-        # 立即返回
-        with app.fetch_status_lock:
-            status_copy = app.fetch_status.copy()
-        
-        return jsonify({
-            'success': True,
-            'message': '抓取任务已启动',
-            'status': status_copy
-        })
-        
-    except Exception as e:
-        logger.error(f"触发ArXiv抓取失败: {e}")
-        import traceback
-        logger.error(traceback.format_exc())
-        return jsonify({
-            'success': False,
-            'message': f'触发抓取失败: {str(e)}'
-        }), 500
+    import app
+    return app.enqueue_and_respond(
+        'fetch_papers', '抓取任务已启动', '抓取任务正在运行中，请稍候...',
+        source='admin', current_key='current_keyword'
+    )
 
 
 @admin_bp.route('/papers/fetch-arxiv-status', methods=['GET'])
@@ -1765,8 +1647,7 @@ def get_fetch_arxiv_status():
     try:
         import app
         
-        with app.fetch_status_lock:
-            status_copy = app.fetch_status.copy()
+        status_copy = app.load_task_status(app.PAPER_TASK_TYPES, current_key='current_keyword')
         
         return jsonify({
             'success': True,
@@ -1781,11 +1662,15 @@ def get_fetch_arxiv_status():
         }), 500
 
 
+# Semantic Scholar更新的几种任务共用一个状态
+SEMANTIC_TASK_TYPES = ['update_semantic', 'update_semantic_recent', 'update_semantic_all']
+
+
 @admin_bp.route('/papers/update-semantic', methods=['POST'])
 @admin_required
 def trigger_update_semantic():
     """
-    触发更新Semantic Scholar数据
+    触发更新Semantic Scholar数据（写入任务表，由worker执行）
     
     POST /api/admin/papers/update-semantic
     {
@@ -1793,146 +1678,31 @@ def trigger_update_semantic():
         "skip_existing": true  // 可选
     }
     """
-    try:
-        import app
-        import threading
-        from datetime import datetime, timedelta
-        
-        data = request.get_json() or {}
-        limit = data.get('limit')
-        skip_existing = data.get('skip_existing', True)
-        
-        with app.semantic_update_status_lock:
-            # 检查状态，如果running为True但last_update超过30分钟，认为任务已卡死，重置状态
-            if app.semantic_update_status['running']:
-                last_update_str = app.semantic_update_status.get('last_update', '')
-                if last_update_str:
-                    try:
-                        last_update = datetime.strptime(last_update_str, '%Y-%m-%d %H:%M:%S')
-                        if datetime.now() - last_update > timedelta(minutes=30):
-                            logger.warning("检测到Semantic Scholar更新任务可能已卡死，重置状态")
-                            app.semantic_update_status['running'] = False
-                            app.semantic_update_status['progress'] = 0
-                            app.semantic_update_status['current_paper'] = ''
-                            app.semantic_update_status['message'] = '检测到任务可能已卡死，已重置状态'
-                        else:
-                            # 任务正在运行，拒绝新请求
-                            logger.info(f"拒绝新的更新请求：任务正在运行中")
-                            return jsonify({
-                                'success': False,
-                                'message': '更新任务正在运行中，请稍候...',
-                                'status': app.semantic_update_status.copy()
-                            }), 400
-                    except Exception as e:
-                        logger.warning(f"无法解析last_update时间，重置状态: {e}")
-                        app.semantic_update_status['running'] = False
-                        app.semantic_update_status['progress'] = 0
-                        app.semantic_update_status['current_paper'] = ''
-                else:
-                    logger.warning("没有last_update信息，重置状态")
-                    app.semantic_update_status['running'] = False
-                    app.semantic_update_status['progress'] = 0
-                    app.semantic_update_status['current_paper'] = ''
-            
-            # 原子性设置running状态
-            if app.semantic_update_status['running']:
-                return jsonify({
-                    'success': False,
-                    'message': '更新任务正在运行中，请稍候...',
-                    'status': app.semantic_update_status.copy()
-                }), 400
-            
-            # 设置running状态
-            app.semantic_update_status['running'] = True
-            app.semantic_update_status['message'] = '准备启动更新任务...'
-            app.semantic_update_status['progress'] = 0
-            app.semantic_update_status['total'] = 0
-            app.semantic_update_status['current_paper'] = ''
-            app.semantic_update_status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        def update_task():
-            """后台更新任务"""
-            try:
-                with app.semantic_update_status_lock:
-                    app.semantic_update_status['message'] = '开始更新Semantic Scholar数据...'
-                    app.semantic_update_status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                
-                logger.info("=" * 60)
-                logger.info("开始更新Semantic Scholar数据（通过管理端API）...")
-                logger.info("=" * 60)
-                
-                from update_semantic_scholar_data import update_all_papers
-                update_all_papers(
-                    limit=limit,
-                    skip_existing=skip_existing,
-                    status=app.semantic_update_status,
-                    status_lock=app.semantic_update_status_lock
-                )
-                
-                logger.info("=" * 60)
-                logger.info("Semantic Scholar数据更新完成")
-                logger.info("=" * 60)
-                
-            except Exception as e:
-                error_msg = f"更新失败: {str(e)}"
-                logger.error("=" * 60)
-                logger.error(f"Semantic Scholar数据更新失败: {error_msg}")
-                logger.error("=" * 60)
-                import traceback
-                logger.error(traceback.format_exc())
-                with app.semantic_update_status_lock:
-                    app.semantic_update_status['message'] = error_msg
-                    app.semantic_update_status['running'] = False
-                    app.semantic_update_status['progress'] = 0
-                    app.semantic_update_status['current_paper'] = ''
-                    app.semantic_update_status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            finally:
-                with app.semantic_update_status_lock:
-                    if app.semantic_update_status.get('running', False):
-                        app.semantic_update_status['running'] = False
-                        app.semantic_update_status['progress'] = 0
-                        app.semantic_update_status['current_paper'] = ''
-                        if not app.semantic_update_status.get('last_update'):
-                            app.semantic_update_status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        # 在后台线程中运行
-        thread = threading.Thread(target=update_task)
-        thread.daemon = True
-        thread.start()
-        
-        # 立即返回
-        with app.semantic_update_status_lock:
-            status_copy = app.semantic_update_status.copy()
-        
-        return jsonify({
-            'success': True,
-            'message': '更新任务已启动',
-            'status': status_copy
-        })
-        
-    except Exception as e:
-        logger.error(f"触发Semantic Scholar更新失败: {e}")
-        import traceback
-        logger.error(traceback.format_exc())
-        return jsonify({
-            'success': False,
-            'message': f'触发更新失败: {str(e)}'
-        }), 500
+    import app
+    
+    data = request.get_json() or {}
+    params = {
+        'limit': data.get('limit'),
+        'skip_existing': data.get('skip_existing', True)
+    }
+    return app.enqueue_and_respond(
+        'update_semantic', '更新任务已启动', '更新任务正在运行中，请稍候...',
+        params=params, source='admin', current_key='current_paper'
+    )
 
 
 @admin_bp.route('/papers/update-semantic-status', methods=['GET'])
 @admin_required
 def get_update_semantic_status():
     """
-    获取Semantic Scholar更新状态
+    获取Semantic Scholar更新状态（包括定时增量更新）
     
     GET /api/admin/papers/update-semantic-status
     """
     try:
         import app
         
-        with app.semantic_update_status_lock:
-            status_copy = app.semantic_update_status.copy()
+        status_copy = app.load_task_status(SEMANTIC_TASK_TYPES, current_key='current_paper')
         
         return jsonify({
             'success': True,
@@ -2355,7 +2125,7 @@ def get_bilibili_stats():
 @admin_required
 def trigger_fetch_bilibili_data():
     """
-    手动触发B站数据更新
+    手动触发B站数据更新（写入任务表，由worker执行）
     包括：UP主信息、视频列表、播放量数据
     
     POST /api/admin/bilibili/fetch-data
@@ -2364,122 +2134,31 @@ def trigger_fetch_bilibili_data():
         "video_count": 50  // 每个UP主抓取的视频数量（默认50）
     }
     """
-    try:
-        import threading
-        import app
-        
-        data = request.get_json() or {}
-        update_play_counts = data.get('update_play_counts', True)
-        video_count = data.get('video_count', 50)
-        
-        # 检查是否有任务正在运行
-        with app.bilibili_fetch_status_lock:
-            if app.bilibili_fetch_status.get('running', False):
-                return jsonify({
-                    'success': False,
-                    'message': '数据更新任务正在运行中，请稍候...',
-                    'status': app.bilibili_fetch_status.copy()
-                }), 400
-        
-        def fetch_task():
-            """后台数据更新任务"""
-            try:
-                with app.bilibili_fetch_status_lock:
-                    app.bilibili_fetch_status['running'] = True
-                    app.bilibili_fetch_status['progress'] = 0
-                    app.bilibili_fetch_status['message'] = '开始更新B站数据...'
-                    app.bilibili_fetch_status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                
-                logger.info("=" * 60)
-                logger.info("开始执行手动B站数据更新任务...")
-                logger.info("=" * 60)
-                
-                # 1. 更新UP主信息和视频列表
-                with app.bilibili_fetch_status_lock:
-                    app.bilibili_fetch_status['message'] = '正在更新UP主信息和视频列表...'
-                    app.bilibili_fetch_status['progress'] = 20
-                
-                from fetch_bilibili_data import fetch_all_bilibili_data
-                fetch_all_bilibili_data(video_count=video_count, delay_between_requests=2.0)
-                
-                # 2. 更新播放量（如果需要）
-                if update_play_counts:
-                    with app.bilibili_fetch_status_lock:
-                        app.bilibili_fetch_status['message'] = '正在更新视频播放量...'
-                        app.bilibili_fetch_status['progress'] = 60
-                    
-                    import sys
-                    import os
-                    # 获取项目根目录
-                    current_file = os.path.abspath(__file__)
-                    # auth_routes.py 在项目根目录，scripts也在项目根目录
-                    project_root = os.path.dirname(current_file)
-                    scripts_path = os.path.join(project_root, 'scripts')
-                    if scripts_path not in sys.path:
-                        sys.path.insert(0, scripts_path)
-                    
-                    from update_video_play_counts import update_video_play_counts
-                    update_video_play_counts(force_update=True)
-                
-                # 3. 清除API缓存
-                with app.bilibili_fetch_status_lock:
-                    app.bilibili_fetch_status['message'] = '正在清除缓存...'
-                    app.bilibili_fetch_status['progress'] = 90
-                
-                # 清除缓存
-                with app.bilibili_cache_lock:
-                    app.bilibili_cache['all_data'] = None
-                    app.bilibili_cache['all_expires_at'] = None
-                    app.bilibili_cache['data'] = None
-                    app.bilibili_cache['expires_at'] = None
-                
-                with app.bilibili_fetch_status_lock:
-                    app.bilibili_fetch_status['message'] = '更新完成！'
-                    app.bilibili_fetch_status['progress'] = 100
-                    app.bilibili_fetch_status['running'] = False
-                    app.bilibili_fetch_status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                
-                logger.info("=" * 60)
-                logger.info("手动B站数据更新任务完成")
-                logger.info("=" * 60)
-                
-            except Exception as e:
-                error_msg = f"更新失败: {str(e)}"
-                logger.error("=" * 60)
-                logger.error(f"手动B站数据更新任务失败: {error_msg}")
-                logger.error("=" * 60)
-                import traceback
-                logger.error(traceback.format_exc())
-                
-                with app.bilibili_fetch_status_lock:
-                    app.bilibili_fetch_status['message'] = error_msg
-                    app.bilibili_fetch_status['running'] = False
-                    app.bilibili_fetch_status['progress'] = 0
-                    app.bilibili_fetch_status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-        
-        # 在后台线程中运行
-        thread = threading.Thread(target=fetch_task)
-        thread.daemon = True
-        thread.start()
-        
-        # 立即返回
-        with app.bilibili_fetch_status_lock:
-            status_copy = app.bilibili_fetch_status.copy()
-        
-        return jsonify({
-            'success': True,
-            'message': '数据更新任务已启动',
-            'status': status_copy
-        })
-        
-    except Exception as e:
-        logger.error(f"触发B站数据更新失败: {e}")
-        import traceback
-        logger.error(traceback.format_exc())
-        return jsonify({
-            'success': False,
-            'message': f'触发更新失败: {str(e)}'
-        }), 500
+    import app
+    
+    data = request.get_json() or {}
+    params = {
+        'update_play_counts': data.get('update_play_counts', True),
+        'video_count': data.get('video_count', 50)
+    }
+    return app.enqueue_and_respond(
+        'fetch_bilibili', '数据更新任务已启动', '数据更新任务正在运行中，请稍候...',
+        params=params, source='admin'
+    )
+
+
+def _bilibili_fetch_status(status=None):
+    """B站数据更新状态，progress 为百分比（管理后台进度条使用）"""
+    import app
+    if status is None:
+        status = app.load_task_status('fetch_bilibili')
+    if status['state'] == 'success':
+        status['progress'] = 100
+    elif status['total'] > 0:
+        status['progress'] = min(int(status['progress'] * 100 / status['total']), 100)
+    else:
+        status['progress'] = 0
+    return status
 
 
 @admin_bp.route('/bilibili/fetch-status', methods=['GET'])
@@ -2493,8 +2172,7 @@ def get_bilibili_fetch_status():
     try:
         import app
         
-        with app.bilibili_fetch_status_lock:
-            status_copy = app.bilibili_fetch_status.copy()
+        status_copy = _bilibili_fetch_status()
         
         return jsonify({
             'success': True,
@@ -2509,5 +2187,55 @@ def get_bilibili_fetch_status():
         }), 500
 
 
+def _admin_event_loader(stream):
+    """管理后台推送流名称 -> 状态读取函数"""
+    import app
+    if stream == 'arxiv':
+        return lambda: app.task_status(app.get_latest_task(app.PAPER_TASK_TYPES), current_key='current_keyword')
+    if stream == 'semantic':
+        return lambda: app.task_status(app.get_latest_task(SEMANTIC_TASK_TYPES), current_key='current_paper')
+    if stream == 'bilibili':
+        return lambda: _bilibili_fetch_status(app.task_status(app.get_latest_task('fetch_bilibili')))
+    return None
+
+
+@admin_bp.route('/task-events/<stream>', methods=['GET'])
+@admin_required
+def admin_task_events(stream):
+    """
+    管理后台任务进度推送（SSE）：arxiv/semantic/bilibili
+    
+    GET /api/admin/task-events/<stream>
+    EventSource 无法设置 Authorization 头，前端通过 fetch 读取事件流
+    """
+    import app
+    loader = _admin_event_loader(stream)
+    if loader is None:
+        return jsonify({'success': False, 'message': f'未知的推送流: {stream}'}), 404
+    # 鉴权已完成，推送期间不占用认证库连接
+    db.session.remove()
+    return app.task_event_response(f'admin:{stream}', loader)
+
+
+@admin_bp.route('/metrics', methods=['GET'])
+@admin_required
+def get_request_metrics():
+    """
+    请求级性能指标（Prometheus 文本格式）
+    
+    GET /api/admin/metrics
+    按路由的请求耗时、响应大小、数据库查询次数/耗时、缓存命中情况，见 request_metrics.py
+    """
+    from flask import Response
+    from request_metrics import render_metrics
+    body, content_type = render_metrics()
+    if body is None:
+        return jsonify({
+            'success': False,
+            'message': '请求指标不可用（未安装 prometheus_client 或 METRICS_ENABLED=false）'
+        }), 503
+    return Response(body, content_type=content_type)
+
+
 # ==================== Phase 3 管理端API开发完成 ====================
 
@@ -23,16 +23,43 @@ except ImportError:
 except Exception as e:
     pass  # 加载失败，跳过
 
-try:
-    from bilibili_api import user, Credential
-    BILIBILI_API_AVAILABLE = True
-except ImportError as e:
-    BILIBILI_API_AVAILABLE = False
-    logging.warning(f"bilibili-api-python 未安装或导入失败: {e}")
-    logging.warning("请运行: pip install bilibili-api-python aiohttp")
+# bilibili-api-python（连同 aiohttp）导入耗时较长，Web 进程只用到 format_number 等工具函数，
+# 因此在首次创建 BilibiliClient 时才导入
+user = None
+Credential = None
+BILIBILI_API_AVAILABLE = None  # None 表示尚未尝试导入
 
 logger = logging.getLogger(__name__)
 
+# 增量同步每页视频数：大多数UP主两次同步之间的新视频不超过一页，每次只需请求一页
+INCREMENTAL_PAGE_SIZE = int(os.getenv('BILIBILI_INCREMENTAL_PAGE_SIZE', '20'))
+
+
+def _filter_since(videos: List[Dict], since_pubdate: Optional[int]):
+    """
+    按增量水位过滤一页视频（列表按发布时间倒序），返回 (保留的视频, 是否已到达已入库的视频)
+    发布时间等于水位的视频也保留（同一秒发布的视频，重复写入无副作用）
+    """
+    if since_pubdate is None:
+        return videos, False
+    kept = [video for video in videos if (video.get('pubdate') or 0) >= since_pubdate]
+    return kept, len(kept) < len(videos)
+
+
+def _import_bilibili_api() -> bool:
+    """导入 bilibili-api-python，返回是否可用"""
+    global user, Credential, BILIBILI_API_AVAILABLE
+    if BILIBILI_API_AVAILABLE is None:
+        try:
+            from bilibili_api import user as _user, Credential as _Credential
+            user, Credential = _user, _Credential
+            BILIBILI_API_AVAILABLE = True
+        except ImportError as e:
+            BILIBILI_API_AVAILABLE = False
+            logging.warning(f"bilibili-api-python 未安装或导入失败: {e}")
+            logging.warning("请运行: pip install bilibili-api-python aiohttp")
+    return BILIBILI_API_AVAILABLE
+
 class BilibiliClient:
     """Bilibili API客户端（使用 bilibili-api-python 库）"""
     
@@ -47,7 +74,7 @@ class BilibiliClient:
         self.timeout = timeout
         self.min_request_interval = min_request_interval
         self.last_request_time = 0
-        if not BILIBILI_API_AVAILABLE:
+        if not _import_bilibili_api():
             raise ImportError("bilibili-api-python 未安装，请运行: pip install bilibili-api-python aiohttp")
         # 读取 Cookie/SESSDATA，提高通过风控概率
         sessdata = os.getenv("BILI_SESSDATA")
@@ -149,7 +176,8 @@ class BilibiliClient:
             'friend': card.get('friend', 0),
         }
 
-    def _fallback_user_videos(self, mid: int, page_size: int = 20, max_pages: int = None) -> List[Dict]:
+    def _fallback_user_videos(self, mid: int, page_size: int = 20, max_pages: int = None,
+                              since_pubdate: int = None) -> List[Dict]:
         """
         风控触发时，通过公开接口兜底获取视频列表（按发布时间排序）
         支持分页抓取
@@ -158,6 +186,7 @@ class BilibiliClient:
             mid: UP主UID
             page_size: 每页数量
             max_pages: 最大页数（None表示抓取所有）
+            since_pubdate: 增量水位，翻到发布时间早于水位的视频即停止
         """
         all_videos: List[Dict] = []
         page = 1
@@ -184,11 +213,12 @@ class BilibiliClient:
                 
                 import time
                 current_timestamp = int(time.time())
+                page_videos = []
                 for video in vlist:
                     pubdate = video.get('created', 0) or video.get('pubdate', 0)
                     if pubdate > current_timestamp * 10:
                         pubdate = pubdate // 1000
-                    all_videos.append({
+                    page_videos.append({
                         'bvid': video.get('bvid', ''),
                         'aid': video.get('aid', 0),
                         'title': video.get('title', ''),
@@ -200,11 +230,13 @@ class BilibiliClient:
                         'description': video.get('description', ''),
                         'length': video.get('length', ''),
                     })
+                page_videos, reached_known = _filter_since(page_videos, since_pubdate)
+                all_videos.extend(page_videos)
                 
                 logger.info(f"Fallback API 已抓取第 {page} 页，共 {len(vlist)} 个视频，累计 {len(all_videos)} 个")
                 
                 # 如果返回的视频数量少于page_size，说明已经是最后一页
-                if len(vlist) < page_size:
+                if len(vlist) < page_size or reached_known:
                     break
                 
                 # 如果达到最大页数限制，停止
@@ -568,7 +600,8 @@ class BilibiliClient:
         videos = self._fallback_user_videos(mid, page_size=10)
         return self._fallback_user_stat(mid, videos)
     
-    def get_all_videos_paginated(self, mid: int, max_videos: int = None, page_size: int = 50) -> List[Dict]:
+    def get_all_videos_paginated(self, mid: int, max_videos: int = None, page_size: int = 50,
+                                 since_pubdate: int = None) -> List[Dict]:
         """
         分页获取UP主的所有视频
         
@@ -576,6 +609,8 @@ class BilibiliClient:
             mid: UP主的UID
             max_videos: 最大抓取数量（None表示抓取所有）
             page_size: 每页数量
+            since_pubdate: 增量水位（已入库视频的最新发布时间戳），翻到早于水位的视频即停止，
+                只返回发布时间不早于水位的视频
             
         Returns:
             所有视频列表
@@ -590,11 +625,13 @@ class BilibiliClient:
                 if not videos or len(videos) == 0:
                     break
                 
+                returned_count = len(videos)
+                videos, reached_known = _filter_since(videos, since_pubdate)
                 all_videos.extend(videos)
-                logger.info(f"已抓取第 {page} 页，共 {len(videos)} 个视频，累计 {len(all_videos)} 个")
+                logger.info(f"已抓取第 {page} 页，共 {returned_count} 个视频，累计 {len(all_videos)} 个")
                 
-                # 如果返回的视频数量少于page_size，说明已经是最后一页
-                if len(videos) < page_size:
+                # 如果返回的视频数量少于page_size，说明已经是最后一页；增量同步翻到已入库的视频也停止
+                if returned_count < page_size or reached_known:
                     break
                 
                 # 如果达到最大数量限制，停止
@@ -614,7 +651,8 @@ class BilibiliClient:
         logger.info(f"UP主 {mid} 共抓取 {len(all_videos)} 个视频")
         return all_videos
     
-    def get_all_data(self, mid: int, video_count: int = 10, fetch_all: bool = False) -> Optional[Dict]:
+    def get_all_data(self, mid: int, video_count: int = 10, fetch_all: bool = False,
+                     since_pubdate: int = None) -> Optional[Dict]:
         """
         获取UP主的完整数据（信息+统计+视频列表）
         
@@ -622,10 +660,13 @@ class BilibiliClient:
             mid: UP主的UID
             video_count: 获取的视频数量（当fetch_all=False时使用）
             fetch_all: 是否抓取所有视频（True时忽略video_count，抓取所有）
+            since_pubdate: 增量同步水位（fetch_all=False时有效）：从最新视频开始翻页，
+                到达该发布时间即停止，请求次数取决于新发布的视频数
             
         Returns:
             完整数据字典
         """
+        incremental = since_pubdate is not None and not fetch_all
         try:
             # 使用异步方式获取数据，但添加小延迟避免并发请求过多
             async def fetch_all():
@@ -638,8 +679,8 @@ class BilibiliClient:
                 user_stat_task = self._get_user_stat_async(mid)
                 await asyncio.sleep(0.3)  # 再延迟300ms
                 
-                # ✅ 修复：如果fetch_all=True，只获取统计，视频稍后分页抓取
-                if fetch_all:
+                # ✅ 修复：如果fetch_all=True（或增量同步），只获取统计，视频稍后分页抓取
+                if fetch_all or incremental:
                     # fetch_all=True时，只获取统计，视频稍后分页抓取
                     user_stat = await user_stat_task
                     videos = None
@@ -677,6 +718,16 @@ class BilibiliClient:
                     time.sleep(2.0)  # 延迟2秒避免频繁请求
                     # fallback时也分页抓取所有视频
                     videos = self._fallback_user_videos(mid, page_size=50, max_pages=None)
+            elif incremental and videos is None:
+                videos = self.get_all_videos_paginated(mid, page_size=INCREMENTAL_PAGE_SIZE,
+                                                       since_pubdate=since_pubdate)
+                # 水位上的视频本身也会返回，空列表说明请求失败（或视频全部被删除），改用兜底接口
+                if not videos:
+                    logger.warning(f"增量抓取失败，尝试fallback方法 (UID: {mid})")
+                    import time
+                    time.sleep(2.0)
+                    videos = self._fallback_user_videos(mid, page_size=INCREMENTAL_PAGE_SIZE,
+                                                        since_pubdate=since_pubdate)
             
             # 兜底补全（解决 412 风控导致的数据缺失）
             import time
@@ -697,8 +748,8 @@ class BilibiliClient:
                 except Exception as e:
                     logger.debug(f"fallback更新粉丝数失败: {e}")
             
-            # ✅ 修复：只有在非fetch_all模式下才使用fallback
-            if not videos and not fetch_all:
+            # ✅ 修复：只有在非fetch_all模式下才使用fallback（增量同步已在上面兜底）
+            if not videos and not fetch_all and not incremental:
                 logger.info(f"使用fallback方法获取视频列表 (UID: {mid})")
                 time.sleep(1.5)  # 延迟1.5秒避免频繁请求
                 videos = self._fallback_user_videos(mid, page_size=video_count)
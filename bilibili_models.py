@@ -45,6 +45,7 @@ class BilibiliUp(Base):
     is_active = Column(Boolean, default=True)  # 是否活跃（是否在监控列表中）
     last_fetch_at = Column(DateTime)  # 最后抓取时间
     fetch_error = Column(Text)  # 抓取错误信息（如果有）
+    latest_pubdate_raw = Column(BigInteger)  # 已入库视频的最新发布时间戳（增量同步水位）
     created_at = Column(DateTime, default=datetime.now)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
     
@@ -197,9 +198,24 @@ class BilibiliVideo(Base):
         }
 
 
+class BilibiliVideoStat(Base):
+    """B站视频统计历史（只追加：每次获取到视频播放量时记录一个采样点）"""
+    __tablename__ = 'bilibili_video_stats'
+
+    bvid = Column(String, primary_key=True)  # 视频BV号
+    ts = Column(BigInteger, primary_key=True, autoincrement=False)  # 采样时间（Unix时间戳，秒）
+    play = Column(BigInteger, nullable=False, default=0)  # 播放量
+    reply = Column(Integer, nullable=False, default=0)  # 评论数
+    favorite = Column(Integer, nullable=False, default=0)  # 收藏数
+
+    __table_args__ = (
+        Index('idx_video_stats_ts', 'ts'),
+    )
+
+
 # 数据库配置
-# 使用独立的数据库文件
-BILIBILI_DATABASE_URL = os.getenv('BILIBILI_DATABASE_URL', 'sqlite:///./bilibili.db')
+# 默认与主数据库相同（Web 与 worker 容器需读写同一个库）；如需独立数据库，通过BILIBILI_DATABASE_URL指定
+BILIBILI_DATABASE_URL = os.getenv('BILIBILI_DATABASE_URL', os.getenv('DATABASE_URL', 'sqlite:///./bilibili.db'))
 
 def get_bilibili_engine():
     """获取B站数据库引擎"""
@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+"""
+首屏数据批量接口
+首页加载时原本要分别请求十多个接口（每个占一个 worker、各开一次数据库会话），
+/api/bootstrap 在服务端并发调用这些接口的视图函数，一次返回所有模块的数据：
+
+    GET /api/bootstrap                                  # 首页默认模块
+    GET /api/bootstrap?sections=stats,news&news.limit=10
+    GET /api/bootstrap?known=stats:3f2a...,papers:9c1d...   # 未变化的模块只返回 etag，不返回 data
+
+返回:
+    {
+        "success": true,
+        "sections": {
+            "stats": {"url": "/api/stats", "status": 200, "etag": "3f2a...", "data": {...}},
+            "papers": {"url": "/api/papers", "status": 304, "etag": "9c1d..."},
+            ...
+        }
+    }
+
+各模块结果在 BOOTSTRAP_CACHE_SECONDS 内复用（按模块 URL 缓存）；整体响应带 ETag，支持 If-None-Match。
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from contextvars import copy_context
+from typing import Optional
+from urllib.parse import urlencode
+
+from flask import Blueprint, Response, current_app, jsonify, request
+
+from request_metrics import record_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+bootstrap_bp = Blueprint('bootstrap', __name__, url_prefix='/api')
+
+# 模块名 -> (接口路径, 默认参数)；默认参数与 static/js/app.js 首次加载时的请求一致，
+# 前端按返回的 url 匹配，参数顺序不能随意调整
+BOOTSTRAP_SECTIONS = {
+    'categories': ('/api/categories/meta', {}),
+    'stats': ('/api/stats', {}),
+    'paper_stats': ('/api/paper-stats', {}),
+    'papers': ('/api/papers', {}),
+    'trends': ('/api/trends', {'days': '60'}),
+    'research_activity': ('/api/research-activity', {'weeks': '8', 'level': 'category'}),
+    'authors_ranking': ('/api/authors/ranking', {'days': '7', 'category': '', 'limit': '20'}),
+    'news': ('/api/news', {'limit': '30'}),
+    'jobs': ('/api/jobs', {'limit': '20'}),
+    'datasets': ('/api/datasets', {'limit': '20'}),
+    'bilibili': ('/api/bilibili', {}),
+}
+# 首页首屏实际用到的模块（未指定 sections 时返回）
+DEFAULT_SECTIONS = [
+    'categories', 'stats', 'paper_stats', 'papers', 'research_activity',
+    'authors_ranking', 'datasets', 'bilibili',
+]
+
+BOOTSTRAP_CACHE_SECONDS = float(os.getenv('BOOTSTRAP_CACHE_SECONDS', '30'))
+BOOTSTRAP_WORKERS = int(os.getenv('BOOTSTRAP_WORKERS', '6'))
+# 等待各模块的总时长（秒）；超时的模块返回 504，前端改为单独请求该接口
+# （如 /api/bilibili 缓存过期时要实时请求B站），后台线程完成后结果仍写入缓存
+BOOTSTRAP_TIMEOUT = float(os.getenv('BOOTSTRAP_TIMEOUT', '3'))
+
+# 模块 URL -> (过期时间, 结果)；参数组合由客户端决定，超过上限时先清理过期项
+_section_cache = {}
+_SECTION_CACHE_MAX = 256
+_section_cache_lock = threading.Lock()
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    """线程池（按进程懒加载，gunicorn fork 之后才创建线程）"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=BOOTSTRAP_WORKERS, thread_name_prefix='bootstrap')
+        return _executor
+
+
+def section_etag(data) -> str:
+    """模块数据的 ETag（内容哈希）"""
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def build_section_url(name: str, overrides: dict) -> str:
+    """模块请求 URL：默认参数 + 请求中的 <模块>.<参数> 覆盖"""
+    path, defaults = BOOTSTRAP_SECTIONS[name]
+    params = dict(defaults)
+    params.update(overrides)
+    return f"{path}?{urlencode(params)}" if params else path
+
+
+def _call_section(app, url: str) -> dict:
+    """在独立请求上下文中调用接口的视图函数（不经过 HTTP，也不触发 before_request 钩子）"""
+    now = time.monotonic()
+    with _section_cache_lock:
+        cached = _section_cache.get(url)
+    if cached and cached[0] > now:
+        record_cache_lookup('bootstrap', True)
+        return cached[1]
+    record_cache_lookup('bootstrap', False)
+
+    path, _, query_string = url.partition('?')
+    with app.test_request_context(path, query_string=query_string):
+        try:
+            response = app.make_response(app.dispatch_request())
+        except Exception as e:
+            logger.error(f"首屏数据模块调用失败 {url}: {e}")
+            return {'url': url, 'status': 500, 'error': str(e)}
+    data = response.get_json(silent=True)
+    result = {'url': url, 'status': response.status_code}
+    if data is None:
+        result['error'] = '接口未返回JSON'
+        return result
+    result['etag'] = section_etag(data)
+    result['data'] = data
+    if response.status_code == 200:
+        with _section_cache_lock:
+            if len(_section_cache) >= _SECTION_CACHE_MAX:
+                now = time.monotonic()
+                for key in [key for key, (expires_at, _) in _section_cache.items() if expires_at <= now]:
+                    del _section_cache[key]
+                if len(_section_cache) >= _SECTION_CACHE_MAX:
+                    _section_cache.clear()
+            _section_cache[url] = (time.monotonic() + BOOTSTRAP_CACHE_SECONDS, result)
+    return result
+
+
+def clear_section_cache():
+    """清空本进程的模块缓存（一键刷新完成后调用，见 app.publish_refreshed）"""
+    with _section_cache_lock:
+        _section_cache.clear()
+
+
+def _parse_known(value: str) -> dict:
+    """known=模块:etag,模块:etag -> {模块: etag}"""
+    known = {}
+    for item in (value or '').split(','):
+        name, _, etag = item.partition(':')
+        if name.strip() and etag.strip():
+            known[name.strip()] = etag.strip()
+    return known
+
+
+def _json_response(payload: dict, etag: Optional[str]) -> Response:
+    # 压缩由 response_compression 统一处理
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    response = Response(body, mimetype='application/json')
+    if etag:
+        response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+@bootstrap_bp.route('/bootstrap')
+def bootstrap():
+    """
+    首屏数据批量接口（各模块并发读取）
+
+    参数:
+        sections: 逗号分隔的模块名，默认 DEFAULT_SECTIONS
+        <模块>.<参数>: 覆盖模块请求参数，如 news.limit=10
+        known: 客户端已有的模块 ETag（模块:etag，逗号分隔），未变化的模块不返回 data
+    """
+    names = [name.strip() for name in request.args.get('sections', '').split(',') if name.strip()]
+    names = names or DEFAULT_SECTIONS
+    unknown = [name for name in names if name not in BOOTSTRAP_SECTIONS]
+    if unknown:
+        return jsonify({
+            'success': False,
+            'error': f"未知模块: {', '.join(unknown)}",
+            'available': list(BOOTSTRAP_SECTIONS),
+        }), 400
+
+    overrides = {name: {} for name in names}
+    for key, value in request.args.items():
+        name, _, param = key.partition('.')
+        if param and name in overrides:
+            overrides[name][param] = value
+    urls = {name: build_section_url(name, overrides[name]) for name in names}
+
+    app = current_app._get_current_object()
+    executor = _get_executor()
+    # 复制上下文，子线程中的数据库查询计入本请求的性能指标
+    futures = {
+        name: executor.submit(copy_context().run, _call_section, app, url)
+        for name, url in urls.items()
+    }
+    deadline = time.monotonic() + BOOTSTRAP_TIMEOUT
+    results = {}
+    for name, future in futures.items():
+        try:
+            results[name] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            logger.warning(f"首屏数据模块超时（{BOOTSTRAP_TIMEOUT:.0f}秒）: {urls[name]}")
+            results[name] = {'url': urls[name], 'status': 504, 'error': '超时'}
+
+    # 有模块失败/超时时不带整体 ETag，避免客户端缓存不完整的结果
+    overall_etag = None
+    if all(result.get('etag') for result in results.values()):
+        overall_etag = section_etag({name: result['etag'] for name, result in results.items()})
+    # 压缩后的响应带弱 ETag，按弱比较匹配
+    if overall_etag and request.if_none_match.contains_weak(overall_etag):
+        response = Response(status=304)
+        response.set_etag(overall_etag)
+        return response
+
+    known = _parse_known(request.args.get('known'))
+    sections = {}
+    for name, result in results.items():
+        if result.get('etag') and known.get(name) == result['etag']:
+            sections[name] = {'url': result['url'], 'status': 304, 'etag': result['etag']}
+        else:
+            sections[name] = result
+    return _json_response({'success': True, 'sections': sections}, overall_etag)
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+批量比对+写入工具（招聘、新闻、数据集共用）
+
+逐条保存时每条数据都要单独开会话、查询是否存在、提交一次；
+这里改为：
+1. 为每条数据计算稳定的内容哈希
+2. 用一次（分块的）IN 查询取回本批次已存在的记录
+3. 将本批次划分为 新建 / 更新 / 未变化 三组
+4. 在同一个事务中批量插入、批量更新
+   （PostgreSQL/SQLite 上插入使用 INSERT ... ON CONFLICT，并发写入也不会产生重复）
+
+返回的统计字典与原 batch_save_* 函数保持一致：
+{'total', 'created', 'updated', 'skipped', 'error'}
+"""
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Callable, Dict, Hashable, Iterable, List, Optional
+
+from sqlalchemy import inspect as sa_inspect
+
+logger = logging.getLogger(__name__)
+
+# 单条IN查询的最大参数数量（SQLite老版本上限为999）
+LOOKUP_CHUNK_SIZE = 500
+# 多行INSERT每条语句的行数（行数×列数需低于SQLite的参数上限）
+INSERT_CHUNK_SIZE = 50
+
+
+def content_hash(row: Dict, fields: Iterable[str]) -> str:
+    """
+    计算记录在指定字段上的稳定内容哈希
+
+    字段按名称排序后序列化，值统一转为字符串，保证同样的内容得到同样的哈希
+    """
+    payload = [(field, row.get(field)) for field in sorted(fields)]
+    raw = json.dumps(payload, ensure_ascii=False, default=str, separators=(',', ':'))
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def _chunks(values: List, size: int):
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def _dialect_insert(session, model):
+    """返回支持 ON CONFLICT 的方言 insert 构造；不支持的数据库返回 None"""
+    dialect = session.get_bind().dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    return insert(model)
+
+
+def insert_on_conflict(
+    session,
+    model,
+    rows: List[Dict],
+    index_elements: List[str],
+    index_where=None,
+    update_fields: Optional[List[str]] = None,
+) -> int:
+    """
+    多行 INSERT ... ON CONFLICT DO NOTHING / DO UPDATE（不提交事务）
+
+    Args:
+        index_elements: 冲突目标列（必须对应一个唯一索引）
+        index_where: 部分唯一索引的条件
+        update_fields: 为空时 DO NOTHING；否则冲突时用新值更新这些列
+
+    Returns:
+        实际插入（或更新）的行数
+    """
+    if not rows:
+        return 0
+    stmt = _dialect_insert(session, model)
+    if stmt is None:
+        # 其他数据库：退回普通批量插入（依赖调用方已做存在性比对）
+        session.bulk_insert_mappings(model, rows)
+        return len(rows)
+
+    # 多行VALUES要求每行的列一致
+    columns = list(dict.fromkeys(col for row in rows for col in row))
+    affected = 0
+    for chunk in _chunks(rows, INSERT_CHUNK_SIZE):
+        values = [{col: row.get(col) for col in columns} for row in chunk]
+        chunk_stmt = stmt.values(values)
+        if update_fields:
+            set_ = {f: getattr(chunk_stmt.excluded, f) for f in update_fields if f in columns}
+            set_['updated_at'] = datetime.now()
+            chunk_stmt = chunk_stmt.on_conflict_do_update(
+                index_elements=index_elements, index_where=index_where, set_=set_
+            )
+        else:
+            chunk_stmt = chunk_stmt.on_conflict_do_nothing(
+                index_elements=index_elements, index_where=index_where
+            )
+        result = session.execute(chunk_stmt)
+        affected += max(result.rowcount or 0, 0)
+    return affected
+
+
+def bulk_upsert(
+    session_factory: Callable,
+    model,
+    rows: List[Dict],
+    key_fields: List[str],
+    key_of: Callable[[Dict], Hashable],
+    lookup_clause: Callable[[List[Dict]], object],
+    update_fields: List[str],
+    defaults: Optional[Dict] = None,
+    label: str = '',
+    conflict_target_of: Optional[Callable[[Dict], tuple]] = None,
+) -> Dict[str, int]:
+    """
+    批量比对并写入
+
+    Args:
+        session_factory: 返回数据库会话的函数（如 get_jobs_session）
+        model: ORM模型类
+        rows: 已转换为列字典的数据（只包含来源数据中提供的列）
+        key_fields: 计算去重键需要的列名
+        key_of: 从列字典计算去重键（新数据与已有记录共用）
+        lookup_clause: 根据一组数据生成 IN 查询条件
+        update_fields: 已存在记录允许被更新的列（只更新本条数据提供了的列）
+        defaults: 新建记录时缺失列的默认值
+        label: 日志前缀
+        conflict_target_of: 返回该行对应唯一索引的 (index_elements, index_where)；
+            提供时插入使用 ON CONFLICT DO NOTHING（比对后被并发写入的行计为跳过）
+
+    Returns:
+        统计信息: {'total', 'created', 'updated', 'skipped', 'error'}
+    """
+    defaults = defaults or {}
+    stats = {
+        'total': len(rows),
+        'created': 0,
+        'updated': 0,
+        'skipped': 0,
+        'error': 0
+    }
+    if not rows:
+        return stats
+
+    # 批次内去重：同一个键以最后一条为准，其余计为跳过
+    batch = {}
+    for row in rows:
+        key = key_of({**defaults, **row})
+        if key in batch:
+            stats['skipped'] += 1
+        batch[key] = row
+    unique_rows = list(batch.values())
+
+    pk_name = sa_inspect(model).primary_key[0].name
+    select_fields = [pk_name] + [f for f in dict.fromkeys(key_fields + update_fields) if f != pk_name]
+    select_columns = [getattr(model, f) for f in select_fields]
+
+    session = session_factory()
+    try:
+        # 一次（分块）IN 查询取回已存在记录
+        existing = {}
+        for chunk in _chunks(unique_rows, LOOKUP_CHUNK_SIZE):
+            for record in session.query(*select_columns).filter(lookup_clause(chunk)).all():
+                record_dict = dict(zip(select_fields, record))
+                existing.setdefault(key_of(record_dict), record_dict)
+
+        to_insert = []
+        to_update = []
+        now = datetime.now()
+        for key, row in batch.items():
+            current = existing.get(key)
+            if current is None:
+                to_insert.append({**defaults, **row})
+                continue
+            fields = [f for f in update_fields if f in row]
+            if content_hash(row, fields) == content_hash(current, fields):
+                stats['skipped'] += 1
+                continue
+            mapping = {f: row[f] for f in fields}
+            mapping[pk_name] = current[pk_name]
+            mapping['updated_at'] = now
+            to_update.append(mapping)
+
+        created = 0
+        if to_insert and conflict_target_of is not None:
+            groups = {}
+            for row in to_insert:
+                index_elements, index_where = conflict_target_of(row)
+                groups.setdefault((tuple(index_elements), index_where), []).append(row)
+            for (index_elements, index_where), group in groups.items():
+                created += insert_on_conflict(session, model, group, list(index_elements), index_where)
+            stats['skipped'] += len(to_insert) - created
+        elif to_insert:
+            session.bulk_insert_mappings(model, to_insert)
+            created = len(to_insert)
+        if to_update:
+            session.bulk_update_mappings(model, to_update)
+        session.commit()
+
+        stats['created'] = created
+        stats['updated'] = len(to_update)
+        logger.info(
+            f"{label}批量写入完成: 新建 {stats['created']}，更新 {stats['updated']}，"
+            f"跳过 {stats['skipped']}（共 {stats['total']}）"
+        )
+    except Exception as e:
+        session.rollback()
+        logger.error(f"{label}批量写入失败: {e}")
+        stats['error'] = stats['total'] - stats['skipped']
+    finally:
+        session.close()
+
+    return stats
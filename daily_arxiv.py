@@ -304,7 +304,7 @@ def parse_paper_entry_from_string(entry_str):
         logging.error(f"解析论文条目失败: {e}")
     return None
 
-def update_json_file(filename,data_dict, save_to_db=True, enable_dedup=True, enable_incremental=True, days_back=7, fetch_semantic_scholar=False):
+def update_json_file(filename,data_dict, save_to_db=True, enable_dedup=True, enable_incremental=True, days_back=7, fetch_semantic_scholar=False, task_progress=None):
     '''
     daily update json file using data_dict
     同时保存到数据库（如果启用）
@@ -317,6 +317,7 @@ def update_json_file(filename,data_dict, save_to_db=True, enable_dedup=True, ena
         enable_incremental: 是否启用增量更新
         days_back: 只抓取最近N天的论文（默认7天）
         fetch_semantic_scholar: 是否从Semantic Scholar获取补充数据（默认False）
+        task_progress: 任务进度上报器（可选），上报入库/跳过的论文数
     '''
     # 如果启用数据库，先保存到数据库
     if save_to_db:
@@ -328,6 +329,8 @@ def update_json_file(filename,data_dict, save_to_db=True, enable_dedup=True, ena
             
             # 获取所有已有标题（用于去重）
             existing_titles = []
+            if task_progress is not None:
+                task_progress.update(message='正在保存论文到数据库...', force=True)
             if enable_dedup:
                 try:
                     session = get_session()
@@ -392,11 +395,15 @@ def update_json_file(filename,data_dict, save_to_db=True, enable_dedup=True, ena
                                 saved_count += 1
                             elif action == 'updated':
                                 saved_count += 1  # 更新也算作处理成功
+                            if task_progress is not None:
+                                task_progress.incr('saved')
                             # 更新已有标题列表（避免同一批次内重复）
                             if enable_dedup and parsed.get('title'):
                                 existing_titles.append(parsed['title'])
                         elif action == 'skipped':
                             skipped_dup += 1
+                            if task_progress is not None:
+                                task_progress.incr('skipped')
             
             logging.info(f"保存统计: 新增 {saved_count} 篇, 跳过重复 {skipped_dup} 篇, 跳过旧论文 {skipped_old} 篇")
         except Exception as e:
@@ -547,8 +554,7 @@ def demo(**config):
     publish_gitpage = config.get('publish_gitpage', False)
     publish_wechat = config.get('publish_wechat', False)
     show_badge = config.get('show_badge', False)
-    fetch_status = config.get('fetch_status', None)  # 获取fetch_status用于更新进度
-    fetch_status_lock = config.get('fetch_status_lock', None)  # 获取锁用于线程安全更新
+    task_progress = config.get('task_progress', None)  # 任务进度上报器（后台任务运行时传入）
     enable_dedup = config.get('enable_dedup', True)  # 是否启用智能去重
     enable_incremental = config.get('enable_incremental', True)  # 是否启用增量更新
 
@@ -561,19 +567,11 @@ def demo(**config):
         
         for topic, keyword in keywords.items():
             current_progress += 1
-            if fetch_status:
-                # 使用锁保护更新
-                if fetch_status_lock:
-                    with fetch_status_lock:
-                        fetch_status['current_keyword'] = topic
-                        fetch_status['message'] = f'正在抓取 {topic} ({current_progress}/{total_keywords})...'
-                        fetch_status['progress'] = current_progress
-                else:
-                    # 如果没有锁，直接更新（向后兼容）
-                    fetch_status['current_keyword'] = topic
-                    fetch_status['message'] = f'正在抓取 {topic} ({current_progress}/{total_keywords})...'
-                    fetch_status['progress'] = current_progress
-                logging.info(f"更新进度: {fetch_status['message']}, progress={fetch_status['progress']}/{fetch_status.get('total', total_keywords)}")
+            if task_progress is not None:
+                message = f'正在抓取 {topic} ({current_progress}/{total_keywords})...'
+                task_progress.update(progress=current_progress, total=total_keywords,
+                                     current=topic, message=message)
+                logging.info(f"更新进度: {message}, progress={current_progress}/{total_keywords}")
             
             logging.info(f"Keyword: {topic} ({current_progress}/{total_keywords})")
             data, data_web = get_daily_papers(topic, query = keyword,
@@ -598,7 +596,8 @@ def demo(**config):
                            enable_dedup=enable_dedup,
                            enable_incremental=enable_incremental,
                            days_back=config.get('days_back', 7),
-                           fetch_semantic_scholar=config.get('fetch_semantic_scholar', False))
+                           fetch_semantic_scholar=config.get('fetch_semantic_scholar', False),
+                           task_progress=task_progress)
         # json data to markdown
         json_to_md(json_file,md_file, task ='Update Readme', \
             show_badge = show_badge)
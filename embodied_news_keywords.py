@@ -172,9 +172,93 @@ COMPANY_NAMES = [
     '星动纪元', 'gradmotion'
 ]
 
+# ===== 相关性判断用关键词（由 news_relevance 在导入时统一编译） =====
+
+# 核心词：宽松模式下必须包含机器人或具身相关词（也用于RSS标题检查）
+RELEVANCE_CORE_KEYWORDS = [
+    # 英文核心词
+    'robot', 'robotics', 'robotic', 'humanoid', 'manipulator', 'gripper',
+    'embodied', 'embodied ai', 'embodied intelligence',
+    # 中文核心词
+    '机器人', '具身', '具身智能', '具身ai', '人形机器人', '机械臂', '抓取'
+]
+
+# 排除明显不相关的词（除非同时包含机器人相关词）
+RELEVANCE_EXCLUDE_KEYWORDS = [
+    # 电子设备
+    '手机', 'mobile phone', 'iphone', 'android phone', 'smartphone',
+    '电脑', 'computer', 'laptop', 'pc',
+    # 智能家居/消费电子
+    '智能家居', 'smart home', 'home automation',
+    '智能音箱', 'smart speaker', 'alexa', 'siri',
+    # 自动驾驶（非机器人）
+    '自动驾驶', 'self-driving car', 'autonomous vehicle', 'driverless car',  # 除非明确提到机器人
+    # AI芯片（非机器人）
+    'ai芯片', 'ai chip', '芯片', 'chip',  # 除非明确提到机器人
+    # 大模型/LLM（非机器人）
+    'chatgpt', 'gpt', 'llm', '大模型', 'large language model',  # 除非明确提到机器人
+    # 基础设施/交通（非机器人）
+    '高铁', 'high-speed rail', 'railway', '铁路', '轨道交通',
+    '地铁', 'subway', 'metro', '交通', 'transportation',
+    '基础设施建设', 'infrastructure', '建设', 'construction',
+    # 旅游/娱乐（非机器人）
+    '迪士尼', 'disney', 'disneyland', '主题公园', 'theme park',
+    '旅游', 'tourism', 'travel', '景点', 'attraction',
+    # 规划/政策（非机器人，除非明确提到机器人）
+    '十五五', '十四五', '十三五', '五年规划', '规划', 'planning',  # 除非明确提到机器人
+    '海南', 'hainan', '上海', 'shanghai', '北京', 'beijing',  # 地名，除非明确提到机器人
+    '政策', 'policy', '法规', 'regulation', '法律', 'law',
+    # 经济/金融（非机器人）
+    '经济发展', 'economic', 'gdp', '投资', 'investment',  # 除非是机器人公司融资
+    '股票', 'stock', '股市', 'market', '金融', 'finance',
+    # 其他不相关
+    '医疗', 'healthcare', '教育', 'education', '农业', 'agriculture',
+]
+
+# 包含排除词时需要的机器人上下文
+ROBOT_CONTEXT_KEYWORDS = [
+    'robot', 'robotics', '机器人', 'embodied', '具身',
+    'humanoid', '人形', 'manipulator', '机械臂'
+]
+
+# 强排除词（如：高铁、迪士尼、规划等），需要更严格的检查
+STRONG_EXCLUDE_KEYWORDS = [
+    '高铁', 'high-speed rail', 'railway', '铁路',
+    '迪士尼', 'disney', 'disneyland',
+    '十五五', '十四五', '十三五', '五年规划',
+    '海南', 'hainan', '上海', 'shanghai', '北京', 'beijing',
+    '旅游', 'tourism', '主题公园', 'theme park',
+    '地铁', 'subway', 'metro', '轨道交通',
+]
+
+# 强排除词：必须明确包含机器人相关词才匹配（如"机器人路径规划"可以，但"城市规划"不行）
+ROBOT_SPECIFIC_KEYWORDS = [
+    'robot', 'robotics', '机器人', 'embodied', '具身',
+    'humanoid', '人形', 'manipulator', '机械臂',
+    '机器人规划', 'robot planning', 'robotic planning'  # 明确的机器人规划
+]
+
+# RSS科技媒体：新闻聚合类、商业大会类标题
+RSS_AGGREGATION_KEYWORDS = [
+    '8点', '8点1氪', '早报', '晚报', '日报', '周报',
+    '热点', '要闻', '资讯', 'news', 'daily', 'weekly',
+]
+RSS_BUSINESS_EVENT_KEYWORDS = [
+    '大会', 'conference', 'forum', '论坛', '会议',
+    '商业', 'business', 'wise', '创新大会',
+]
+# RSS科技媒体：包含排除词时必须包含的机器人核心词
+RSS_ROBOT_CORE_KEYWORDS = ['robot', 'robotics', '机器人', 'embodied', '具身', 'humanoid', '人形']
+
+# ArXiv论文：标识词，以及宽松模式下只要包含即认为相关的关键词
+ACADEMIC_MARKER_KEYWORDS = ['arxiv', 'cs.ro', 'cs.ai', 'cs.lg']
+ACADEMIC_BROAD_KEYWORDS = ['robot', 'robotics', 'ai', 'machine learning', 'ml', 'neural', 'deep learning', 'embodied', '具身']
+
+
 def is_embodied_related(text: str, strict: bool = False) -> bool:
     """
     判断文本是否与具身智能相关（优化版，减少误匹配）
+    规则与预编译的关键词自动机见 news_relevance
     
     Args:
         text: 文本内容（标题+描述）
@@ -183,152 +267,8 @@ def is_embodied_related(text: str, strict: bool = False) -> bool:
     Returns:
         是否相关
     """
-    text_lower = text.lower()
-    
-    if strict:
-        # 严格模式：必须包含核心关键词
-        for keyword in CORE_EMBODIED_KEYWORDS + ROBOTICS_KEYWORDS:
-            if keyword.lower() in text_lower:
-                return True
-        return False
-    
-    # 宽松模式：必须包含核心词（机器人/具身）或特定组合
-    # 核心词：必须包含机器人或具身相关词
-    core_required_keywords = [
-        # 英文核心词
-        'robot', 'robotics', 'robotic', 'humanoid', 'manipulator', 'gripper',
-        'embodied', 'embodied ai', 'embodied intelligence',
-        # 中文核心词
-        '机器人', '具身', '具身智能', '具身ai', '人形机器人', '机械臂', '抓取'
-    ]
-    
-    # 检查是否包含核心词
-    has_core_keyword = any(kw in text_lower for kw in core_required_keywords)
-    
-    # 检查是否包含已知的具身智能公司名称（即使没有明确提到"机器人"）
-    has_company_name = any(company.lower() in text_lower for company in COMPANY_NAMES)
-    
-    # 如果包含公司名称，也认为相关（因为这些公司都是具身智能/机器人公司）
-    if has_company_name:
-        return True
-    
-    # 如果没有核心词，直接返回False（避免误匹配）
-    if not has_core_keyword:
-        return False
-    
-    # 排除明显不相关的词（除非同时包含机器人相关词）
-    exclude_keywords = [
-        # 电子设备
-        '手机', 'mobile phone', 'iphone', 'android phone', 'smartphone',
-        '电脑', 'computer', 'laptop', 'pc',
-        # 智能家居/消费电子
-        '智能家居', 'smart home', 'home automation',
-        '智能音箱', 'smart speaker', 'alexa', 'siri',
-        # 自动驾驶（非机器人）
-        '自动驾驶', 'self-driving car', 'autonomous vehicle', 'driverless car',  # 除非明确提到机器人
-        # AI芯片（非机器人）
-        'ai芯片', 'ai chip', '芯片', 'chip',  # 除非明确提到机器人
-        # 大模型/LLM（非机器人）
-        'chatgpt', 'gpt', 'llm', '大模型', 'large language model',  # 除非明确提到机器人
-        # 基础设施/交通（非机器人）
-        '高铁', 'high-speed rail', 'railway', '铁路', '轨道交通',
-        '地铁', 'subway', 'metro', '交通', 'transportation',
-        '基础设施建设', 'infrastructure', '建设', 'construction',
-        # 旅游/娱乐（非机器人）
-        '迪士尼', 'disney', 'disneyland', '主题公园', 'theme park',
-        '旅游', 'tourism', 'travel', '景点', 'attraction',
-        # 规划/政策（非机器人，除非明确提到机器人）
-        '十五五', '十四五', '十三五', '五年规划', '规划', 'planning',  # 除非明确提到机器人
-        '海南', 'hainan', '上海', 'shanghai', '北京', 'beijing',  # 地名，除非明确提到机器人
-        '政策', 'policy', '法规', 'regulation', '法律', 'law',
-        # 经济/金融（非机器人）
-        '经济发展', 'economic', 'gdp', '投资', 'investment',  # 除非是机器人公司融资
-        '股票', 'stock', '股市', 'market', '金融', 'finance',
-        # 其他不相关
-        '医疗', 'healthcare', '教育', 'education', '农业', 'agriculture',
-    ]
-    
-    has_exclude = any(kw in text_lower for kw in exclude_keywords)
-    
-    # 如果包含排除词，必须同时包含机器人核心词才认为相关
-    if has_exclude:
-        # 检查是否有明确的机器人上下文
-        robot_context_keywords = [
-            'robot', 'robotics', '机器人', 'embodied', '具身',
-            'humanoid', '人形', 'manipulator', '机械臂'
-        ]
-        # 对于某些强排除词（如：高铁、迪士尼、规划等），需要更严格的检查
-        strong_exclude_keywords = [
-            '高铁', 'high-speed rail', 'railway', '铁路',
-            '迪士尼', 'disney', 'disneyland',
-            '十五五', '十四五', '十三五', '五年规划',
-            '海南', 'hainan', '上海', 'shanghai', '北京', 'beijing',
-            '旅游', 'tourism', '主题公园', 'theme park',
-            '地铁', 'subway', 'metro', '轨道交通',
-        ]
-        has_strong_exclude = any(kw in text_lower for kw in strong_exclude_keywords)
-        
-        if has_strong_exclude:
-            # 强排除词：必须明确包含机器人相关词才匹配（如"机器人路径规划"可以，但"城市规划"不行）
-            robot_specific_keywords = [
-                'robot', 'robotics', '机器人', 'embodied', '具身',
-                'humanoid', '人形', 'manipulator', '机械臂',
-                '机器人规划', 'robot planning', 'robotic planning'  # 明确的机器人规划
-            ]
-            if not any(kw in text_lower for kw in robot_specific_keywords):
-                return False
-        
-        # 其他排除词：需要机器人上下文
-        if not any(kw in text_lower for kw in robot_context_keywords):
-            return False
-    
-    # 特殊处理：如果只有通用AI/ML关键词，需要同时有机器人上下文
-    generic_ai_keywords = [
-        'artificial intelligence', 'ai', '人工智能', '智能',
-        'machine learning', 'ml', '机器学习', '深度学习', 'deep learning'
-    ]
-    
-    has_generic_ai = any(kw in text_lower for kw in generic_ai_keywords)
-    has_robot_context = any(kw in text_lower for kw in core_required_keywords)
-    
-    # 如果只有通用AI关键词，没有机器人上下文，不认为相关
-    if has_generic_ai and not has_robot_context:
-        return False
-    
-    # 特殊处理：自动驾驶相关，除非明确提到机器人
-    if 'autonomous' in text_lower or '自主' in text_lower or '自动驾驶' in text_lower:
-        if 'robot' not in text_lower and '机器人' not in text_lower and 'robotics' not in text_lower:
-            # 可能是自动驾驶汽车，不是机器人
-            if 'car' in text_lower or 'vehicle' in text_lower or '汽车' in text_lower or '车' in text_lower or 'robotaxi' in text_lower:
-                return False
-    
-    # 特殊处理：Robotaxi（自动驾驶出租车），不是机器人
-    if 'robotaxi' in text_lower:
-        if 'robot' not in text_lower or 'robotics' not in text_lower:
-            # Robotaxi是自动驾驶，不是机器人（除非明确提到机器人）
-            return False
-    
-    # 特殊处理：通用商业/经济新闻，即使包含AI也不匹配
-    business_keywords = [
-        '商业', 'business', '公司', 'company', '行业', 'industry',
-        '经济', 'economic', '市场', 'market', '投资', 'investment',
-        '出海', '国际化', '全球化', 'global',
-    ]
-    has_business = any(kw in text_lower for kw in business_keywords)
-    if has_business:
-        # 如果是纯商业新闻（没有机器人核心词），不匹配
-        if not has_core_keyword and not has_company_name:
-            return False
-    
-    # 特殊处理：通用AI会议/论坛，除非明确提到机器人
-    if 'ai' in text_lower or '人工智能' in text_lower:
-        if '会议' in text_lower or '论坛' in text_lower or 'conference' in text_lower or 'forum' in text_lower:
-            # AI会议/论坛，除非明确提到机器人，不匹配
-            if not has_core_keyword and not has_company_name:
-                return False
-    
-    # 如果通过了所有检查，且有核心词，认为相关
-    return has_core_keyword
+    from news_relevance import is_embodied_text
+    return is_embodied_text(text, strict=strict)
 
 def get_search_queries() -> list:
     """
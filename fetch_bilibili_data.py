@@ -13,6 +13,9 @@ from bilibili_models import (
     get_bilibili_session, BilibiliUp, BilibiliVideo,
     init_bilibili_db
 )
+from bulk_upsert import LOOKUP_CHUNK_SIZE, insert_on_conflict
+from video_stats_history import append_samples
+from sqlalchemy import func, select
 
 # 配置日志
 logging.basicConfig(
@@ -37,7 +40,110 @@ except ImportError:
     logger.warning("无法从app.py导入BILIBILI_UP_LIST，使用默认列表")
 
 
-def fetch_and_save_up_data(uid, video_count=50, fetch_all=False):
+def _video_row(uid, video_data, now):
+    """API返回的视频数据 -> bilibili_videos 行（API没有返回的播放量、发布时间不写入，保留原值）"""
+    bvid = video_data['bvid']
+    video_review = video_data.get('video_review', 0) or 0
+    favorites = video_data.get('favorites', 0) or 0
+    row = {
+        'bvid': bvid,
+        'uid': uid,
+        'aid': video_data.get('aid', 0),
+        'title': video_data.get('title', ''),
+        'pic': video_data.get('pic', ''),
+        'description': video_data.get('description', ''),
+        'length': video_data.get('length', ''),
+        'video_review': video_review,
+        'video_review_formatted': format_number(video_review),
+        'favorites': favorites,
+        'favorites_formatted': format_number(favorites),
+        'url': f"https://www.bilibili.com/video/{bvid}",
+        'is_deleted': False,
+        'created_at': now,
+        'updated_at': now,
+    }
+    # 播放量只会增加：API返回了（即使为0）就更新，没有返回（None）保持原值
+    if video_data.get('play') is not None:
+        row['play'] = video_data['play']
+        row['play_formatted'] = format_number(video_data['play'])
+    pubdate_raw = video_data.get('pubdate', 0)
+    if pubdate_raw:
+        row['pubdate_raw'] = pubdate_raw
+        row['pubdate'] = datetime.fromtimestamp(pubdate_raw)
+    return row
+
+
+def save_videos(session, uid, videos):
+    """
+    批量写入一个UP主的视频（不提交事务）
+
+    一次（分块）IN 查询取回已存在的BV号，按列组合分组后多行 INSERT ... ON CONFLICT DO UPDATE；
+    已存在视频的 uid、created_at 不变。返回了播放量的视频同时写入 bilibili_video_stats 采样点。
+
+    Returns:
+        (新增数, 更新数)
+    """
+    now = datetime.now()
+    rows = {}
+    for idx, video_data in enumerate(videos):
+        if not video_data.get('bvid'):
+            logger.warning(f"视频数据 {idx} 缺少BV号，跳过: {video_data}")
+            continue
+        rows[video_data['bvid']] = _video_row(uid, video_data, now)
+    if not rows:
+        return 0, 0
+
+    bvids = list(rows)
+    existing = set()
+    for i in range(0, len(bvids), LOOKUP_CHUNK_SIZE):
+        chunk = bvids[i:i + LOOKUP_CHUNK_SIZE]
+        existing.update(session.execute(
+            select(BilibiliVideo.bvid).where(BilibiliVideo.bvid.in_(chunk))
+        ).scalars())
+
+    # 多行VALUES要求每行的列一致：按列组合（是否有播放量/发布时间）分组
+    groups = {}
+    for bvid, row in rows.items():
+        if bvid not in existing and 'pubdate' not in row:
+            logger.warning(f"新视频缺少发布时间，跳过: {bvid}")
+            continue
+        groups.setdefault(tuple(row), []).append(row)
+    for columns, group in groups.items():
+        update_fields = [col for col in columns if col not in ('bvid', 'uid', 'created_at')]
+        insert_on_conflict(session, BilibiliVideo, group, ['bvid'], update_fields=update_fields)
+
+    # 返回了播放量的视频追加一个统计采样点
+    append_samples(session, [
+        {'bvid': row['bvid'], 'play': row['play'], 'reply': row['video_review'], 'favorite': row['favorites']}
+        for group in groups.values() for row in group if 'play' in row
+    ], ts=now.timestamp())
+
+    written = sum(len(group) for group in groups.values())
+    updated_count = len(existing)
+    return written - updated_count, updated_count
+
+
+def video_totals(session, uid):
+    """一次聚合查询：UP主未删除视频的数量和总播放量"""
+    video_count, total_views = session.execute(
+        select(func.count(BilibiliVideo.bvid), func.coalesce(func.sum(BilibiliVideo.play), 0))
+        .where(BilibiliVideo.uid == uid, BilibiliVideo.is_deleted == False)
+    ).one()
+    return video_count or 0, total_views or 0
+
+
+def sync_watermark(session, up):
+    """UP主的增量同步水位：优先用 bilibili_ups.latest_pubdate_raw，未回填时取视频表中的最新发布时间"""
+    if up is None:
+        return None
+    if up.latest_pubdate_raw:
+        return up.latest_pubdate_raw
+    return session.execute(
+        select(func.max(BilibiliVideo.pubdate_raw)).where(BilibiliVideo.uid == up.uid)
+    ).scalar()
+
+
+def fetch_and_save_up_data(uid, video_count=50, fetch_all=False, incremental=False):
     """
     抓取并保存单个UP主的数据
     
@@ -45,6 +151,8 @@ def fetch_and_save_up_data(uid, video_count=50, fetch_all=False):
         uid: UP主UID
         video_count: 抓取的视频数量（当fetch_all=False时使用）
         fetch_all: 是否抓取所有视频（True时忽略video_count，抓取所有）
+        incremental: 增量同步：只翻页到上次同步的最新视频为止（没有水位时按 video_count 抓取）；
+            已入库旧视频的播放量由 update_video_play_counts 更新
     
     Returns:
         bool: 是否成功
@@ -53,18 +161,23 @@ def fetch_and_save_up_data(uid, video_count=50, fetch_all=False):
     client = BilibiliClient()
     
     try:
+        up = session.query(BilibiliUp).filter_by(uid=uid).first()
+        since_pubdate = sync_watermark(session, up) if incremental and not fetch_all else None
+        
         if fetch_all:
             logger.info(f"开始抓取UP主 {uid} 的所有视频数据...")
+        elif since_pubdate:
+            logger.info(f"开始增量抓取UP主 {uid} 的数据（{format_timestamp(since_pubdate)} 之后发布的视频）...")
         else:
             logger.info(f"开始抓取UP主 {uid} 的数据（最新 {video_count} 个视频）...")
         
         # 从API获取数据
-        data = client.get_all_data(uid, video_count=video_count, fetch_all=fetch_all)
+        data = client.get_all_data(uid, video_count=video_count, fetch_all=fetch_all,
+                                   since_pubdate=since_pubdate or None)
         
         if not data:
             logger.warning(f"UP主 {uid} 数据获取失败")
             # 更新错误信息
-            up = session.query(BilibiliUp).filter_by(uid=uid).first()
             if up:
                 up.fetch_error = "数据获取失败"
                 up.last_fetch_at = datetime.now()
@@ -81,7 +194,6 @@ def fetch_and_save_up_data(uid, video_count=50, fetch_all=False):
             logger.info(f"前3个视频BV号: {[v.get('bvid') for v in videos[:3]]}")
         
         # 更新或创建UP主信息
-        up = session.query(BilibiliUp).filter_by(uid=uid).first()
         if not up:
             up = BilibiliUp(uid=uid)
             session.add(up)
@@ -96,33 +208,32 @@ def fetch_and_save_up_data(uid, video_count=50, fetch_all=False):
         up.friend = user_info.get('friend', 0)
         up.space_url = f"https://space.bilibili.com/{uid}"
         
-        # 更新统计数据（只更新有效数据，防止覆盖为0）
-        from sqlalchemy import func
+        # 视频：一次 IN 查询区分新旧，多行 UPSERT 写入（与UP主信息在同一事务中）
+        created_count, updated_count = save_videos(session, uid, videos)
+        # 水位只前进：取本次使用的水位与返回视频最新发布时间中的较大者
+        latest_pubdate = max((v.get('pubdate') or 0 for v in videos if v.get('bvid')),
+                             default=0)
+        latest_pubdate = max(latest_pubdate, since_pubdate or 0)
+        if latest_pubdate > (up.latest_pubdate_raw or 0):
+            up.latest_pubdate_raw = latest_pubdate
+        if not videos:
+            logger.warning(f"视频列表为空，只更新UP主信息（已有视频的播放量由 update_video_play_counts 更新）(UID: {uid})")
         
-        # 视频数量：优先使用API数据，如果为0则尝试从视频表计算
+        # 更新统计数据（只更新有效数据，防止覆盖为0）
+        # 视频数量、总播放量优先使用API数据；API返回0且数据库也是0时，用一次聚合查询从视频表计算
         api_videos_count = user_stat.get('videos', 0)
+        api_views_count = user_stat.get('views', 0)
         if api_videos_count > 0:
             up.videos_count = api_videos_count
-        elif up.videos_count == 0:
-            # 如果API返回0且数据库也是0，尝试从视频表计算
-            video_count = session.query(func.count(BilibiliVideo.bvid)).filter_by(
-                uid=uid, is_deleted=False
-            ).scalar()
-            if video_count > 0:
-                up.videos_count = video_count
-                logger.info(f"从视频表计算视频数量: {video_count}")
-        
-        # 总播放量：优先使用API数据，如果为0则尝试从视频表计算
-        api_views_count = user_stat.get('views', 0)
         if api_views_count > 0:
             up.views_count = api_views_count
             up.views_formatted = format_number(api_views_count)
-        elif up.views_count == 0:
-            # 如果API返回0且数据库也是0，尝试从视频表计算
-            total_views = session.query(func.sum(BilibiliVideo.play)).filter_by(
-                uid=uid, is_deleted=False
-            ).scalar() or 0
-            if total_views > 0:
+        if (api_videos_count <= 0 and not up.videos_count) or (api_views_count <= 0 and not up.views_count):
+            stored_count, total_views = video_totals(session, uid)
+            if api_videos_count <= 0 and not up.videos_count and stored_count > 0:
+                up.videos_count = stored_count
+                logger.info(f"从视频表计算视频数量: {stored_count}")
+            if api_views_count <= 0 and not up.views_count and total_views > 0:
                 up.views_count = total_views
                 up.views_formatted = format_number(total_views)
                 logger.info(f"从视频表计算总播放量: {total_views:,}")
@@ -139,95 +250,14 @@ def fetch_and_save_up_data(uid, video_count=50, fetch_all=False):
         up.fetch_error = None
         up.updated_at = datetime.now()
         
-        session.commit()
-        logger.info(f"UP主 {up.name} 信息已更新")
-        
-        # 处理视频数据（更新为主，只更新已存在的记录，不创建新记录）
-        updated_count = 0
-        created_count = 0
-        
-        # ✅ 修复：即使视频列表为空，也要尝试更新已存在的视频播放量
-        if not videos or len(videos) == 0:
-            logger.warning(f"视频列表为空，尝试更新已存在的视频播放量 (UID: {uid})")
-            # 获取该UP主最近更新的视频（最多50个），尝试更新播放量
-            existing_videos = session.query(BilibiliVideo).filter_by(
-                uid=uid, is_deleted=False
-            ).order_by(BilibiliVideo.updated_at.asc()).limit(50).all()
-            
-            if existing_videos:
-                logger.info(f"找到 {len(existing_videos)} 个已存在的视频，尝试更新播放量...")
-                # 这里可以调用 update_video_play_counts 的逻辑，但为了简单，先跳过
-                # 建议使用独立的视频播放量更新脚本
-        
-        for idx, video_data in enumerate(videos):
-            bvid = video_data.get('bvid', '')
-            if not bvid:
-                logger.warning(f"视频数据 {idx} 缺少BV号，跳过: {video_data}")
-                continue
-            
-            # 查找或创建视频记录
-            video = session.query(BilibiliVideo).filter_by(bvid=bvid).first()
-            is_new = False
-            if not video:
-                # 只创建新视频记录（如果数据库中不存在）
-                video = BilibiliVideo(bvid=bvid, uid=uid)
-                session.add(video)
-                is_new = True
-                created_count += 1
-            else:
-                updated_count += 1
-            
-            # 更新视频信息（无论新旧都更新，确保数据最新）
-            video.aid = video_data.get('aid', 0)
-            video.title = video_data.get('title', '')
-            video.pic = video_data.get('pic', '')
-            video.description = video_data.get('description', '')
-            video.length = video_data.get('length', '')
-            
-            # 统计数据（总是更新，确保数据最新）
-            play_raw = video_data.get('play', 0) or 0
-            # ✅ 修复：总是更新播放量（即使为0也更新，因为播放量只会增加不会减少）
-            # 如果API返回了播放量数据，就更新；如果没有返回（None），保持原值
-            if 'play' in video_data and video_data['play'] is not None:
-                video.play = play_raw
-                video.play_formatted = format_number(play_raw)
-            # 如果API没有返回播放量字段，保持原值（避免覆盖为0）
-            video.video_review = video_data.get('video_review', 0) or 0
-            video.video_review_formatted = format_number(video.video_review)
-            video.favorites = video_data.get('favorites', 0) or 0
-            video.favorites_formatted = format_number(video.favorites)
-            
-            # 时间（如果API返回了新的时间，也更新）
-            pubdate_raw = video_data.get('pubdate', 0)
-            if pubdate_raw:
-                video.pubdate_raw = pubdate_raw
-                video.pubdate = datetime.fromtimestamp(pubdate_raw)
-            
-            video.url = f"https://www.bilibili.com/video/{bvid}"
-            video.is_deleted = False
-            video.updated_at = datetime.now()
-        
         try:
             session.commit()
-            total_count = updated_count + created_count
-            logger.info(f"UP主 {up.name} 的视频数据已更新: 更新{updated_count}条, 新增{created_count}条, 共{total_count}条")
-            
-            # ✅ 验证：检查是否真的保存成功
-            if created_count > 0:
-                # 验证新创建的视频是否真的在数据库中
-                sample_bvids = [v.get('bvid') for v in videos[:min(5, len(videos))] if v.get('bvid')]
-                for sample_bvid in sample_bvids:
-                    saved = session.query(BilibiliVideo).filter_by(bvid=sample_bvid).first()
-                    if saved:
-                        logger.debug(f"✅ 验证成功: {sample_bvid} 已保存到数据库")
-                    else:
-                        logger.error(f"❌ 验证失败: {sample_bvid} 未保存到数据库！")
         except Exception as commit_error:
             logger.error(f"❌ 数据库提交失败: {commit_error}")
-            import traceback
-            logger.error(traceback.format_exc())
             session.rollback()
             raise
+        logger.info(f"UP主 {up.name} 信息已更新，视频数据: 更新{updated_count}条, 新增{created_count}条, "
+                    f"共{created_count + updated_count}条")
         
         return True
         
@@ -238,6 +268,7 @@ def fetch_and_save_up_data(uid, video_count=50, fetch_all=False):
         
         # 更新错误信息（改进：记录详细错误信息和时间）
         try:
+            session.rollback()  # 本次抓取的写入整体回滚
             up = session.query(BilibiliUp).filter_by(uid=uid).first()
             if up:
                 error_msg = f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}: {str(e)}"
@@ -254,7 +285,8 @@ def fetch_and_save_up_data(uid, video_count=50, fetch_all=False):
         session.close()
 
 
-def fetch_all_bilibili_data(video_count=50, delay_between_requests=1.5, fetch_all=False):
+def fetch_all_bilibili_data(video_count=50, delay_between_requests=1.5, fetch_all=False, task_progress=None,
+                            incremental=False):
     """
     抓取所有UP主的数据
     
@@ -262,12 +294,16 @@ def fetch_all_bilibili_data(video_count=50, delay_between_requests=1.5, fetch_al
         video_count: 每个UP主抓取的视频数量（当fetch_all=False时使用）
         delay_between_requests: 请求间隔（秒），避免触发风控
         fetch_all: 是否抓取所有视频（True时忽略video_count，抓取所有）
+        incremental: 增量同步（只抓取上次同步之后发布的视频）
+        task_progress: 任务进度上报器（task_queue.TaskProgress，可选）
     """
     logger.info("=" * 60)
     logger.info("开始抓取所有B站数据")
     logger.info(f"UP主数量: {len(BILIBILI_UP_LIST)}")
     if fetch_all:
         logger.info(f"抓取模式: 所有视频（分页抓取）")
+    elif incremental:
+        logger.info(f"抓取模式: 增量同步（无同步记录的UP主抓取最新 {video_count} 个视频）")
     else:
         logger.info(f"每个UP主视频数量: {video_count}")
     logger.info("=" * 60)
@@ -284,14 +320,27 @@ def fetch_all_bilibili_data(video_count=50, delay_between_requests=1.5, fetch_al
                 logger.info(f"请求间隔 {delay:.1f}秒，避免风控 (进度: {idx+1}/{total})")
                 time.sleep(delay)
             
-            if fetch_and_save_up_data(uid, video_count=video_count, fetch_all=fetch_all):
+            if task_progress is not None:
+                task_progress.update(progress=idx, total=total, current=str(uid),
+                                     message=f'正在抓取UP主 {uid} ({idx+1}/{total})...')
+            
+            if fetch_and_save_up_data(uid, video_count=video_count, fetch_all=fetch_all, incremental=incremental):
                 success_count += 1
+                if task_progress is not None:
+                    task_progress.incr('success')
             else:
                 fail_count += 1
+                if task_progress is not None:
+                    task_progress.incr('failed')
                 
         except Exception as e:
             logger.error(f"处理UP主 {uid} 时出错: {e}")
             fail_count += 1
+            if task_progress is not None:
+                task_progress.incr('failed')
+    
+    if task_progress is not None:
+        task_progress.update(progress=total, total=total, message=f'抓取完成！成功: {success_count}, 失败: {fail_count}', force=True)
     
     logger.info("=" * 60)
     logger.info(f"抓取完成！成功: {success_count}, 失败: {fail_count}")
@@ -308,6 +357,7 @@ def main():
     parser.add_argument('--init-db', action='store_true', help='初始化数据库表')
     parser.add_argument('--uid', type=int, help='只抓取指定UID的数据')
     parser.add_argument('--fetch-all', action='store_true', help='抓取所有视频（分页抓取，忽略--video-count）')
+    parser.add_argument('--incremental', action='store_true', help='增量同步：只抓取上次同步之后发布的视频')
     
     args = parser.parse_args()
     
@@ -319,13 +369,15 @@ def main():
     
     # 如果指定了UID，只抓取该UP主
     if args.uid:
-        fetch_and_save_up_data(args.uid, video_count=args.video_count, fetch_all=args.fetch_all)
+        fetch_and_save_up_data(args.uid, video_count=args.video_count, fetch_all=args.fetch_all,
+                               incremental=args.incremental)
     else:
         # 抓取所有UP主
         fetch_all_bilibili_data(
             video_count=args.video_count,
             delay_between_requests=args.delay,
-            fetch_all=args.fetch_all
+            fetch_all=args.fetch_all,
+            incremental=args.incremental
         )
 
 
@@ -17,9 +17,12 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def fetch_and_save_jobs():
+def fetch_and_save_jobs(task_progress=None):
     """
     抓取并保存招聘信息
+
+    Args:
+        task_progress: 任务进度上报器（task_queue.TaskProgress，可选），上报抓取/保存两步及入库/跳过/失败数
     """
     logger.info("=" * 60)
     logger.info("开始抓取招聘信息")
@@ -32,16 +35,28 @@ def fetch_and_save_jobs():
         logger.warning(f"数据库初始化警告: {e}")
     
     # 获取招聘信息
+    if task_progress is not None:
+        task_progress.update(progress=0, total=2, message='正在获取招聘信息...', force=True)
     jobs = fetch_all_jobs()
     
     if not jobs:
         logger.warning("未获取到任何招聘信息")
+        if task_progress is not None:
+            task_progress.update(progress=2, message='未获取到任何招聘信息', force=True)
         return
     
     logger.info(f"获取到 {len(jobs)} 条招聘信息，开始保存...")
+    if task_progress is not None:
+        task_progress.update(progress=1, message=f'获取到 {len(jobs)} 条招聘信息，正在保存...', force=True)
     
     # 批量保存
     stats = batch_save_jobs(jobs)
+    if task_progress is not None:
+        for counter, value in (('saved', stats['created'] + stats['updated']),
+                               ('skipped', stats['skipped']), ('failed', stats['error'])):
+            if value:
+                task_progress.incr(counter, value)
+        task_progress.update(progress=2, message='招聘信息保存完成', force=True)
     
     logger.info("=" * 60)
     logger.info("招聘信息抓取完成")
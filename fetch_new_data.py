@@ -7,13 +7,13 @@ import os
 from daily_arxiv import load_config, demo
 from fetch_news import fetch_and_save_news
 
-def fetch_papers(fetch_status=None, fetch_status_lock=None):
+def fetch_papers(task_progress=None, raise_errors=False):
     """
     抓取新论文
     
     Args:
-        fetch_status: 用于更新抓取进度的字典（可选）
-        fetch_status_lock: 用于线程安全更新的锁（可选）
+        task_progress: 任务进度上报器（task_queue.TaskProgress，可选）
+        raise_errors: 抓取失败时向上抛出（作为后台任务或刷新阶段运行时）
     """
     print("=" * 60)
     print("开始抓取新论文...")
@@ -30,19 +30,13 @@ def fetch_papers(fetch_status=None, fetch_status_lock=None):
     config['publish_wechat'] = False  # 不更新wechat
     
     # 传递进度更新参数（如果提供）
-    if fetch_status is not None:
-        config['fetch_status'] = fetch_status
-        config['fetch_status_lock'] = fetch_status_lock
+    if task_progress is not None:
+        config['task_progress'] = task_progress
         # 设置总数（关键词数量）
         # 注意：load_config 会将 keywords 处理成 kv 键，所以这里使用 kv
         keywords = config.get('kv', {})
-        if fetch_status_lock:
-            with fetch_status_lock:
-                fetch_status['total'] = len(keywords)
-                fetch_status['message'] = f'准备抓取 {len(keywords)} 个类别...'
-        else:
-            fetch_status['total'] = len(keywords)
-            fetch_status['message'] = f'准备抓取 {len(keywords)} 个类别...'
+        task_progress.update(progress=0, total=len(keywords),
+                             message=f'准备抓取 {len(keywords)} 个类别...', force=True)
         print(f"📊 将抓取 {len(keywords)} 个类别的论文")
     
     try:
@@ -52,6 +46,9 @@ def fetch_papers(fetch_status=None, fetch_status_lock=None):
         print(f"❌ 论文抓取失败: {e}")
         import traceback
         traceback.print_exc()
+        # 作为后台任务运行时向上抛出，由任务表记录失败状态
+        if task_progress is not None or raise_errors:
+            raise
 
 def fetch_news():
     """抓取新新闻"""
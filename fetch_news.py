@@ -7,12 +7,9 @@ import logging
 import argparse
 import os
 from sqlalchemy import or_, and_
-from rss_news_client import fetch_all_news as fetch_rss_news
-from news_client import fetch_all_news as fetch_orz_news
-from newsapi_client import fetch_news_from_newsapi
+from news_aggregator import fetch_all_sources, save_feed_cache
 from save_news_to_db import batch_save_news
 from news_models import init_news_db
-from concurrent.futures import ThreadPoolExecutor, as_completed
 
 logging.basicConfig(
     level=logging.INFO,
@@ -22,10 +19,13 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-def fetch_and_save_news():
+def fetch_and_save_news(task_progress=None):
     """
     抓取并保存新闻信息
     只保存24小时内的新闻
+
+    Args:
+        task_progress: 任务进度上报器（task_queue.TaskProgress，可选），上报抓取/筛选/保存三步及入库/跳过/失败数
     """
     logger.info("=" * 60)
     logger.info("开始抓取新闻信息（24小时内）")
@@ -37,86 +37,84 @@ def fetch_and_save_news():
     except Exception as e:
         logger.warning(f"数据库初始化警告: {e}")
     
-    # 获取新闻信息（先抓取，再清理，避免误删新抓取的新闻）
-    # 优先级：RSS源 > NewsAPI.org > Orz.ai API
-    # 优化：并发抓取多个源，提高效率
-    news_list = []
-    
-    # 方案1: 尝试RSS源（最稳定，免费，并发优化）
+    if task_progress is not None:
+        task_progress.update(progress=0, total=3, message='正在抓取新闻源...', force=True)
     try:
-        logger.info("尝试从RSS源获取新闻（并发抓取）...")
-        # 先获取更多新闻，然后再过滤24小时内的
-        # 增加每个源的获取数量，确保有足够的新新闻（优化：并发抓取）
-        all_rss_news = fetch_rss_news(max_per_feed=150, max_workers=5)  # 并发抓取，提高效率
-        # 再次过滤24小时内的新闻（双重保险）
-        from datetime import datetime, timedelta
-        twenty_four_hours_ago = datetime.now() - timedelta(hours=24)
-        filtered_news = [n for n in all_rss_news if n.get('published_at') and n['published_at'] >= twenty_four_hours_ago]
-        if filtered_news:
-            news_list = filtered_news
-            logger.info(f"✅ 从RSS源获取到 {len(news_list)} 条24小时内的新闻（共抓取 {len(all_rss_news)} 条）")
-        else:
-            logger.warning(f"⚠️  RSS源获取到 {len(all_rss_news)} 条新闻，但没有24小时内的新闻")
+        sources = fetch_news_sources()
     except Exception as e:
-        logger.warning(f"RSS源获取失败: {e}")
+        logger.warning(f"并发抓取新闻失败: {e}")
         import traceback
         logger.error(traceback.format_exc())
+        sources = {'rss': [], 'newsapi': [], 'orz': [], 'feed_cache': None}
+    if task_progress is not None:
+        task_progress.update(progress=1, message='正在筛选24小时内的相关新闻...', force=True)
+    news_list = select_recent_news(sources)
+    if task_progress is not None:
+        task_progress.update(progress=2, message=f'筛选出 {len(news_list)} 条新闻，正在保存...', force=True)
+    stats = save_news(news_list, sources.get('feed_cache'))
+    if task_progress is not None:
+        if stats:
+            for counter, value in (('saved', stats['created'] + stats['updated']),
+                                   ('skipped', stats['skipped']), ('failed', stats['error'])):
+                if value:
+                    task_progress.incr(counter, value)
+        task_progress.update(progress=3, message='新闻保存完成', force=True)
+
+
+def fetch_news_sources():
+    """
+    抓取各来源的新闻（所有来源并发抓取，见 news_aggregator）
+
+    Returns:
+        {'rss': [...], 'newsapi': [...], 'orz': [...], 'feed_cache': RSS条件请求校验值或None}
+
+    Raises:
+        RuntimeError: 所有RSS源都抓取失败（网络中断等），由调用方决定是否忽略
+    """
+    sources = fetch_all_sources(max_per_feed=150)
+    if sources['rss_feeds'] and sources['rss_failed'] == sources['rss_feeds']:
+        raise RuntimeError(f"所有RSS源抓取失败（{sources['rss_failed']} 个）")
+    return sources
+
+
+def select_recent_news(sources):
+    """
+    合并各来源的新闻：只保留24小时内、与具身智能相关的新闻，按链接去重
+    合并时保持优先级：RSS源 > NewsAPI.org > Orz.ai API
+    """
+    from datetime import datetime, timedelta
+    twenty_four_hours_ago = datetime.now() - timedelta(hours=24)
+    news_list = []
     
-    # 方案2: 如果RSS没有获取到足够数据（至少30条），尝试NewsAPI.org
-    if len(news_list) < 30:
-        try:
-            logger.info("尝试从NewsAPI.org获取新闻...")
-            # 计算需要补充的数量（目标30条）
-            needed = 30 - len(news_list)
-            newsapi_news = fetch_news_from_newsapi(max_results=max(needed + 20, 80))  # 增加获取数量
-            if newsapi_news:
-                # 过滤24小时内的新闻
-                from datetime import datetime, timedelta
-                twenty_four_hours_ago = datetime.now() - timedelta(hours=24)
-                newsapi_news = [n for n in newsapi_news if n.get('published_at') and n['published_at'] >= twenty_four_hours_ago]
-                
-                # 去重合并
-                existing_links = {news['link'] for news in news_list}
-                added_count = 0
-                for news in newsapi_news:
-                    if news['link'] not in existing_links:
-                        news_list.append(news)
-                        existing_links.add(news['link'])
-                        added_count += 1
-                        # 如果已经达到30条，可以提前停止
-                        if len(news_list) >= 30:
-                            break
-                logger.info(f"✅ 从NewsAPI.org补充 {added_count} 条24小时内的新闻")
-        except Exception as e:
-            logger.warning(f"NewsAPI.org获取失败: {e}")
-    
-    # 方案3: 如果还是没有足够数据，尝试Orz.ai API（最后备选）
-    if len(news_list) < 30:
-        try:
-            logger.info("尝试从Orz.ai API获取新闻...")
-            # 计算需要补充的数量（目标30条）
-            needed = 30 - len(news_list)
-            orz_news = fetch_orz_news(max_per_platform=max(needed // 6 + 10, 30))  # 增加获取数量
-            if orz_news:
-                # 过滤24小时内的新闻
-                from datetime import datetime, timedelta
-                twenty_four_hours_ago = datetime.now() - timedelta(hours=24)
-                orz_news = [n for n in orz_news if n.get('published_at') and n['published_at'] >= twenty_four_hours_ago]
-                
-                # 去重合并
-                existing_links = {news['link'] for news in news_list}
-                added_count = 0
-                for news in orz_news:
-                    if news['link'] not in existing_links:
-                        news_list.append(news)
-                        existing_links.add(news['link'])
-                        added_count += 1
-                        # 如果已经达到30条，可以提前停止
-                        if len(news_list) >= 30:
-                            break
-                logger.info(f"✅ 从Orz.ai API补充 {added_count} 条24小时内的新闻")
-        except Exception as e:
-            logger.warning(f"Orz.ai API获取失败: {e}")
+    # 方案1: RSS源（最稳定，免费）
+    # 再次过滤24小时内的新闻（双重保险）
+    all_rss_news = sources['rss']
+    filtered_news = [n for n in all_rss_news if n.get('published_at') and n['published_at'] >= twenty_four_hours_ago]
+    if filtered_news:
+        news_list = filtered_news
+        logger.info(f"✅ 从RSS源获取到 {len(news_list)} 条24小时内的新闻（共抓取 {len(all_rss_news)} 条）")
+    else:
+        logger.warning(f"⚠️  RSS源获取到 {len(all_rss_news)} 条新闻，但没有24小时内的新闻")
+    
+    # 方案2/3: 如果RSS没有获取到足够数据（至少30条），依次用NewsAPI.org、Orz.ai API补充
+    for source_name, source_key in (('NewsAPI.org', 'newsapi'), ('Orz.ai API', 'orz')):
+        if len(news_list) >= 30:
+            break
+        # 过滤24小时内的新闻
+        candidates = [n for n in sources[source_key] if n.get('published_at') and n['published_at'] >= twenty_four_hours_ago]
+        
+        # 去重合并
+        existing_links = {news['link'] for news in news_list}
+        added_count = 0
+        for news in candidates:
+            if news['link'] not in existing_links:
+                news_list.append(news)
+                existing_links.add(news['link'])
+                added_count += 1
+                # 如果已经达到30条，可以提前停止
+                if len(news_list) >= 30:
+                    break
+        logger.info(f"✅ 从{source_name}补充 {added_count} 条24小时内的新闻")
     
     # 最终检查：确保至少有30条新闻（如果可能）
     if len(news_list) < 30:
@@ -151,16 +149,29 @@ def fetch_and_save_news():
             news['published_at'] = datetime.now()
             final_news_list.append(news)
     
-    news_list = final_news_list
-    
+    return final_news_list
+
+
+def save_news(news_list, feed_cache=None):
+    """
+    保存新闻并清理24小时前的旧新闻（先保存，再清理，避免误删新抓取的新闻）
+
+    Returns:
+        批量保存的统计信息，没有新闻时返回None
+    """
     if not news_list:
         logger.warning("未获取到任何24小时内的新闻信息")
-        return
+        if feed_cache is not None:
+            save_feed_cache(feed_cache)
+        return None
     
     logger.info(f"获取到 {len(news_list)} 条24小时内的新闻，开始保存...")
     
     # 批量保存
     stats = batch_save_news(news_list)
+    # 保存成功后才记录RSS条件请求校验值（否则下次304会漏掉这批新闻）
+    if feed_cache is not None and stats['error'] == 0:
+        save_feed_cache(feed_cache)
     
     # 清理24小时前的旧新闻（在保存新新闻之后，避免误删新抓取的新闻）
     # 这样可以确保新抓取的新闻不会被误删，同时保持数据库整洁
@@ -196,6 +207,7 @@ def fetch_and_save_news():
     logger.info(f"更新: {stats['updated']} 条")
     logger.info(f"跳过: {stats['skipped']} 条")
     logger.info(f"错误: {stats['error']} 条")
+    return stats
 
 
 if __name__ == "__main__":
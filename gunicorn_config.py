@@ -16,11 +16,52 @@ backlog = 2048
 # Worker进程
 # 公式: workers = (2 × CPU核心数) + 1
 workers = multiprocessing.cpu_count() * 2 + 1
-worker_class = "sync"
+# 任务进度推送（/api/task-events，SSE）是长连接，gevent worker 下每个连接只占一个协程；
+# 未安装 gevent 时退回 sync worker，SSE 连接只保持一个长轮询周期。
+# 使用 PostgreSQL 时 gevent worker 还需要 psycogreen：否则每个 psycopg2 查询都会阻塞整个 worker
+try:
+    from dotenv import load_dotenv
+    load_dotenv(os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env'))
+except ImportError:
+    pass
+_database_urls = [os.getenv(name, '') for name in (
+    'DATABASE_URL', 'JOBS_DATABASE_URL', 'NEWS_DATABASE_URL', 'DATASETS_DATABASE_URL',
+    'BILIBILI_DATABASE_URL', 'TASKS_DATABASE_URL')]
+_uses_postgres = any(url.startswith(('postgresql://', 'postgres://')) for url in _database_urls)
+try:
+    import gevent  # noqa: F401
+    if _uses_postgres:
+        import psycogreen  # noqa: F401
+    _default_worker_class = "gevent"
+except ImportError:
+    _default_worker_class = "sync"
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", _default_worker_class)
 worker_connections = 1000
+
+if worker_class == "gevent":
+    # preload_app 会在 fork 前导入应用（requests/ssl 等），需在导入应用之前打补丁
+    from gevent import monkey
+    monkey.patch_all()
+    # psycopg2 的查询改为协作式
+    try:
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+    except ImportError:
+        if _uses_postgres:
+            raise RuntimeError("gevent worker 使用 PostgreSQL 时需要安装 psycogreen（pip install psycogreen），"
+                               "或设置 GUNICORN_WORKER_CLASS=sync")
 timeout = 30
 keepalive = 2
 
+# 请求指标（request_metrics.py）：多 worker 时各 worker 把指标写入同一目录，导出时汇总；
+# 目录需在导入应用（preload_app）之前准备好，并清理上次运行留下的指标文件
+_metrics_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+if _metrics_dir:
+    os.makedirs(_metrics_dir, exist_ok=True)
+    for _name in os.listdir(_metrics_dir):
+        if _name.endswith(".db"):
+            os.remove(os.path.join(_metrics_dir, _name))
+
 # 日志
 # 注意：需要确保日志目录存在且有写权限
 accesslog = "-"  # 输出到stdout
@@ -45,37 +86,43 @@ preload_app = True
 max_requests = 1000
 max_requests_jitter = 50
 
-# Gunicorn启动钩子 - 确保定时任务在应用加载后启动
+# Gunicorn启动钩子 - 应用加载后启动后台任务worker（抓取任务和定时任务不在Web worker中执行）
 def when_ready(server):
     """Gunicorn服务器就绪时调用（所有worker启动后）"""
     import logging
     logger = logging.getLogger('gunicorn.error')
     logger.info("=" * 60)
-    logger.info("Gunicorn服务器已就绪，检查定时任务...")
+    logger.info("Gunicorn服务器已就绪，检查后台任务worker...")
     logger.info("=" * 60)
     
-    # 导入app模块并启动定时任务
+    # 在主进程中拉起 worker.py 子进程（EMBEDDED_WORKER=false 时由独立的 worker 服务负责）
     try:
         from app import init_scheduler
-        scheduler = init_scheduler()
-        if scheduler:
-            logger.info("✅ 定时任务调度器已在Gunicorn启动时初始化")
+        worker_process = init_scheduler()
+        if worker_process:
+            logger.info(f"✅ 后台任务worker已在Gunicorn启动时拉起（pid: {worker_process.pid}）")
         else:
-            logger.info("ℹ️  定时任务未启用（AUTO_FETCH_ENABLED=false）")
+            logger.info("ℹ️  未启动嵌入式worker（EMBEDDED_WORKER=false）")
     except Exception as e:
-        logger.error(f"❌ 启动定时任务失败: {e}")
+        logger.error(f"❌ 启动后台任务worker失败: {e}")
         import traceback
         logger.error(traceback.format_exc())
 
+def child_exit(server, worker):
+    """worker 退出时（含 max_requests 回收）清理其多进程指标文件"""
+    try:
+        from request_metrics import mark_worker_dead
+        mark_worker_dead(worker.pid)
+    except Exception:
+        pass
+
 def on_exit(server):
     """Gunicorn服务器退出时调用"""
     import logging
     logger = logging.getLogger('gunicorn.error')
     try:
-        from app import scheduler
-        if scheduler:
-            scheduler.shutdown()
-            logger.info("定时任务调度器已关闭")
+        from worker import stop_embedded_worker
+        stop_embedded_worker()
+        logger.info("后台任务worker已关闭")
     except:
         pass
-
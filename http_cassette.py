@@ -0,0 +1,605 @@
+#!/usr/bin/env python3
+"""
+外部接口录制/回放（离线测试与性能分析用）
+录制模式下把 arXiv、Semantic Scholar、B站、RSS、GitHub 等接口的真实响应保存到磁盘（gzip 压缩），
+回放模式下按请求确定性地返回录制的响应，不访问外网；回放时可注入延迟和 412/429 等风控错误。
+
+拦截位置（客户端代码无需修改）：
+- requests（HTTPAdapter.send）：semantic_scholar_client、github_jobs_client、NewsAPI/Orz.ai 客户端、arxiv 库
+- aiohttp（ClientSession._request）：news_aggregator 并发抓取 RSS 源
+- urllib（OpenerDirector.open）：rss_news_client.fetch_news_from_rss 中的 feedparser.parse(url)
+- bilibili-api-python：注册基于 requests 的请求客户端，同样经过上面的 requests 拦截
+
+使用方式：
+    # 后台任务：worker 子进程启动时读取环境变量（HTTP_CASSETTE_MODE=record|replay，HTTP_CASSETTE_DIR=...）
+    HTTP_CASSETTE_MODE=record HTTP_CASSETTE_DIR=cassettes python worker.py
+
+    # 命令行：录制/回放一次完整抓取（默认写入临时 SQLite 库，不影响业务库）
+    python http_cassette.py record --target bilibili --dir cassettes
+    python http_cassette.py replay --target bilibili --dir cassettes --latency-ms 80 --fault-rate 0.05 --no-sleep --profile
+
+    # 代码中
+    with use_cassette('cassettes', mode='replay', latency_ms=50):
+        fetch_all_bilibili_data()
+"""
+import argparse
+import asyncio
+import base64
+import email.message
+import gzip
+import hashlib
+import http.client
+import io
+import json
+import logging
+import os
+import random
+import threading
+import time
+import urllib.error
+import urllib.request
+import urllib.response
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from urllib.parse import urlsplit, parse_qsl, urlencode
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+MODE_RECORD = 'record'
+MODE_REPLAY = 'replay'
+
+# 每次请求都会变化的查询参数（B站 WBI 签名、时间戳等），不参与请求匹配
+IGNORED_QUERY_PARAMS = {'wts', 'w_rid', '_', 't', 'ts', 'timestamp', 'dm_img_list', 'dm_img_str', 'dm_cover_img_str'}
+
+# 不写入录制文件的响应头（body 已解压保存 / 可能包含会话信息）
+_DROPPED_RESPONSE_HEADERS = {'set-cookie', 'content-encoding', 'content-length', 'transfer-encoding'}
+
+# 注入延迟使用真实的 sleep（--no-sleep 只跳过客户端自身的限速等待）
+_real_sleep = time.sleep
+
+
+class CassetteMissError(Exception):
+    """回放模式下没有找到录制的响应"""
+
+
+class CassetteUnsupportedError(NotImplementedError):
+    """录制/回放模式不支持的操作（bilibili-api 的文件下载和 WebSocket 只能访问真实网络）"""
+
+
+class Cassette:
+    """
+    录制目录及回放状态
+
+    录制文件：<dir>/<host>/<请求哈希>.json.gz，内容为请求信息和按顺序录制的响应列表；
+    同一请求回放多次时按录制顺序返回，超出后重复最后一个响应
+    """
+
+    def __init__(self, cassette_dir: str, mode: str = MODE_REPLAY, latency_ms=0,
+                 fault_rate: float = 0.0, fault_status: int = 412, seed: int = 0):
+        """
+        Args:
+            cassette_dir: 录制目录
+            mode: record / replay
+            latency_ms: 回放时每个请求的延迟（毫秒），'recorded' 表示使用录制时的实际耗时
+            fault_rate: 回放时注入错误响应的比例（0-1）
+            fault_status: 注入的错误状态码（B站风控为412，限流为429）
+            seed: 错误注入的随机种子（相同种子注入位置相同）
+        """
+        if mode not in (MODE_RECORD, MODE_REPLAY):
+            raise ValueError(f"未知的录制模式: {mode}")
+        self.dir = cassette_dir
+        self.mode = mode
+        self.latency_ms = latency_ms
+        self.fault_rate = fault_rate
+        self.fault_status = fault_status
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._replay_index: Dict[str, int] = {}
+        self._recorded_this_run = set()
+        self._cache: Dict[str, dict] = {}
+        self.stats = {'recorded': 0, 'replayed': 0, 'missed': 0, 'injected_faults': 0}
+
+    # ==================== 请求匹配 ====================
+
+    @staticmethod
+    def request_key(transport: str, method: str, url: str, body=None) -> str:
+        parts = urlsplit(url)
+        query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                       if k not in IGNORED_QUERY_PARAMS)
+        normalized = f"{transport} {method.upper()} {parts.scheme}://{parts.netloc}{parts.path}?{urlencode(query)}"
+        if body:
+            if isinstance(body, str):
+                body = body.encode('utf-8')
+            normalized += ' ' + hashlib.sha1(body).hexdigest()
+        return normalized
+
+    def _path(self, key: str, url: str) -> str:
+        host = urlsplit(url).netloc.replace(':', '_') or 'unknown'
+        return os.path.join(self.dir, host, hashlib.sha1(key.encode('utf-8')).hexdigest()[:20] + '.json.gz')
+
+    def _load(self, path: str) -> Optional[dict]:
+        if path in self._cache:
+            return self._cache[path]
+        if not os.path.exists(path):
+            return None
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            entry = json.load(f)
+        self._cache[path] = entry
+        return entry
+
+    # ==================== 录制 ====================
+
+    def record(self, transport: str, method: str, url: str, body, status: int,
+               headers: Dict[str, str], content: bytes, elapsed_ms: float):
+        key = self.request_key(transport, method, url, body)
+        path = self._path(key, url)
+        # requests/aiohttp 已解压 body，去掉编码相关的头；urllib 保存原始 body（feedparser 自行解压），只去掉 Set-Cookie
+        dropped = _DROPPED_RESPONSE_HEADERS if transport in ('requests', 'aiohttp') else {'set-cookie'}
+        response = {
+            'status': status,
+            'headers': {k: v for k, v in headers.items() if k.lower() not in dropped},
+            'body': base64.b64encode(content or b'').decode('ascii'),
+            'elapsed_ms': round(elapsed_ms, 1),
+            'recorded_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        with self._lock:
+            # 本次运行第一次录制该请求时覆盖旧录制，之后按顺序追加（同一请求多次调用）
+            entry = None if key not in self._recorded_this_run else self._load(path)
+            if entry is None:
+                entry = {'request': {'transport': transport, 'method': method.upper(), 'url': url, 'key': key},
+                         'responses': []}
+            entry['responses'].append(response)
+            self._recorded_this_run.add(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with gzip.open(path, 'wt', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            self._cache[path] = entry
+            self.stats['recorded'] += 1
+
+    # ==================== 回放 ====================
+
+    def replay(self, transport: str, method: str, url: str, body) -> dict:
+        """返回录制的响应（status/headers/content/elapsed_ms），可能是注入的错误响应"""
+        key = self.request_key(transport, method, url, body)
+        with self._lock:
+            if self.fault_rate and self._rng.random() < self.fault_rate:
+                self.stats['injected_faults'] += 1
+                response = self._fault_response()
+            else:
+                entry = self._load(self._path(key, url))
+                if entry is None or not entry['responses']:
+                    self.stats['missed'] += 1
+                    raise CassetteMissError(f"没有录制的响应: {key}")
+                index = self._replay_index.get(key, 0)
+                self._replay_index[key] = index + 1
+                recorded = entry['responses'][min(index, len(entry['responses']) - 1)]
+                response = {
+                    'status': recorded['status'],
+                    'headers': recorded['headers'],
+                    'content': base64.b64decode(recorded['body']),
+                    'elapsed_ms': recorded.get('elapsed_ms', 0),
+                }
+                self.stats['replayed'] += 1
+        delay_ms = response['elapsed_ms'] if self.latency_ms == 'recorded' else float(self.latency_ms or 0)
+        if delay_ms > 0:
+            _real_sleep(delay_ms / 1000)
+        return response
+
+    def _fault_response(self) -> dict:
+        body = json.dumps({'code': -self.fault_status, 'message': '回放注入的错误响应'}).encode('utf-8')
+        return {
+            'status': self.fault_status,
+            'headers': {'Content-Type': 'application/json; charset=utf-8'},
+            'content': body,
+            'elapsed_ms': 0,
+        }
+
+
+# ==================== requests ====================
+
+def _patch_requests(cassette: Cassette):
+    import requests
+    from requests.adapters import HTTPAdapter
+    from requests.structures import CaseInsensitiveDict
+    from requests.utils import get_encoding_from_headers
+
+    original_send = HTTPAdapter.send
+
+    def send(adapter, request, *args, **kwargs):
+        if cassette.mode == MODE_RECORD:
+            started = time.perf_counter()
+            response = original_send(adapter, request, *args, **kwargs)
+            content = response.content  # 读取完整响应（stream=True 时后续 iter_content 复用已读取的内容）
+            cassette.record('requests', request.method, request.url, request.body, response.status_code,
+                            dict(response.headers), content, (time.perf_counter() - started) * 1000)
+            return response
+
+        try:
+            recorded = cassette.replay('requests', request.method, request.url, request.body)
+        except CassetteMissError as e:
+            # 作为连接错误抛出，客户端按网络失败处理
+            raise requests.exceptions.ConnectionError(str(e), request=request)
+        response = requests.Response()
+        response.status_code = recorded['status']
+        response.reason = http.client.responses.get(recorded['status'], '')
+        response.headers = CaseInsensitiveDict(recorded['headers'])
+        response._content = recorded['content']
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = adapter
+        response.elapsed = timedelta(milliseconds=recorded['elapsed_ms'])
+        return response
+
+    HTTPAdapter.send = send
+    return lambda: setattr(HTTPAdapter, 'send', original_send)
+
+
+# ==================== aiohttp（news_aggregator） ====================
+
+class _ReplayedAiohttpResponse:
+    """回放的 aiohttp 响应（支持 async with、status/headers/read/text/json 等常用接口）"""
+
+    def __init__(self, url, method: str, recorded: dict):
+        from multidict import CIMultiDict, CIMultiDictProxy
+        from yarl import URL
+        self.url = URL(url)
+        self.method = method
+        self.status = recorded['status']
+        self.reason = http.client.responses.get(self.status, '')
+        self.headers = CIMultiDictProxy(CIMultiDict(recorded['headers']))
+        self._body = recorded['content']
+
+    @property
+    def ok(self) -> bool:
+        return self.status < 400
+
+    @property
+    def content_type(self) -> str:
+        return self.headers.get('Content-Type', 'application/octet-stream').split(';')[0].strip()
+
+    @property
+    def charset(self) -> Optional[str]:
+        message = email.message.Message()
+        message['Content-Type'] = self.headers.get('Content-Type', '')
+        return message.get_param('charset')
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self, encoding: Optional[str] = None, errors: str = 'strict') -> str:
+        return self._body.decode(encoding or self.charset or 'utf-8', errors)
+
+    async def json(self, *, encoding: Optional[str] = None, loads=json.loads, content_type=None):
+        return loads(await self.text(encoding))
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            import aiohttp
+            raise aiohttp.ClientResponseError(None, (), status=self.status, message=self.reason,
+                                              headers=self.headers)
+
+    def release(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    async def wait_for_close(self) -> None:
+        pass
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+def _patch_aiohttp(cassette: Cassette):
+    """拦截 aiohttp.ClientSession 的所有请求（session.get/post/request 都经过 _request），未安装时跳过"""
+    try:
+        import aiohttp
+        from yarl import URL
+    except ImportError:
+        return lambda: None
+
+    original_request = aiohttp.ClientSession._request
+
+    async def _request(session, method, str_or_url, *args, params=None, **kwargs):
+        url = URL(str(str_or_url))
+        if params:
+            url = url.extend_query(params)
+        data = kwargs.get('data')
+        body = data if isinstance(data, (bytes, str)) else None
+        if kwargs.get('json') is not None:
+            body = json.dumps(kwargs['json'], sort_keys=True)
+
+        if cassette.mode == MODE_RECORD:
+            started = time.perf_counter()
+            response = await original_request(session, method, url, *args, **kwargs)
+            content = await response.read()  # 读取完整响应（之后 read/text 复用已读取的内容）
+            cassette.record('aiohttp', method, str(url), body, response.status,
+                            dict(response.headers), content, (time.perf_counter() - started) * 1000)
+            return response
+
+        try:
+            recorded = await asyncio.to_thread(cassette.replay, 'aiohttp', method, str(url), body)
+        except CassetteMissError as e:
+            # 作为连接错误抛出，客户端按网络失败处理
+            raise aiohttp.ClientConnectionError(str(e))
+        return _ReplayedAiohttpResponse(url, method, recorded)
+
+    aiohttp.ClientSession._request = _request
+    return lambda: setattr(aiohttp.ClientSession, '_request', original_request)
+
+
+# ==================== urllib（rss_news_client 兜底） ====================
+
+def _patch_urllib(cassette: Cassette):
+    original_open = urllib.request.OpenerDirector.open
+
+    def open_(opener, fullurl, data=None, *args, **kwargs):
+        if isinstance(fullurl, str):
+            request = urllib.request.Request(fullurl, data=data)
+        else:
+            request = fullurl
+            if data is not None:
+                request.data = data
+        url, method = request.full_url, request.get_method()
+        if not url.startswith(('http://', 'https://')):
+            return original_open(opener, fullurl, data, *args, **kwargs)
+
+        if cassette.mode == MODE_RECORD:
+            started = time.perf_counter()
+            try:
+                response = original_open(opener, request, None, *args, **kwargs)
+                status, headers, content = response.status, response.headers, response.read()
+                final_url = response.geturl()
+            except urllib.error.HTTPError as e:
+                status, headers, content, final_url = e.code, e.headers, e.read(), url
+                cassette.record('urllib', method, url, request.data, status, dict(headers.items()), content,
+                                (time.perf_counter() - started) * 1000)
+                raise urllib.error.HTTPError(url, status, e.msg, headers, io.BytesIO(content))
+            cassette.record('urllib', method, url, request.data, status, dict(headers.items()), content,
+                            (time.perf_counter() - started) * 1000)
+            return urllib.response.addinfourl(io.BytesIO(content), headers, final_url, status)
+
+        try:
+            recorded = cassette.replay('urllib', method, url, request.data)
+        except CassetteMissError as e:
+            raise urllib.error.URLError(str(e))
+        headers = email.message.Message()
+        for name, value in recorded['headers'].items():
+            headers[name] = value
+        if recorded['status'] >= 400:
+            raise urllib.error.HTTPError(url, recorded['status'], http.client.responses.get(recorded['status'], ''),
+                                         headers, io.BytesIO(recorded['content']))
+        return urllib.response.addinfourl(io.BytesIO(recorded['content']), headers, url, recorded['status'])
+
+    urllib.request.OpenerDirector.open = open_
+    return lambda: setattr(urllib.request.OpenerDirector, 'open', original_open)
+
+
+# ==================== bilibili-api-python ====================
+
+def _patch_bilibili_api():
+    """把 bilibili-api-python 的请求客户端切换为 requests（经过 requests 拦截），未安装时跳过"""
+    try:
+        from bilibili_api.utils import network
+        from bilibili_api.utils.network import BiliAPIClient, BiliAPIResponse
+    except ImportError:
+        return lambda: None
+
+    import asyncio
+    import requests
+
+    class RequestsBiliClient(BiliAPIClient):
+        """基于 requests 的 bilibili-api 请求客户端（仅支持普通请求，不支持下载和 WebSocket）"""
+
+        def __init__(self, proxy: str = "", timeout: float = 0.0, verify_ssl: bool = True,
+                     trust_env: bool = True, session: Optional[object] = None) -> None:
+            self._session = session or requests.Session()
+            self._session.trust_env = trust_env
+            self._session.verify = verify_ssl
+            self._timeout = timeout or None
+            self.set_proxy(proxy)
+
+        def get_wrapped_session(self):
+            return self._session
+
+        def set_timeout(self, timeout: float = 0.0) -> None:
+            self._timeout = timeout or None
+
+        def set_proxy(self, proxy: str = "") -> None:
+            self._session.proxies = {'http': proxy, 'https': proxy} if proxy else {}
+
+        def set_verify_ssl(self, verify_ssl: bool = True) -> None:
+            self._session.verify = verify_ssl
+
+        def set_trust_env(self, trust_env: bool = True) -> None:
+            self._session.trust_env = trust_env
+
+        async def request(self, method: str = "", url: str = "", params: dict = {}, data=None,
+                          files: dict = {}, headers: dict = {}, cookies: dict = {},
+                          allow_redirects: bool = True) -> BiliAPIResponse:
+            resp = await asyncio.to_thread(
+                self._session.request, method, url, params=params, data=data or None, headers=headers,
+                cookies=cookies, allow_redirects=allow_redirects, timeout=self._timeout,
+            )
+            return BiliAPIResponse(code=resp.status_code, headers=dict(resp.headers),
+                                   cookies=resp.cookies.get_dict(), raw=resp.content, url=resp.url)
+
+        def _unsupported_sync(self, *args, **kwargs):
+            raise CassetteUnsupportedError('录制/回放模式只支持普通请求，不支持下载和 WebSocket')
+
+        async def _unsupported(self, *args, **kwargs):
+            self._unsupported_sync()
+
+        download_create = download_chunk = download_close = _unsupported
+        ws_create = ws_send = ws_recv = ws_close = _unsupported
+        download_content_length = _unsupported_sync
+
+        async def close(self):
+            self._session.close()
+
+    previous = network.selected_client
+    network.register_client('cassette', RequestsBiliClient)
+
+    def restore():
+        if previous:
+            network.select_client(previous)
+        network.unregister_client('cassette')
+    return restore
+
+
+# ==================== 安装/卸载 ====================
+
+_active: Optional[Cassette] = None
+_restore_callbacks = []
+
+
+def install(cassette: Cassette) -> Cassette:
+    """全局启用录制/回放（同一时间只能有一个）"""
+    global _active
+    if _active is not None:
+        raise RuntimeError('已启用录制/回放，请先调用 uninstall()')
+    _restore_callbacks.extend([_patch_requests(cassette), _patch_aiohttp(cassette), _patch_urllib(cassette),
+                               _patch_bilibili_api()])
+    _active = cassette
+    logger.info(f"📼 外部接口{'录制' if cassette.mode == MODE_RECORD else '回放'}已启用: {cassette.dir}")
+    return cassette
+
+
+def uninstall():
+    """恢复真实网络请求"""
+    global _active
+    while _restore_callbacks:
+        _restore_callbacks.pop()()
+    if _active is not None:
+        logger.info(f"📼 录制/回放结束: {_active.stats}")
+    _active = None
+
+
+@contextmanager
+def use_cassette(cassette_dir: str, mode: str = MODE_REPLAY, **options):
+    """在代码块内启用录制/回放（options 见 Cassette）"""
+    cassette = install(Cassette(cassette_dir, mode, **options))
+    try:
+        yield cassette
+    finally:
+        uninstall()
+
+
+def install_from_env() -> Optional[Cassette]:
+    """
+    按环境变量启用（worker 任务子进程启动时调用），未设置 HTTP_CASSETTE_MODE 时不做任何事
+
+    HTTP_CASSETTE_MODE=record|replay、HTTP_CASSETTE_DIR（默认 ./cassettes）、
+    HTTP_REPLAY_LATENCY_MS（数字或 recorded）、HTTP_REPLAY_FAULT_RATE、HTTP_REPLAY_FAULT_STATUS
+    """
+    mode = os.getenv('HTTP_CASSETTE_MODE', '').lower()
+    if not mode or _active is not None:
+        return None
+    latency = os.getenv('HTTP_REPLAY_LATENCY_MS', '0')
+    return install(Cassette(
+        os.getenv('HTTP_CASSETTE_DIR', os.path.join(BASE_DIR, 'cassettes')),
+        mode=mode,
+        latency_ms=latency if latency == 'recorded' else float(latency),
+        fault_rate=float(os.getenv('HTTP_REPLAY_FAULT_RATE', '0')),
+        fault_status=int(os.getenv('HTTP_REPLAY_FAULT_STATUS', '412')),
+    ))
+
+
+# ==================== 命令行：录制/回放一次完整抓取 ====================
+
+def _run_target(target: str, limit: int):
+    if target == 'papers':
+        from fetch_new_data import fetch_papers
+        fetch_papers()
+    elif target == 'bilibili':
+        from fetch_bilibili_data import fetch_all_bilibili_data
+        fetch_all_bilibili_data()
+    elif target == 'news':
+        from fetch_news import fetch_and_save_news
+        fetch_and_save_news()
+    elif target == 'jobs':
+        from fetch_jobs import fetch_and_save_jobs
+        fetch_and_save_jobs()
+    elif target == 'semantic':
+        from update_semantic_scholar_data import update_all_papers
+        update_all_papers(limit=limit, skip_existing=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='录制/回放一次完整抓取，用于离线测试和性能分析')
+    parser.add_argument('mode', choices=[MODE_RECORD, MODE_REPLAY])
+    parser.add_argument('--target', required=True, choices=['papers', 'bilibili', 'news', 'jobs', 'semantic'])
+    parser.add_argument('--dir', default=os.path.join(BASE_DIR, 'cassettes'), help='录制目录')
+    parser.add_argument('--db-url', help='抓取结果写入的数据库（默认临时 SQLite 库）')
+    parser.add_argument('--limit', type=int, default=50, help='semantic：更新的论文数量')
+    parser.add_argument('--latency-ms', default='0', help='回放延迟（毫秒），recorded 表示使用录制时的耗时')
+    parser.add_argument('--fault-rate', type=float, default=0.0, help='回放时注入错误响应的比例（0-1）')
+    parser.add_argument('--fault-status', type=int, default=412, help='注入的错误状态码')
+    parser.add_argument('--seed', type=int, default=0, help='错误注入的随机种子')
+    parser.add_argument('--no-sleep', action='store_true', help='回放时跳过客户端自身的限速等待（time.sleep）')
+    parser.add_argument('--profile', action='store_true', help='用 cProfile 分析并打印耗时最多的函数')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(name)s: %(message)s')
+    cassette_dir = os.path.abspath(args.dir)
+
+    import shutil
+    import tempfile
+    from benchmark import configure_database, create_tables
+
+    # 抓取代码按相对路径读写 config.yaml 和 docs/*.json，在临时目录中运行，不改动仓库文件
+    work_dir = tempfile.mkdtemp(prefix='embodiedpulse_cassette_')
+    temp_db_dir = configure_database(args.db_url)
+    shutil.copy(os.path.join(BASE_DIR, 'config.yaml'), work_dir)
+    shutil.copytree(os.path.join(BASE_DIR, 'docs'), os.path.join(work_dir, 'docs'))
+    os.chdir(work_dir)
+
+    skipped_sleep = [0.0]
+    original_sleep = time.sleep
+    if args.no_sleep and args.mode == MODE_REPLAY:
+        def no_sleep(seconds):
+            skipped_sleep[0] += seconds
+        time.sleep = no_sleep
+
+    profiler = None
+    started = time.perf_counter()
+    try:
+        create_tables()
+        with use_cassette(cassette_dir, args.mode,
+                          latency_ms=args.latency_ms if args.latency_ms == 'recorded' else float(args.latency_ms),
+                          fault_rate=args.fault_rate, fault_status=args.fault_status, seed=args.seed) as cassette:
+            if args.profile:
+                import cProfile
+                profiler = cProfile.Profile()
+                profiler.runcall(_run_target, args.target, args.limit)
+            else:
+                _run_target(args.target, args.limit)
+        elapsed = time.perf_counter() - started
+    finally:
+        time.sleep = original_sleep
+        os.chdir(BASE_DIR)
+        shutil.rmtree(work_dir, ignore_errors=True)
+        if temp_db_dir:
+            shutil.rmtree(temp_db_dir, ignore_errors=True)
+
+    print("=" * 60)
+    print(f"{args.target} {args.mode} 完成，耗时 {elapsed:.1f}s")
+    print(f"请求统计: {cassette.stats}")
+    if skipped_sleep[0]:
+        print(f"跳过的客户端等待: {skipped_sleep[0]:.1f}s")
+    print("=" * 60)
+    if profiler is not None:
+        import pstats
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(30)
+
+
+if __name__ == '__main__':
+    main()
@@ -7,6 +7,7 @@ from jobs_models import init_jobs_db
 from news_models import init_news_db
 from datasets_models import init_datasets_db
 from bilibili_models import init_bilibili_db
+from task_models import init_tasks_db
 from migrate_json_to_db import migrate_json_to_database
 
 if __name__ == '__main__':
@@ -26,6 +27,40 @@ if __name__ == '__main__':
     init_datasets_db()
     print("   - B站视频数据库...")
     init_bilibili_db()
+    print("   - 后台任务表...")
+    init_tasks_db()
+    
+    # 已有表的增量字段迁移（create_all不会给已有表加列）
+    print("   - 招聘信息 update_day 字段迁移...")
+    try:
+        from migrate_add_job_update_day import migrate_database as migrate_jobs_update_day
+        migrate_jobs_update_day()
+    except Exception as e:
+        print(f"   招聘信息字段迁移失败: {e}")
+    print("   - 新闻/招聘信息去重列与唯一索引迁移...")
+    try:
+        from migrate_add_dedup_keys import migrate_database as migrate_dedup_keys
+        migrate_dedup_keys()
+    except Exception as e:
+        print(f"   去重列迁移失败: {e}")
+    print("   - 后台任务进度与心跳字段迁移...")
+    try:
+        from migrate_add_task_progress import migrate_database as migrate_task_progress
+        migrate_task_progress()
+    except Exception as e:
+        print(f"   任务表字段迁移失败: {e}")
+    print("   - 论文作者索引 paper_authors 回填...")
+    try:
+        from migrate_add_paper_authors import migrate_database as migrate_paper_authors
+        migrate_paper_authors()
+    except Exception as e:
+        print(f"   论文作者索引迁移失败: {e}")
+    print("   - B站UP主增量同步水位字段迁移...")
+    try:
+        from migrate_add_bilibili_sync_watermark import migrate_database as migrate_bilibili_watermark
+        migrate_bilibili_watermark()
+    except Exception as e:
+        print(f"   B站同步水位字段迁移失败: {e}")
     
     # 2. 迁移JSON数据到数据库（仅论文数据库）
     print("\n2. 迁移JSON数据到数据库...")
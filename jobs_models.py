@@ -2,14 +2,34 @@
 招聘信息数据库模型定义
 使用独立的数据库，不与论文数据库混在一起
 """
-from sqlalchemy import create_engine, Column, String, Text, DateTime, Index, Integer
+from sqlalchemy import create_engine, Column, String, Text, Date, DateTime, Index, Integer, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from datetime import datetime
+from datetime import datetime, date
+from typing import Optional
 import os
 
 Base = declarative_base()
 
+
+def parse_update_date(date_str: Optional[str]) -> Optional[date]:
+    """
+    将GitHub源中的日期字符串（如"2025.9.8"）解析为date
+
+    Returns:
+        解析成功返回date，格式不合法返回None
+    """
+    if not date_str:
+        return None
+    try:
+        parts = date_str.strip().split('.')
+        if len(parts) != 3:
+            return None
+        return date(int(parts[0]), int(parts[1]), int(parts[2]))
+    except (ValueError, AttributeError):
+        return None
+
+
 class Job(Base):
     """招聘信息模型"""
     __tablename__ = 'jobs'
@@ -18,8 +38,11 @@ class Job(Base):
     title = Column(Text, nullable=False)  # 招聘标题（公司/机构 - 职位描述）
     description = Column(Text)  # 详细描述
     link = Column(String)  # 链接URL
+    canonical_link = Column(String, default='')  # 规范化链接（去重用，无链接时为空字符串）
+    title_hash = Column(String(40))  # 规范化标题SHA1（去重用）
     update_date = Column(String)  # 更新日期（从GitHub提取，如2025.12.7）
-    source_date = Column(String)  # 数据源中的日期字符串
+    update_day = Column(Date)  # 更新日期（由update_date解析，用于SQL排序）
+    source_date = Column(String, default='')  # 数据源中的日期字符串（去重键的一部分，没有日期时为空字符串而不是NULL）
     company = Column(String)  # 公司/机构名称
     location = Column(String)  # 地点
     job_type = Column(String)  # 职位类型（PhD/PostDoc/Intern/FullTime等）
@@ -29,10 +52,18 @@ class Job(Base):
     # 索引
     __table_args__ = (
         Index('idx_update_date', 'update_date'),
+        Index('idx_jobs_update_day', 'update_day'),
         Index('idx_company', 'company'),
         Index('idx_job_type', 'job_type'),
         Index('idx_link', 'link'),
         Index('idx_created_at', 'created_at'),
+        # 去重唯一索引（与 save_job_to_db 的去重策略一致）：
+        # 有链接时按 链接+日期 唯一，没有链接时按 标题+日期 唯一
+        # （唯一索引中 NULL 互不相等，source_date 写入时以空字符串代替 NULL，见 save_jobs_to_db._job_row）
+        Index('uq_jobs_canonical_link_source_date', 'canonical_link', 'source_date', unique=True,
+              sqlite_where=text("canonical_link != ''"), postgresql_where=text("canonical_link != ''")),
+        Index('uq_jobs_title_hash_source_date', 'title_hash', 'source_date', unique=True,
+              sqlite_where=text("canonical_link = ''"), postgresql_where=text("canonical_link = ''")),
     )
     
     def to_dict(self):
@@ -51,6 +82,10 @@ class Job(Base):
             'updated_at': self.updated_at.strftime('%Y-%m-%d %H:%M:%S') if self.updated_at else ''
         }
 
+# 冲突目标（供 INSERT ... ON CONFLICT 使用，需与上面的部分唯一索引一致）
+JOB_LINK_CONFLICT = (['canonical_link', 'source_date'], text("canonical_link != ''"))
+JOB_TITLE_CONFLICT = (['title_hash', 'source_date'], text("canonical_link = ''"))
+
 # 招聘信息数据库配置（独立数据库）
 # 支持PostgreSQL和SQLite
 # 如果使用PostgreSQL，可以通过JOBS_DATABASE_URL指定独立数据库
@@ -79,7 +79,7 @@ class JWTManager:
         """
         try:
             payload = jwt.decode(token, self.secret_key, algorithms=[self.algorithm])
-            logger.info(f"JWT token验证成功 - user_id: {payload.get('user_id')}")
+            logger.debug(f"JWT token验证成功 - user_id: {payload.get('user_id')}")
             return payload
             
         except jwt.ExpiredSignatureError:
@@ -0,0 +1,174 @@
+"""
+定时任务调度器的领导者选举
+多个 worker（多容器/多节点）同时运行时，只有领导者的 APScheduler 触发定时任务，
+避免论文/新闻/招聘/B站抓取被重复执行 N 次。
+
+- PostgreSQL：会话级 advisory lock（pg_try_advisory_lock），持有锁的连接断开即自动释放；
+  锁使用不经过连接池的专用连接（连接池回收连接时不会释放会话级锁）
+- SQLite 等：scheduler_leases 表中的租约行，领导者定期续约，租约过期后其他节点接管
+"""
+import logging
+import os
+import uuid
+import zlib
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.pool import NullPool
+
+from task_models import get_tasks_engine, get_tasks_session, SchedulerLease
+
+logger = logging.getLogger(__name__)
+
+# 租约有效期（秒），领导者宕机后最长经过该时间由其他节点接管
+SCHEDULER_LEASE_SECONDS = int(os.getenv('SCHEDULER_LEASE_SECONDS', '60'))
+
+
+class LeaderElection:
+    """
+    基于任务表数据库的领导者选举
+
+    用法：worker 主循环定期调用 refresh()，返回值表示当前是否为领导者；
+    退出时调用 release() 让其他节点立即接管
+    """
+
+    def __init__(self, holder: str, name: str = 'scheduler', lease_seconds: int = None):
+        # 附加随机后缀：容器重启后主机名:进程号可能与旧租约相同，不能直接续约旧租约
+        self.holder = f"{holder}:{uuid.uuid4().hex[:8]}"
+        self.name = name
+        self.lease_seconds = lease_seconds or SCHEDULER_LEASE_SECONDS
+        self.is_leader = False
+        self._engine = get_tasks_engine()
+        self._use_advisory_lock = self._engine.dialect.name == 'postgresql'
+        # advisory lock 所在的专用连接：NullPool 下 close() 真正断开连接，锁随之释放；
+        # 若使用共享连接池，close() 只把连接（连同锁）还给连接池，其他节点再也无法成为领导者
+        self._lock_engine = create_engine(self._engine.url, poolclass=NullPool) if self._use_advisory_lock else None
+        self._lock_conn = None
+
+    @property
+    def renew_interval(self) -> float:
+        """续约间隔（租约有效期的三分之一，允许连续两次续约失败）"""
+        return self.lease_seconds / 3
+
+    def refresh(self) -> bool:
+        """尝试取得或续约领导权，返回当前是否为领导者（数据库异常时视为失去领导权）"""
+        try:
+            if self._use_advisory_lock:
+                leader = self._refresh_advisory_lock()
+            else:
+                leader = self._refresh_lease()
+        except Exception as e:
+            logger.error(f"领导者选举失败（{self.name}）: {e}")
+            self._close_lock_conn()
+            leader = False
+
+        if leader and not self.is_leader:
+            logger.info(f"✅ {self.holder} 成为 {self.name} 领导者")
+        elif not leader and self.is_leader:
+            logger.warning(f"⚠️  {self.holder} 失去 {self.name} 领导权")
+        self.is_leader = leader
+        return leader
+
+    def release(self):
+        """主动释放领导权"""
+        try:
+            if self._use_advisory_lock:
+                if self._lock_conn is not None:
+                    self._lock_conn.execute(text("SELECT pg_advisory_unlock(:key)"), {'key': self._lock_key()})
+                    self._lock_conn.commit()
+            elif self.is_leader:
+                session = get_tasks_session()
+                try:
+                    session.query(SchedulerLease).filter(
+                        SchedulerLease.name == self.name,
+                        SchedulerLease.holder == self.holder
+                    ).update({'expires_at': datetime.now()}, synchronize_session=False)
+                    session.commit()
+                finally:
+                    session.close()
+        except Exception as e:
+            logger.error(f"释放领导权失败（{self.name}）: {e}")
+        finally:
+            self._close_lock_conn()
+            if self.is_leader:
+                logger.info(f"{self.holder} 已释放 {self.name} 领导权")
+            self.is_leader = False
+
+    # ==================== PostgreSQL advisory lock ====================
+
+    def _lock_key(self) -> int:
+        return zlib.crc32(f"embodiedpulse:{self.name}".encode('utf-8'))
+
+    def _refresh_advisory_lock(self) -> bool:
+        if self._lock_conn is not None:
+            # 已持有锁：确认连接仍然存活（连接断开时锁已被数据库释放）
+            self._lock_conn.execute(text("SELECT 1"))
+            self._lock_conn.commit()
+            return True
+        conn = self._lock_engine.connect()
+        # 会话级锁不随事务结束释放，提交以免连接长期处于 idle in transaction
+        acquired = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {'key': self._lock_key()}).scalar()
+        conn.commit()
+        if acquired:
+            self._lock_conn = conn
+            return True
+        conn.close()
+        return False
+
+    def _close_lock_conn(self):
+        if self._lock_conn is not None:
+            try:
+                self._lock_conn.close()
+            except Exception:
+                pass
+            self._lock_conn = None
+
+    # ==================== 租约行 ====================
+
+    def _refresh_lease(self) -> bool:
+        now = datetime.now()
+        expires_at = now + timedelta(seconds=self.lease_seconds)
+        session = get_tasks_session()
+        try:
+            # 续约自己的租约，或接管已过期的租约（单条UPDATE，多个节点同时接管时只有一个成功）
+            lease = session.query(SchedulerLease).filter(SchedulerLease.name == self.name).first()
+            if lease is None:
+                session.add(SchedulerLease(
+                    name=self.name, holder=self.holder,
+                    expires_at=expires_at, acquired_at=now, renewed_at=now
+                ))
+                try:
+                    session.commit()
+                    return True
+                except IntegrityError:
+                    session.rollback()
+                    return False
+
+            values = {'holder': self.holder, 'expires_at': expires_at, 'renewed_at': now}
+            if lease.holder != self.holder:
+                values['acquired_at'] = now
+            updated = session.query(SchedulerLease).filter(
+                SchedulerLease.name == self.name,
+                (SchedulerLease.holder == self.holder) | (SchedulerLease.expires_at < now)
+            ).update(values, synchronize_session=False)
+            session.commit()
+            return updated == 1
+        except Exception:
+            session.rollback()
+            raise
+        finally:
+            session.close()
+
+
+def get_current_leader(name: str = 'scheduler') -> Optional[dict]:
+    """查询当前租约（仅租约行方式有效，PostgreSQL advisory lock 不落表）"""
+    session = get_tasks_session()
+    try:
+        lease = session.query(SchedulerLease).filter(SchedulerLease.name == name).first()
+        if lease is None or lease.expires_at < datetime.now():
+            return None
+        return lease.to_dict()
+    finally:
+        session.close()
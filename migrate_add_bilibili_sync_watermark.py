@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+数据库迁移脚本：为B站UP主表添加 latest_pubdate_raw（增量同步水位）字段并回填
+定时抓取原本每次都请求每个UP主最新50个视频；有了水位后只翻页到上次同步的最新视频，
+大多数UP主每次只需一页请求（见 fetch_bilibili_data.fetch_and_save_up_data 的 incremental 参数）。
+"""
+from sqlalchemy import text, inspect, func, select
+from bilibili_models import get_bilibili_engine, get_bilibili_session, BilibiliUp, BilibiliVideo
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def migrate_database():
+    """执行数据库迁移（可重复执行）"""
+    engine = get_bilibili_engine()
+
+    try:
+        columns = [col['name'] for col in inspect(engine).get_columns('bilibili_ups')]
+        with engine.connect() as conn:
+            if 'latest_pubdate_raw' not in columns:
+                logger.info("添加字段: latest_pubdate_raw")
+                conn.execute(text("ALTER TABLE bilibili_ups ADD COLUMN latest_pubdate_raw BIGINT"))
+                conn.commit()
+                logger.info("✅ 字段 latest_pubdate_raw 添加成功")
+            else:
+                logger.info("字段 latest_pubdate_raw 已存在，跳过")
+    except Exception as e:
+        logger.error(f"数据库迁移失败: {e}")
+        raise
+    finally:
+        engine.dispose()
+
+    backfill_latest_pubdate()
+
+
+def backfill_latest_pubdate():
+    """回填 latest_pubdate_raw 为空的UP主（取已入库视频的最新发布时间）"""
+    session = get_bilibili_session()
+    filled = 0
+    try:
+        latest = dict(session.execute(
+            select(BilibiliVideo.uid, func.max(BilibiliVideo.pubdate_raw))
+            .where(BilibiliVideo.pubdate_raw.isnot(None))
+            .group_by(BilibiliVideo.uid)
+        ).all())
+        for up in session.query(BilibiliUp).filter(BilibiliUp.latest_pubdate_raw.is_(None)):
+            if latest.get(up.uid):
+                up.latest_pubdate_raw = latest[up.uid]
+                filled += 1
+        session.commit()
+        logger.info(f"✅ 回填完成：{filled} 个UP主已写入 latest_pubdate_raw")
+    except Exception as e:
+        session.rollback()
+        logger.error(f"回填 latest_pubdate_raw 失败: {e}")
+        raise
+    finally:
+        session.close()
+    return filled
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("数据库迁移：B站UP主增量同步水位 latest_pubdate_raw")
+    print("=" * 60)
+    migrate_database()
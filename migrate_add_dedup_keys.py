@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+数据库迁移脚本：为新闻表和招聘信息表添加去重列与唯一索引
+- canonical_link: 规范化链接（utils.canonical_url）
+- title_hash: 规范化标题SHA1（utils.title_hash）
+- 招聘信息 source_date 为 NULL 的记录改为空字符串（唯一索引中 NULL 互不相等，无法去重）
+
+步骤：加列 -> 回填 -> 删除历史重复记录（保留id最小的一条）-> 创建唯一索引
+可重复执行
+"""
+from sqlalchemy import text, inspect
+from news_models import get_news_engine, get_news_session, News
+from jobs_models import get_jobs_engine, get_jobs_session, Job
+from utils import canonical_url, title_hash
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+NEW_COLUMNS = {
+    'canonical_link': "VARCHAR DEFAULT ''",
+    'title_hash': 'VARCHAR(40)',
+}
+
+
+def _add_columns(engine, table_name):
+    columns = [col['name'] for col in inspect(engine).get_columns(table_name)]
+    with engine.connect() as conn:
+        for col_name, col_type in NEW_COLUMNS.items():
+            if col_name not in columns:
+                logger.info(f"{table_name}: 添加字段 {col_name}")
+                conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {col_name} {col_type}"))
+                conn.commit()
+            else:
+                logger.info(f"{table_name}: 字段 {col_name} 已存在，跳过")
+
+
+def _backfill_and_dedup(session, model, key_of, batch_size=500):
+    """回填去重列，并删除按新去重键重复的记录（保留id最小的一条）"""
+    rows = session.query(model.id, model.title, model.link, model.canonical_link, model.title_hash,
+                         *([model.source_date] if model is Job else [])).order_by(model.id).all()
+
+    mappings = []
+    seen = set()
+    duplicate_ids = []
+    for row in rows:
+        values = {
+            'id': row.id,
+            'canonical_link': canonical_url(row.link),
+            'title_hash': title_hash(row.title),
+            'source_date': (row.source_date or '') if model is Job else None,
+        }
+        key = key_of(values)
+        if key in seen:
+            duplicate_ids.append(row.id)
+            continue
+        seen.add(key)
+        if model is Job and row.source_date is None:
+            mappings.append({k: values[k] for k in ('id', 'canonical_link', 'title_hash', 'source_date')})
+        elif row.canonical_link != values['canonical_link'] or row.title_hash != values['title_hash']:
+            mappings.append({k: values[k] for k in ('id', 'canonical_link', 'title_hash')})
+
+    for i in range(0, len(duplicate_ids), batch_size):
+        session.query(model).filter(model.id.in_(duplicate_ids[i:i + batch_size])).delete(synchronize_session=False)
+    for i in range(0, len(mappings), batch_size):
+        session.bulk_update_mappings(model, mappings[i:i + batch_size])
+    session.commit()
+    logger.info(f"{model.__tablename__}: 回填 {len(mappings)} 条，删除重复 {len(duplicate_ids)} 条")
+
+
+def _create_unique_indexes(engine, model):
+    for index in model.__table__.indexes:
+        if index.unique:
+            index.create(engine, checkfirst=True)
+            logger.info(f"{model.__tablename__}: 唯一索引 {index.name} 已就绪")
+
+
+def migrate_table(engine, session_factory, model, key_of):
+    _add_columns(engine, model.__tablename__)
+    session = session_factory()
+    try:
+        _backfill_and_dedup(session, model, key_of)
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+    _create_unique_indexes(engine, model)
+
+
+def migrate_database():
+    """执行数据库迁移"""
+    try:
+        migrate_table(
+            get_news_engine(), get_news_session, News,
+            lambda v: (v['canonical_link'], v['title_hash'])
+        )
+        migrate_table(
+            get_jobs_engine(), get_jobs_session, Job,
+            lambda v: ('link', v['canonical_link'], v['source_date']) if v['canonical_link']
+            else ('title', v['title_hash'], v['source_date'])
+        )
+        logger.info("✅ 数据库迁移完成！")
+    except Exception as e:
+        logger.error(f"数据库迁移失败: {e}")
+        raise
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("数据库迁移：新闻/招聘信息去重列与唯一索引")
+    print("=" * 60)
+    migrate_database()
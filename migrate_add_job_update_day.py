@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+数据库迁移脚本：为招聘信息表添加 update_day（DATE）字段并回填
+update_date 是字符串（如"2025.9.8"），无法直接在SQL中排序，
+回填后 /api/jobs 可以直接按 update_day 排序分页
+"""
+from sqlalchemy import text, inspect
+from jobs_models import get_jobs_engine, get_jobs_session, Job, parse_update_date
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def migrate_database():
+    """执行数据库迁移（可重复执行）"""
+    engine = get_jobs_engine()
+
+    try:
+        columns = [col['name'] for col in inspect(engine).get_columns('jobs')]
+        with engine.connect() as conn:
+            if 'update_day' not in columns:
+                logger.info("添加字段: update_day")
+                conn.execute(text("ALTER TABLE jobs ADD COLUMN update_day DATE"))
+                conn.commit()
+                logger.info("✅ 字段 update_day 添加成功")
+            else:
+                logger.info("字段 update_day 已存在，跳过")
+
+            conn.execute(text("CREATE INDEX IF NOT EXISTS idx_jobs_update_day ON jobs (update_day)"))
+            conn.commit()
+            logger.info("✅ 索引 idx_jobs_update_day 已就绪")
+    except Exception as e:
+        logger.error(f"数据库迁移失败: {e}")
+        raise
+
+    backfill_update_day()
+
+
+def backfill_update_day(batch_size: int = 500):
+    """回填 update_day 为空的记录"""
+    session = get_jobs_session()
+    filled = 0
+    try:
+        rows = session.query(Job.id, Job.update_date).filter(
+            Job.update_day.is_(None),
+            Job.update_date.isnot(None)
+        ).all()
+
+        mappings = []
+        for job_id, update_date in rows:
+            update_day = parse_update_date(update_date)
+            if update_day is None:
+                continue
+            mappings.append({'id': job_id, 'update_day': update_day})
+
+        for i in range(0, len(mappings), batch_size):
+            session.bulk_update_mappings(Job, mappings[i:i + batch_size])
+            filled += len(mappings[i:i + batch_size])
+        session.commit()
+        logger.info(f"✅ 回填完成：{filled}/{len(rows)} 条记录已写入 update_day")
+    except Exception as e:
+        session.rollback()
+        logger.error(f"回填 update_day 失败: {e}")
+        raise
+    finally:
+        session.close()
+    return filled
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("数据库迁移：招聘信息 update_day 字段")
+    print("=" * 60)
+    migrate_database()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+数据库迁移脚本：创建论文作者索引表 paper_authors 并回填
+作者排行榜原本每次请求都要读出窗口内全部论文、逐篇拆分作者字符串，
+回填后 /api/authors/ranking 直接对 paper_authors 做 GROUP BY author_norm。
+新入库/修改的论文由 models.py 中的 ORM 事件同步，本脚本只需执行一次（可重复执行）。
+"""
+from sqlalchemy import exists, select
+from models import get_engine, get_session, Paper, PaperAuthor, paper_author_rows
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def migrate_database():
+    """执行数据库迁移（可重复执行）"""
+    engine = get_engine()
+    try:
+        PaperAuthor.__table__.create(engine, checkfirst=True)
+        logger.info("✅ 表 paper_authors 已就绪")
+    except Exception as e:
+        logger.error(f"数据库迁移失败: {e}")
+        raise
+    finally:
+        engine.dispose()
+
+    backfill_paper_authors()
+
+
+def backfill_paper_authors(batch_size: int = 5000):
+    """回填还没有作者索引的论文"""
+    session = get_session()
+    indexed = 0
+    rows_written = 0
+    try:
+        missing = select(Paper.id, Paper.authors).where(
+            Paper.authors.isnot(None),
+            ~exists().where(PaperAuthor.paper_id == Paper.id)
+        ).execution_options(yield_per=batch_size)
+        batch = []
+        for paper_id, authors in session.execute(missing):
+            batch.extend(paper_author_rows(paper_id, authors))
+            indexed += 1
+            if len(batch) >= batch_size:
+                session.execute(PaperAuthor.__table__.insert(), batch)
+                rows_written += len(batch)
+                batch = []
+        if batch:
+            session.execute(PaperAuthor.__table__.insert(), batch)
+            rows_written += len(batch)
+        session.commit()
+        logger.info(f"✅ 回填完成：{indexed} 篇论文，写入 {rows_written} 条作者索引")
+    except Exception as e:
+        session.rollback()
+        logger.error(f"回填 paper_authors 失败: {e}")
+        raise
+    finally:
+        session.close()
+    return rows_written
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("数据库迁移：论文作者索引 paper_authors")
+    print("=" * 60)
+    migrate_database()
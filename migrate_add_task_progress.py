@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+数据库迁移脚本：为后台任务表添加进度、计数器和心跳字段
+状态接口改为从任务表读取进度（progress/total/current_item/counters），
+worker 通过 heartbeat_at 判断任务是否仍在执行，version 用于状态接口长轮询
+"""
+from sqlalchemy import text, inspect
+from task_models import get_tasks_engine
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# 字段名 -> 列定义
+NEW_COLUMNS = {
+    'progress': 'INTEGER NOT NULL DEFAULT 0',
+    'total': 'INTEGER NOT NULL DEFAULT 0',
+    'current_item': 'VARCHAR(255)',
+    'counters': 'TEXT',
+    'version': 'INTEGER NOT NULL DEFAULT 0',
+    'heartbeat_at': 'TIMESTAMP',
+}
+
+
+def migrate_database():
+    """执行数据库迁移（可重复执行）"""
+    engine = get_tasks_engine()
+
+    try:
+        columns = [col['name'] for col in inspect(engine).get_columns('task_runs')]
+        with engine.connect() as conn:
+            for name, definition in NEW_COLUMNS.items():
+                if name in columns:
+                    logger.info(f"字段 {name} 已存在，跳过")
+                    continue
+                logger.info(f"添加字段: {name}")
+                conn.execute(text(f"ALTER TABLE task_runs ADD COLUMN {name} {definition}"))
+                conn.commit()
+                logger.info(f"✅ 字段 {name} 添加成功")
+    except Exception as e:
+        logger.error(f"数据库迁移失败: {e}")
+        raise
+
+
+if __name__ == '__main__':
+    print("=" * 60)
+    print("数据库迁移：后台任务进度与心跳字段")
+    print("=" * 60)
+    migrate_database()
@@ -2,11 +2,15 @@
 数据库模型定义
 使用 SQLAlchemy ORM
 """
-from sqlalchemy import create_engine, Column, String, Date, Text, DateTime, Index, Integer, JSON
+from sqlalchemy import create_engine, Column, String, Date, Text, DateTime, Index, Integer, JSON, event, inspect
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
+import logging
 import os
+import re
+
+logger = logging.getLogger(__name__)
 
 Base = declarative_base()
 
@@ -69,6 +73,95 @@ class Paper(Base):
             'publication_year': self.publication_year
         }
 
+
+class PaperAuthor(Base):
+    """论文作者索引（由 Paper.authors 拆分，作者排行榜直接 GROUP BY author_norm）"""
+    __tablename__ = 'paper_authors'
+
+    paper_id = Column(String, primary_key=True)  # 论文ID（papers.id）
+    position = Column(Integer, primary_key=True)  # 作者顺序（从0开始）
+    author_norm = Column(String, nullable=False)  # 规范化作者名（去掉 Team、et al. 等后缀）
+
+    __table_args__ = (
+        Index('idx_paper_authors_author', 'author_norm', 'paper_id'),
+    )
+
+
+_AUTHOR_SEPARATORS = re.compile(r'[,，;；]')
+_AUTHOR_SUFFIX = re.compile(r'\s+(Team|et al\.?|等)$', re.IGNORECASE)
+
+
+def split_authors(authors):
+    """
+    作者字符串拆分为规范化作者名列表（作者排行榜的统计口径）
+
+    >>> split_authors('Alice Team，Bob et al.; X')
+    ['Alice', 'Bob']
+    """
+    names = []
+    for author in _AUTHOR_SEPARATORS.split(authors or ''):
+        author = author.strip()
+        if len(author) < 2:  # 过滤太短的名称
+            continue
+        author = _AUTHOR_SUFFIX.sub('', author).strip()
+        if len(author) >= 2:
+            names.append(author)
+    return names
+
+
+def paper_author_rows(paper_id, authors):
+    """paper_authors 表的行"""
+    return [
+        {'paper_id': paper_id, 'position': position, 'author_norm': name}
+        for position, name in enumerate(split_authors(authors))
+    ]
+
+
+# 已确认存在 paper_authors 表的数据库（未执行迁移时入库不写作者索引，之后由回填补齐）
+_paper_authors_ready = set()
+
+
+def _has_paper_authors_table(connection):
+    url = str(connection.engine.url)
+    if url not in _paper_authors_ready:
+        if not inspect(connection).has_table(PaperAuthor.__tablename__):
+            logger.warning("paper_authors 表不存在，跳过作者索引（运行 python migrate_add_paper_authors.py）")
+            return False
+        _paper_authors_ready.add(url)
+    return True
+
+
+# 论文写入时同步作者索引（与论文在同一事务中，覆盖所有通过 ORM 写入论文的入口）
+@event.listens_for(Paper, 'after_insert')
+def _index_paper_authors(mapper, connection, target):
+    if not _has_paper_authors_table(connection):
+        return
+    # 先清理同ID的旧索引行：批量删除论文（Query.delete）不触发 after_delete，可能留下索引行
+    table = PaperAuthor.__table__
+    connection.execute(table.delete().where(table.c.paper_id == target.id))
+    rows = paper_author_rows(target.id, target.authors)
+    if rows:
+        connection.execute(table.insert(), rows)
+
+
+@event.listens_for(Paper, 'after_update')
+def _reindex_paper_authors(mapper, connection, target):
+    if not inspect(target).attrs.authors.history.has_changes():
+        return
+    if _has_paper_authors_table(connection):
+        table = PaperAuthor.__table__
+        connection.execute(table.delete().where(table.c.paper_id == target.id))
+        rows = paper_author_rows(target.id, target.authors)
+        if rows:
+            connection.execute(table.insert(), rows)
+
+
+@event.listens_for(Paper, 'after_delete')
+def _delete_paper_authors(mapper, connection, target):
+    if _has_paper_authors_table(connection):
+        table = PaperAuthor.__table__
+        connection.execute(table.delete().where(table.c.paper_id == target.id))
+
 # 数据库配置
 # 支持PostgreSQL和SQLite
 DATABASE_URL = os.getenv('DATABASE_URL', 'sqlite:///./papers.db')
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+新闻聚合引擎（asyncio）
+一次新闻刷新并发抓取所有来源，整次刷新耗时约等于最慢的一个源：
+- RSS源：aiohttp 并发请求，按主机限流，带 ETag/Last-Modified 条件请求
+  （源未更新时服务器返回304，不再下载和解析）
+- NewsAPI.org、Orz.ai：同步客户端放到线程中执行，同样受按主机限流约束
+- RSS解析（feedparser 为纯Python，CPU密集）提交到进程池并行执行，进程池不可用时退回线程池
+- 相关性过滤使用导入时预编译的关键词自动机（见 news_relevance）
+"""
+import asyncio
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+from rss_news_client import RSS_FEEDS, parse_feed_content, dedup_news
+from newsapi_client import NEWSAPI_BASE_URL, fetch_news_from_newsapi
+from news_client import ORZ_API_BASE, PREFERRED_PLATFORMS, fetch_news_from_platform
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+# 单个请求超时（秒）
+REQUEST_TIMEOUT = 30
+# 同一主机的最大并发请求数（如 arxiv.org 上有3个源，orz.ai 上有6个平台）
+PER_HOST_LIMIT = int(os.getenv('NEWS_PER_HOST_LIMIT', '2'))
+# 解析进程数（0 表示只使用线程池）
+PARSE_PROCESSES = int(os.getenv('NEWS_PARSE_PROCESSES', str(min(os.cpu_count() or 1, 4))))
+# 条件请求校验值缓存（{feed_url: {'etag': ..., 'last_modified': ...}}）
+FEED_CACHE_FILE = os.getenv(
+    'NEWS_FEED_CACHE_FILE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'news_feed_cache.json')
+)
+
+
+def load_feed_cache() -> Dict[str, Dict]:
+    """读取各RSS源上次的 ETag/Last-Modified"""
+    try:
+        with open(FEED_CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"读取RSS条件请求缓存失败，将全量抓取: {e}")
+        return {}
+
+
+def save_feed_cache(cache: Dict[str, Dict]):
+    """
+    保存各RSS源的 ETag/Last-Modified
+    应在本次抓取的新闻写入数据库之后调用，否则下次304时会漏掉这批新闻
+    """
+    tmp_file = f"{FEED_CACHE_FILE}.tmp"
+    try:
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, FEED_CACHE_FILE)
+    except Exception as e:
+        logger.warning(f"保存RSS条件请求缓存失败: {e}")
+
+
+def _host_semaphore(semaphores: Dict[str, asyncio.Semaphore], url: str) -> asyncio.Semaphore:
+    host = urlparse(url).netloc
+    if host not in semaphores:
+        semaphores[host] = asyncio.Semaphore(PER_HOST_LIMIT)
+    return semaphores[host]
+
+
+def _create_parse_pool(feed_count: int):
+    """创建解析用进程池（spawn 方式，避免在多线程的Web进程中fork）；失败时退回线程池"""
+    workers = min(feed_count, PARSE_PROCESSES)
+    if workers > 1:
+        try:
+            return ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'))
+        except Exception as e:
+            logger.warning(f"创建解析进程池失败，使用线程池: {e}")
+    return ThreadPoolExecutor(max_workers=max(workers, 1))
+
+
+async def _fetch_feed_content(http: aiohttp.ClientSession, semaphores, feed_url: str, validators: Dict):
+    """
+    条件请求RSS源
+
+    Returns:
+        (HTTP状态码, 内容或None, 新的校验值)
+    """
+    headers = {'User-Agent': USER_AGENT}
+    if validators.get('etag'):
+        headers['If-None-Match'] = validators['etag']
+    if validators.get('last_modified'):
+        headers['If-Modified-Since'] = validators['last_modified']
+
+    async with _host_semaphore(semaphores, feed_url):
+        # 与同步客户端一致：部分源证书有问题，不校验SSL
+        async with http.get(feed_url, headers=headers, ssl=False) as response:
+            if response.status != 200:
+                return response.status, None, {}
+            content = await response.read()
+            new_validators = {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+            }
+            return 200, content, {k: v for k, v in new_validators.items() if v}
+
+
+async def _fetch_rss_feed(http, semaphores, parse_pool, feed: Dict, feed_cache: Dict,
+                          max_items: int) -> Optional[List[Dict]]:
+    """抓取并解析单个RSS源；成功解析后把新的校验值写入 feed_cache，请求失败时返回 None"""
+    feed_url = feed['url']
+    feed_name = feed.get('name', '')
+    try:
+        status, content, validators = await _fetch_feed_content(
+            http, semaphores, feed_url, feed_cache.get(feed_url, {})
+        )
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.warning(f"从 {feed_name or feed_url} 获取RSS失败: {e!r}")
+        return None
+
+    if status == 304:
+        logger.info(f"{feed_name or feed_url} 未更新（304），跳过解析")
+        return []
+    if content is None:
+        logger.warning(f"从 {feed_name or feed_url} 获取RSS失败: HTTP {status}")
+        return None
+
+    loop = asyncio.get_running_loop()
+    try:
+        news = await loop.run_in_executor(parse_pool, parse_feed_content, content, feed_url, feed_name, max_items)
+    except BrokenProcessPool:
+        logger.warning(f"解析进程池不可用，在线程中解析 {feed_name or feed_url}")
+        news = await asyncio.to_thread(parse_feed_content, content, feed_url, feed_name, max_items)
+
+    if validators:
+        feed_cache[feed_url] = validators
+    else:
+        feed_cache.pop(feed_url, None)
+    logger.info(f"从 {feed_name or feed_url} 获取到 {len(news)} 条相关新闻")
+    return news
+
+
+async def _run_limited(semaphores, url: str, func, *args):
+    """在线程中执行同步客户端函数，受主机限流约束"""
+    async with _host_semaphore(semaphores, url):
+        return await asyncio.to_thread(func, *args)
+
+
+def _flatten(results: list, label: str) -> List[Dict]:
+    news_list = []
+    for result in results:
+        if isinstance(result, BaseException):
+            logger.error(f"{label}获取新闻异常: {result!r}")
+            continue
+        news_list.extend(result or [])
+    return news_list
+
+
+async def aggregate_news(
+    max_per_feed: int = 150,
+    newsapi_max_results: int = 80,
+    orz_max_per_platform: int = 30,
+    feeds: Optional[List[Dict]] = None,
+) -> Dict:
+    """
+    并发抓取 RSS、NewsAPI.org、Orz.ai 所有来源
+
+    Returns:
+        {'rss': [...], 'newsapi': [...], 'orz': [...], 'feed_cache': {...}, 'rss_feeds': 源数, 'rss_failed': 失败数}
+        feed_cache 为本次更新后的条件请求缓存，需由调用方在保存成功后调用 save_feed_cache
+    """
+    feeds = [feed for feed in (feeds or RSS_FEEDS) if feed.get('url')]
+    feed_cache = load_feed_cache()
+    semaphores: Dict[str, asyncio.Semaphore] = {}
+    parse_pool = _create_parse_pool(len(feeds))
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+
+    logger.info(
+        f"开始并发抓取 {len(feeds)} 个RSS源、NewsAPI.org 和 {len(PREFERRED_PLATFORMS)} 个Orz.ai平台"
+        f"（每主机并发: {PER_HOST_LIMIT}）..."
+    )
+    try:
+        async with aiohttp.ClientSession(timeout=timeout) as http:
+            rss_tasks = [
+                _fetch_rss_feed(http, semaphores, parse_pool, feed, feed_cache, max_per_feed)
+                for feed in feeds
+            ]
+            newsapi_task = _run_limited(semaphores, NEWSAPI_BASE_URL, fetch_news_from_newsapi, newsapi_max_results)
+            orz_tasks = [
+                _run_limited(semaphores, ORZ_API_BASE, fetch_news_from_platform, platform, orz_max_per_platform)
+                for platform in PREFERRED_PLATFORMS
+            ]
+            results = await asyncio.gather(*rss_tasks, newsapi_task, *orz_tasks, return_exceptions=True)
+    finally:
+        parse_pool.shutdown(wait=False, cancel_futures=True)
+
+    rss_count = len(rss_tasks)
+    all_rss_news = _flatten(results[:rss_count], 'RSS源')
+    rss_news = dedup_news(all_rss_news)
+    logger.info(f"RSS源总共获取到 {len(rss_news)} 条具身智能相关新闻（去重后，原始: {len(all_rss_news)}）")
+    return {
+        'rss': rss_news,
+        'newsapi': _flatten(results[rss_count:rss_count + 1], 'NewsAPI.org'),
+        'orz': _flatten(results[rss_count + 1:], 'Orz.ai'),
+        'feed_cache': feed_cache,
+        'rss_feeds': rss_count,
+        'rss_failed': sum(1 for result in results[:rss_count] if result is None or isinstance(result, BaseException)),
+    }
+
+
+def fetch_all_sources(**kwargs) -> Dict:
+    """同步入口（供 fetch_news / 定时任务调用），参数见 aggregate_news"""
+    return asyncio.run(aggregate_news(**kwargs))
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    import time
+    start = time.time()
+    sources = fetch_all_sources(max_per_feed=50)
+    print(f"\n耗时 {time.time() - start:.1f}s：RSS {len(sources['rss'])} 条，"
+          f"NewsAPI {len(sources['newsapi'])} 条，Orz {len(sources['orz'])} 条")
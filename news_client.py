@@ -18,8 +18,8 @@ ORZ_API_BASE = "https://orz.ai/api/v1/dailynews"
 # 导入扩展的关键词配置
 from embodied_news_keywords import (
     ALL_EMBODIED_KEYWORDS,
-    is_embodied_related
 )
+from news_relevance import is_embodied_text
 
 # 使用扩展的关键词列表
 EMBODIED_AI_KEYWORDS = ALL_EMBODIED_KEYWORDS
@@ -46,9 +46,8 @@ def is_embodied_ai_related(title: str, description: str = '') -> bool:
     Returns:
         是否相关
     """
-    text = (title + ' ' + description).lower()
-    # 使用扩展的关键词判断函数
-    return is_embodied_related(text, strict=False)
+    # 使用预编译的关键词自动机（单遍扫描）
+    return is_embodied_text(title + ' ' + description)
 
 
 def fetch_news_from_platform(platform: str, limit: int = 50) -> List[Dict]:
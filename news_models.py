@@ -18,6 +18,8 @@ class News(Base):
     title = Column(Text, nullable=False)  # 新闻标题
     description = Column(Text)  # 新闻描述/摘要
     link = Column(String)  # 新闻链接
+    canonical_link = Column(String, default='')  # 规范化链接（去重用，见 utils.canonical_url）
+    title_hash = Column(String(40))  # 规范化标题SHA1（去重用，见 utils.title_hash）
     source = Column(String)  # 新闻来源（如：github, hackernews等）
     platform = Column(String)  # 平台名称
     published_at = Column(DateTime)  # 发布时间
@@ -33,6 +35,8 @@ class News(Base):
         Index('idx_platform', 'platform'),
         Index('idx_published_at', 'published_at'),
         Index('idx_created_at', 'created_at'),
+        # 去重唯一索引：同一链接+同一标题只保留一条
+        Index('uq_news_canonical_link_title_hash', 'canonical_link', 'title_hash', unique=True),
     )
     
     def to_dict(self):
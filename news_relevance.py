@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+具身智能新闻相关性判断引擎
+导入时把 embodied_news_keywords 中的所有关键词集合编译成一个多模式匹配自动机：
+- 每条新闻只扫描一遍文本，得到命中的关键词及其所属类别（含是否出现在标题中）
+- 判断规则基于命中的类别，不再逐个关键词做 `kw.lower() in text`
+- explain_relevance 可以给出判定结果、命中规则和命中的关键词，便于排查误判
+
+安装了 pyahocorasick 时使用 Aho-Corasick 自动机；否则退回由关键词前缀树生成的正则
+匹配语义与原实现一致：子串匹配，不区分大小写
+"""
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from embodied_news_keywords import (
+    CORE_EMBODIED_KEYWORDS,
+    ROBOTICS_KEYWORDS,
+    COMPANY_NAMES,
+    RSS_EXCLUDE_KEYWORDS,
+    RELEVANCE_CORE_KEYWORDS,
+    RELEVANCE_EXCLUDE_KEYWORDS,
+    ROBOT_CONTEXT_KEYWORDS,
+    STRONG_EXCLUDE_KEYWORDS,
+    ROBOT_SPECIFIC_KEYWORDS,
+    RSS_AGGREGATION_KEYWORDS,
+    RSS_BUSINESS_EVENT_KEYWORDS,
+    RSS_ROBOT_CORE_KEYWORDS,
+    ACADEMIC_MARKER_KEYWORDS,
+    ACADEMIC_BROAD_KEYWORDS,
+)
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False  # pyahocorasick未安装，使用正则前缀树
+
+# 关键词类别 -> 关键词
+KEYWORD_CLASSES = {
+    'strict_core': CORE_EMBODIED_KEYWORDS + ROBOTICS_KEYWORDS,
+    'core': RELEVANCE_CORE_KEYWORDS,
+    'company': COMPANY_NAMES,
+    'exclude': RELEVANCE_EXCLUDE_KEYWORDS,
+    'strong_exclude': STRONG_EXCLUDE_KEYWORDS,
+    'robot_context': ROBOT_CONTEXT_KEYWORDS,
+    'robot_specific': ROBOT_SPECIFIC_KEYWORDS,
+    # 自动驾驶：自主/自动驾驶 + 车辆词，且没有明确提到机器人
+    'autonomous': ['autonomous', '自主', '自动驾驶'],
+    'robot_explicit': ['robot', '机器人', 'robotics'],
+    'vehicle': ['car', 'vehicle', '汽车', '车', 'robotaxi'],
+    'robotaxi': ['robotaxi'],
+    'robotics': ['robotics'],
+    'rss_aggregation': RSS_AGGREGATION_KEYWORDS,
+    'rss_business_event': RSS_BUSINESS_EVENT_KEYWORDS,
+    'rss_exclude': RSS_EXCLUDE_KEYWORDS,
+    'rss_robot_core': RSS_ROBOT_CORE_KEYWORDS,
+    'academic_marker': ACADEMIC_MARKER_KEYWORDS,
+    'academic_broad': ACADEMIC_BROAD_KEYWORDS,
+}
+
+
+# 每个类别对应一个二进制位，扫描时按位或累积，判断时按位与
+CLASS_BITS = {cls: 1 << i for i, cls in enumerate(KEYWORD_CLASSES)}
+
+
+class KeywordMatches:
+    """一次扫描的结果：命中的类别（全文/标题），collect=True 时还保留命中的关键词"""
+
+    def __init__(self, mask: int, title_mask: int, keywords: Optional[Set[str]] = None,
+                 title_keywords: Optional[Set[str]] = None):
+        self.mask = mask
+        self.title_mask = title_mask
+        self.keywords = keywords
+        self.title_keywords = title_keywords
+
+    def has(self, cls: str) -> bool:
+        return bool(self.mask & CLASS_BITS[cls])
+
+    def in_title(self, cls: str) -> bool:
+        return bool(self.title_mask & CLASS_BITS[cls])
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """由关键词前缀树生成正则（同一位置上贪婪匹配最长的关键词）"""
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """多关键词集合的单遍匹配器（导入时构建一次）"""
+
+    def __init__(self, keyword_classes: Dict[str, Iterable[str]]):
+        # 关键词 -> 所属类别的位掩码
+        self.masks: Dict[str, int] = {}
+        for cls, keywords in keyword_classes.items():
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if keyword:
+                    self.masks[keyword] = self.masks.get(keyword, 0) | CLASS_BITS[cls]
+
+        if AHOCORASICK_AVAILABLE:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self.masks:
+                self._automaton.add_word(keyword, (len(keyword), keyword))
+            self._automaton.make_automaton()
+        else:
+            # 零宽前瞻：在每个位置找到最长的关键词，再展开为该位置上所有是其前缀的关键词
+            self._pattern = re.compile('(?=(' + _trie_pattern(self.masks) + '))')
+            self._prefixes = {
+                keyword: tuple(keyword[:i] for i in range(1, len(keyword) + 1) if keyword[:i] in self.masks)
+                for keyword in self.masks
+            }
+
+    def _iter_matches(self, text: str):
+        """产出 (结束位置（不含）, 关键词)，包含重叠的命中"""
+        if AHOCORASICK_AVAILABLE:
+            for end, (length, keyword) in self._automaton.iter(text):
+                yield end + 1, keyword
+        else:
+            for match in self._pattern.finditer(text):
+                start = match.start()
+                for keyword in self._prefixes[match.group(1)]:
+                    yield start + len(keyword), keyword
+
+    def scan(self, text: str, title_length: int = 0, collect: bool = False) -> KeywordMatches:
+        """
+        扫描已转为小写的文本
+
+        Args:
+            text: 小写文本
+            title_length: 文本开头标题部分的长度；完全落在标题内的命中另外记为标题命中
+            collect: 是否保留命中的关键词（explain_relevance 使用）
+        """
+        masks = self.masks
+        mask = 0
+        title_mask = 0
+        keywords = set() if collect else None
+        title_keywords = set() if collect else None
+        for end, keyword in self._iter_matches(text):
+            mask |= masks[keyword]
+            if end <= title_length:
+                title_mask |= masks[keyword]
+                if collect:
+                    title_keywords.add(keyword)
+            if collect:
+                keywords.add(keyword)
+        return KeywordMatches(mask, title_mask, keywords, title_keywords)
+
+
+RELEVANCE_MATCHER = KeywordMatcher(KEYWORD_CLASSES)
+
+
+def scan_news(title: str, description: str = '', collect: bool = False) -> KeywordMatches:
+    """扫描 标题+描述（标题部分的命中单独记录）"""
+    title_lower = (title or '').lower()
+    text = title_lower + ' ' + (description or '').lower()
+    return RELEVANCE_MATCHER.scan(text, title_length=len(title_lower), collect=collect)
+
+
+# ===== 判定规则（返回 (是否相关, 命中的规则说明)） =====
+
+def _judge_embodied(m: KeywordMatches, strict: bool = False) -> Tuple[bool, str]:
+    if strict:
+        # 严格模式：必须包含核心关键词
+        if m.has('strict_core'):
+            return True, '严格模式：包含具身/机器人关键词'
+        return False, '严格模式：不包含具身/机器人关键词'
+
+    # 如果包含公司名称，也认为相关（因为这些公司都是具身智能/机器人公司）
+    if m.has('company'):
+        return True, '包含具身智能公司名称'
+
+    # 如果没有核心词，直接返回False（避免误匹配）
+    if not m.has('core'):
+        return False, '不包含机器人/具身核心词'
+
+    # 如果包含排除词，必须同时包含机器人核心词才认为相关
+    if m.has('exclude'):
+        if m.has('strong_exclude') and not m.has('robot_specific'):
+            return False, '包含强排除词且没有明确的机器人相关词'
+        if not m.has('robot_context'):
+            return False, '包含排除词且没有机器人上下文'
+
+    # 自动驾驶相关，除非明确提到机器人（可能是自动驾驶汽车，不是机器人）
+    if m.has('autonomous') and not m.has('robot_explicit') and m.has('vehicle'):
+        return False, '自动驾驶汽车，不是机器人'
+
+    # Robotaxi是自动驾驶，不是机器人（除非明确提到robotics）
+    if m.has('robotaxi') and not m.has('robotics'):
+        return False, 'Robotaxi（自动驾驶出租车），不是机器人'
+
+    # 原实现中"通用AI/商业/AI会议"三条规则都要求没有核心词，走到这里时已有核心词，不会触发
+    return True, '包含机器人/具身核心词'
+
+
+def _judge_news(m: KeywordMatches, strict: bool = False) -> Tuple[bool, str]:
+    if strict:
+        return _judge_embodied(m, strict=True)
+    # 对于学术论文（ArXiv），只要包含robot/robotics/ai/ml等关键词就认为相关
+    if m.has('academic_marker') and m.has('academic_broad'):
+        return True, 'ArXiv论文且包含宽泛的AI/机器人关键词'
+    return _judge_embodied(m)
+
+
+def _judge_feed_entry(m: KeywordMatches, is_academic: bool) -> Tuple[bool, str]:
+    if is_academic:
+        # 学术源：使用关键词过滤（宽松模式，因为ArXiv论文标题通常更明确）
+        return _judge_news(m)
+
+    # 科技媒体：如果是新闻聚合或商业大会，且标题没有核心词，不匹配
+    if (m.in_title('rss_aggregation') or m.in_title('rss_business_event')) \
+            and not m.in_title('core') and not m.in_title('company'):
+        return False, '标题为新闻聚合/商业大会且不含核心词或公司名称'
+
+    # 如果有排除词，必须明确包含机器人核心词才保留
+    if m.has('rss_exclude') and not m.has('rss_robot_core'):
+        return False, '包含RSS排除词且没有机器人核心词'
+
+    return _judge_embodied(m)
+
+
+def is_embodied_text(text: str, strict: bool = False) -> bool:
+    """判断文本（标题+描述）是否与具身智能相关"""
+    return _judge_embodied(RELEVANCE_MATCHER.scan((text or '').lower()), strict)[0]
+
+
+def is_embodied_news(title: str, description: str = '', strict: bool = False) -> bool:
+    """判断新闻是否与具身智能相关（宽松模式下ArXiv论文放宽限制）"""
+    return _judge_news(scan_news(title, description), strict)[0]
+
+
+def is_feed_entry_relevant(title: str, description: str, is_academic: bool) -> bool:
+    """判断RSS条目是否保留（科技媒体额外检查标题和排除词）"""
+    return _judge_feed_entry(scan_news(title, description), is_academic)[0]
+
+
+def explain_relevance(title: str, description: str = '', mode: str = 'text') -> Dict:
+    """
+    解释相关性判定
+
+    Args:
+        title: 标题（mode='text' 时也可以直接传入整段文本）
+        description: 描述
+        mode: 'text'（is_embodied_related）、'strict'、'news'（含ArXiv放宽）、
+              'rss'（RSS科技媒体）、'rss_academic'（RSS学术源）
+
+    Returns:
+        {'relevant': 是否相关, 'reason': 命中的规则, 'matches': {类别: [关键词]}, 'title_matches': {...}}
+    """
+    m = scan_news(title, description, collect=True)
+    if mode == 'strict':
+        relevant, reason = _judge_embodied(m, strict=True)
+    elif mode == 'news':
+        relevant, reason = _judge_news(m)
+    elif mode in ('rss', 'rss_academic'):
+        relevant, reason = _judge_feed_entry(m, is_academic=(mode == 'rss_academic'))
+    else:
+        relevant, reason = _judge_embodied(m)
+
+    def by_class(keywords: Set[str]) -> Dict[str, List[str]]:
+        grouped: Dict[str, List[str]] = {}
+        for keyword in sorted(keywords):
+            for cls, bit in CLASS_BITS.items():
+                if RELEVANCE_MATCHER.masks[keyword] & bit:
+                    grouped.setdefault(cls, []).append(keyword)
+        return grouped
+
+    return {
+        'relevant': relevant,
+        'reason': reason,
+        'matches': by_class(m.keywords),
+        'title_matches': by_class(m.title_keywords),
+    }
+
+
+if __name__ == "__main__":
+    import json
+    import sys
+
+    args = sys.argv[1:] or ['波士顿动力发布新一代人形机器人 Atlas']
+    print(json.dumps(explain_relevance(*args[:2], **({'mode': args[2]} if len(args) > 2 else {})),
+                     ensure_ascii=False, indent=2))
@@ -20,8 +20,8 @@ NEWSAPI_API_KEY = os.getenv('NEWSAPI_API_KEY', '359745328c4a471eb7641e120a4c330f
 from embodied_news_keywords import (
     ALL_EMBODIED_KEYWORDS,
     get_search_queries,
-    is_embodied_related
 )
+from news_relevance import is_embodied_text
 
 # 使用扩展的关键词列表
 EMBODIED_AI_KEYWORDS = ALL_EMBODIED_KEYWORDS
@@ -38,9 +38,8 @@ def is_embodied_ai_related(title: str, description: str = '') -> bool:
     Returns:
         是否相关
     """
-    text = (title + ' ' + description).lower()
-    # 使用扩展的关键词判断函数
-    return is_embodied_related(text, strict=False)
+    # 使用预编译的关键词自动机（单遍扫描）
+    return is_embodied_text(title + ' ' + description)
 
 
 def fetch_news_from_newsapi(max_results: int = 50) -> List[Dict]:
@@ -0,0 +1,228 @@
+"""
+SQL 查询分析（开发/测试用，默认关闭）
+按语句形状（参数、字面量、IN 列表归一化后的 SQL）统计一个请求或后台任务内执行的查询：
+- 同一形状执行超过 QUERY_REPEAT_THRESHOLD 次：疑似 N+1（循环内逐条查询），记录警告
+- 单条查询超过 QUERY_SLOW_MS 毫秒：记录慢查询及其执行计划（SQLite: EXPLAIN QUERY PLAN，PostgreSQL: EXPLAIN）
+
+启用方式：
+    QUERY_PROFILER=true python app.py        # Web 请求（app.py 注册）与 worker 任务（task_handlers）都会分析
+
+测试中断言查询预算（不依赖 QUERY_PROFILER）：
+    with assert_query_budget(max_queries=10, max_repeats=3):
+        client.get('/api/papers')
+"""
+import hashlib
+import logging
+import os
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+QUERY_PROFILER_ENABLED = os.getenv('QUERY_PROFILER', 'false').lower() == 'true'
+# 同一语句形状在一个请求/任务中允许的执行次数
+QUERY_REPEAT_THRESHOLD = int(os.getenv('QUERY_REPEAT_THRESHOLD', '10'))
+# 慢查询阈值（毫秒）
+QUERY_SLOW_MS = float(os.getenv('QUERY_SLOW_MS', '200'))
+
+# 当前分析范围（请求或任务），不在分析范围内时为 None
+_current_profile: ContextVar[Optional['QueryProfile']] = ContextVar('query_profile', default=None)
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+_NAMED_PARAM = re.compile(r'%\(\w+\)s|:\w+|\$\d+|%s|\?')
+_PARAM_LIST = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_WHITESPACE = re.compile(r'\s+')
+
+
+def fingerprint(statement: str) -> str:
+    """
+    语句形状：去掉参数和字面量，IN (?, ?, ?) 折叠为 IN (?)
+
+    >>> fingerprint("SELECT * FROM videos WHERE bvid = ? AND play > 100")
+    'SELECT * FROM videos WHERE bvid = ? AND play > ?'
+    """
+    sql = _STRING_LITERAL.sub('?', statement)
+    sql = _NAMED_PARAM.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = _WHITESPACE.sub(' ', sql).strip()
+    return _PARAM_LIST.sub('(?)', sql)
+
+
+def _short_hash(shape: str) -> str:
+    return hashlib.md5(shape.encode('utf-8')).hexdigest()[:8]
+
+
+class QueryProfile:
+    """一个请求/任务内执行的查询记录"""
+
+    def __init__(self, label: str):
+        self.label = label
+        self.shapes: Counter = Counter()
+        self.total_seconds = 0.0
+        self.slow_queries: List[Dict] = []
+
+    @property
+    def count(self) -> int:
+        return sum(self.shapes.values())
+
+    def record(self, conn, statement: str, parameters, seconds: float):
+        shape = fingerprint(statement)
+        self.shapes[shape] += 1
+        self.total_seconds += seconds
+        if seconds * 1000 >= QUERY_SLOW_MS:
+            self.slow_queries.append({
+                'engine': conn.engine,
+                'statement': statement,
+                'parameters': parameters,
+                'ms': seconds * 1000,
+            })
+
+    def repeated(self, threshold: int = None) -> List[tuple]:
+        """执行次数超过阈值的语句形状 [(形状, 次数)]，按次数降序"""
+        threshold = QUERY_REPEAT_THRESHOLD if threshold is None else threshold
+        return [(shape, n) for shape, n in self.shapes.most_common() if n > threshold]
+
+    def report(self):
+        """记录疑似 N+1 和慢查询（含执行计划）"""
+        for shape, n in self.repeated():
+            logger.warning(f"⚠️  [{self.label}] 疑似 N+1：同一语句执行 {n} 次（共 {self.count} 次查询）"
+                           f" [{_short_hash(shape)}] {shape[:300]}")
+        for slow in self.slow_queries:
+            plan = explain(slow['engine'], slow['statement'], slow['parameters'])
+            logger.warning(f"🐢 [{self.label}] 慢查询 {slow['ms']:.0f} ms: {_WHITESPACE.sub(' ', slow['statement'])[:300]}"
+                           + (f"\n执行计划:\n{plan}" if plan else ''))
+
+
+def explain(engine, statement: str, parameters) -> Optional[str]:
+    """获取查询的执行计划（只分析 SELECT，失败时返回 None）"""
+    if not statement.lstrip().upper().startswith('SELECT'):
+        return None
+    dialect = engine.dialect.name
+    if dialect == 'sqlite':
+        prefix = 'EXPLAIN QUERY PLAN '
+    elif dialect == 'postgresql':
+        prefix = 'EXPLAIN '
+    else:
+        return None
+    token = _current_profile.set(None)  # EXPLAIN 本身不计入分析
+    try:
+        with engine.connect() as conn:
+            rows = conn.exec_driver_sql(prefix + statement, parameters or ()).fetchall()
+        if dialect == 'sqlite':
+            # (id, parent, notused, detail)
+            return '\n'.join(f"  {row[-1]}" for row in rows)
+        return '\n'.join(f"  {row[0]}" for row in rows)
+    except Exception as e:
+        logger.debug(f"获取执行计划失败: {e}")
+        return None
+    finally:
+        _current_profile.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault('query_profiler_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    if profile is None:
+        return
+    starts = conn.info.get('query_profiler_start')
+    if not starts:
+        return
+    profile.record(conn, statement, parameters, time.perf_counter() - starts.pop())
+
+
+def _handle_error(context):
+    # 执行失败的语句不会触发 after_cursor_execute，弹出开始时间
+    conn = context.connection
+    if conn is not None and conn.info.get('query_profiler_start'):
+        conn.info['query_profiler_start'].pop()
+
+
+def _install_listeners():
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(Engine, 'handle_error', _handle_error)
+
+
+@contextmanager
+def profile_queries(label: str, report: bool = True):
+    """
+    分析代码块内执行的查询（可嵌套，内层范围单独统计）
+
+    Args:
+        label: 日志中的范围名称（如 'GET /api/bilibili/all'、'task:fetch_bilibili'）
+        report: 结束时是否记录疑似 N+1 和慢查询
+    """
+    _install_listeners()
+    profile = QueryProfile(label)
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+        if report:
+            profile.report()
+
+
+class QueryBudgetExceeded(AssertionError):
+    """查询次数超出预算"""
+
+
+@contextmanager
+def assert_query_budget(max_queries: int = None, max_repeats: int = None, label: str = 'query budget'):
+    """
+    断言代码块内的查询次数不超过预算（用于测试）
+
+    Args:
+        max_queries: 查询总次数上限
+        max_repeats: 同一语句形状的执行次数上限（捕获新增的循环内逐条查询）
+    """
+    with profile_queries(label, report=False) as profile:
+        yield profile
+    problems = []
+    if max_queries is not None and profile.count > max_queries:
+        problems.append(f"共执行 {profile.count} 次查询，预算 {max_queries} 次")
+    if max_repeats is not None:
+        for shape, n in profile.repeated(max_repeats):
+            problems.append(f"同一语句执行 {n} 次（上限 {max_repeats} 次）: {shape[:200]}")
+    if problems:
+        raise QueryBudgetExceeded(f"[{label}] " + '；'.join(problems))
+
+
+def init_query_profiler(app) -> bool:
+    """QUERY_PROFILER=true 时分析每个 Flask 请求的查询"""
+    if not QUERY_PROFILER_ENABLED:
+        return False
+
+    from flask import request
+
+    _install_listeners()
+
+    @app.before_request
+    def _start_query_profile():
+        _current_profile.set(QueryProfile(f"{request.method} {request.path}"))
+
+    @app.teardown_request
+    def _finish_query_profile(exc):
+        profile = _current_profile.get()
+        _current_profile.set(None)
+        if profile is not None:
+            try:
+                profile.report()
+            except Exception as e:
+                logger.error(f"查询分析报告失败: {e}")
+
+    logger.info(f"✅ SQL 查询分析已启用（N+1 阈值 {QUERY_REPEAT_THRESHOLD} 次，慢查询阈值 {QUERY_SLOW_MS:.0f} ms）")
+    return True
@@ -0,0 +1,282 @@
+"""
+一键刷新编排（/api/refresh-all 入队的 refresh_all 任务）
+原本一键刷新是三个互不相干的任务（论文、招聘、新闻），各自完整地跑一遍抓取流水线；
+这里在一个任务内把各数据源拆成阶段，按依赖关系组成 DAG 执行：
+
+    papers.fetch ─────────────────────────────┐
+    jobs.fetch ──→ jobs.write ────────────────┤
+    news.fetch ──→ news.select ─→ news.write ─┼─→ publish
+    bilibili.fetch（可选）────────────────────┘
+
+- fetch: 网络抓取；select: 解析/筛选/相关性分类/按链接去重；write: 比对去重后批量写库
+  （论文抓取在 daily_arxiv 中是一个整体流程，作为一个阶段）
+- 每个阶段声明占用的资源（arXiv接口、数据库写入、B站请求额度等），同一资源同时运行的阶段数
+  不超过 RESOURCE_LIMITS，其余阶段仍并行执行
+- 依赖的阶段失败时跳过后续阶段；publish 在其他阶段都结束后总会执行，只要有数据源写入成功
+  就在任务上记录发布标记（counters.published），Web 进程据此清理首屏数据缓存（即使其他数据源失败）
+- 每个阶段的状态和耗时写入任务消息和日志
+
+用法:
+    from refresh_pipeline import run_refresh
+    results = run_refresh(['papers', 'jobs', 'news'])  # {阶段名: {'state', 'seconds', 'error'}}
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+# 一键刷新默认包含的数据源
+DEFAULT_SOURCES = ('papers', 'jobs', 'news')
+
+# 资源 -> 同时运行的阶段数上限
+RESOURCE_LIMITS = {
+    'arxiv': int(os.getenv('REFRESH_ARXIV_CONCURRENCY', '1')),
+    'db_writer': int(os.getenv('REFRESH_DB_WRITER_CONCURRENCY', '1')),
+    'bilibili': int(os.getenv('REFRESH_BILIBILI_CONCURRENCY', '1')),
+    'network': int(os.getenv('REFRESH_NETWORK_CONCURRENCY', '3')),
+}
+
+STAGE_SUCCESS = 'success'
+STAGE_ERROR = 'error'
+STAGE_SKIPPED = 'skipped'
+
+
+class Stage:
+    """DAG 中的一个阶段：func(context) 的返回值写入 context[name]，供后续阶段读取"""
+
+    def __init__(self, name: str, func: Callable[[Dict], object], deps: Sequence[str] = (),
+                 resources: Sequence[str] = (), always: bool = False):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.resources = tuple(sorted(resources))  # 按固定顺序获取资源，避免互相等待
+        self.always = always  # 依赖失败/跳过时仍然执行
+
+
+def run_stages(stages: List[Stage], context: Optional[Dict] = None, limits: Dict[str, int] = None,
+               max_workers: int = None, on_stage: Callable[[str, str, Dict], None] = None) -> Dict[str, Dict]:
+    """
+    按依赖关系执行阶段
+
+    Args:
+        context: 阶段间共享的数据（阶段返回值按阶段名写入）
+        limits: 资源并发上限，默认 RESOURCE_LIMITS；未列出的资源不限
+        max_workers: 线程数，默认为阶段数
+        on_stage: 阶段开始/结束时的回调 (阶段名, 事件 start/finish, 结果)
+
+    Returns:
+        {阶段名: {'state': success/error/skipped, 'seconds': 耗时, 'error': 错误信息}}
+    """
+    by_name = {stage.name: stage for stage in stages}
+    for stage in stages:
+        missing = [dep for dep in stage.deps if dep not in by_name]
+        if missing:
+            raise ValueError(f"阶段 {stage.name} 依赖未知阶段: {', '.join(missing)}")
+    context = {} if context is None else context
+    limits = RESOURCE_LIMITS if limits is None else limits
+    semaphores = {name: threading.BoundedSemaphore(max(limit, 1)) for name, limit in limits.items()}
+    results = {}
+    pending = list(stages)
+    running = {}
+
+    def execute(stage):
+        acquired = []
+        try:
+            for resource in stage.resources:
+                if resource in semaphores:
+                    semaphores[resource].acquire()
+                    acquired.append(semaphores[resource])
+            started = time.perf_counter()
+            if on_stage:
+                on_stage(stage.name, 'start', {})
+            try:
+                context[stage.name] = stage.func(context)
+                return {'state': STAGE_SUCCESS, 'seconds': time.perf_counter() - started, 'error': None}
+            except Exception as e:
+                logger.error(f"刷新阶段 {stage.name} 失败: {e}", exc_info=True)
+                return {'state': STAGE_ERROR, 'seconds': time.perf_counter() - started, 'error': str(e)}
+        finally:
+            for semaphore in reversed(acquired):
+                semaphore.release()
+
+    with ThreadPoolExecutor(max_workers=max_workers or max(len(stages), 1),
+                            thread_name_prefix='refresh') as executor:
+        while pending or running:
+            for stage in list(pending):
+                if any(dep not in results for dep in stage.deps):
+                    continue
+                pending.remove(stage)
+                failed = [dep for dep in stage.deps if results[dep]['state'] != STAGE_SUCCESS]
+                if failed and not stage.always:
+                    results[stage.name] = {'state': STAGE_SKIPPED, 'seconds': 0.0,
+                                           'error': f"依赖阶段未成功: {', '.join(failed)}"}
+                    if on_stage:
+                        on_stage(stage.name, 'finish', results[stage.name])
+                    continue
+                running[executor.submit(execute, stage)] = stage
+            if not running:
+                if pending:
+                    # 剩余阶段的依赖都已有结果时上面的循环会处理；走到这里说明存在环
+                    raise ValueError(f"阶段依赖存在环: {', '.join(stage.name for stage in pending)}")
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                results[stage.name] = future.result()
+                if on_stage:
+                    on_stage(stage.name, 'finish', results[stage.name])
+    return results
+
+
+# ==================== 一键刷新的各阶段 ====================
+
+def _fetch_papers(context):
+    from fetch_new_data import fetch_papers
+    # 论文抓取按关键词上报的进度会覆盖阶段进度，这里不传进度上报器
+    fetch_papers(raise_errors=True)
+
+
+def _fetch_jobs(context):
+    from jobs_models import init_jobs_db
+    from github_jobs_client import fetch_all_jobs
+    init_jobs_db()
+    return fetch_all_jobs()
+
+
+def _write_jobs(context):
+    from save_jobs_to_db import batch_save_jobs
+    jobs = context['jobs.fetch']
+    if not jobs:
+        logger.warning("未获取到任何招聘信息")
+        return None
+    stats = batch_save_jobs(jobs)
+    if stats['error']:
+        raise RuntimeError(f"招聘信息写入失败 {stats['error']} 条")
+    return stats
+
+
+def _fetch_news(context):
+    from news_models import init_news_db
+    from fetch_news import fetch_news_sources
+    init_news_db()
+    return fetch_news_sources()
+
+
+def _select_news(context):
+    from fetch_news import select_recent_news
+    return select_recent_news(context['news.fetch'])
+
+
+def _write_news(context):
+    from fetch_news import save_news
+    stats = save_news(context['news.select'], context['news.fetch'].get('feed_cache'))
+    if stats and stats['error']:
+        raise RuntimeError(f"新闻写入失败 {stats['error']} 条")
+    return stats
+
+
+def _fetch_bilibili(context):
+    from fetch_bilibili_data import fetch_all_bilibili_data
+    fetch_all_bilibili_data(video_count=50, delay_between_requests=2.0, incremental=True)
+
+
+def _publish(context, finals):
+    """
+    所有写入阶段结束：有数据源写入成功时在任务上记录发布标记
+    （Web 进程看到标记后清理首屏数据缓存，见 app.publish_refreshed）
+
+    Returns:
+        写入成功的数据源最后一个阶段名
+    """
+    # 只有成功的阶段会把返回值写入 context
+    written = [name for name in finals if name in context]
+    task_progress = context.get('task_progress')
+    if written and task_progress is not None:
+        task_progress.incr('published')
+        task_progress.flush()
+    logger.info(f"发布刷新结果: {', '.join(written) or '无数据源写入成功，不清理缓存'}")
+    return written
+
+
+# 数据源 -> 阶段列表；每个数据源最后一个阶段是 publish 的依赖
+SOURCE_STAGES = {
+    'papers': [
+        Stage('papers.fetch', _fetch_papers, resources=('arxiv', 'network')),
+    ],
+    'jobs': [
+        Stage('jobs.fetch', _fetch_jobs, resources=('network',)),
+        Stage('jobs.write', _write_jobs, deps=('jobs.fetch',), resources=('db_writer',)),
+    ],
+    'news': [
+        Stage('news.fetch', _fetch_news, resources=('network',)),
+        Stage('news.select', _select_news, deps=('news.fetch',)),
+        Stage('news.write', _write_news, deps=('news.select',), resources=('db_writer',)),
+    ],
+    'bilibili': [
+        Stage('bilibili.fetch', _fetch_bilibili, resources=('bilibili', 'network')),
+    ],
+}
+
+
+def build_refresh_stages(sources: Iterable[str] = DEFAULT_SOURCES) -> List[Stage]:
+    """按数据源组装阶段，最后追加 publish"""
+    stages = []
+    finals = []
+    for source in sources:
+        if source not in SOURCE_STAGES:
+            raise ValueError(f"未知数据源: {source}（可选: {', '.join(SOURCE_STAGES)}）")
+        stages.extend(SOURCE_STAGES[source])
+        finals.append(SOURCE_STAGES[source][-1].name)
+    stages.append(Stage('publish', lambda context: _publish(context, finals), deps=finals, always=True))
+    return stages
+
+
+def format_timings(results: Dict[str, Dict]) -> str:
+    """阶段耗时摘要，如 "jobs.fetch 1.2s, jobs.write 0.3s, news.fetch 失败" """
+    labels = {STAGE_ERROR: '失败', STAGE_SKIPPED: '跳过'}
+    parts = []
+    for name, result in results.items():
+        if result['state'] == STAGE_SUCCESS:
+            parts.append(f"{name} {result['seconds']:.1f}s")
+        else:
+            parts.append(f"{name} {labels[result['state']]}")
+    return ', '.join(parts)
+
+
+def run_refresh(sources: Iterable[str] = DEFAULT_SOURCES, task_progress=None,
+                limits: Dict[str, int] = None) -> Dict[str, Dict]:
+    """
+    执行一键刷新
+
+    Args:
+        sources: 要刷新的数据源（papers/jobs/news/bilibili）
+        task_progress: 任务进度上报器（task_queue.TaskProgress，可选），每个阶段结束时上报
+
+    Returns:
+        各阶段的结果（见 run_stages）
+    """
+    stages = build_refresh_stages(sources)
+    total = len(stages)
+    finished = []
+    lock = threading.Lock()
+
+    def on_stage(name, event, result):
+        if event == 'start':
+            logger.info(f"刷新阶段开始: {name}")
+            return
+        logger.info(f"刷新阶段结束: {name} {result['state']}（{result['seconds']:.2f}s）")
+        if task_progress is not None:
+            with lock:
+                finished.append(name)
+                task_progress.update(progress=len(finished), total=total, current=name,
+                                     message=f'已完成 {len(finished)}/{total} 个阶段（{name}）', force=True)
+                task_progress.incr('success' if result['state'] == STAGE_SUCCESS else 'failed')
+
+    logger.info(f"开始一键刷新: {', '.join(sources)}（{total} 个阶段）")
+    results = run_stages(stages, {'task_progress': task_progress}, limits=limits, on_stage=on_stage)
+    logger.info(f"一键刷新完成: {format_timings(results)}")
+    return results
@@ -0,0 +1,200 @@
+"""
+请求级性能指标（Prometheus）
+按路由统计请求耗时、响应大小、每个请求的数据库查询次数与耗时，以及缓存命中情况，
+管理端通过 /api/admin/metrics 以 Prometheus 文本格式导出。
+
+gunicorn 多 worker 部署时设置 PROMETHEUS_MULTIPROC_DIR（各 worker 写入同一目录，导出时汇总），
+未设置时只导出当前 worker 的指标。未安装 prometheus_client 时指标功能不可用，不影响请求处理。
+"""
+import logging
+import os
+import time
+from contextvars import ContextVar
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    from prometheus_client import (
+        Counter, Histogram, CollectorRegistry, REGISTRY,
+        generate_latest, CONTENT_TYPE_LATEST, multiprocess,
+    )
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+
+# 当前请求的数据库查询统计 {'count': 次数, 'seconds': 耗时}，不在请求中时为 None（如 worker 中的抓取任务）
+_request_db_stats: ContextVar[Optional[dict]] = ContextVar('request_db_stats', default=None)
+
+_metrics = {}
+
+
+def _create_metrics():
+    """创建指标对象（同一进程只创建一次）"""
+    if _metrics:
+        return _metrics
+    _metrics.update({
+        'requests': Counter(
+            'http_requests_total', '请求数',
+            ['method', 'endpoint', 'status']
+        ),
+        'latency': Histogram(
+            'http_request_duration_seconds', '请求耗时（秒）',
+            ['method', 'endpoint'],
+            buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+        ),
+        'response_bytes': Histogram(
+            'http_response_size_bytes', '响应体大小（字节）',
+            ['endpoint'],
+            buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+        ),
+        'db_queries': Histogram(
+            'http_request_db_queries', '每个请求的数据库查询次数',
+            ['endpoint'],
+            buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500)
+        ),
+        'db_seconds': Histogram(
+            'http_request_db_seconds', '每个请求的数据库查询总耗时（秒）',
+            ['endpoint'],
+            buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+        ),
+        'cache': Counter(
+            'cache_lookups_total', '缓存查询次数',
+            ['cache', 'result']
+        ),
+        'compression_ratio': Histogram(
+            'http_response_compression_ratio', '响应压缩比（原始大小/压缩后大小）',
+            ['endpoint', 'encoding'],
+            buckets=(1, 1.5, 2, 3, 4, 5, 7, 10, 15, 20, 30)
+        ),
+        'compression_bytes': Counter(
+            'http_response_compression_bytes_total', '压缩前后的响应字节数',
+            ['endpoint', 'encoding', 'stage']
+        ),
+    })
+    return _metrics
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _request_db_stats.get() is not None:
+        conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _request_db_stats.get()
+    if stats is None:
+        return
+    starts = conn.info.get('query_start_time')
+    if not starts:
+        return
+    stats['count'] += 1
+    stats['seconds'] += time.perf_counter() - starts.pop()
+
+
+def _handle_error(context):
+    # 执行失败的语句不会触发 after_cursor_execute，同样计入并弹出开始时间
+    conn = context.connection
+    if conn is not None:
+        _after_cursor_execute(conn, None, None, None, None, False)
+
+
+def endpoint_label(request) -> str:
+    """路由模板作为标签（/api/papers/<paper_id> 而不是具体ID，避免标签数量无限增长）"""
+    return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+
+def init_request_metrics(app):
+    """在 Flask 应用上注册请求计时与数据库查询统计"""
+    if not METRICS_ENABLED:
+        logger.info("ℹ️  请求指标未启用（METRICS_ENABLED=false）")
+        return False
+    if not PROMETHEUS_AVAILABLE:
+        logger.warning("prometheus_client 未安装，请求指标功能不可用")
+        logger.warning("安装命令: pip install prometheus_client")
+        return False
+
+    from flask import g, request
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    metrics = _create_metrics()
+    # 监听 Engine 类，覆盖各业务库（论文/招聘/新闻/B站/任务表/认证库）的所有引擎
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(Engine, 'handle_error', _handle_error)
+
+    @app.before_request
+    def _start_request_metrics():
+        g._metrics_start = time.perf_counter()
+        _request_db_stats.set({'count': 0, 'seconds': 0.0})
+
+    @app.after_request
+    def _collect_response_metrics(response):
+        g._metrics_status = response.status_code
+        if not response.is_streamed:
+            g._metrics_bytes = response.calculate_content_length()
+        return response
+
+    @app.teardown_request
+    def _record_request_metrics(exc):
+        start = g.pop('_metrics_start', None)
+        if start is None:
+            return
+        stats = _request_db_stats.get() or {'count': 0, 'seconds': 0.0}
+        _request_db_stats.set(None)
+        try:
+            endpoint = endpoint_label(request)
+            status = g.pop('_metrics_status', 500)
+            size = g.pop('_metrics_bytes', None)
+            metrics['requests'].labels(request.method, endpoint, str(status)).inc()
+            metrics['latency'].labels(request.method, endpoint).observe(time.perf_counter() - start)
+            metrics['db_queries'].labels(endpoint).observe(stats['count'])
+            metrics['db_seconds'].labels(endpoint).observe(stats['seconds'])
+            if size is not None:
+                metrics['response_bytes'].labels(endpoint).observe(size)
+        except Exception as e:
+            logger.error(f"记录请求指标失败: {e}")
+
+    logger.info("✅ 请求指标已启用")
+    return True
+
+
+def record_cache_lookup(cache: str, hit: bool):
+    """记录一次缓存查询（命中/未命中）"""
+    if _metrics:
+        _metrics['cache'].labels(cache, 'hit' if hit else 'miss').inc()
+
+
+def record_compression(endpoint: str, encoding: str, raw_bytes: int, compressed_bytes: int):
+    """记录一次响应压缩（原始大小与压缩后大小）"""
+    if _metrics and compressed_bytes:
+        _metrics['compression_ratio'].labels(endpoint, encoding).observe(raw_bytes / compressed_bytes)
+        _metrics['compression_bytes'].labels(endpoint, encoding, 'raw').inc(raw_bytes)
+        _metrics['compression_bytes'].labels(endpoint, encoding, 'compressed').inc(compressed_bytes)
+
+
+def render_metrics() -> Tuple[Optional[bytes], str]:
+    """
+    导出 Prometheus 文本格式指标
+
+    Returns:
+        (指标文本, Content-Type)，指标不可用时文本为 None
+    """
+    if not PROMETHEUS_AVAILABLE or not _metrics:
+        return None, 'text/plain; charset=utf-8'
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        # 多进程模式：汇总目录中所有 worker 写入的指标
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead(pid: int):
+    """gunicorn worker 退出时清理其多进程指标文件（见 gunicorn_config.child_exit）"""
+    if PROMETHEUS_AVAILABLE and os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.mark_process_dead(pid)
@@ -0,0 +1,174 @@
+"""
+响应压缩
+客户端支持时对超过 COMPRESS_MIN_BYTES 的文本/JSON 响应做 brotli 或 gzip 压缩，
+流式响应（如 SSE 任务进度）逐块压缩并立即 flush，不会攒到结束才发送。
+
+跳过：已设置 Content-Encoding 的响应（如预压缩的静态资源）、send_file 返回的文件、
+HEAD 请求、204/304、非文本类型。压缩比按路由记录到性能指标（request_metrics）。
+
+配置：
+    COMPRESS_ENABLED=true          # 关闭后不压缩（如已由 nginx 压缩）
+    COMPRESS_MIN_BYTES=1024        # 小于该大小的响应不压缩
+    COMPRESS_LEVEL=6               # gzip 压缩级别
+    COMPRESS_BR_QUALITY=5          # brotli 压缩质量（动态内容用低质量，压缩快）
+"""
+import gzip
+import logging
+import os
+import zlib
+from typing import Iterable, Iterator, Optional
+
+from request_metrics import endpoint_label, record_compression
+
+logger = logging.getLogger(__name__)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESS_ENABLED = os.getenv('COMPRESS_ENABLED', 'true').lower() == 'true'
+COMPRESS_MIN_BYTES = int(os.getenv('COMPRESS_MIN_BYTES', '1024'))
+COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', '6'))
+COMPRESS_BR_QUALITY = int(os.getenv('COMPRESS_BR_QUALITY', '5'))
+
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/javascript',
+    'application/xml',
+    'image/svg+xml',
+    'text/event-stream',
+}
+
+
+def _is_compressible(mimetype: Optional[str]) -> bool:
+    return bool(mimetype) and (mimetype.startswith('text/') or mimetype in COMPRESSIBLE_MIMETYPES)
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    按 Accept-Encoding 选择压缩算法（brotli 优先，q=0 表示不接受）
+
+    >>> choose_encoding('gzip, deflate')
+    'gzip'
+    >>> choose_encoding('gzip;q=0, identity') is None
+    True
+    """
+    accepted = set()
+    for item in (accept_encoding or '').lower().split(','):
+        name, _, params = item.strip().partition(';')
+        q = 1.0
+        for param in params.split(';'):
+            key, _, value = param.strip().partition('=')
+            if key == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if q > 0:
+            accepted.add(name.strip())
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data, quality=COMPRESS_BR_QUALITY)
+    return gzip.compress(data, compresslevel=COMPRESS_LEVEL)
+
+
+class _StreamCompressor:
+    """逐块压缩，每块之后 flush，保证客户端能立即解压出已发送的内容"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(quality=COMPRESS_BR_QUALITY)
+        else:
+            # wbits=31：gzip 格式
+            self._compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, chunk: bytes) -> bytes:
+        if self.encoding == 'br':
+            return self._compressor.process(chunk) + self._compressor.flush()
+        return self._compressor.compress(chunk) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        if self.encoding == 'br':
+            return self._compressor.finish()
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+def _compress_stream(chunks: Iterable, encoding: str, endpoint: str) -> Iterator[bytes]:
+    compressor = _StreamCompressor(encoding)
+    raw_bytes = compressed_bytes = 0
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode('utf-8')
+            if not chunk:
+                continue
+            raw_bytes += len(chunk)
+            out = compressor.compress(chunk)
+            compressed_bytes += len(out)
+            yield out
+        tail = compressor.finish()
+        compressed_bytes += len(tail)
+        yield tail
+    finally:
+        close = getattr(chunks, 'close', None)
+        if close is not None:
+            close()
+        if raw_bytes:
+            record_compression(endpoint, encoding, raw_bytes, compressed_bytes)
+
+
+def init_response_compression(app) -> bool:
+    """注册响应压缩（after_request）"""
+    if not COMPRESS_ENABLED:
+        logger.info("ℹ️  响应压缩未启用（COMPRESS_ENABLED=false）")
+        return False
+    if brotli is None:
+        logger.warning("brotli 未安装，响应压缩只使用 gzip（安装命令: pip install brotli）")
+
+    from flask import request
+
+    @app.after_request
+    def _compress_response(response):
+        if (request.method == 'HEAD'
+                or response.status_code < 200 or response.status_code in (204, 304)
+                or 'Content-Encoding' in response.headers
+                or response.direct_passthrough
+                or not _is_compressible(response.mimetype)):
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = choose_encoding(request.headers.get('Accept-Encoding', ''))
+        if encoding is None:
+            return response
+
+        endpoint = endpoint_label(request)
+        if response.is_streamed:
+            response.response = _compress_stream(response.response, encoding, endpoint)
+            response.headers.pop('Content-Length', None)
+        else:
+            data = response.get_data()
+            if len(data) < COMPRESS_MIN_BYTES:
+                return response
+            compressed = compress(data, encoding)
+            if len(compressed) >= len(data):
+                return response
+            response.set_data(compressed)
+            record_compression(endpoint, encoding, len(data), len(compressed))
+        response.headers['Content-Encoding'] = encoding
+        # 压缩后内容与原 ETag 对应的字节不同，改为弱 ETag
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
+
+    logger.info(f"✅ 响应压缩已启用（{'br/' if brotli is not None else ''}gzip，"
+                f"阈值 {COMPRESS_MIN_BYTES} 字节）")
+    return True
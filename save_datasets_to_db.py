@@ -3,7 +3,9 @@
 保存数据集信息到数据库
 """
 from typing import List
+from sqlalchemy import or_
 from datasets_models import get_datasets_session, Dataset
+from bulk_upsert import bulk_upsert
 from datetime import datetime
 import logging
 import json
@@ -88,9 +90,42 @@ def save_dataset_to_db(dataset_data: dict) -> tuple:
         session.close()
 
 
+# 来源数据中可直接写入的列
+DATASET_FIELDS = [
+    'name', 'description', 'category', 'publisher', 'publish_date', 'project_link',
+    'paper_link', 'dataset_link', 'scale', 'link', 'source', 'source_url'
+]
+
+
+def _dataset_row(dataset_data: dict) -> dict:
+    """将数据集信息字典转换为列字典（只包含提供了的列）"""
+    row = {field: dataset_data[field] for field in DATASET_FIELDS if field in dataset_data}
+    tags = dataset_data.get('tags', [])
+    row['tags'] = json.dumps(tags, ensure_ascii=False) if isinstance(tags, list) else tags
+    return row
+
+
+def _dataset_key(row: dict):
+    """去重键：有链接用链接，否则用名称（与 save_dataset_to_db 一致）"""
+    if row.get('link'):
+        return ('link', row.get('link'))
+    return ('name', row.get('name'))
+
+
+def _dataset_lookup(rows: List[dict]):
+    links = {row['link'] for row in rows if row.get('link')}
+    names = {row.get('name', '') for row in rows if not row.get('link')}
+    clauses = []
+    if links:
+        clauses.append(Dataset.link.in_(links))
+    if names:
+        clauses.append(Dataset.name.in_(names))
+    return or_(*clauses)
+
+
 def batch_save_datasets(datasets_list: List[dict]) -> dict:
     """
-    批量保存数据集信息
+    批量保存数据集信息（一次IN查询比对 + 单事务批量写入）
     
     Args:
         datasets_list: 数据集信息列表
@@ -98,27 +133,17 @@ def batch_save_datasets(datasets_list: List[dict]) -> dict:
     Returns:
         统计信息
     """
-    stats = {
-        'total': len(datasets_list),
-        'created': 0,
-        'updated': 0,
-        'skipped': 0,
-        'error': 0
-    }
-    
-    for dataset_data in datasets_list:
-        success, status = save_dataset_to_db(dataset_data)
-        if success:
-            if status == 'created':
-                stats['created'] += 1
-            elif status == 'updated':
-                stats['updated'] += 1
-            elif status == 'skipped':
-                stats['skipped'] += 1
-        else:
-            stats['error'] += 1
-    
-    return stats
+    return bulk_upsert(
+        get_datasets_session,
+        Dataset,
+        [_dataset_row(dataset_data) for dataset_data in datasets_list],
+        key_fields=['name', 'link'],
+        key_of=_dataset_key,
+        lookup_clause=_dataset_lookup,
+        update_fields=DATASET_FIELDS + ['tags'],
+        defaults={'name': '', 'source': 'juejin'},
+        label='数据集',
+    )
 
 
 if __name__ == "__main__":
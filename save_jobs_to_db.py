@@ -4,16 +4,61 @@
 使用独立的招聘信息数据库
 """
 from typing import List
-from jobs_models import get_jobs_session, Job
-from datetime import datetime
+from sqlalchemy import or_, and_
+from jobs_models import get_jobs_session, Job, parse_update_date, JOB_LINK_CONFLICT, JOB_TITLE_CONFLICT
+from bulk_upsert import bulk_upsert, insert_on_conflict
+from utils import canonical_url, title_hash
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+# 来源数据中可直接写入的列
+JOB_FIELDS = ['title', 'description', 'link', 'update_date', 'source_date', 'company', 'location', 'job_type']
+# 已存在记录允许更新的列（source_date 参与去重，不更新）
+JOB_UPDATE_FIELDS = [
+    'title', 'description', 'link', 'canonical_link', 'title_hash',
+    'update_date', 'update_day', 'company', 'location', 'job_type'
+]
+
+
+def _job_row(job_data: dict) -> dict:
+    """将招聘信息字典转换为列字典（只包含提供了的列，外加去重列）"""
+    row = {field: job_data[field] for field in JOB_FIELDS if field in job_data}
+    if 'update_date' in row:
+        row['update_day'] = parse_update_date(row['update_date'])
+    row['canonical_link'] = canonical_url(job_data.get('link'))
+    row['title_hash'] = title_hash(job_data.get('title', ''))
+    # 唯一索引不比较 NULL，没有日期的记录用空字符串参与去重
+    row['source_date'] = job_data.get('source_date') or ''
+    return row
+
+
+def _job_key(row: dict):
+    """去重键：规范化链接+日期，没有链接时使用标题哈希+日期（对应两个部分唯一索引）"""
+    if row.get('canonical_link'):
+        return ('link', row['canonical_link'], row.get('source_date'))
+    return ('title', row.get('title_hash'), row.get('source_date'))
+
+
+def _job_conflict_target(row: dict):
+    return JOB_LINK_CONFLICT if row.get('canonical_link') else JOB_TITLE_CONFLICT
+
+
+def _job_lookup(rows: List[dict]):
+    links = {row['canonical_link'] for row in rows if row.get('canonical_link')}
+    hashes = {row['title_hash'] for row in rows if not row.get('canonical_link')}
+    clauses = []
+    if links:
+        clauses.append(Job.canonical_link.in_(links))
+    if hashes:
+        clauses.append(and_(Job.canonical_link == '', Job.title_hash.in_(hashes)))
+    return or_(*clauses)
+
+
 def save_job_to_db(job_data: dict) -> tuple:
     """
-    保存招聘信息到数据库
+    保存招聘信息到数据库（INSERT ... ON CONFLICT DO UPDATE）
     
     Args:
         job_data: 招聘信息字典
@@ -24,50 +69,20 @@ def save_job_to_db(job_data: dict) -> tuple:
     session = get_jobs_session()
     
     try:
-        link = job_data.get('link')
-        source_date = job_data.get('source_date')
-        title = job_data.get('title', '')
+        row = {'title': '', **_job_row(job_data)}
         
-        # 去重策略：基于链接+日期，如果没有链接则使用标题+日期
-        if link:
-            existing = session.query(Job).filter(
-                Job.link == link,
-                Job.source_date == source_date
-            ).first()
-        else:
-            existing = session.query(Job).filter(
-                Job.title == title,
-                Job.source_date == source_date
-            ).first()
+        # 去重策略：基于链接+日期，如果没有链接则使用标题+日期（均走唯一索引）
+        existed = session.query(
+            session.query(Job.id).filter(_job_lookup([row]), Job.source_date == row.get('source_date')).exists()
+        ).scalar()
         
-        if existing:
-            # 更新现有记录
-            existing.title = job_data.get('title', existing.title)
-            existing.description = job_data.get('description', existing.description)
-            existing.link = job_data.get('link', existing.link)
-            existing.update_date = job_data.get('update_date', existing.update_date)
-            existing.company = job_data.get('company', existing.company)
-            existing.location = job_data.get('location', existing.location)
-            existing.job_type = job_data.get('job_type', existing.job_type)
-            existing.updated_at = datetime.now()
-            session.commit()
-            return True, 'updated'
-        
-        # 创建新记录
-        job = Job(
-            title=job_data.get('title', ''),
-            description=job_data.get('description'),
-            link=job_data.get('link'),
-            update_date=job_data.get('update_date'),
-            source_date=job_data.get('source_date'),
-            company=job_data.get('company'),
-            location=job_data.get('location'),
-            job_type=job_data.get('job_type')
+        index_elements, index_where = _job_conflict_target(row)
+        insert_on_conflict(
+            session, Job, [row], index_elements, index_where,
+            update_fields=[f for f in JOB_UPDATE_FIELDS if f in row]
         )
-        
-        session.add(job)
         session.commit()
-        return True, 'created'
+        return True, 'updated' if existed else 'created'
     
     except Exception as e:
         session.rollback()
@@ -80,7 +95,7 @@ def save_job_to_db(job_data: dict) -> tuple:
 
 def batch_save_jobs(jobs_list: List[dict]) -> dict:
     """
-    批量保存招聘信息
+    批量保存招聘信息（一次IN查询比对 + 单事务批量写入）
     
     Args:
         jobs_list: 招聘信息列表
@@ -88,27 +103,18 @@ def batch_save_jobs(jobs_list: List[dict]) -> dict:
     Returns:
         统计信息: {'total': 总数, 'created': 新建, 'updated': 更新, 'skipped': 跳过, 'error': 错误}
     """
-    stats = {
-        'total': len(jobs_list),
-        'created': 0,
-        'updated': 0,
-        'skipped': 0,
-        'error': 0
-    }
-    
-    for job_data in jobs_list:
-        success, status = save_job_to_db(job_data)
-        if success:
-            if status == 'created':
-                stats['created'] += 1
-            elif status == 'updated':
-                stats['updated'] += 1
-            elif status == 'skipped':
-                stats['skipped'] += 1
-        else:
-            stats['error'] += 1
-    
-    return stats
+    return bulk_upsert(
+        get_jobs_session,
+        Job,
+        [_job_row(job_data) for job_data in jobs_list],
+        key_fields=['canonical_link', 'title_hash', 'source_date'],
+        key_of=_job_key,
+        lookup_clause=_job_lookup,
+        update_fields=JOB_UPDATE_FIELDS,
+        defaults={'title': ''},
+        label='招聘信息',
+        conflict_target_of=_job_conflict_target,
+    )
 
 
 if __name__ == "__main__":
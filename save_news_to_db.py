@@ -7,13 +7,77 @@ from typing import List, Dict, Optional
 from datetime import datetime
 import json
 from news_models import get_news_session, News
+from bulk_upsert import bulk_upsert, insert_on_conflict
+from utils import canonical_url, title_hash
 
 logger = logging.getLogger(__name__)
 
 
+def _parse_published_at(pub_time) -> Optional[datetime]:
+    """解析发布时间（支持 datetime、"YYYY-MM-DD HH:MM:SS" 和 ISO 格式）"""
+    if not pub_time:
+        return None
+    published_at = None
+    try:
+        if isinstance(pub_time, str):
+            # 尝试解析ISO格式（YYYY-MM-DD HH:MM:SS 或 YYYY-MM-DDTHH:MM:SS）
+            try:
+                # 标准格式：YYYY-MM-DD HH:MM:SS
+                if ' ' in pub_time and len(pub_time) == 19:
+                    published_at = datetime.strptime(pub_time, '%Y-%m-%d %H:%M:%S')
+                # ISO格式：YYYY-MM-DDTHH:MM:SS
+                elif 'T' in pub_time:
+                    published_at = datetime.fromisoformat(pub_time.replace('Z', '+00:00'))
+                else:
+                    published_at = datetime.fromisoformat(pub_time)
+            except:
+                # 如果解析失败，尝试其他格式
+                try:
+                    published_at = datetime.strptime(pub_time, '%Y-%m-%d %H:%M:%S')
+                except:
+                    pass
+        elif isinstance(pub_time, datetime):
+            # 直接使用datetime对象
+            published_at = pub_time
+    except Exception as e:
+        logger.warning(f"解析发布时间失败: {e}, 时间数据: {pub_time}")
+    return published_at
+
+
+# 已存在记录允许更新的列（不更新标题/链接/发布时间）
+NEWS_UPDATE_FIELDS = ['description', 'source', 'platform', 'image_url', 'author', 'tags']
+# 去重唯一索引（见 news_models.News）
+NEWS_CONFLICT_COLUMNS = ['canonical_link', 'title_hash']
+
+
+def _news_row(news_data: Dict) -> Dict:
+    """将新闻字典转换为列字典（只包含提供了的列，外加去重列）"""
+    row = {field: news_data[field] for field in ['title', 'description', 'link', 'source', 'platform', 'image_url', 'author']
+           if field in news_data}
+    row['published_at'] = _parse_published_at(news_data.get('published_at'))
+    tags = news_data.get('tags', [])
+    row['tags'] = json.dumps(tags, ensure_ascii=False) if isinstance(tags, list) else tags
+    row['canonical_link'] = canonical_url(news_data.get('link'))
+    row['title_hash'] = title_hash(news_data.get('title', ''))
+    return row
+
+
+def _news_key(row: Dict):
+    """去重键：规范化链接+标题哈希（对应唯一索引）"""
+    return (row.get('canonical_link') or '', row.get('title_hash'))
+
+
+def _news_conflict_target(row: Dict):
+    return NEWS_CONFLICT_COLUMNS, None
+
+
+def _news_lookup(rows: List[Dict]):
+    return News.title_hash.in_({row['title_hash'] for row in rows})
+
+
 def save_news_to_db(news_data: Dict) -> tuple[bool, str]:
     """
-    保存单条新闻到数据库
+    保存单条新闻到数据库（INSERT ... ON CONFLICT DO UPDATE）
     
     Args:
         news_data: 新闻数据字典
@@ -24,72 +88,22 @@ def save_news_to_db(news_data: Dict) -> tuple[bool, str]:
     session = get_news_session()
     
     try:
-        # 检查是否已存在（基于标题和链接）
-        existing = session.query(News).filter(
-            News.title == news_data.get('title', ''),
-            News.link == news_data.get('link', '')
-        ).first()
-        
-        if existing:
-            # 更新现有记录
-            existing.description = news_data.get('description', existing.description)
-            existing.source = news_data.get('source', existing.source)
-            existing.platform = news_data.get('platform', existing.platform)
-            existing.image_url = news_data.get('image_url', existing.image_url)
-            existing.author = news_data.get('author', existing.author)
-            tags = news_data.get('tags', [])
-            existing.tags = json.dumps(tags, ensure_ascii=False) if isinstance(tags, list) else tags
-            existing.updated_at = datetime.now()
-            session.commit()
-            return True, 'updated'
+        row = {'title': '', 'source': 'orz', 'platform': '', **_news_row(news_data)}
         
-        # 解析发布时间
-        published_at = None
-        if news_data.get('published_at'):
-            try:
-                # 尝试解析各种时间格式
-                pub_time = news_data['published_at']
-                if isinstance(pub_time, str):
-                    # 尝试解析ISO格式（YYYY-MM-DD HH:MM:SS 或 YYYY-MM-DDTHH:MM:SS）
-                    try:
-                        # 标准格式：YYYY-MM-DD HH:MM:SS
-                        if ' ' in pub_time and len(pub_time) == 19:
-                            published_at = datetime.strptime(pub_time, '%Y-%m-%d %H:%M:%S')
-                        # ISO格式：YYYY-MM-DDTHH:MM:SS
-                        elif 'T' in pub_time:
-                            published_at = datetime.fromisoformat(pub_time.replace('Z', '+00:00'))
-                        else:
-                            published_at = datetime.fromisoformat(pub_time)
-                    except:
-                        # 如果解析失败，尝试其他格式
-                        try:
-                            published_at = datetime.strptime(pub_time, '%Y-%m-%d %H:%M:%S')
-                        except:
-                            pass
-                elif isinstance(pub_time, datetime):
-                    # 直接使用datetime对象
-                    published_at = pub_time
-            except Exception as e:
-                logger.warning(f"解析发布时间失败: {e}, 时间数据: {news_data.get('published_at')}")
-                pass
+        # 检查是否已存在（基于规范化链接和标题哈希，走唯一索引）
+        existed = session.query(
+            session.query(News.id).filter(
+                News.canonical_link == row['canonical_link'],
+                News.title_hash == row['title_hash']
+            ).exists()
+        ).scalar()
         
-        # 创建新记录
-        tags = news_data.get('tags', [])
-        news = News(
-            title=news_data.get('title', ''),
-            description=news_data.get('description'),
-            link=news_data.get('link'),
-            source=news_data.get('source', 'orz'),
-            platform=news_data.get('platform', ''),
-            published_at=published_at,
-            image_url=news_data.get('image_url'),
-            author=news_data.get('author'),
-            tags=json.dumps(tags, ensure_ascii=False) if isinstance(tags, list) else None
+        insert_on_conflict(
+            session, News, [row], NEWS_CONFLICT_COLUMNS,
+            update_fields=[f for f in NEWS_UPDATE_FIELDS if f in row]
         )
-        
-        session.add(news)
         session.commit()
-        return True, 'created'
+        return True, 'updated' if existed else 'created'
     
     except Exception as e:
         session.rollback()
@@ -102,7 +116,7 @@ def save_news_to_db(news_data: Dict) -> tuple[bool, str]:
 
 def batch_save_news(news_list: List[Dict]) -> Dict[str, int]:
     """
-    批量保存新闻到数据库
+    批量保存新闻到数据库（一次IN查询比对 + 单事务批量写入）
     
     Args:
         news_list: 新闻数据列表
@@ -110,28 +124,18 @@ def batch_save_news(news_list: List[Dict]) -> Dict[str, int]:
     Returns:
         统计信息字典
     """
-    stats = {
-        'total': len(news_list),
-        'created': 0,
-        'updated': 0,
-        'skipped': 0,
-        'error': 0
-    }
-    
-    for news_data in news_list:
-        success, status = save_news_to_db(news_data)
-        
-        if success:
-            if status == 'created':
-                stats['created'] += 1
-            elif status == 'updated':
-                stats['updated'] += 1
-            elif status == 'skipped':
-                stats['skipped'] += 1
-        else:
-            stats['error'] += 1
-    
-    return stats
+    return bulk_upsert(
+        get_news_session,
+        News,
+        [_news_row(news_data) for news_data in news_list],
+        key_fields=['canonical_link', 'title_hash'],
+        key_of=_news_key,
+        lookup_clause=_news_lookup,
+        update_fields=NEWS_UPDATE_FIELDS,
+        defaults={'title': '', 'source': 'orz', 'platform': ''},
+        label='新闻',
+        conflict_target_of=_news_conflict_target,
+    )
 
 
 if __name__ == "__main__":
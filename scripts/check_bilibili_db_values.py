@@ -24,7 +24,7 @@ def main():
     print("\n方法1：直接SQL查询")
     print("-" * 60)
     
-    bilibili_db_url = os.getenv('BILIBILI_DATABASE_URL', 'sqlite:///./bilibili.db')
+    bilibili_db_url = os.getenv('BILIBILI_DATABASE_URL', os.getenv('DATABASE_URL', 'sqlite:///./bilibili.db'))
     print(f"数据库URL: {bilibili_db_url}")
     
     engine = create_engine(bilibili_db_url)
@@ -28,7 +28,7 @@ if bilibili_models_path.exists():
         if 'BILIBILI_DATABASE_URL = os.getenv' in content:
             # 提取默认值
             import re
-            match = re.search(r"BILIBILI_DATABASE_URL = os\.getenv\('BILIBILI_DATABASE_URL', '([^']+)'\)", content)
+            match = re.search(r"BILIBILI_DATABASE_URL = os\.getenv\('BILIBILI_DATABASE_URL', (?:os\.getenv\('DATABASE_URL', )?'([^']+)'\)", content)
             if match:
                 default_db = match.group(1)
                 print(f"✅ 默认数据库URL: {default_db}")
@@ -76,7 +76,7 @@ if env_file.exists():
                     print(f"   BILIBILI_DATABASE_URL: {db_url}")
         if not found_bilibili:
             print("   ⚠️  .env文件中未设置BILIBILI_DATABASE_URL")
-            print("   ⚠️  将使用代码中的默认值: sqlite:///./bilibili.db")
+            print("   ⚠️  将使用DATABASE_URL，未设置时使用默认值: sqlite:///./bilibili.db")
 else:
     print("❌ 未找到.env文件")
     print("   ⚠️  将使用代码中的默认值: sqlite:///./bilibili.db")
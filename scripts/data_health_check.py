@@ -2,6 +2,8 @@
 """
 数据健康检查脚本
 全面检查网站数据的可用性和可靠性
+
+--snapshot: 论文统计从列式快照读取（见 snapshot_export.py）
 """
 import sys
 import os
@@ -26,10 +28,61 @@ logger = logging.getLogger(__name__)
 class DataHealthChecker:
     """数据健康检查器"""
     
-    def __init__(self):
+    def __init__(self, use_snapshot=False):
         self.issues = []
         self.warnings = []
         self.info = []
+        # 论文统计从列式快照读取（见 snapshot_export.py），不扫描线上库
+        self.use_snapshot = use_snapshot
+    
+    def _paper_stats_from_db(self, today_start, yesterday_start, week_ago):
+        session = get_session()
+        try:
+            latest_paper = session.query(Paper).order_by(Paper.publish_date.desc()).first()
+            last_update = session.query(Paper).order_by(Paper.updated_at.desc()).first()
+            return {
+                'total': session.query(Paper).count(),
+                'latest_date': latest_paper.publish_date if latest_paper else None,
+                'today': session.query(Paper).filter(Paper.created_at >= today_start).count(),
+                'yesterday': session.query(Paper).filter(
+                    Paper.created_at >= yesterday_start,
+                    Paper.created_at < today_start
+                ).count(),
+                'week': session.query(Paper).filter(Paper.created_at >= week_ago).count(),
+                'uncategorized': session.query(Paper).filter(
+                    Paper.category == 'Uncategorized'
+                ).count(),
+                'last_update': last_update.updated_at if last_update else None,
+            }
+        finally:
+            session.close()
+    
+    def _paper_stats_from_snapshot(self, today_start, yesterday_start, week_ago):
+        from snapshot_export import iter_rows, read_manifest
+        manifest = read_manifest('papers')
+        if manifest:
+            self.info.append(f"论文快照导出时间: {manifest.get('exported_at')}")
+            logger.info(f"论文快照导出时间: {manifest.get('exported_at')}")
+        stats = {'total': 0, 'latest_date': None, 'today': 0, 'yesterday': 0,
+                 'week': 0, 'uncategorized': 0, 'last_update': None}
+        columns = ['publish_date', 'created_at', 'updated_at', 'category']
+        for row in iter_rows('papers', columns=columns):
+            stats['total'] += 1
+            if row['publish_date'] and (stats['latest_date'] is None or row['publish_date'] > stats['latest_date']):
+                stats['latest_date'] = row['publish_date']
+            if row['updated_at'] and (stats['last_update'] is None or row['updated_at'] > stats['last_update']):
+                stats['last_update'] = row['updated_at']
+            created_at = row['created_at']
+            if created_at:
+                if created_at >= today_start:
+                    stats['today'] += 1
+                elif created_at >= yesterday_start:
+                    stats['yesterday'] += 1
+                if created_at >= week_ago:
+                    stats['week'] += 1
+            if row['category'] == 'Uncategorized':
+                stats['uncategorized'] += 1
+        return stats
     
     def check_papers_data(self):
         """检查论文数据健康状态"""
@@ -37,17 +90,24 @@ class DataHealthChecker:
         logger.info("检查论文数据...")
         logger.info("=" * 60)
         
-        session = get_session()
         try:
+            today = date.today()
+            today_start = datetime.combine(today, datetime.min.time())
+            yesterday_start = datetime.combine(today - timedelta(days=1), datetime.min.time())
+            week_ago = datetime.now() - timedelta(days=7)
+            if self.use_snapshot:
+                stats = self._paper_stats_from_snapshot(today_start, yesterday_start, week_ago)
+            else:
+                stats = self._paper_stats_from_db(today_start, yesterday_start, week_ago)
+            
             # 1. 检查总论文数
-            total_papers = session.query(Paper).count()
+            total_papers = stats['total']
             self.info.append(f"总论文数: {total_papers}")
             logger.info(f"总论文数: {total_papers}")
             
             # 2. 检查最新论文日期
-            latest_paper = session.query(Paper).order_by(Paper.publish_date.desc()).first()
-            if latest_paper and latest_paper.publish_date:
-                latest_date = latest_paper.publish_date
+            if stats['latest_date']:
+                latest_date = stats['latest_date']
                 days_ago = (date.today() - latest_date).days
                 self.info.append(f"最新论文日期: {latest_date} ({days_ago}天前)")
                 logger.info(f"最新论文日期: {latest_date} ({days_ago}天前)")
@@ -63,22 +123,12 @@ class DataHealthChecker:
                 logger.error(issue)
             
             # 3. 检查今天是否有新论文
-            today = date.today()
-            today_start = datetime.combine(today, datetime.min.time())
-            today_papers = session.query(Paper).filter(
-                Paper.created_at >= today_start
-            ).count()
+            today_papers = stats['today']
             self.info.append(f"今天新增论文: {today_papers}篇")
             logger.info(f"今天新增论文: {today_papers}篇")
             
             # 4. 检查昨天是否有新论文
-            yesterday = today - timedelta(days=1)
-            yesterday_start = datetime.combine(yesterday, datetime.min.time())
-            today_start = datetime.combine(today, datetime.min.time())
-            yesterday_papers = session.query(Paper).filter(
-                Paper.created_at >= yesterday_start,
-                Paper.created_at < today_start
-            ).count()
+            yesterday_papers = stats['yesterday']
             self.info.append(f"昨天新增论文: {yesterday_papers}篇")
             logger.info(f"昨天新增论文: {yesterday_papers}篇")
             
@@ -88,28 +138,23 @@ class DataHealthChecker:
                 logger.warning(warning)
             
             # 5. 检查最近7天的论文数量
-            week_ago = datetime.now() - timedelta(days=7)
-            week_papers = session.query(Paper).filter(
-                Paper.created_at >= week_ago
-            ).count()
+            week_papers = stats['week']
             self.info.append(f"最近7天新增论文: {week_papers}篇")
             logger.info(f"最近7天新增论文: {week_papers}篇")
             
             # 6. 检查未分类论文
-            uncategorized = session.query(Paper).filter(
-                Paper.category == 'Uncategorized'
-            ).count()
+            uncategorized = stats['uncategorized']
             if uncategorized > 0:
                 warning = f"⚠️  有{uncategorized}篇未分类论文"
                 self.warnings.append(warning)
                 logger.warning(warning)
             
             # 7. 检查最后更新时间
-            last_update = session.query(Paper).order_by(Paper.updated_at.desc()).first()
-            if last_update and last_update.updated_at:
-                hours_ago = (datetime.now() - last_update.updated_at).total_seconds() / 3600
-                self.info.append(f"最后更新时间: {last_update.updated_at} ({hours_ago:.1f}小时前)")
-                logger.info(f"最后更新时间: {last_update.updated_at} ({hours_ago:.1f}小时前)")
+            if stats['last_update']:
+                last_updated_at = stats['last_update']
+                hours_ago = (datetime.now() - last_updated_at).total_seconds() / 3600
+                self.info.append(f"最后更新时间: {last_updated_at} ({hours_ago:.1f}小时前)")
+                logger.info(f"最后更新时间: {last_updated_at} ({hours_ago:.1f}小时前)")
                 
                 if hours_ago > 25:  # 超过25小时
                     warning = f"⚠️  数据最后更新时间是{hours_ago:.1f}小时前，可能没有及时更新"
@@ -120,8 +165,6 @@ class DataHealthChecker:
             issue = f"❌ 检查论文数据失败: {e}"
             self.issues.append(issue)
             logger.error(issue, exc_info=True)
-        finally:
-            session.close()
     
     def check_bilibili_data(self):
         """检查B站数据健康状态"""
@@ -355,7 +398,7 @@ class DataHealthChecker:
 
 def main():
     """主函数"""
-    checker = DataHealthChecker()
+    checker = DataHealthChecker(use_snapshot='--snapshot' in sys.argv)
     
     # 执行各项检查
     checker.check_scheduler_status()
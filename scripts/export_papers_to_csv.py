@@ -1,6 +1,10 @@
 #!/usr/bin/env python3
 """
 导出论文数据为CSV格式
+
+用法：
+    python scripts/export_papers_to_csv.py [输出文件] [--snapshot]
+    --snapshot: 从列式快照读取（见 snapshot_export.py），不扫描线上库
 """
 import sys
 import os
@@ -10,9 +14,18 @@ from datetime import datetime
 # 添加项目根目录到路径
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from types import SimpleNamespace
+
 from models import get_session, Paper
 
-def export_papers_to_csv(output_file='papers_export.csv'):
+def _load_papers_from_snapshot():
+    """从快照读取全部论文，按发布日期倒序"""
+    from snapshot_export import iter_rows
+    papers = [SimpleNamespace(**row) for row in iter_rows('papers')]
+    papers.sort(key=lambda p: p.publish_date or datetime.min.date(), reverse=True)
+    return papers
+
+def export_papers_to_csv(output_file='papers_export.csv', from_snapshot=False):
     """导出所有论文数据为CSV格式"""
     session = None
     try:
@@ -20,11 +33,14 @@ def export_papers_to_csv(output_file='papers_export.csv'):
         print("开始导出论文数据...")
         print("=" * 60)
         
-        # 获取数据库会话
-        session = get_session()
-        
-        # 查询所有论文，按发布日期倒序
-        papers = session.query(Paper).order_by(Paper.publish_date.desc()).all()
+        if from_snapshot:
+            papers = _load_papers_from_snapshot()
+        else:
+            # 获取数据库会话
+            session = get_session()
+            
+            # 查询所有论文，按发布日期倒序
+            papers = session.query(Paper).order_by(Paper.publish_date.desc()).all()
         
         total_count = len(papers)
         print(f"📊 查询到 {total_count} 篇论文")
@@ -129,9 +145,11 @@ if __name__ == '__main__':
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     output_file = f'papers_export_{timestamp}.csv'
     
+    args = [arg for arg in sys.argv[1:] if arg != '--snapshot']
+    
     # 如果提供了命令行参数，使用指定的文件名
-    if len(sys.argv) > 1:
-        output_file = sys.argv[1]
+    if args:
+        output_file = args[0]
     
-    export_papers_to_csv(output_file)
+    export_papers_to_csv(output_file, from_snapshot='--snapshot' in sys.argv)
 
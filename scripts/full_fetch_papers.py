@@ -26,13 +26,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def fetch_full_papers(days_back=3, max_results_per_query=100):
+def fetch_full_papers(days_back=3, max_results_per_query=100, task_progress=None):
     """
     全量抓取论文（使用宽泛的关键词查询）
     
     Args:
         days_back: 抓取最近N天的论文（默认3天）
         max_results_per_query: 每个查询的最大结果数（默认100）
+        task_progress: 任务进度上报器（task_queue.TaskProgress，可选），先按查询、再按论文上报进度及入库/跳过/失败数
     """
     logger.info("=" * 60)
     logger.info("开始全量抓取论文（宽泛关键词查询）")
@@ -72,8 +73,13 @@ def fetch_full_papers(days_back=3, max_results_per_query=100):
     
     all_papers = {}  # 使用字典去重（key: paper_id）
     total_fetched = 0
+    if task_progress is not None:
+        task_progress.update(progress=0, total=len(broad_queries),
+                             message=f'正在执行 {len(broad_queries)} 个宽泛查询...', force=True)
     
     for i, query in enumerate(broad_queries, 1):
+        if task_progress is not None:
+            task_progress.update(progress=i - 1, current=query[:50])
         try:
             # 构建完整查询（添加日期过滤）
             full_query = f"({query}) AND {date_filter}"
@@ -112,11 +118,16 @@ def fetch_full_papers(days_back=3, max_results_per_query=100):
     # 保存到数据库
     if all_papers:
         logger.info("开始保存到数据库...")
+        if task_progress is not None:
+            task_progress.update(progress=0, total=len(all_papers),
+                                 message=f'获取到 {len(all_papers)} 篇唯一论文，正在保存...', force=True)
         session = get_session()
         saved_count = 0
         skipped_count = 0
         
         for i, (paper_id, result) in enumerate(all_papers.items(), 1):
+            if task_progress is not None:
+                task_progress.update(progress=i - 1, current=paper_id)
             try:
                 # 构建论文数据
                 paper_data = {
@@ -144,6 +155,8 @@ def fetch_full_papers(days_back=3, max_results_per_query=100):
                     saved_count += 1
                 elif action == 'skipped':
                     skipped_count += 1
+                if task_progress is not None:
+                    task_progress.incr('saved' if success else 'skipped' if action == 'skipped' else 'failed')
                 
                 # 每50篇输出一次进度
                 if i % 50 == 0:
@@ -151,6 +164,8 @@ def fetch_full_papers(days_back=3, max_results_per_query=100):
             
             except Exception as e:
                 logger.error(f"保存论文失败 {paper_id}: {e}")
+                if task_progress is not None:
+                    task_progress.incr('failed')
                 continue
         
         session.close()
@@ -161,8 +176,12 @@ def fetch_full_papers(days_back=3, max_results_per_query=100):
         logger.info(f"  ✅ 新增: {saved_count} 篇")
         logger.info(f"  ⏭️  跳过: {skipped_count} 篇（重复）")
         logger.info("=" * 60)
+        if task_progress is not None:
+            task_progress.update(progress=len(all_papers), message='论文保存完成', force=True)
     else:
         logger.info("没有找到新论文")
+        if task_progress is not None:
+            task_progress.update(progress=len(broad_queries), message='没有找到新论文', force=True)
 
 if __name__ == '__main__':
     import argparse
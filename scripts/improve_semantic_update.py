@@ -17,13 +17,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def update_recent_papers(days=30, limit=None):
+def update_recent_papers(days=30, limit=None, task_progress=None):
     """
     更新最近N天的论文（增量更新）
     
     Args:
         days: 更新最近N天的论文（默认30天）
         limit: 限制更新的论文数量（None表示全部）
+        task_progress: 任务进度上报器（task_queue.TaskProgress，可选）
     """
     session = get_session()
     
@@ -42,6 +43,8 @@ def update_recent_papers(days=30, limit=None):
         total = len(papers)
         
         logger.info(f"找到 {total} 篇最近{days}天的论文（将进行增量更新）")
+        if task_progress is not None:
+            task_progress.update(progress=0, total=total, message=f'找到 {total} 篇最近{days}天的论文', force=True)
         
         if total == 0:
             logger.info("没有需要更新的论文")
@@ -60,12 +63,18 @@ def update_recent_papers(days=30, limit=None):
                     if days_since_update < 7:
                         skipped_count += 1
                         needs_update = False
+                        if task_progress is not None:
+                            task_progress.incr('skipped')
+                            task_progress.update(progress=idx)
                         logger.debug(f"[{idx}/{total}] 跳过（7天内已更新）: {paper.id}")
                 
                 if not needs_update:
                     continue
                 
                 logger.info(f"[{idx}/{total}] 更新论文: {paper.id} - {paper.title[:50]}...")
+                if task_progress is not None:
+                    task_progress.update(progress=idx, current=paper.id,
+                                         message=f'正在更新: {paper.title[:50]}... ({idx}/{total})')
                 
                 supplement_data = get_paper_supplement_data(paper.id)
                 
@@ -85,9 +94,13 @@ def update_recent_papers(days=30, limit=None):
                     session.commit()
                     success_count += 1
                     logger.info(f"  ✅ 成功: 引用数={paper.citation_count}, 机构数={len(affiliations)}")
+                    if task_progress is not None:
+                        task_progress.incr('success')
                 else:
                     fail_count += 1
                     logger.warning(f"  ⚠️  未获取到数据")
+                    if task_progress is not None:
+                        task_progress.incr('failed')
                 
                 # 添加延迟以避免速率限制
                 if idx < total:
@@ -97,6 +110,8 @@ def update_recent_papers(days=30, limit=None):
                 fail_count += 1
                 logger.error(f"  ❌ 更新失败: {e}")
                 session.rollback()
+                if task_progress is not None:
+                    task_progress.incr('failed')
                 continue
         
         logger.info("=" * 60)
@@ -109,13 +124,14 @@ def update_recent_papers(days=30, limit=None):
         session.close()
 
 
-def update_all_papers_incremental(limit=None, skip_recent=True):
+def update_all_papers_incremental(limit=None, skip_recent=True, task_progress=None):
     """
     增量更新所有论文的Semantic Scholar数据
     
     Args:
         limit: 限制更新的论文数量（None表示全部）
         skip_recent: 是否跳过最近7天已更新的论文
+        task_progress: 任务进度上报器（task_queue.TaskProgress，可选）
     """
     session = get_session()
     
@@ -141,6 +157,8 @@ def update_all_papers_incremental(limit=None, skip_recent=True):
         total = len(papers)
         
         logger.info(f"找到 {total} 篇需要更新的论文（增量更新）")
+        if task_progress is not None:
+            task_progress.update(progress=0, total=total, message=f'找到 {total} 篇需要更新的论文', force=True)
         
         if total == 0:
             logger.info("没有需要更新的论文")
@@ -152,6 +170,9 @@ def update_all_papers_incremental(limit=None, skip_recent=True):
         for idx, paper in enumerate(papers, 1):
             try:
                 logger.info(f"[{idx}/{total}] 更新论文: {paper.id} - {paper.title[:50]}...")
+                if task_progress is not None:
+                    task_progress.update(progress=idx, current=paper.id,
+                                         message=f'正在更新: {paper.title[:50]}... ({idx}/{total})')
                 
                 supplement_data = get_paper_supplement_data(paper.id)
                 
@@ -171,9 +192,13 @@ def update_all_papers_incremental(limit=None, skip_recent=True):
                     session.commit()
                     success_count += 1
                     logger.info(f"  ✅ 成功: 引用数={paper.citation_count}, 机构数={len(affiliations)}")
+                    if task_progress is not None:
+                        task_progress.incr('success')
                 else:
                     fail_count += 1
                     logger.warning(f"  ⚠️  未获取到数据")
+                    if task_progress is not None:
+                        task_progress.incr('failed')
                 
                 # 添加延迟以避免速率限制
                 if idx < total:
@@ -183,6 +208,8 @@ def update_all_papers_incremental(limit=None, skip_recent=True):
                 fail_count += 1
                 logger.error(f"  ❌ 更新失败: {e}")
                 session.rollback()
+                if task_progress is not None:
+                    task_progress.incr('failed')
                 continue
         
         logger.info("=" * 60)
@@ -2,44 +2,36 @@
 # -*- coding: utf-8 -*-
 """
 稳妥更新视频播放量数据
-支持分批更新、错误重试、进度保存
+按刷新优先级（预计陈旧程度）排序，每次运行只请求固定数量的视频（请求预算）；
+支持分批更新、错误重试，进度以每批提交的方式保存在数据库中
+
+刷新优先级 = 距上次刷新以来预计增长的播放量 / 当前播放量：
+- 播放速度优先取 bilibili_video_stats 历史记录中观测到的速度，没有历史时按发布以来的平均速度估算
+  （新发布的视频平均速度高，自然排在前面）
+- 上次刷新时间取最近一次采样与视频行更新时间中较晚的一个（抓取视频列表时也会更新播放量）
+同样的B站请求额度集中在播放量变化快的视频上，多年不变的老视频很少被请求。
 """
 
 import sys
 import os
 import time
-import json
+import heapq
 from datetime import datetime
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from bilibili_models import get_bilibili_session, BilibiliVideo
 from bilibili_client import BilibiliClient, format_number
-from sqlalchemy import func
+from video_stats_history import append_samples, sample_summary
+from sqlalchemy import select
 
 # 配置
-BATCH_SIZE = 10  # 每批处理的视频数量
+BATCH_SIZE = 10  # 每批处理的视频数量（每批提交一次，作为进度检查点）
 DELAY_BETWEEN_BATCHES = 3  # 批次之间的延迟（秒）
 DELAY_BETWEEN_VIDEOS = 1  # 视频之间的延迟（秒）
 MAX_RETRIES = 3  # 最大重试次数
-PROGRESS_FILE = 'video_update_progress.json'  # 进度保存文件
-
-def load_progress():
-    """加载进度"""
-    if os.path.exists(PROGRESS_FILE):
-        try:
-            with open(PROGRESS_FILE, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except:
-            return {}
-    return {}
-
-def save_progress(progress):
-    """保存进度"""
-    try:
-        with open(PROGRESS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(progress, f, ensure_ascii=False, indent=2)
-    except Exception as e:
-        print(f"⚠️  保存进度失败: {e}")
+REQUEST_BUDGET = int(os.getenv('BILIBILI_PLAY_REFRESH_BUDGET', '300'))  # 每次运行最多刷新的视频数
+MIN_REFRESH_HOURS = 1  # 距上次刷新不足该时长的视频本次跳过
+PLAY_SMOOTHING = 1000  # 相对增长的平滑项，避免播放量很小的视频因几次播放就排到最前
 
 def get_video_info_from_api(client, bvid, retry=0):
     """从API获取视频信息"""
@@ -47,7 +39,7 @@ def get_video_info_from_api(client, bvid, retry=0):
         # 使用 bilibili_client 的 _request_json 方法
         url = "https://api.bilibili.com/x/web-interface/view"
         params = {"bvid": bvid}
-        
+
         data = client._request_json(url, params=params)
         if data and data.get('code') == 0:
             stat = data.get('data', {}).get('stat', {})
@@ -66,88 +58,127 @@ def get_video_info_from_api(client, bvid, retry=0):
             print(f"    ❌ 获取失败: {e}")
             return None
 
-def update_video_play_counts(specific_uids=None, force_update=False):
+def refresh_priority(play, pubdate_raw, last_refresh_ts, velocity, now_ts):
+    """
+    视频的刷新优先级（预计陈旧程度），越大越应该先刷新
+
+    Args:
+        play: 当前播放量
+        pubdate_raw: 发布时间戳
+        last_refresh_ts: 上次刷新时间戳（None 表示从未刷新）
+        velocity: 观测到的播放速度（次/小时），None 表示没有历史记录
+        now_ts: 当前时间戳
+    """
+    if last_refresh_ts is None:
+        return float('inf')
+    hours_since_refresh = max(now_ts - last_refresh_ts, 0) / 3600
+    if not play:
+        # 还没有播放量的视频按等待时间排队，每等待一天相当于预计增长一倍
+        return hours_since_refresh / 24
+    if velocity is None:
+        age_hours = max((now_ts - pubdate_raw) / 3600, 1) if pubdate_raw else float('inf')
+        velocity = play / age_hours
+    return velocity * hours_since_refresh / (play + PLAY_SMOOTHING)
+
+def select_videos_to_refresh(session, specific_uids=None, budget=None, force_update=False, now_ts=None):
+    """
+    按刷新优先级选出本次要刷新的视频
+
+    Args:
+        budget: 最多选出的视频数（None 表示不限）
+        force_update: 为 True 时不跳过最近刷新过的视频
+
+    Returns:
+        按优先级从高到低排列的BV号列表
+    """
+    now_ts = int(now_ts if now_ts is not None else time.time())
+    query = select(
+        BilibiliVideo.bvid, BilibiliVideo.play, BilibiliVideo.pubdate_raw, BilibiliVideo.updated_at
+    ).where(BilibiliVideo.is_deleted == False)
+    if specific_uids:
+        query = query.where(BilibiliVideo.uid.in_(specific_uids))
+
+    summary = sample_summary(session, now_ts=now_ts)
+    candidates = []
+    for bvid, play, pubdate_raw, updated_at in session.execute(query):
+        last_refresh_ts, velocity = summary.get(bvid, (None, None))
+        if updated_at is not None:
+            last_refresh_ts = max(last_refresh_ts or 0, int(updated_at.timestamp()))
+        if (not force_update and play and last_refresh_ts is not None
+                and now_ts - last_refresh_ts < MIN_REFRESH_HOURS * 3600):
+            continue
+        candidates.append((refresh_priority(play, pubdate_raw, last_refresh_ts, velocity, now_ts), bvid))
+
+    if budget:
+        candidates = heapq.nlargest(budget, candidates)
+    else:
+        candidates.sort(reverse=True)
+    return [bvid for _, bvid in candidates]
+
+def update_video_play_counts(specific_uids=None, force_update=False, budget=None, task_progress=None):
     """
-    更新视频播放量数据
-    
+    按优先级更新视频播放量数据
+
     Args:
         specific_uids: 指定要更新的UP主UID列表，None表示更新所有
-        force_update: 是否强制更新所有视频（即使最近更新过）
+        force_update: 是否强制更新所有视频（不限预算，不跳过最近刷新过的视频）
+        budget: 本次最多请求的视频数，默认 REQUEST_BUDGET（force_update 时默认不限）
+        task_progress: 任务进度上报器（task_queue.TaskProgress，可选）
+
+    Returns:
+        统计信息: {'total', 'updated', 'skipped', 'failed'}
     """
     print("=" * 80)
     print("稳妥更新视频播放量数据")
     print("=" * 80)
-    
+
+    if budget is None and not force_update:
+        budget = REQUEST_BUDGET
+    stats = {'total': 0, 'updated': 0, 'skipped': 0, 'failed': 0}
     session = get_bilibili_session()
     client = BilibiliClient()
-    progress = load_progress()
-    
+
     try:
-        # 获取需要更新的视频列表
-        query = session.query(BilibiliVideo).filter_by(is_deleted=False)
-        
-        if specific_uids:
-            query = query.filter(BilibiliVideo.uid.in_(specific_uids))
-        
-        # 如果不需要强制更新，只更新最近7天未更新的视频
-        # ✅ 改进：即使 updated_at 在7天内，如果播放量为0，也需要更新
-        # ✅ 改进：如果视频发布时间在最近30天内，即使updated_at在7天内也更新（新视频播放量增长快）
-        if not force_update:
-            from datetime import timedelta
-            cutoff_date = datetime.now() - timedelta(days=7)
-            # 新视频判断：发布时间在最近30天内
-            recent_video_date = datetime.now() - timedelta(days=30)
-            query = query.filter(
-                (BilibiliVideo.updated_at < cutoff_date) | 
-                (BilibiliVideo.updated_at.is_(None)) |
-                (BilibiliVideo.play == 0) |  # ✅ 播放量为0的视频也需要更新
-                ((BilibiliVideo.pubdate >= recent_video_date) & (BilibiliVideo.updated_at < datetime.now() - timedelta(hours=6)))  # ✅ 新视频（30天内发布）且6小时未更新
-            )
-        
-        videos = query.order_by(BilibiliVideo.updated_at.asc()).all()
-        total_videos = len(videos)
-        
-        print(f"\n找到 {total_videos} 个需要更新的视频")
+        bvids = select_videos_to_refresh(session, specific_uids, budget=budget, force_update=force_update)
+        total_videos = len(bvids)
+        stats['total'] = total_videos
+
+        print(f"\n本次刷新 {total_videos} 个视频（预算: {budget or '不限'}）")
         print(f"批次大小: {BATCH_SIZE}")
         print(f"批次延迟: {DELAY_BETWEEN_BATCHES} 秒")
         print(f"视频延迟: {DELAY_BETWEEN_VIDEOS} 秒")
         print(f"最大重试: {MAX_RETRIES} 次")
         print()
-        
+
         if total_videos == 0:
             print("✅ 没有需要更新的视频")
-            return
-        
-        # 从上次进度继续
-        last_bvid = progress.get('last_bvid', None)
-        start_index = 0
-        if last_bvid:
-            for i, v in enumerate(videos):
-                if v.bvid == last_bvid:
-                    start_index = i + 1
-                    print(f"从上次进度继续，跳过前 {start_index} 个视频")
-                    break
-        
-        updated_count = 0
-        failed_count = 0
-        skipped_count = 0
-        
+            return stats
+
         # 分批处理
-        for batch_start in range(start_index, total_videos, BATCH_SIZE):
+        for batch_start in range(0, total_videos, BATCH_SIZE):
             batch_end = min(batch_start + BATCH_SIZE, total_videos)
-            batch_videos = videos[batch_start:batch_end]
-            
+            batch_bvids = bvids[batch_start:batch_end]
+            videos = {video.bvid: video for video in
+                      session.query(BilibiliVideo).filter(BilibiliVideo.bvid.in_(batch_bvids))}
+            samples = []
+
             print(f"\n处理批次 {batch_start // BATCH_SIZE + 1} ({batch_start + 1}-{batch_end}/{total_videos})")
-            
-            for video in batch_videos:
+
+            for idx, bvid in enumerate(batch_bvids):
+                video = videos.get(bvid)
+                if video is None:
+                    continue
+                if task_progress is not None:
+                    task_progress.update(progress=batch_start + idx, total=total_videos, current=bvid,
+                                         message=f'正在更新视频播放量 ({batch_start + idx + 1}/{total_videos})...')
                 try:
                     # 获取视频信息
-                    video_info = get_video_info_from_api(client, video.bvid)
-                    
+                    video_info = get_video_info_from_api(client, bvid)
+
                     if video_info:
                         old_play = video.play
                         new_play = video_info.get('play', 0)
-                        
+
                         # 更新数据
                         video.play = new_play
                         video.play_formatted = format_number(new_play)
@@ -156,56 +187,54 @@ def update_video_play_counts(specific_uids=None, force_update=False):
                         video.favorites = video_info.get('favorites', 0)
                         video.favorites_formatted = format_number(video.favorites)
                         video.updated_at = datetime.now()
-                        
+                        samples.append({'bvid': bvid, 'play': new_play, 'reply': video.video_review,
+                                        'favorite': video.favorites})
+
                         if old_play != new_play:
-                            print(f"  ✅ {video.bvid[:12]}... 播放量: {old_play:,} → {new_play:,}")
-                            updated_count += 1
+                            print(f"  ✅ {bvid[:12]}... 播放量: {old_play or 0:,} → {new_play:,}")
+                            stats['updated'] += 1
                         else:
-                            skipped_count += 1
+                            stats['skipped'] += 1
+                        if task_progress is not None:
+                            task_progress.incr('success')
                     else:
-                        print(f"  ⚠️  {video.bvid[:12]}... 跳过（无法获取数据）")
-                        failed_count += 1
-                    
-                    # 保存进度
-                    progress['last_bvid'] = video.bvid
-                    progress['last_update'] = datetime.now().isoformat()
-                    save_progress(progress)
-                    
+                        print(f"  ⚠️  {bvid[:12]}... 跳过（无法获取数据）")
+                        stats['failed'] += 1
+                        if task_progress is not None:
+                            task_progress.incr('failed')
+
                     # 视频之间延迟
-                    if video != batch_videos[-1]:
+                    if idx < len(batch_bvids) - 1:
                         time.sleep(DELAY_BETWEEN_VIDEOS)
-                    
+
                 except Exception as e:
-                    print(f"  ❌ {video.bvid[:12]}... 更新失败: {e}")
-                    failed_count += 1
-            
-            # 提交批次
+                    print(f"  ❌ {bvid[:12]}... 更新失败: {e}")
+                    stats['failed'] += 1
+                    if task_progress is not None:
+                        task_progress.incr('failed')
+
+            # 提交批次（视频行与采样点在同一事务中写入；中断后下次运行按新的优先级继续）
             try:
+                append_samples(session, samples)
                 session.commit()
                 print(f"  ✅ 批次已提交")
             except Exception as e:
                 print(f"  ❌ 批次提交失败: {e}")
                 session.rollback()
-            
+
             # 批次之间延迟
             if batch_end < total_videos:
                 print(f"  等待 {DELAY_BETWEEN_BATCHES} 秒...")
                 time.sleep(DELAY_BETWEEN_BATCHES)
-        
-        # 清理进度文件
-        if updated_count + skipped_count == total_videos:
-            if os.path.exists(PROGRESS_FILE):
-                os.remove(PROGRESS_FILE)
-                print(f"\n✅ 进度文件已清理")
-        
+
         print("\n" + "=" * 80)
         print("更新完成")
         print("=" * 80)
         print(f"总计: {total_videos} 个视频")
-        print(f"更新: {updated_count} 个")
-        print(f"跳过: {skipped_count} 个（数据未变化）")
-        print(f"失败: {failed_count} 个")
-        
+        print(f"更新: {stats['updated']} 个")
+        print(f"跳过: {stats['skipped']} 个（数据未变化）")
+        print(f"失败: {stats['failed']} 个")
+
     except Exception as e:
         print(f"\n❌ 更新过程出错: {e}")
         import traceback
@@ -213,18 +242,20 @@ def update_video_play_counts(specific_uids=None, force_update=False):
         session.rollback()
     finally:
         session.close()
+    return stats
 
 if __name__ == '__main__':
     import argparse
-    
+
     parser = argparse.ArgumentParser(description='更新视频播放量数据')
     parser.add_argument('--uids', nargs='+', type=int, help='指定要更新的UP主UID列表')
     parser.add_argument('--force', action='store_true', help='强制更新所有视频')
-    
+    parser.add_argument('--budget', type=int, help=f'本次最多请求的视频数（默认 {REQUEST_BUDGET}）')
+
     args = parser.parse_args()
-    
+
     update_video_play_counts(
         specific_uids=args.uids,
-        force_update=args.force
+        force_update=args.force,
+        budget=args.budget
     )
-
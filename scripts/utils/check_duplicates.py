@@ -2,13 +2,29 @@
 """
 检查数据库中的重复论文
 核心原则：确保没有重复论文（基于ID和标题相似度）
+
+--snapshot: 标题检查从列式快照读取（见 snapshot_export.py），不扫描线上库
 """
 from models import get_session, Paper
 from sqlalchemy import func
 from collections import Counter
+from types import SimpleNamespace
 from utils import calculate_title_similarity
 import sys
 
+USE_SNAPSHOT = '--snapshot' in sys.argv
+
+def _load_id_titles():
+    """读取全部论文的 (id, title)，只取两列，不加载整行"""
+    if USE_SNAPSHOT:
+        from snapshot_export import iter_rows
+        return [SimpleNamespace(**row) for row in iter_rows('papers', columns=['id', 'title'])]
+    session = get_session()
+    try:
+        return session.query(Paper.id, Paper.title).all()
+    finally:
+        session.close()
+
 def check_duplicate_ids():
     """检查重复的论文ID（理论上不应该有，因为id是主键）"""
     print("=" * 60)
@@ -46,22 +62,18 @@ def check_duplicate_titles():
     print("检查2: 完全相同的标题")
     print("=" * 60)
     
-    session = get_session()
-    try:
-        titles = [p.title for p in session.query(Paper.title).all() if p.title]
-        title_counter = Counter(titles)
-        duplicate_titles = {title: count for title, count in title_counter.items() if count > 1}
-        
-        if duplicate_titles:
-            print(f"⚠️  发现 {len(duplicate_titles)} 个完全相同的标题:")
-            for title, count in list(duplicate_titles.items())[:10]:
-                print(f"  \"{title[:60]}...\" 出现 {count} 次")
-            return False
-        else:
-            print("✅ 没有完全相同的标题")
-            return True
-    finally:
-        session.close()
+    titles = [p.title for p in _load_id_titles() if p.title]
+    title_counter = Counter(titles)
+    duplicate_titles = {title: count for title, count in title_counter.items() if count > 1}
+    
+    if duplicate_titles:
+        print(f"⚠️  发现 {len(duplicate_titles)} 个完全相同的标题:")
+        for title, count in list(duplicate_titles.items())[:10]:
+            print(f"  \"{title[:60]}...\" 出现 {count} 次")
+        return False
+    else:
+        print("✅ 没有完全相同的标题")
+        return True
 
 def check_similar_titles(threshold=0.85):
     """检查相似度高的标题（可能重复）"""
@@ -69,49 +81,45 @@ def check_similar_titles(threshold=0.85):
     print(f"检查3: 相似标题（相似度 >= {threshold}）")
     print("=" * 60)
     
-    session = get_session()
-    try:
-        papers = session.query(Paper).all()
-        similar_pairs = []
-        
-        print(f"正在检查 {len(papers)} 篇论文...")
-        
-        for i, paper1 in enumerate(papers):
-            if not paper1.title:
+    papers = _load_id_titles()
+    similar_pairs = []
+    
+    print(f"正在检查 {len(papers)} 篇论文...")
+    
+    for i, paper1 in enumerate(papers):
+        if not paper1.title:
+            continue
+            
+        for paper2 in papers[i+1:]:
+            if not paper2.title:
                 continue
-                
-            for paper2 in papers[i+1:]:
-                if not paper2.title:
-                    continue
-                
-                # 跳过相同ID的论文（它们可能是同一篇论文的不同版本）
-                if paper1.id == paper2.id:
-                    continue
-                
-                similarity = calculate_title_similarity(paper1.title, paper2.title)
-                if similarity >= threshold:
-                    similar_pairs.append({
-                        'id1': paper1.id,
-                        'title1': paper1.title,
-                        'id2': paper2.id,
-                        'title2': paper2.title,
-                        'similarity': similarity
-                    })
-        
-        if similar_pairs:
-            print(f"⚠️  发现 {len(similar_pairs)} 对相似标题:")
-            for pair in similar_pairs[:20]:  # 只显示前20对
-                print(f"\n  相似度: {pair['similarity']:.2%}")
-                print(f"  ID1: {pair['id1']}")
-                print(f"  标题1: {pair['title1'][:60]}...")
-                print(f"  ID2: {pair['id2']}")
-                print(f"  标题2: {pair['title2'][:60]}...")
-            return False
-        else:
-            print("✅ 没有发现高度相似的标题")
-            return True
-    finally:
-        session.close()
+            
+            # 跳过相同ID的论文（它们可能是同一篇论文的不同版本）
+            if paper1.id == paper2.id:
+                continue
+            
+            similarity = calculate_title_similarity(paper1.title, paper2.title)
+            if similarity >= threshold:
+                similar_pairs.append({
+                    'id1': paper1.id,
+                    'title1': paper1.title,
+                    'id2': paper2.id,
+                    'title2': paper2.title,
+                    'similarity': similarity
+                })
+    
+    if similar_pairs:
+        print(f"⚠️  发现 {len(similar_pairs)} 对相似标题:")
+        for pair in similar_pairs[:20]:  # 只显示前20对
+            print(f"\n  相似度: {pair['similarity']:.2%}")
+            print(f"  ID1: {pair['id1']}")
+            print(f"  标题1: {pair['title1'][:60]}...")
+            print(f"  ID2: {pair['id2']}")
+            print(f"  标题2: {pair['title2'][:60]}...")
+        return False
+    else:
+        print("✅ 没有发现高度相似的标题")
+        return True
 
 def check_same_id_different_categories():
     """检查是否有相同ID但不同类别的论文（这种情况应该更新类别，不应该重复）"""
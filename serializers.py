@@ -0,0 +1,260 @@
+"""
+轻量序列化（按字段集投影查询）
+列表接口原本查询完整 ORM 对象再逐行调用 to_dict()，大列表（/api/papers 全量论文）的耗时主要在
+ORM 对象构建和身份映射上。这里只 SELECT 字段集需要的列（结果为元组），按预先编译的
+(输出键, 取值函数) 列表直接构建 dict。
+
+每个模型三个字段集：
+    list    只需标题、链接等的列表场景
+    card    前端卡片渲染用到的字段
+    detail  与模型 to_dict() 输出一致（接口默认，保持兼容）
+
+用法:
+    from serializers import fetch_dicts
+    papers = fetch_dicts(session, Paper, 'detail', Paper.category == 'VLA',
+                         order_by=[Paper.publish_date.desc()], limit=100)
+
+BilibiliUp.to_dict() 在统计为0时会回查视频表，不是单纯的列投影，没有对应的字段集。
+耗时对比见 benchmark.py 中的 serialize_* 基准项。
+"""
+import json
+from functools import lru_cache
+from operator import itemgetter
+from typing import Callable, Dict, List, Sequence, Tuple
+
+from sqlalchemy import select
+
+from bilibili_client import format_number, format_timestamp
+from bilibili_models import BilibiliVideo
+from jobs_models import Job
+from models import Paper
+from news_models import News
+
+FIELD_SET_NAMES = ('list', 'card', 'detail')
+
+# JSON 值的首字符；其他开头的文本直接按逗号分割，不必先让 json.loads 抛异常
+_JSON_START = set('[{"-0123456789tfn')
+
+
+def parse_json_list(value):
+    """
+    解析 JSON 字符串字段（机构、标签），不是 JSON 时按逗号分割；与 to_dict() 的解析结果一致
+
+    >>> parse_json_list('["MIT", "CMU"]')
+    ['MIT', 'CMU']
+    >>> parse_json_list('MIT, CMU')
+    ['MIT', 'CMU']
+    """
+    if not value:
+        return []
+    stripped = value.lstrip()
+    if stripped[:1] in _JSON_START:
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def _or_empty(value):
+    return value or ''
+
+
+def _or_zero(value):
+    return value or 0
+
+
+def _format_date(value):
+    return value.strftime('%Y-%m-%d') if value else ''
+
+
+def _format_datetime(value):
+    return value.strftime('%Y-%m-%d %H:%M:%S') if value else ''
+
+
+def _format_count(value):
+    return format_number(value) if value else '0'
+
+
+def _or_zero_str(value):
+    return value or '0'
+
+
+def _format_timestamp(value):
+    return format_timestamp(value) if value else ''
+
+
+def _video_url(url, bvid):
+    return url or f"https://www.bilibili.com/video/{bvid}"
+
+
+# 字段定义：输出键 -> 列名（或多个列名），可选转换函数（多列时按列顺序传参）
+PAPER_FIELDS = {
+    'id': ('id',),
+    'title': ('title',),
+    'authors': ('authors',),
+    'date': ('publish_date', _format_date),
+    'pdf_id': ('id',),
+    'pdf_url': ('pdf_url',),
+    'code_url': ('code_url',),
+    'category': ('category',),
+    'abstract': ('abstract', _or_empty),
+    'citation_count': ('citation_count', _or_zero),
+    'influential_citation_count': ('influential_citation_count', _or_zero),
+    'author_affiliations': ('author_affiliations', parse_json_list),
+    'venue': ('venue', _or_empty),
+    'publication_year': ('publication_year',),
+}
+PAPER_FIELD_SETS = {
+    'list': ['id', 'title', 'authors', 'date', 'pdf_id', 'pdf_url', 'code_url', 'category'],
+    'card': ['id', 'title', 'authors', 'date', 'pdf_id', 'pdf_url', 'code_url', 'category',
+             'citation_count', 'influential_citation_count', 'author_affiliations', 'venue',
+             'publication_year'],
+    'detail': list(PAPER_FIELDS),
+}
+
+NEWS_FIELDS = {
+    'id': ('id',),
+    'title': ('title',),
+    'description': ('description',),
+    'link': ('link',),
+    'source': ('source',),
+    'platform': ('platform',),
+    'published_at': ('published_at', _format_datetime),
+    'image_url': ('image_url',),
+    'author': ('author',),
+    'tags': ('tags', parse_json_list),
+    'created_at': ('created_at', _format_datetime),
+    'updated_at': ('updated_at', _format_datetime),
+}
+NEWS_FIELD_SETS = {
+    'list': ['id', 'title', 'link', 'platform', 'published_at'],
+    'card': ['id', 'title', 'description', 'link', 'source', 'platform', 'published_at', 'created_at'],
+    'detail': list(NEWS_FIELDS),
+}
+
+JOB_FIELDS = {
+    'id': ('id',),
+    'title': ('title',),
+    'description': ('description',),
+    'link': ('link',),
+    'update_date': ('update_date',),
+    'source_date': ('source_date',),
+    'company': ('company',),
+    'location': ('location',),
+    'job_type': ('job_type',),
+    'created_at': ('created_at', _format_datetime),
+    'updated_at': ('updated_at', _format_datetime),
+}
+JOB_FIELD_SETS = {
+    'list': ['id', 'title', 'link', 'update_date', 'company'],
+    'card': ['id', 'title', 'link', 'update_date', 'source_date', 'company', 'location', 'job_type'],
+    'detail': list(JOB_FIELDS),
+}
+
+# 视频的 card 与 /api/bilibili/all 返回的视频格式一致（pubdate 由 pubdate_raw 格式化），
+# detail 与 BilibiliVideo.to_dict() 一致
+VIDEO_FIELDS = {
+    'bvid': ('bvid',),
+    'aid': ('aid',),
+    'title': ('title', _or_empty),
+    'pic': ('pic', _or_empty),
+    'description': ('description', _or_empty),
+    'length': ('length', _or_empty),
+    # 实时格式化播放量，不依赖可能过时的 play_formatted
+    'play': ('play', _format_count),
+    'play_raw': ('play',),
+    'video_review': ('video_review_formatted', _or_zero_str),
+    'favorites': ('favorites_formatted', _or_zero_str),
+    'pubdate': ('pubdate', _format_datetime),
+    'pubdate_raw': ('pubdate_raw',),
+    'url': (('url', 'bvid'), _video_url),
+}
+_VIDEO_CARD_FIELDS = dict(
+    VIDEO_FIELDS,
+    play_raw=('play', _or_zero),
+    pubdate=('pubdate_raw', _format_timestamp),
+    pubdate_raw=('pubdate_raw', _or_zero),
+)
+VIDEO_FIELD_SETS = {
+    'list': ['bvid', 'title', 'pic', 'url'],
+    'card': {key: _VIDEO_CARD_FIELDS[key] for key in (
+        'bvid', 'title', 'pic', 'play', 'play_raw', 'favorites', 'video_review',
+        'pubdate', 'pubdate_raw', 'description', 'length', 'url')},
+    'detail': list(VIDEO_FIELDS),
+}
+
+# 模型 -> (字段定义, 字段集)；字段集可以是字段名列表，也可以是自带定义的 dict（覆盖同名字段）
+SERIALIZERS = {
+    Paper: (PAPER_FIELDS, PAPER_FIELD_SETS),
+    News: (NEWS_FIELDS, NEWS_FIELD_SETS),
+    Job: (JOB_FIELDS, JOB_FIELD_SETS),
+    BilibiliVideo: (VIDEO_FIELDS, VIDEO_FIELD_SETS),
+}
+
+
+class Projection:
+    """编译后的字段集：需要查询的列 + 每个输出键的取值函数"""
+
+    def __init__(self, model, fields: Dict[str, tuple]):
+        column_names: List[str] = []
+        getters: List[Tuple[str, Callable]] = []
+        for key, spec in fields.items():
+            names = spec[0] if isinstance(spec[0], tuple) else (spec[0],)
+            convert = spec[1] if len(spec) > 1 else None
+            indexes = []
+            for name in names:
+                if name not in column_names:
+                    column_names.append(name)
+                indexes.append(column_names.index(name))
+            getters.append((key, self._make_getter(indexes, convert)))
+        self.model = model
+        self.columns = [getattr(model, name) for name in column_names]
+        self.getters = getters
+
+    @staticmethod
+    def _make_getter(indexes: List[int], convert):
+        if len(indexes) > 1:
+            get_values = itemgetter(*indexes)
+            return lambda row: convert(*get_values(row))
+        get_value = itemgetter(indexes[0])
+        if convert is None:
+            return get_value
+        return lambda row: convert(get_value(row))
+
+    def select(self):
+        return select(*self.columns)
+
+    def to_dicts(self, rows) -> List[dict]:
+        getters = self.getters
+        return [{key: get(row) for key, get in getters} for row in rows]
+
+
+@lru_cache(maxsize=None)
+def get_projection(model, field_set: str = 'detail') -> Projection:
+    """按模型和字段集名获取编译后的投影（进程内缓存）"""
+    if model not in SERIALIZERS:
+        raise ValueError(f"模型 {model.__name__} 没有定义字段集")
+    fields, field_sets = SERIALIZERS[model]
+    if field_set not in field_sets:
+        raise ValueError(f"未知字段集: {field_set}（可选: {', '.join(field_sets)}）")
+    selected = field_sets[field_set]
+    if not isinstance(selected, dict):
+        selected = {key: fields[key] for key in selected}
+    return Projection(model, selected)
+
+
+def fetch_dicts(session, model, field_set: str = 'detail', *criteria,
+                order_by: Sequence = (), limit: int = None, offset: int = None) -> List[dict]:
+    """只查询字段集需要的列，返回 dict 列表"""
+    projection = get_projection(model, field_set)
+    stmt = projection.select()
+    if criteria:
+        stmt = stmt.where(*criteria)
+    if order_by:
+        stmt = stmt.order_by(*order_by)
+    if offset:
+        stmt = stmt.offset(offset)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return projection.to_dicts(session.execute(stmt))
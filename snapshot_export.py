@@ -0,0 +1,585 @@
+#!/usr/bin/env python3
+"""
+业务表列式快照导出
+把 papers / news / jobs / bilibili_videos 等表按块流式导出到快照目录，分析脚本和数据检查读取快照，
+不再对线上库做全表 ORM 扫描。
+
+- 格式：安装了 pyarrow 时写 Arrow IPC 文件（列式、lz4 压缩，读取时 memory-map），否则写 gzip CSV
+- 增量：按 updated_at 水位导出（updated_at >= 上次水位的行写入新分片），读取时按主键去重，新分片优先；
+  分片数超过 SNAPSHOT_MAX_PARTS 时在本地合并为一个分片。删除的行只有全量导出（--full）才会移除
+- 目录：SNAPSHOT_DIR（默认 ./snapshots）/<表名>/manifest.json + part-00001.arrow ...
+
+用法：
+    python snapshot_export.py                     # 增量导出全部表
+    python snapshot_export.py papers --full       # 全量重建论文快照
+    python snapshot_export.py --info              # 查看快照状态
+
+读取：
+    from snapshot_export import iter_rows, group_count
+    for row in iter_rows('papers', columns=['id', 'title']):
+        ...
+    group_count('papers', 'category')
+"""
+import argparse
+import csv
+import gzip
+import json
+import logging
+import os
+import sys
+from collections import Counter
+from datetime import date, datetime
+from typing import Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import Boolean, Date, DateTime, Float, Integer, JSON, Numeric, select
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR', './snapshots')
+SNAPSHOT_FORMAT = os.getenv('SNAPSHOT_FORMAT', 'arrow' if PYARROW_AVAILABLE else 'csv')
+SNAPSHOT_CHUNK_SIZE = int(os.getenv('SNAPSHOT_CHUNK_SIZE', '5000'))
+SNAPSHOT_MAX_PARTS = int(os.getenv('SNAPSHOT_MAX_PARTS', '20'))
+# Arrow IPC 缓冲区压缩（lz4 解压最快；设为 none 时读取可完全零拷贝）
+SNAPSHOT_COMPRESSION = os.getenv('SNAPSHOT_COMPRESSION', 'lz4')
+
+MANIFEST_NAME = 'manifest.json'
+PART_SUFFIX = {'arrow': '.arrow', 'csv': '.csv.gz'}
+WATERMARK_COLUMN = 'updated_at'
+
+# 快照表名 -> (模型模块, 模型类, 引擎函数)
+SNAPSHOT_TABLES = {
+    'papers': ('models', 'Paper', 'get_engine'),
+    'news': ('news_models', 'News', 'get_news_engine'),
+    'jobs': ('jobs_models', 'Job', 'get_jobs_engine'),
+    'bilibili_ups': ('bilibili_models', 'BilibiliUp', 'get_bilibili_engine'),
+    'bilibili_videos': ('bilibili_models', 'BilibiliVideo', 'get_bilibili_engine'),
+}
+
+
+def _load_model(table: str):
+    """返回 (模型类, 引擎函数)"""
+    if table not in SNAPSHOT_TABLES:
+        raise ValueError(f"不支持的快照表: {table}（可选: {', '.join(SNAPSHOT_TABLES)}）")
+    module_name, model_name, engine_fn = SNAPSHOT_TABLES[table]
+    module = __import__(module_name)
+    return getattr(module, model_name), getattr(module, engine_fn)
+
+
+def _column_kind(column) -> str:
+    """SQLAlchemy 列类型 -> 快照列类型（Arrow 与 CSV 共用）"""
+    col_type = column.type
+    if isinstance(col_type, Boolean):
+        return 'bool'
+    if isinstance(col_type, Integer):
+        return 'int'
+    if isinstance(col_type, (Float, Numeric)):
+        return 'float'
+    if isinstance(col_type, DateTime):
+        return 'datetime'
+    if isinstance(col_type, Date):
+        return 'date'
+    if isinstance(col_type, JSON):
+        return 'json'
+    return 'string'
+
+
+def _arrow_type(kind: str):
+    return {
+        'bool': pa.bool_(),
+        'int': pa.int64(),
+        'float': pa.float64(),
+        'datetime': pa.timestamp('us'),
+        'date': pa.date32(),
+    }.get(kind, pa.string())
+
+
+def _table_dir(table: str, snapshot_dir: Optional[str] = None) -> str:
+    return os.path.join(snapshot_dir or SNAPSHOT_DIR, table)
+
+
+def read_manifest(table: str, snapshot_dir: Optional[str] = None) -> Optional[Dict]:
+    """读取快照清单，快照不存在时返回 None"""
+    path = os.path.join(_table_dir(table, snapshot_dir), MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_manifest(table_dir: str, manifest: Dict):
+    path = os.path.join(table_dir, MANIFEST_NAME)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+# ---------------------------------------------------------------------------
+# 分片写入
+# ---------------------------------------------------------------------------
+
+class _PartWriter:
+    """把行块写入一个分片文件（先写临时文件，完成后改名）"""
+
+    def __init__(self, path: str, fmt: str, columns: List[Dict]):
+        self.path = path
+        self.tmp_path = path + '.tmp'
+        self.fmt = fmt
+        self.columns = columns
+        self.rows = 0
+        if fmt == 'arrow':
+            self.schema = pa.schema([(c['name'], _arrow_type(c['kind'])) for c in columns])
+            compression = None if SNAPSHOT_COMPRESSION == 'none' else SNAPSHOT_COMPRESSION
+            self._sink = pa.OSFile(self.tmp_path, 'wb')
+            self._writer = pa_ipc.new_file(
+                self._sink, self.schema,
+                options=pa_ipc.IpcWriteOptions(compression=compression)
+            )
+        else:
+            self._file = gzip.open(self.tmp_path, 'wt', encoding='utf-8', newline='')
+            self._writer = csv.writer(self._file)
+            self._writer.writerow([c['name'] for c in columns])
+
+    def write(self, rows: List[tuple]):
+        if not rows:
+            return
+        if self.fmt == 'arrow':
+            arrays = []
+            for idx, column in enumerate(self.columns):
+                values = [row[idx] for row in rows]
+                if column['kind'] == 'json':
+                    values = [None if v is None else json.dumps(v, ensure_ascii=False) for v in values]
+                elif _arrow_type(column['kind']) == pa.string():
+                    values = [None if v is None else str(v) for v in values]
+                arrays.append(pa.array(values, type=self.schema.field(idx).type))
+            self._writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        else:
+            for row in rows:
+                self._writer.writerow([_csv_value(v, c['kind']) for v, c in zip(row, self.columns)])
+        self.rows += len(rows)
+
+    def close(self):
+        if self.fmt == 'arrow':
+            self._writer.close()
+            self._sink.close()
+        else:
+            self._file.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self):
+        try:
+            if self.fmt == 'arrow':
+                self._sink.close()
+            else:
+                self._file.close()
+        finally:
+            if os.path.exists(self.tmp_path):
+                os.remove(self.tmp_path)
+
+
+def _csv_value(value, kind: str):
+    # CSV 中空字符串表示 NULL（字符串列的空串与 NULL 不再区分）
+    if value is None:
+        return ''
+    if kind == 'json':
+        return json.dumps(value, ensure_ascii=False)
+    if kind in ('date', 'datetime'):
+        return value.isoformat()
+    if kind == 'bool':
+        return '1' if value else '0'
+    return value
+
+
+def _parse_csv_value(value: str, kind: str):
+    if value == '':
+        return None
+    if kind == 'int':
+        return int(value)
+    if kind == 'float':
+        return float(value)
+    if kind == 'bool':
+        return value == '1'
+    if kind == 'date':
+        return date.fromisoformat(value)
+    if kind == 'datetime':
+        return datetime.fromisoformat(value)
+    if kind == 'json':
+        return json.loads(value)
+    return value
+
+
+# ---------------------------------------------------------------------------
+# 导出
+# ---------------------------------------------------------------------------
+
+def export_table(table: str, snapshot_dir: Optional[str] = None, full: bool = False,
+                 fmt: Optional[str] = None, chunk_size: Optional[int] = None, engine=None) -> Dict:
+    """
+    导出一张表到快照（默认增量）
+
+    Args:
+        table: 快照表名（见 SNAPSHOT_TABLES）
+        full: 全量重建（清除旧分片，同步删除的行）
+        fmt: 'arrow' 或 'csv'，默认 SNAPSHOT_FORMAT
+        chunk_size: 每次从数据库取的行数
+        engine: 数据库引擎，默认使用表所在库
+
+    Returns:
+        {'table', 'rows', 'parts', 'watermark', 'full'}
+    """
+    fmt = fmt or SNAPSHOT_FORMAT
+    if fmt == 'arrow' and not PYARROW_AVAILABLE:
+        logger.warning("pyarrow 未安装，快照改用 CSV 格式（安装命令: pip install pyarrow）")
+        fmt = 'csv'
+    if fmt not in PART_SUFFIX:
+        raise ValueError(f"不支持的快照格式: {fmt}")
+    chunk_size = chunk_size or SNAPSHOT_CHUNK_SIZE
+
+    model, get_engine_fn = _load_model(table)
+    sa_table = model.__table__
+    columns = [{'name': c.name, 'kind': _column_kind(c)} for c in sa_table.columns]
+    primary_key = [c.name for c in sa_table.primary_key.columns]
+
+    table_dir = _table_dir(table, snapshot_dir)
+    os.makedirs(table_dir, exist_ok=True)
+    manifest = read_manifest(table, snapshot_dir)
+    if manifest and (manifest.get('format') != fmt or manifest.get('columns') != columns):
+        logger.info(f"[{table}] 快照格式或表结构已变化，全量重建")
+        full = True
+    if full or not manifest:
+        full = True
+        manifest = {
+            'table': table,
+            'format': fmt,
+            'columns': columns,
+            'primary_key': primary_key,
+            'watermark': None,
+            'watermark_keys': [],
+            # 分片编号不复用，全量重建时新分片不会与旧文件同名
+            'next_part': manifest['next_part'] if manifest else 1,
+            'parts': [],
+        }
+
+    stmt = select(sa_table)
+    watermark = datetime.fromisoformat(manifest['watermark']) if manifest['watermark'] else None
+    if watermark:
+        # >= 水位：不漏掉与上次最后一行同一时刻更新、但上次导出时尚未提交的行
+        stmt = stmt.where(sa_table.c[WATERMARK_COLUMN] >= watermark)
+    # 上次已导出的、正好位于水位时刻的行（主键），本次跳过
+    exported_at_watermark = {tuple(key) for key in manifest.get('watermark_keys', [])}
+    pk_idx = [[c['name'] for c in columns].index(name) for name in primary_key]
+
+    part_name = f"part-{manifest['next_part']:05d}{PART_SUFFIX[fmt]}"
+    writer = _PartWriter(os.path.join(table_dir, part_name), fmt, columns)
+    watermark_idx = [c['name'] for c in columns].index(WATERMARK_COLUMN)
+    new_watermark = watermark
+    watermark_keys = set(exported_at_watermark)
+
+    engine = engine or get_engine_fn()
+    try:
+        with engine.connect() as conn:
+            # yield_per：SQLite 按块 fetchmany，PostgreSQL 使用服务端游标，不会一次性载入整表
+            result = conn.execution_options(yield_per=chunk_size).execute(stmt)
+            for chunk in result.partitions():
+                rows = []
+                for row in chunk:
+                    value = row[watermark_idx]
+                    key = tuple(row[idx] for idx in pk_idx)
+                    if value == watermark and key in exported_at_watermark:
+                        continue
+                    rows.append(row)
+                    if value is None:
+                        continue
+                    if new_watermark is None or value > new_watermark:
+                        new_watermark = value
+                        watermark_keys = {key}
+                    elif value == new_watermark:
+                        watermark_keys.add(key)
+                writer.write(rows)
+    except Exception:
+        writer.abort()
+        raise
+
+    if writer.rows == 0 and not full:
+        writer.abort()
+        logger.info(f"[{table}] 快照无新增数据（水位 {manifest['watermark']}）")
+        return {'table': table, 'rows': 0, 'parts': len(manifest['parts']),
+                'watermark': manifest['watermark'], 'full': False}
+
+    writer.close()
+    manifest['parts'].append({
+        'file': part_name,
+        'rows': writer.rows,
+        'exported_at': datetime.now().isoformat(timespec='seconds'),
+    })
+    manifest['next_part'] += 1
+    manifest['watermark'] = new_watermark.isoformat() if new_watermark else None
+    manifest['watermark_keys'] = [list(key) for key in watermark_keys]
+    manifest['exported_at'] = datetime.now().isoformat(timespec='seconds')
+    _write_manifest(table_dir, manifest)
+    if full:
+        # 清单已指向新分片，再删除旧分片（读取方不会读到半删的快照）
+        _remove_parts(table_dir, _stale_parts(table_dir, manifest))
+    logger.info(f"[{table}] 快照{'全量' if full else '增量'}导出 {writer.rows} 行 -> {part_name}"
+                f"（水位 {manifest['watermark']}）")
+
+    if len(manifest['parts']) > SNAPSHOT_MAX_PARTS:
+        compact_table(table, snapshot_dir)
+        manifest = read_manifest(table, snapshot_dir)
+
+    return {'table': table, 'rows': writer.rows, 'parts': len(manifest['parts']),
+            'watermark': manifest['watermark'], 'full': full}
+
+
+def _stale_parts(table_dir: str, manifest: Dict) -> List[Dict]:
+    """目录中不在清单里的分片（上次导出中断或全量重建前的文件）"""
+    listed = {part['file'] for part in manifest.get('parts', [])}
+    return [{'file': name} for name in os.listdir(table_dir)
+            if name.startswith('part-') and not name.endswith('.tmp') and name not in listed]
+
+
+def _remove_parts(table_dir: str, parts: List[Dict]):
+    for part in parts:
+        path = os.path.join(table_dir, part['file'])
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def compact_table(table: str, snapshot_dir: Optional[str] = None) -> int:
+    """把多个增量分片合并为一个（只读快照，不访问数据库），返回合并后的行数"""
+    manifest = read_manifest(table, snapshot_dir)
+    if not manifest or len(manifest['parts']) <= 1:
+        return sum(part['rows'] for part in manifest['parts']) if manifest else 0
+
+    table_dir = _table_dir(table, snapshot_dir)
+    columns = manifest['columns']
+    names = [c['name'] for c in columns]
+    part_name = f"part-{manifest['next_part']:05d}{PART_SUFFIX[manifest['format']]}"
+    writer = _PartWriter(os.path.join(table_dir, part_name), manifest['format'], columns)
+    try:
+        batch = []
+        for row in iter_rows(table, snapshot_dir=snapshot_dir):
+            batch.append(tuple(row[name] for name in names))
+            if len(batch) >= SNAPSHOT_CHUNK_SIZE:
+                writer.write(batch)
+                batch = []
+        writer.write(batch)
+    except Exception:
+        writer.abort()
+        raise
+    writer.close()
+
+    old_parts = manifest['parts']
+    manifest['parts'] = [{
+        'file': part_name,
+        'rows': writer.rows,
+        'exported_at': datetime.now().isoformat(timespec='seconds'),
+    }]
+    manifest['next_part'] += 1
+    _write_manifest(table_dir, manifest)
+    _remove_parts(table_dir, old_parts)
+    logger.info(f"[{table}] 已合并 {len(old_parts)} 个分片 -> {part_name}（{writer.rows} 行）")
+    return writer.rows
+
+
+# ---------------------------------------------------------------------------
+# 读取
+# ---------------------------------------------------------------------------
+
+def _require_manifest(table: str, snapshot_dir: Optional[str]) -> Dict:
+    manifest = read_manifest(table, snapshot_dir)
+    if manifest is None:
+        raise FileNotFoundError(f"快照不存在: {_table_dir(table, snapshot_dir)}"
+                                f"（先运行 python snapshot_export.py {table}）")
+    return manifest
+
+
+def _open_arrow(path: str):
+    """memory-map 打开 Arrow IPC 分片（未压缩的列直接映射，不复制到内存）"""
+    return pa_ipc.open_file(pa.memory_map(path, 'r'))
+
+
+def iter_rows(table: str, columns: Optional[List[str]] = None,
+              snapshot_dir: Optional[str] = None) -> Iterator[Dict]:
+    """
+    逐行读取快照（按主键去重，同一主键取最新分片中的行）
+
+    Args:
+        columns: 只读取这些列（主键列总会读取，用于去重）
+    """
+    manifest = _require_manifest(table, snapshot_dir)
+    table_dir = _table_dir(table, snapshot_dir)
+    kinds = {c['name']: c['kind'] for c in manifest['columns']}
+    primary_key = manifest['primary_key']
+    wanted = list(columns) if columns else list(kinds)
+    read_columns = wanted + [name for name in primary_key if name not in wanted]
+    multi_part = len(manifest['parts']) > 1
+    seen = set()
+
+    for part in reversed(manifest['parts']):
+        path = os.path.join(table_dir, part['file'])
+        for row in _iter_part(path, manifest['format'], read_columns, kinds):
+            if multi_part:
+                key = tuple(row[name] for name in primary_key)
+                if key in seen:
+                    continue
+                seen.add(key)
+            yield {name: row[name] for name in wanted}
+
+
+def _iter_part(path: str, fmt: str, columns: List[str], kinds: Dict[str, str]) -> Iterator[Dict]:
+    if fmt == 'arrow':
+        if not PYARROW_AVAILABLE:
+            raise RuntimeError("读取 Arrow 快照需要 pyarrow（安装命令: pip install pyarrow）")
+        reader = _open_arrow(path)
+        json_columns = [name for name in columns if kinds[name] == 'json']
+        for i in range(reader.num_record_batches):
+            for row in reader.get_batch(i).select(columns).to_pylist():
+                for name in json_columns:
+                    if row[name] is not None:
+                        row[name] = json.loads(row[name])
+                yield row
+    else:
+        with gzip.open(path, 'rt', encoding='utf-8', newline='') as f:
+            for record in csv.DictReader(f):
+                yield {name: _parse_csv_value(record[name], kinds[name]) for name in columns}
+
+
+def read_arrow_table(table: str, columns: Optional[List[str]] = None,
+                     snapshot_dir: Optional[str] = None):
+    """
+    读取为 pyarrow.Table（需要 Arrow 格式快照），按主键去重
+
+    只有一个分片时直接返回 memory-map 的数据，适合大表分析（pyarrow.compute / to_pandas）
+    """
+    if not PYARROW_AVAILABLE:
+        raise RuntimeError("需要 pyarrow（安装命令: pip install pyarrow）")
+    import pyarrow.compute as pc
+
+    manifest = _require_manifest(table, snapshot_dir)
+    if manifest['format'] != 'arrow':
+        raise ValueError(f"[{table}] 快照为 {manifest['format']} 格式，请使用 iter_rows 读取")
+    table_dir = _table_dir(table, snapshot_dir)
+    primary_key = manifest['primary_key']
+    wanted = list(columns) if columns else [c['name'] for c in manifest['columns']]
+
+    tables = []
+    seen = None
+    for part in reversed(manifest['parts']):
+        part_table = _open_arrow(os.path.join(table_dir, part['file'])).read_all()
+        if len(primary_key) == 1:
+            keys = part_table.column(primary_key[0])
+            if seen is not None:
+                part_table = part_table.filter(pc.invert(pc.is_in(keys, value_set=seen)))
+                seen = pa.concat_arrays([seen, part_table.column(primary_key[0]).combine_chunks()])
+            else:
+                seen = keys.combine_chunks()
+        elif len(manifest['parts']) > 1:
+            raise ValueError(f"[{table}] 复合主键的多分片快照请先合并（compact_table）")
+        tables.append(part_table.select(wanted))
+    if not tables:
+        return pa.schema([]).empty_table()
+    return pa.concat_tables(tables)
+
+
+def count_rows(table: str, where: Optional[Callable[[Dict], bool]] = None,
+               columns: Optional[List[str]] = None, snapshot_dir: Optional[str] = None) -> int:
+    """统计快照行数，where 为行过滤函数（columns 为过滤需要的列）"""
+    return sum(1 for row in iter_rows(table, columns or [], snapshot_dir)
+               if where is None or where(row))
+
+
+def group_count(table: str, column: str, where: Optional[Callable[[Dict], bool]] = None,
+                columns: Optional[List[str]] = None, snapshot_dir: Optional[str] = None) -> Counter:
+    """按列分组计数，相当于 SELECT column, COUNT(*) ... GROUP BY column"""
+    read_columns = [column] + [name for name in (columns or []) if name != column]
+    return Counter(row[column] for row in iter_rows(table, read_columns, snapshot_dir)
+                   if where is None or where(row))
+
+
+def max_value(table: str, column: str, snapshot_dir: Optional[str] = None):
+    """列最大值（忽略 NULL），快照为空时返回 None"""
+    return max((row[column] for row in iter_rows(table, [column], snapshot_dir)
+                if row[column] is not None), default=None)
+
+
+def snapshot_info(snapshot_dir: Optional[str] = None) -> List[Dict]:
+    """所有表的快照状态"""
+    info = []
+    for table in SNAPSHOT_TABLES:
+        manifest = read_manifest(table, snapshot_dir)
+        if manifest is None:
+            info.append({'table': table, 'exists': False})
+            continue
+        table_dir = _table_dir(table, snapshot_dir)
+        size = sum(os.path.getsize(os.path.join(table_dir, part['file']))
+                   for part in manifest['parts']
+                   if os.path.exists(os.path.join(table_dir, part['file'])))
+        info.append({
+            'table': table,
+            'exists': True,
+            'format': manifest['format'],
+            'parts': len(manifest['parts']),
+            'rows_written': sum(part['rows'] for part in manifest['parts']),
+            'bytes': size,
+            'watermark': manifest['watermark'],
+            'exported_at': manifest.get('exported_at'),
+        })
+    return info
+
+
+def export_all(tables: Optional[List[str]] = None, snapshot_dir: Optional[str] = None,
+               full: bool = False, fmt: Optional[str] = None) -> List[Dict]:
+    """导出多张表，单表失败不影响其他表"""
+    results = []
+    for table in tables or list(SNAPSHOT_TABLES):
+        try:
+            results.append(export_table(table, snapshot_dir, full=full, fmt=fmt))
+        except Exception as e:
+            logger.error(f"[{table}] 快照导出失败: {e}")
+            results.append({'table': table, 'error': str(e)})
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='业务表列式快照导出')
+    parser.add_argument('tables', nargs='*', help=f"要导出的表（默认全部: {', '.join(SNAPSHOT_TABLES)}）")
+    parser.add_argument('--full', action='store_true', help='全量重建（同步已删除的行）')
+    parser.add_argument('--format', choices=sorted(PART_SUFFIX), help='快照格式（默认 SNAPSHOT_FORMAT）')
+    parser.add_argument('--dir', help='快照目录（默认 SNAPSHOT_DIR）')
+    parser.add_argument('--compact', action='store_true', help='只合并已有分片，不访问数据库')
+    parser.add_argument('--info', action='store_true', help='查看快照状态')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='[%(asctime)s %(levelname)s] %(message)s',
+                        datefmt='%Y-%m-%d %H:%M:%S')
+
+    if args.info:
+        for item in snapshot_info(args.dir):
+            if not item['exists']:
+                print(f"{item['table']:<16} 无快照")
+                continue
+            print(f"{item['table']:<16} {item['format']:<6} 分片 {item['parts']:>3}  "
+                  f"写入 {item['rows_written']:>8} 行  {item['bytes'] / 1024 / 1024:>7.1f} MB  "
+                  f"水位 {item['watermark']}  导出于 {item['exported_at']}")
+        return 0
+
+    if args.compact:
+        for table in args.tables or list(SNAPSHOT_TABLES):
+            if read_manifest(table, args.dir):
+                compact_table(table, args.dir)
+        return 0
+
+    results = export_all(args.tables or None, args.dir, full=args.full, fmt=args.format)
+    return 1 if any('error' in result for result in results) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
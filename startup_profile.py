@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+启动耗时分析
+在子进程中以 python -X importtime 导入指定模块（默认 app），汇总各模块的导入耗时。
+gunicorn 按 max_requests 回收 worker、容器重启时都要重新导入 app，导入变慢会直接拖慢冷启动。
+
+运行方式：
+    python startup_profile.py                      # app 导入耗时排行
+    python startup_profile.py --module worker --top 50
+    python startup_profile.py --budget-ms 1500     # 超出预算时退出码为1（可用于CI）
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 只有 worker 进程（抓取任务、定时任务）才需要的依赖，Web 进程导入 app 时不应加载
+WORKER_ONLY_MODULES = ('arxiv', 'bilibili_api', 'aiohttp', 'feedparser', 'bs4', 'daily_arxiv', 'apscheduler')
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)')
+
+
+def measure_import(module: str = 'app') -> Tuple[float, List[Dict]]:
+    """
+    在干净的子进程中导入模块并解析 -X importtime 输出
+
+    Returns:
+        (模块导入总耗时毫秒, 各模块明细列表 [{'name', 'self_ms', 'cumulative_ms', 'depth'}])
+    """
+    env = dict(os.environ, EMBEDDED_WORKER='false')
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=BASE_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"导入 {module} 失败:\n{result.stderr[-2000:]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        rows.append({
+            'name': name,
+            'self_ms': int(self_us) / 1000,
+            'cumulative_ms': int(cumulative_us) / 1000,
+            'depth': (len(indent) - 1) // 2,
+        })
+    total_ms = next((row['cumulative_ms'] for row in rows if row['name'] == module and row['depth'] == 0), 0.0)
+    return total_ms, rows
+
+
+def group_by_package(rows: List[Dict]) -> List[Tuple[str, float]]:
+    """按顶层包汇总自身耗时（如 sqlalchemy.* 合并为 sqlalchemy），降序排列"""
+    totals = {}
+    for row in rows:
+        package = row['name'].split('.')[0]
+        totals[package] = totals.get(package, 0.0) + row['self_ms']
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def print_report(module: str, total_ms: float, rows: List[Dict], top: int = 30):
+    """打印导入耗时报告"""
+    print("=" * 60)
+    print(f"导入 {module} 总耗时: {total_ms:.1f} ms（共 {len(rows)} 个模块）")
+    print("=" * 60)
+
+    print(f"\n按顶层包汇总（前 {top} 个）:")
+    for package, self_ms in group_by_package(rows)[:top]:
+        print(f"  {self_ms:9.1f} ms  {package}")
+
+    print(f"\n{module} 直接导入的模块（累计耗时）:")
+    for row in sorted((r for r in rows if r['depth'] == 1), key=lambda r: r['cumulative_ms'], reverse=True)[:top]:
+        print(f"  {row['cumulative_ms']:9.1f} ms  {row['name']}")
+
+    loaded = sorted({row['name'].split('.')[0] for row in rows} & set(WORKER_ONLY_MODULES))
+    if loaded:
+        print(f"\n⚠️  导入时加载了仅 worker 需要的依赖: {', '.join(loaded)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='分析模块导入耗时（冷启动）')
+    parser.add_argument('--module', default='app', help='要分析的模块（默认 app）')
+    parser.add_argument('--top', type=int, default=30, help='显示前N项')
+    parser.add_argument('--budget-ms', type=float, help='导入耗时预算（毫秒），超出时退出码为1')
+    args = parser.parse_args()
+
+    total_ms, rows = measure_import(args.module)
+    print_report(args.module, total_ms, rows, args.top)
+
+    if args.budget_ms and total_ms > args.budget_ms:
+        print(f"\n❌ 导入耗时 {total_ms:.1f} ms 超出预算 {args.budget_ms:.0f} ms")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
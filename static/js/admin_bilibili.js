@@ -669,12 +669,12 @@ async function triggerFetchBilibiliData() {
     }
 }
 
-// 轮询更新状态
+// 订阅更新状态（任务进度推送，不支持时自动退回每2秒轮询状态接口）
 let statusPollInterval = null;
 function pollFetchStatus() {
-    // 清除之前的轮询
+    // 清除之前的订阅
     if (statusPollInterval) {
-        clearInterval(statusPollInterval);
+        statusPollInterval.close();
     }
     
     const messageSpan = document.getElementById('fetch-task-message');
@@ -683,63 +683,47 @@ function pollFetchStatus() {
     const fetchBtn = document.getElementById('fetch-bilibili-btn');
     const statusDiv = document.getElementById('fetch-task-status');
     
-    // 立即查询一次
-    checkFetchStatus();
-    
-    // 每2秒查询一次
-    statusPollInterval = setInterval(() => {
-        checkFetchStatus();
-    }, 2000);
-    
-    function checkFetchStatus() {
-        fetch('/api/admin/bilibili/fetch-status', {
-            headers: {
-                'Authorization': `Bearer ${token}`
-            }
-        })
-        .then(response => response.json())
-        .then(data => {
-            if (data.success && data.status) {
-                const status = data.status;
-                
-                // 更新状态显示
-                messageSpan.textContent = status.message || '处理中...';
-                const progress = status.progress || 0;
-                progressSpan.textContent = `${progress}%`;
-                progressBar.style.width = `${progress}%`;
-                
-                // 如果任务完成，停止轮询并刷新数据
-                if (!status.running) {
-                    clearInterval(statusPollInterval);
-                    statusPollInterval = null;
-                    
-                    // 恢复按钮
-                    fetchBtn.disabled = false;
-                    fetchBtn.innerHTML = '<svg viewBox="0 0 24 24" width="18" height="18" fill="currentColor"><path d="M19 12h-2v3h-3v2h5v-5zM7 8h3V6H5v5h2V8zm14-4H3c-1.1 0-2 .9-2 2v12c0 1.1.9 2 2 2h18c1.1 0 2-.9 2-2V6c0-1.1-.9-2-2-2zm0 14H3V6h18v12z"/></svg> 更新B站数据';
-                    
-                    // 3秒后隐藏状态区域
-                    setTimeout(() => {
-                        statusDiv.style.display = 'none';
-                    }, 3000);
-                    
-                    // 刷新统计数据
-                    loadStats();
-                    
-                    // 刷新当前列表
-                    if (currentTab === 'ups') {
-                        loadUps(currentPage);
-                    } else {
-                        loadVideos(currentPage);
-                    }
-                    
-                    showToast('数据更新完成！', 'success');
-                }
-            }
-        })
-        .catch(error => {
-            console.error('查询状态失败:', error);
-        });
-    }
+    statusPollInterval = watchTaskEvents('/api/admin/task-events/bilibili', (status) => {
+        // 更新状态显示
+        messageSpan.textContent = status.message || '处理中...';
+        const progress = status.progress || 0;
+        progressSpan.textContent = `${progress}%`;
+        progressBar.style.width = `${progress}%`;
+        
+        if (status.running) {
+            return false;
+        }
+        
+        // 任务完成，停止订阅并刷新数据
+        statusPollInterval = null;
+        
+        // 恢复按钮
+        fetchBtn.disabled = false;
+        fetchBtn.innerHTML = '<svg viewBox="0 0 24 24" width="18" height="18" fill="currentColor"><path d="M19 12h-2v3h-3v2h5v-5zM7 8h3V6H5v5h2V8zm14-4H3c-1.1 0-2 .9-2 2v12c0 1.1.9 2 2 2h18c1.1 0 2-.9 2-2V6c0-1.1-.9-2-2-2zm0 14H3V6h18v12z"/></svg> 更新B站数据';
+        
+        // 3秒后隐藏状态区域
+        setTimeout(() => {
+            statusDiv.style.display = 'none';
+        }, 3000);
+        
+        // 刷新统计数据
+        loadStats();
+        
+        // 刷新当前列表
+        if (currentTab === 'ups') {
+            loadUps(currentPage);
+        } else {
+            loadVideos(currentPage);
+        }
+        
+        showToast('数据更新完成！', 'success');
+        return true;
+    }, {
+        headers: { 'Authorization': `Bearer ${token}` },
+        pollUrl: '/api/admin/bilibili/fetch-status',
+        pollInterval: 2000,
+        unwrap: (data) => (data.success ? data.status : null)
+    });
 }
 
 // 页面加载时执行
@@ -565,7 +565,7 @@ document.addEventListener('DOMContentLoaded', async () => {
 
 // ==================== 论文数据更新功能 ====================
 
-// 状态轮询相关变量
+// 任务进度订阅（watchTaskEvents）
 let arxivStatusPollInterval = null;
 let semanticStatusPollInterval = null;
 
@@ -641,50 +641,43 @@ function resetFetchArxivButton() {
     fetchArxivBtn.appendChild(document.createTextNode(' 从ArXiv拉取新论文'));
 }
 
-// 轮询ArXiv抓取状态
+// 订阅ArXiv抓取状态
 function startArxivStatusPolling() {
     if (arxivStatusPollInterval) {
-        clearInterval(arxivStatusPollInterval);
+        arxivStatusPollInterval.close();
     }
     
-    arxivStatusPollInterval = setInterval(async () => {
-        try {
-            const response = await fetch('/api/admin/papers/fetch-arxiv-status', {
-                headers: {
-                    'Authorization': `Bearer ${token}`
-                }
-            });
-            
-            const data = await response.json();
-            
-            if (data.success) {
-                updateStatusDisplay(data.status, 'arxiv');
-                
-                if (!data.status.running) {
-                    // 任务完成，停止轮询
-                    clearInterval(arxivStatusPollInterval);
-                    arxivStatusPollInterval = null;
-                    resetFetchArxivButton();
-                    
-                    if (data.status.message.includes('完成') || data.status.message.includes('成功')) {
-                        showToast('抓取完成！', 'success');
-                        // 刷新论文列表和统计
-                        await loadPapers(currentPage);
-                        await loadStats();
-                    } else if (data.status.message.includes('失败')) {
-                        showToast('抓取失败: ' + data.status.message, 'error');
-                    }
-                    
-                    // 延迟隐藏状态显示
-                    setTimeout(() => {
-                        taskStatusDiv.style.display = 'none';
-                    }, 3000);
-                }
-            }
-        } catch (error) {
-            console.error('获取ArXiv抓取状态失败:', error);
+    // 订阅任务进度推送（不支持时自动退回每2秒轮询状态接口）
+    arxivStatusPollInterval = watchTaskEvents('/api/admin/task-events/arxiv', (status) => {
+        updateStatusDisplay(status, 'arxiv');
+        
+        if (status.running) {
+            return false;
+        }
+        
+        // 任务完成，停止订阅
+        arxivStatusPollInterval = null;
+        resetFetchArxivButton();
+        
+        if (status.message.includes('完成') || status.message.includes('成功')) {
+            showToast('抓取完成！', 'success');
+            // 刷新论文列表和统计
+            loadPapers(currentPage).then(() => loadStats());
+        } else if (status.message.includes('失败')) {
+            showToast('抓取失败: ' + status.message, 'error');
         }
-    }, 2000); // 每2秒查询一次
+        
+        // 延迟隐藏状态显示
+        setTimeout(() => {
+            taskStatusDiv.style.display = 'none';
+        }, 3000);
+        return true;
+    }, {
+        headers: { 'Authorization': `Bearer ${token}` },
+        pollUrl: '/api/admin/papers/fetch-arxiv-status',
+        pollInterval: 2000,
+        unwrap: (data) => (data.success ? data.status : null)
+    });
 }
 
 // 启动Semantic Scholar更新
@@ -754,50 +747,43 @@ function resetUpdateSemanticButton() {
     updateSemanticBtn.appendChild(document.createTextNode(' 更新Semantic Scholar数据'));
 }
 
-// 轮询Semantic Scholar更新状态
+// 订阅Semantic Scholar更新状态
 function startSemanticStatusPolling() {
     if (semanticStatusPollInterval) {
-        clearInterval(semanticStatusPollInterval);
+        semanticStatusPollInterval.close();
     }
     
-    semanticStatusPollInterval = setInterval(async () => {
-        try {
-            const response = await fetch('/api/admin/papers/update-semantic-status', {
-                headers: {
-                    'Authorization': `Bearer ${token}`
-                }
-            });
-            
-            const data = await response.json();
-            
-            if (data.success) {
-                updateStatusDisplay(data.status, 'semantic');
-                
-                if (!data.status.running) {
-                    // 任务完成，停止轮询
-                    clearInterval(semanticStatusPollInterval);
-                    semanticStatusPollInterval = null;
-                    resetUpdateSemanticButton();
-                    
-                    if (data.status.message.includes('完成') || data.status.message.includes('成功')) {
-                        showToast('更新完成！', 'success');
-                        // 刷新论文列表和统计
-                        await loadPapers(currentPage);
-                        await loadStats();
-                    } else if (data.status.message.includes('失败')) {
-                        showToast('更新失败: ' + data.status.message, 'error');
-                    }
-                    
-                    // 延迟隐藏状态显示
-                    setTimeout(() => {
-                        taskStatusDiv.style.display = 'none';
-                    }, 3000);
-                }
-            }
-        } catch (error) {
-            console.error('获取Semantic Scholar更新状态失败:', error);
+    // 订阅任务进度推送（不支持时自动退回每2秒轮询状态接口）
+    semanticStatusPollInterval = watchTaskEvents('/api/admin/task-events/semantic', (status) => {
+        updateStatusDisplay(status, 'semantic');
+        
+        if (status.running) {
+            return false;
+        }
+        
+        // 任务完成，停止订阅
+        semanticStatusPollInterval = null;
+        resetUpdateSemanticButton();
+        
+        if (status.message.includes('完成') || status.message.includes('成功')) {
+            showToast('更新完成！', 'success');
+            // 刷新论文列表和统计
+            loadPapers(currentPage).then(() => loadStats());
+        } else if (status.message.includes('失败')) {
+            showToast('更新失败: ' + status.message, 'error');
         }
-    }, 2000); // 每2秒查询一次
+        
+        // 延迟隐藏状态显示
+        setTimeout(() => {
+            taskStatusDiv.style.display = 'none';
+        }, 3000);
+        return true;
+    }, {
+        headers: { 'Authorization': `Bearer ${token}` },
+        pollUrl: '/api/admin/papers/update-semantic-status',
+        pollInterval: 2000,
+        unwrap: (data) => (data.success ? data.status : null)
+    });
 }
 
 // 更新状态显示
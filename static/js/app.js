@@ -4,8 +4,8 @@ let papersData = {}; // 扁平：leaf -> papers
 let papersDataNested = {}; // 嵌套：level1 -> level2 -> leaf -> papers
 let statsData = {}; // 嵌套统计
 let lastFetchUpdate = null; // 记录上次抓取完成时间，避免重复刷新
-let statusPollingInterval = null; // 论文抓取轮询定时器
-let newsStatusPollingInterval = null; // 新闻抓取轮询定时器
+let statusPollingInterval = null; // 论文抓取进度订阅（watchTaskEvents）
+let newsStatusPollingInterval = null; // 新闻抓取进度订阅（watchTaskEvents）
 let refreshStatusInterval = null; // 刷新状态轮询定时器
 let trendsChart = null;  // 趋势图表实例
 let currentTrendDays = 30;  // 当前选择的天数
@@ -15,6 +15,45 @@ let currentActivityWeeks = 8;  // 当前选择周数
 let currentActivityView = 'category';  // 当前视图：'category' 或 'tag'
 let currentTagCategoryFilter = '';  // 当前子标签分类筛选
 
+// 首屏数据批量预取：页面加载时请求一次 /api/bootstrap，各模块首次加载时直接使用其中的数据，
+// 不再分别请求十多个接口。每个 URL 的预取数据只使用一次（且只在预取完成后的短时间内），
+// 之后的刷新、轮询都单独请求接口
+const BOOTSTRAP_MAX_AGE_MS = 10000;
+let bootstrapPromise = null;
+
+function startBootstrap() {
+    bootstrapPromise = fetch('/api/bootstrap')
+        .then(response => response.ok ? response.json() : null)
+        .then(result => {
+            if (!result || !result.success) return null;
+            const byUrl = {};
+            Object.values(result.sections).forEach(section => {
+                if (section.status === 200) byUrl[section.url] = section.data;
+            });
+            return { byUrl, receivedAt: Date.now() };
+        })
+        .catch(error => {
+            console.warn('首屏数据预取失败，各模块单独加载', error);
+            return null;
+        });
+}
+
+// 与 fetch(url) 用法相同：预取结果中有该 URL 时直接返回（并从预取结果中移除），否则请求接口
+async function fetchWithBootstrap(url) {
+    if (bootstrapPromise) {
+        const bootstrap = await bootstrapPromise;
+        if (bootstrap && Date.now() - bootstrap.receivedAt < BOOTSTRAP_MAX_AGE_MS && url in bootstrap.byUrl) {
+            const data = bootstrap.byUrl[url];
+            delete bootstrap.byUrl[url];
+            return new Response(JSON.stringify(data), {
+                status: 200,
+                headers: { 'Content-Type': 'application/json' }
+            });
+        }
+    }
+    return fetch(url);
+}
+
 // 显示通知消息
 function showNotification(message, type = 'info') {
     // 创建通知元素
@@ -321,7 +360,7 @@ const FALLBACK_TREE = [
 // 从后端同步最新的标签元数据，避免前后端不一致
 async function syncCategoryMeta() {
     try {
-        const resp = await fetch('/api/categories/meta');
+        const resp = await fetchWithBootstrap('/api/categories/meta');
         if (!resp.ok) return;
         const result = await resp.json();
         if (result.success && result.data) {
@@ -394,6 +433,7 @@ document.addEventListener('DOMContentLoaded', async () => {
     }
     
     try {
+        startBootstrap();
         await syncCategoryMeta();
         loadStats();
         // 新规则：不再需要localStorage的papersLastViewed
@@ -422,11 +462,11 @@ document.addEventListener('DOMContentLoaded', async () => {
     // 页面卸载时清理所有定时器
     window.addEventListener('beforeunload', () => {
         if (statusPollingInterval) {
-            clearInterval(statusPollingInterval);
+            stopStatusWatch(statusPollingInterval);
             statusPollingInterval = null;
         }
         if (newsStatusPollingInterval) {
-            clearInterval(newsStatusPollingInterval);
+            stopStatusWatch(newsStatusPollingInterval);
             newsStatusPollingInterval = null;
         }
         if (refreshStatusInterval) {
@@ -788,7 +828,7 @@ function setupEventListeners() {
 async function loadStats() {
     console.log('开始加载统计信息...');
     try {
-        const response = await fetch('/api/stats');
+        const response = await fetchWithBootstrap('/api/stats');
         console.log('统计API响应状态:', response.status, response.statusText);
         if (!response.ok) {
             throw new Error(`HTTP ${response.status}: ${response.statusText}`);
@@ -1032,7 +1072,7 @@ async function loadPapers(showNewBadge = true) {
         const url = '/api/papers';
         
         console.log('请求论文API:', url);
-        const response = await fetch(url);
+        const response = await fetchWithBootstrap(url);
         console.log('论文API响应状态:', response.status, response.statusText);
         if (!response.ok) {
             throw new Error(`HTTP ${response.status}: ${response.statusText}`);
@@ -2098,7 +2138,7 @@ async function startFetchPapers() {
             
             // 清除之前的轮询
             if (statusPollingInterval) {
-                clearInterval(statusPollingInterval);
+                stopStatusWatch(statusPollingInterval);
             }
             
             // 启动状态轮询
@@ -2292,145 +2332,143 @@ async function startFetchNews() {
     }
 }
 
-// 轮询新闻抓取状态（只在新闻抓取时启动）
+// 停止进度订阅（watchTaskEvents 返回的订阅对象，兼容旧的 setInterval 定时器）
+function stopStatusWatch(watch) {
+    if (watch && typeof watch.close === 'function') {
+        watch.close();
+    } else if (watch) {
+        clearInterval(watch);
+    }
+}
+
+// 订阅新闻抓取状态（只在新闻抓取时启动）
 function startNewsStatusPolling() {
     // 清除之前的定时器
     if (newsStatusPollingInterval) {
-        clearInterval(newsStatusPollingInterval);
+        stopStatusWatch(newsStatusPollingInterval);
     }
     
     // 同时停止论文抓取状态轮询，避免冲突
     if (statusPollingInterval) {
-        clearInterval(statusPollingInterval);
+        stopStatusWatch(statusPollingInterval);
         statusPollingInterval = null;
     }
     
-    newsStatusPollingInterval = setInterval(async () => {
-        try {
-            const response = await fetch('/api/fetch-news-status');
-            const status = await response.json();
-            
-            const statusDiv = document.getElementById('fetchStatus');
-            const messageSpan = document.getElementById('statusMessage');
-            const progressFill = document.getElementById('progressFill');
-            const fetchNewsBtn = document.getElementById('fetchNewsBtn');
-            
-            // 调试日志
-            if (status.running || status.progress > 0) {
-                console.log('新闻抓取状态:', status);
-            }
+    // 订阅任务进度推送（不支持时自动退回轮询 /api/fetch-news-status）
+    newsStatusPollingInterval = watchTaskEvents('/api/task-events/news', (status) => {
+        const statusDiv = document.getElementById('fetchStatus');
+        const messageSpan = document.getElementById('statusMessage');
+        const progressFill = document.getElementById('progressFill');
+        const fetchNewsBtn = document.getElementById('fetchNewsBtn');
+        
+        // 调试日志
+        if (status.running || status.progress > 0) {
+            console.log('新闻抓取状态:', status);
+        }
+        
+        if (status.running) {
+            statusDiv.classList.remove('hidden');
+            messageSpan.textContent = status.message || '正在抓取新闻...';
             
-            if (status.running) {
-                statusDiv.classList.remove('hidden');
-                messageSpan.textContent = status.message || '正在抓取新闻...';
-                
-                if (status.total > 0) {
-                    const progress = Math.min((status.progress / status.total) * 100, 100);
-                    progressFill.style.width = progress + '%';
-                } else {
-                    progressFill.style.width = '50%';  // 不确定进度时显示50%
-                }
+            if (status.total > 0) {
+                const progress = Math.min((status.progress / status.total) * 100, 100);
+                progressFill.style.width = progress + '%';
             } else {
-                // 抓取完成
-                if (status.last_update) {
-                    // 恢复按钮状态
-                    if (fetchNewsBtn) {
-                        fetchNewsBtn.disabled = false;
-                        fetchNewsBtn.innerHTML = '<i class="fas fa-sync-alt"></i>';
-                    }
-                    
-                    // 隐藏状态条并刷新新闻数据
-                    setTimeout(() => {
-                        statusDiv.classList.add('hidden');
-                        loadNews();  // 刷新新闻列表
-                    }, 2000);
-                } else {
-                    // 没有任务运行时，隐藏状态栏
-                    statusDiv.classList.add('hidden');
+                progressFill.style.width = '50%';  // 不确定进度时显示50%
+            }
+        } else {
+            // 抓取完成
+            if (status.last_update) {
+                // 恢复按钮状态
+                if (fetchNewsBtn) {
+                    fetchNewsBtn.disabled = false;
+                    fetchNewsBtn.innerHTML = '<i class="fas fa-sync-alt"></i>';
                 }
                 
-                // 停止轮询
-                if (newsStatusPollingInterval) {
-                    clearInterval(newsStatusPollingInterval);
-                    newsStatusPollingInterval = null;
-                }
+                // 隐藏状态条并刷新新闻数据
+                setTimeout(() => {
+                    statusDiv.classList.add('hidden');
+                    loadNews();  // 刷新新闻列表
+                }, 2000);
+            } else {
+                // 没有任务运行时，隐藏状态栏
+                statusDiv.classList.add('hidden');
             }
-        } catch (error) {
-            console.error('获取新闻抓取状态失败:', error);
+            
+            // 停止订阅
+            newsStatusPollingInterval = null;
+            return true;
         }
-    }, 2000);  // 每2秒轮询一次
+        return false;
+    }, { pollUrl: '/api/fetch-news-status', pollInterval: 2000 });
 }
 
-// 轮询论文抓取状态（只在论文抓取时启动）
+// 订阅论文抓取状态（只在论文抓取时启动）
 function startStatusPolling() {
     // 清除之前的定时器
     if (statusPollingInterval) {
-        clearInterval(statusPollingInterval);
+        stopStatusWatch(statusPollingInterval);
     }
     
     // 同时停止新闻抓取状态轮询，避免冲突
     if (newsStatusPollingInterval) {
-        clearInterval(newsStatusPollingInterval);
+        stopStatusWatch(newsStatusPollingInterval);
         newsStatusPollingInterval = null;
     }
     
-    statusPollingInterval = setInterval(async () => {
-        try {
-            const response = await fetch('/api/fetch-status');
-            const status = await response.json();
-            
-            const statusDiv = document.getElementById('fetchStatus');
-            const messageSpan = document.getElementById('statusMessage');
-            const progressFill = document.getElementById('progressFill');
-            
-            // 调试日志
-            if (status.running || status.progress > 0) {
-                console.log('论文抓取状态:', status);
+    // 订阅任务进度推送（不支持时自动退回轮询 /api/fetch-status）
+    statusPollingInterval = watchTaskEvents('/api/task-events/papers', (status) => {
+        const statusDiv = document.getElementById('fetchStatus');
+        const messageSpan = document.getElementById('statusMessage');
+        const progressFill = document.getElementById('progressFill');
+        
+        // 调试日志
+        if (status.running || status.progress > 0) {
+            console.log('论文抓取状态:', status);
+        }
+        
+        if (status.running) {
+            statusDiv.classList.remove('hidden');
+            // 显示当前抓取的关键词和进度
+            let displayMessage = status.message || '正在抓取论文...';
+            if (status.current_keyword) {
+                displayMessage = `正在抓取 ${status.current_keyword}...`;
             }
+            messageSpan.textContent = displayMessage;
             
-            if (status.running) {
-                statusDiv.classList.remove('hidden');
-                // 显示当前抓取的关键词和进度
-                let displayMessage = status.message || '正在抓取论文...';
-                if (status.current_keyword) {
-                    displayMessage = `正在抓取 ${status.current_keyword}...`;
-                }
-                messageSpan.textContent = displayMessage;
-                
-                if (status.total > 0) {
-                    const progress = Math.min((status.progress / status.total) * 100, 100);
-                    progressFill.style.width = progress + '%';
-                    console.log(`📊 抓取进度: ${status.progress}/${status.total} (${progress.toFixed(1)}%) - ${displayMessage}`);
-                } else {
-                    // 如果total还没设置，显示不确定进度
-                    progressFill.style.width = '10%';
-                    console.log('⏳ 等待抓取任务启动...');
-                }
+            if (status.total > 0) {
+                const progress = Math.min((status.progress / status.total) * 100, 100);
+                progressFill.style.width = progress + '%';
+                console.log(`📊 抓取进度: ${status.progress}/${status.total} (${progress.toFixed(1)}%) - ${displayMessage}`);
             } else {
-                // 只在抓取刚完成时刷新一次（避免重复刷新）
-                if (status.last_update && status.last_update !== lastFetchUpdate) {
-                    lastFetchUpdate = status.last_update;
-                    // 抓取完成，刷新数据
-                    setTimeout(() => {
-                        statusDiv.classList.add('hidden');
-                        // 强制刷新统计、论文数据和趋势图（显示新论文提示）
-                        loadStats();
-                        loadPapers(true); // 传入true以显示新论文提示
-                        loadCategories(); // 重新加载类别筛选器
-                        loadTrends(currentTrendDays); // 刷新趋势图
-                        if (status.last_update) {
-                            updateLastUpdateTime(status.last_update);
-                        }
-                    }, 2000);
-                } else if (!status.running) {
-                    // 没有任务运行时，隐藏状态栏
+                // 如果total还没设置，显示不确定进度
+                progressFill.style.width = '10%';
+                console.log('⏳ 等待抓取任务启动...');
+            }
+        } else {
+            // 只在抓取刚完成时刷新一次（避免重复刷新）
+            if (status.last_update && status.last_update !== lastFetchUpdate) {
+                lastFetchUpdate = status.last_update;
+                // 抓取完成，刷新数据
+                setTimeout(() => {
                     statusDiv.classList.add('hidden');
-                }
+                    // 强制刷新统计、论文数据和趋势图（显示新论文提示）
+                    loadStats();
+                    loadPapers(true); // 传入true以显示新论文提示
+                    loadCategories(); // 重新加载类别筛选器
+                    loadTrends(currentTrendDays); // 刷新趋势图
+                    if (status.last_update) {
+                        updateLastUpdateTime(status.last_update);
+                    }
+                }, 2000);
+            } else if (!status.running) {
+                // 没有任务运行时，隐藏状态栏
+                statusDiv.classList.add('hidden');
             }
-        } catch (error) {
-            console.error('获取抓取状态失败:', error);
         }
-    }, 5000); // 改为每5秒轮询一次，减少请求频率
+        // 任务结束后停止订阅
+        return !status.running;
+    }, { pollUrl: '/api/fetch-status', pollInterval: 5000 });
 }
 
 // 已移除模态框相关代码
@@ -2560,7 +2598,7 @@ function hideSearchResults() {
 // 加载类别到筛选器（与研究方向保持一致，显示所有研究方向）
 async function loadCategories() {
     try {
-        const response = await fetch('/api/stats');
+        const response = await fetchWithBootstrap('/api/stats');
         const result = await response.json();
         
         if (result.success) {
@@ -2723,7 +2761,7 @@ async function loadDatasets() {
     }
     
     try {
-        const response = await fetch('/api/datasets?limit=20');
+        const response = await fetchWithBootstrap('/api/datasets?limit=20');
         
         if (!response.ok) {
             throw new Error(`HTTP ${response.status}: ${response.statusText}`);
@@ -2939,7 +2977,7 @@ async function loadBilibili() {
     
     try {
         console.log('loadBilibili: 开始调用 /api/bilibili API...');
-        const response = await fetch('/api/bilibili');
+        const response = await fetchWithBootstrap('/api/bilibili');
         console.log('loadBilibili: API响应状态:', response.status, response.statusText);
         
         if (!response.ok) {
@@ -4223,7 +4261,7 @@ async function loadPaperStats() {
     console.log('[论文统计] 开始加载...');
     
     try {
-        const response = await fetch('/api/paper-stats');
+        const response = await fetchWithBootstrap('/api/paper-stats');
         const data = await response.json();
         console.log('[论文统计] 数据加载成功:', data);
         
@@ -4279,7 +4317,7 @@ async function loadAuthorRanking() {
     const category = categorySelect ? categorySelect.value || '' : '';
     
     try {
-        const response = await fetch(`/api/authors/ranking?days=${days}&category=${category}&limit=20`);
+        const response = await fetchWithBootstrap(`/api/authors/ranking?days=${days}&category=${category}&limit=20`);
         const result = await response.json();
         
         if (result.success && result.data) {
@@ -4417,7 +4455,7 @@ async function loadResearchActivity(weeks = 8, level = 'category', categoryFilte
             params.append('category', categoryFilter);
         }
         
-        const response = await fetch(`/api/research-activity?${params}`);
+        const response = await fetchWithBootstrap(`/api/research-activity?${params}`);
         const result = await response.json();
         
         if (result.success) {
@@ -0,0 +1,164 @@
+/**
+ * 任务进度订阅
+ * 优先使用服务端推送（SSE，/api/task-events/<stream>），不可用时退回定时轮询原状态接口。
+ *
+ * 用法：
+ *   const watcher = watchTaskEvents('/api/task-events/papers', (status) => {
+ *       ...更新进度条...
+ *       return !status.running;   // 返回 true 表示结束订阅
+ *   }, { pollUrl: '/api/fetch-status' });
+ *   watcher.close();
+ *
+ * options:
+ *   headers       额外请求头（如管理后台的 Authorization），此时用 fetch 读取事件流（EventSource 不支持自定义请求头）
+ *   pollUrl       退回轮询时请求的地址
+ *   pollInterval  轮询间隔（毫秒）
+ *   unwrap        轮询响应转换为状态对象（如管理后台接口的 data => data.status）
+ */
+(function (global) {
+    'use strict';
+
+    function parseEventBlock(block) {
+        const event = { id: null, type: 'message', data: '' };
+        const dataLines = [];
+        block.split('\n').forEach((line) => {
+            if (!line || line.startsWith(':')) {
+                return; // 空行或心跳注释
+            }
+            const sep = line.indexOf(':');
+            const field = sep === -1 ? line : line.slice(0, sep);
+            const value = sep === -1 ? '' : line.slice(sep + 1).replace(/^ /, '');
+            if (field === 'id') event.id = value;
+            else if (field === 'event') event.type = value;
+            else if (field === 'data') dataLines.push(value);
+        });
+        event.data = dataLines.join('\n');
+        return event;
+    }
+
+    function watchTaskEvents(url, onStatus, options) {
+        const opts = Object.assign({ headers: null, pollUrl: null, pollInterval: 3000, unwrap: null }, options || {});
+        let closed = false;
+        let source = null;
+        let controller = null;
+        let pollTimer = null;
+        let lastEventId = '';
+
+        function close() {
+            closed = true;
+            if (source) {
+                source.close();
+                source = null;
+            }
+            if (controller) {
+                controller.abort();
+                controller = null;
+            }
+            if (pollTimer) {
+                clearInterval(pollTimer);
+                pollTimer = null;
+            }
+        }
+
+        function handle(status) {
+            if (closed || !status) return;
+            try {
+                if (onStatus(status) === true) {
+                    close();
+                }
+            } catch (error) {
+                console.error('处理任务状态失败:', error);
+            }
+        }
+
+        function startPolling() {
+            if (closed || pollTimer || !opts.pollUrl) return;
+            console.warn('任务进度推送不可用，改为轮询:', opts.pollUrl);
+            const poll = async () => {
+                try {
+                    const response = await fetch(opts.pollUrl, { headers: opts.headers || {} });
+                    const data = await response.json();
+                    handle(opts.unwrap ? opts.unwrap(data) : data);
+                } catch (error) {
+                    console.error('获取任务状态失败:', error);
+                }
+            };
+            pollTimer = setInterval(poll, opts.pollInterval);
+            poll();
+        }
+
+        // 无自定义请求头：浏览器原生 EventSource，自动重连并带上 Last-Event-ID
+        function startEventSource() {
+            source = new EventSource(url);
+            let opened = false;
+            source.onopen = () => { opened = true; };
+            source.addEventListener('status', (e) => handle(JSON.parse(e.data)));
+            source.onerror = () => {
+                // 从未连上（接口不存在/被代理拦截）时退回轮询，连上后的断线交给浏览器重连
+                if (!opened && source) {
+                    source.close();
+                    source = null;
+                    startPolling();
+                }
+            };
+        }
+
+        // 带请求头：fetch 读取事件流，连接结束后按服务端的 retry 间隔带 Last-Event-ID 重连
+        async function startFetchStream() {
+            let retry = 3000;
+            while (!closed) {
+                controller = new AbortController();
+                try {
+                    const headers = Object.assign({ 'Accept': 'text/event-stream' }, opts.headers || {});
+                    if (lastEventId) headers['Last-Event-ID'] = lastEventId;
+                    const response = await fetch(url, { headers: headers, signal: controller.signal });
+                    if (!response.ok || !response.body ||
+                        !(response.headers.get('Content-Type') || '').includes('text/event-stream')) {
+                        throw new Error(`HTTP ${response.status}`);
+                    }
+                    const reader = response.body.getReader();
+                    const decoder = new TextDecoder();
+                    let buffer = '';
+                    while (!closed) {
+                        const { done, value } = await reader.read();
+                        if (done) break;
+                        buffer += decoder.decode(value, { stream: true }).replace(/\r\n?/g, '\n');
+                        let idx;
+                        while ((idx = buffer.indexOf('\n\n')) !== -1) {
+                            const block = buffer.slice(0, idx);
+                            buffer = buffer.slice(idx + 2);
+                            const retryMatch = block.match(/^retry:\s*(\d+)/m);
+                            if (retryMatch) retry = parseInt(retryMatch[1], 10);
+                            const event = parseEventBlock(block);
+                            if (event.id !== null) lastEventId = event.id;
+                            if (event.type === 'status' && event.data) {
+                                handle(JSON.parse(event.data));
+                            }
+                        }
+                    }
+                } catch (error) {
+                    if (closed) return;
+                    startPolling();
+                    return;
+                }
+                await new Promise((resolve) => setTimeout(resolve, retry));
+            }
+        }
+
+        if (opts.headers) {
+            if (global.ReadableStream && global.TextDecoder && global.AbortController) {
+                startFetchStream();
+            } else {
+                startPolling();
+            }
+        } else if (global.EventSource) {
+            startEventSource();
+        } else {
+            startPolling();
+        }
+
+        return { close: close };
+    }
+
+    global.watchTaskEvents = watchTaskEvents;
+})(window);
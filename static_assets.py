@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+静态资源构建与发布
+构建（部署前执行一次）：
+    python static_assets.py build
+- 压缩 JS/CSS（需要 rjsmin / rcssmin，未安装时只复制）
+- 文件名带内容哈希：js/app.js -> static/dist/js/app.3f2a1b9c0d.js
+- 为文本资源生成 .gz / .br（br 需要 brotli）预压缩文件
+- CSS 中 url('/static/...') 改写为带哈希的文件名
+- 写入 static/dist/manifest.json（原文件名 -> 带哈希文件名）
+
+运行时（init_static_assets）：
+- url_for('static', filename='js/app.js') 生成 /static/dist/js/app.3f2a1b9c0d.js（清单中没有的文件不变）
+- /static/dist/ 下的文件按 Accept-Encoding 返回预压缩版本，Cache-Control: immutable（内容变化时文件名随之变化）
+- 未构建（没有 manifest.json）时不做任何改动，开发环境照常使用原文件
+"""
+import gzip
+import hashlib
+import json
+import logging
+import mimetypes
+import os
+import re
+import shutil
+import sys
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+DIST_DIRNAME = 'dist'
+MANIFEST_NAME = 'manifest.json'
+
+# 需要预压缩的文本资源
+COMPRESSIBLE_EXTENSIONS = {'.js', '.css', '.svg', '.json', '.txt', '.html'}
+# 带哈希发布的资源
+ASSET_EXTENSIONS = COMPRESSIBLE_EXTENSIONS | {'.png', '.jpg', '.jpeg', '.gif', '.webp', '.ico', '.woff', '.woff2'}
+# 压缩后没有明显变小的文件不保留预压缩版本
+MIN_COMPRESSION_SAVING = 0.9
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+_CSS_URL = re.compile(r"""url\(\s*(['"]?)/static/([^'")?#]+)([^'")]*)\1\s*\)""")
+
+
+def _content_hash(data: bytes) -> str:
+    return hashlib.md5(data).hexdigest()[:10]
+
+
+def _hashed_name(rel_path: str, digest: str) -> str:
+    root, ext = os.path.splitext(rel_path)
+    return f"{root}.{digest}{ext}"
+
+
+def _minify(rel_path: str, data: bytes) -> bytes:
+    ext = os.path.splitext(rel_path)[1]
+    if ext == '.js' and rjsmin is not None:
+        return rjsmin.jsmin(data.decode('utf-8')).encode('utf-8')
+    if ext == '.css' and rcssmin is not None:
+        return rcssmin.cssmin(data.decode('utf-8')).encode('utf-8')
+    return data
+
+
+def _rewrite_css_urls(css: bytes, manifest: Dict[str, str]) -> bytes:
+    """CSS 中引用的 /static/ 资源改为带哈希的文件名"""
+    def replace(match):
+        quote, path, suffix = match.groups()
+        hashed = manifest.get(path)
+        if not hashed:
+            return match.group(0)
+        return f"url({quote}/static/{DIST_DIRNAME}/{hashed}{suffix}{quote})"
+    return _CSS_URL.sub(replace, css.decode('utf-8')).encode('utf-8')
+
+
+def _write_variants(path: str, data: bytes) -> Dict[str, int]:
+    """写入文件及其 .gz / .br 预压缩版本，返回各版本大小"""
+    with open(path, 'wb') as f:
+        f.write(data)
+    sizes = {'raw': len(data)}
+    if os.path.splitext(path)[1] not in COMPRESSIBLE_EXTENSIONS:
+        return sizes
+    # mtime=0：内容不变时 .gz 文件也不变
+    variants = {'gz': gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants['br'] = brotli.compress(data, quality=11)
+    for suffix, compressed in variants.items():
+        if len(compressed) < len(data) * MIN_COMPRESSION_SAVING:
+            with open(f"{path}.{suffix}", 'wb') as f:
+                f.write(compressed)
+            sizes[suffix] = len(compressed)
+    return sizes
+
+
+def build(static_dir: str = STATIC_DIR) -> Dict[str, str]:
+    """构建带哈希的静态资源到 static/dist/，返回清单"""
+    if rjsmin is None or rcssmin is None:
+        logger.warning("rjsmin/rcssmin 未安装，JS/CSS 不压缩（安装命令: pip install rjsmin rcssmin）")
+    if brotli is None:
+        logger.warning("brotli 未安装，只生成 .gz 预压缩文件（安装命令: pip install brotli）")
+
+    dist_dir = os.path.join(static_dir, DIST_DIRNAME)
+    tmp_dir = dist_dir + '.tmp'
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    sources = []
+    for root, dirs, files in os.walk(static_dir):
+        dirs[:] = sorted(d for d in dirs if os.path.join(root, d) not in (dist_dir, tmp_dir))
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in ASSET_EXTENSIONS:
+                full_path = os.path.join(root, name)
+                sources.append(os.path.relpath(full_path, static_dir).replace(os.sep, '/'))
+    # CSS 最后处理，引用的图片等已有哈希文件名
+    sources.sort(key=lambda rel_path: rel_path.endswith('.css'))
+
+    manifest = {}
+    total = {'raw': 0, 'min': 0, 'gz': 0, 'br': 0}
+    for rel_path in sources:
+        with open(os.path.join(static_dir, rel_path), 'rb') as f:
+            data = f.read()
+        output = _minify(rel_path, data)
+        if rel_path.endswith('.css'):
+            output = _rewrite_css_urls(output, manifest)
+        hashed = _hashed_name(rel_path, _content_hash(output))
+        target = os.path.join(tmp_dir, hashed)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        sizes = _write_variants(target, output)
+        manifest[rel_path] = hashed
+
+        total['raw'] += len(data)
+        total['min'] += len(output)
+        total['gz'] += sizes.get('gz', len(output))
+        total['br'] += sizes.get('br', sizes.get('gz', len(output)))
+        if os.path.splitext(rel_path)[1] in COMPRESSIBLE_EXTENSIONS:
+            logger.info(f"{rel_path} -> {hashed}: {len(data) / 1024:.1f} KB -> 压缩 {len(output) / 1024:.1f} KB"
+                        f" / gz {sizes.get('gz', len(output)) / 1024:.1f} KB"
+                        + (f" / br {sizes['br'] / 1024:.1f} KB" if 'br' in sizes else ''))
+
+    with open(os.path.join(tmp_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    shutil.rmtree(dist_dir, ignore_errors=True)
+    os.replace(tmp_dir, dist_dir)
+
+    logger.info(f"✅ 静态资源构建完成: {len(manifest)} 个文件 -> {dist_dir}")
+    logger.info(f"   原始 {total['raw'] / 1024:.0f} KB，压缩后 {total['min'] / 1024:.0f} KB，"
+                f"gzip {total['gz'] / 1024:.0f} KB，brotli {total['br'] / 1024:.0f} KB")
+    return manifest
+
+
+def load_manifest(static_dir: str = STATIC_DIR) -> Optional[Dict[str, str]]:
+    """读取构建清单，未构建时返回 None"""
+    path = os.path.join(static_dir, DIST_DIRNAME, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _choose_encoding(accept_encoding: str, file_path: str) -> Optional[str]:
+    """按 Accept-Encoding 选择已有的预压缩版本（br 优先）"""
+    accepted = {item.split(';')[0].strip().lower() for item in accept_encoding.split(',')}
+    for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if encoding in accepted and os.path.exists(file_path + suffix):
+            return encoding
+    return None
+
+
+def init_static_assets(app) -> bool:
+    """已构建时启用带哈希的静态资源 URL 和预压缩文件服务"""
+    if os.getenv('STATIC_ASSETS_ENABLED', 'true').lower() != 'true':
+        return False
+    static_dir = app.static_folder
+    manifest = load_manifest(static_dir)
+    if manifest is None:
+        logger.info("静态资源未构建（python static_assets.py build），使用原文件")
+        return False
+
+    from flask import abort, request, send_from_directory
+
+    dist_dir = os.path.join(static_dir, DIST_DIRNAME)
+
+    @app.url_defaults
+    def _hashed_static_url(endpoint, values):
+        if endpoint == 'static':
+            hashed = manifest.get(values.get('filename'))
+            if hashed:
+                values['filename'] = f"{DIST_DIRNAME}/{hashed}"
+
+    # 比 /static/<path:filename> 更具体，优先匹配
+    @app.route(f"{app.static_url_path}/{DIST_DIRNAME}/<path:filename>", endpoint='static_dist')
+    def _serve_dist(filename):
+        file_path = os.path.join(dist_dir, filename)
+        if filename.endswith(('.gz', '.br')) or not os.path.isfile(file_path):
+            abort(404)
+        encoding = _choose_encoding(request.headers.get('Accept-Encoding', ''), file_path)
+        send_name = filename + {'br': '.br', 'gzip': '.gz'}[encoding] if encoding else filename
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        response = send_from_directory(dist_dir, send_name, mimetype=mimetype, max_age=31536000)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.headers['Vary'] = 'Accept-Encoding'
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        return response
+
+    logger.info(f"✅ 静态资源已启用带哈希文件名和预压缩（{len(manifest)} 个文件）")
+    return True
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    if argv[:1] == ['build']:
+        build()
+        return 0
+    if argv[:1] == ['clean']:
+        shutil.rmtree(os.path.join(STATIC_DIR, DIST_DIRNAME), ignore_errors=True)
+        logger.info("已删除 static/dist/")
+        return 0
+    print("用法: python static_assets.py build|clean")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,277 @@
+"""
+后台任务处理函数
+每个任务类型对应一个模块级函数（任务子进程以 spawn 方式启动，入口函数必须可按名称导入），
+抓取模块在函数内部导入，只在 worker 的子进程中加载
+"""
+import logging
+import os
+import sys
+import traceback
+from typing import Dict
+
+from task_models import TASK_SUCCESS, TASK_ERROR
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _import_scripts_path():
+    """scripts/ 目录下的脚本使用同目录导入，需加入 sys.path"""
+    scripts_path = os.path.join(BASE_DIR, 'scripts')
+    if scripts_path not in sys.path:
+        sys.path.insert(0, scripts_path)
+
+
+def run_fetch_papers(params: Dict, progress=None) -> str:
+    """论文关键词抓取（fetch_new_data.fetch_papers）"""
+    config_path = os.path.join(BASE_DIR, 'config.yaml')
+    if not os.path.exists(config_path):
+        raise FileNotFoundError(f"配置文件不存在: {config_path}")
+    from fetch_new_data import fetch_papers
+    fetch_papers(task_progress=progress)
+    return _counters_message('抓取完成！', progress)
+
+
+def run_full_fetch_papers(params: Dict, progress=None) -> str:
+    """论文全量抓取（宽泛关键词）"""
+    from scripts.full_fetch_papers import fetch_full_papers
+    fetch_full_papers(
+        days_back=params.get('days_back', 3),
+        max_results_per_query=params.get('max_results_per_query', 100),
+        task_progress=progress
+    )
+    return _counters_message('全量抓取完成！', progress)
+
+
+def run_fetch_jobs(params: Dict, progress=None) -> str:
+    """招聘信息抓取"""
+    from fetch_jobs import fetch_and_save_jobs
+    fetch_and_save_jobs(task_progress=progress)
+    return _counters_message('招聘信息刷新完成', progress)
+
+
+def run_fetch_news(params: Dict, progress=None) -> str:
+    """新闻抓取"""
+    from news_models import init_news_db
+    init_news_db()
+    from fetch_news import fetch_and_save_news
+    fetch_and_save_news(task_progress=progress)
+    return _counters_message('新闻抓取完成！', progress)
+
+
+def run_update_semantic(params: Dict, progress=None) -> str:
+    """Semantic Scholar数据更新（管理端手动触发）"""
+    from update_semantic_scholar_data import update_all_papers
+    update_all_papers(
+        limit=params.get('limit'),
+        skip_existing=params.get('skip_existing', True),
+        task_progress=progress
+    )
+    return _counters_message('Semantic Scholar数据更新完成', progress)
+
+
+def run_update_semantic_recent(params: Dict, progress=None) -> str:
+    """Semantic Scholar增量更新（最近N天的论文）"""
+    from scripts.improve_semantic_update import update_recent_papers
+    days = params.get('days', 30)
+    update_recent_papers(days=days, limit=params.get('limit'), task_progress=progress)
+    return _counters_message(f'最近{days}天论文的Semantic Scholar数据更新完成', progress)
+
+
+def run_update_semantic_all(params: Dict, progress=None) -> str:
+    """Semantic Scholar增量更新（所有论文）"""
+    from scripts.improve_semantic_update import update_all_papers_incremental
+    update_all_papers_incremental(
+        limit=params.get('limit', 1000),
+        skip_recent=params.get('skip_recent', True),
+        task_progress=progress
+    )
+    return _counters_message('所有论文的Semantic Scholar数据更新完成', progress)
+
+
+def run_fetch_bilibili(params: Dict, progress=None) -> str:
+    """B站UP主信息和视频列表抓取，可选同时更新播放量"""
+    from fetch_bilibili_data import fetch_all_bilibili_data
+    # 使用较长的延迟避免触发风控
+    fetch_all_bilibili_data(
+        video_count=params.get('video_count', 50),
+        delay_between_requests=params.get('delay_between_requests', 2.0),
+        task_progress=progress,
+        incremental=params.get('incremental', False)
+    )
+    if params.get('update_play_counts'):
+        _import_scripts_path()
+        from update_video_play_counts import update_video_play_counts
+        if progress is not None:
+            progress.update(message='正在更新视频播放量...', force=True)
+        update_video_play_counts(force_update=True)
+    return _counters_message('更新完成！', progress)
+
+
+def run_update_video_play_counts(params: Dict, progress=None) -> str:
+    """视频播放量更新"""
+    _import_scripts_path()
+    from update_video_play_counts import update_video_play_counts
+    update_video_play_counts(force_update=params.get('force_update', False),
+                             budget=params.get('budget'), task_progress=progress)
+    return _counters_message('视频播放量更新完成', progress)
+
+
+def run_downsample_video_stats(params: Dict, progress=None) -> str:
+    """B站视频统计历史降采样"""
+    from video_stats_history import downsample_history
+    deleted = downsample_history()
+    return f"统计历史降采样完成（删除 {deleted} 个采样点）"
+
+
+def run_refresh_all(params: Dict, progress=None) -> str:
+    """一键刷新：各数据源按阶段编排执行（见 refresh_pipeline.py），已有单独抓取任务的数据源跳过"""
+    from refresh_pipeline import DEFAULT_SOURCES, STAGE_SUCCESS, format_timings, run_refresh
+    from task_queue import get_active_lock_keys
+    active = get_active_lock_keys()
+    sources = [source for source in params.get('sources') or DEFAULT_SOURCES
+               if get_lock_key(SOURCE_TASK_TYPES[source]) not in active]
+    skipped = [source for source in params.get('sources') or DEFAULT_SOURCES if source not in sources]
+    if skipped:
+        logger.info(f"以下数据源已有抓取任务在执行，本次跳过: {', '.join(skipped)}")
+    results = run_refresh(sources, task_progress=progress)
+    failed = [name for name, result in results.items() if result['state'] != STAGE_SUCCESS]
+    if failed:
+        raise RuntimeError(f"刷新阶段未成功: {', '.join(failed)}（{format_timings(results)}）")
+    return f"一键刷新完成（{format_timings(results)}）"
+
+
+def run_export_snapshot(params: Dict, progress=None) -> str:
+    """业务表列式快照导出（默认增量，full=True 全量重建）"""
+    from snapshot_export import export_all
+    results = export_all(params.get('tables'), full=params.get('full', False))
+    failed = [result['table'] for result in results if 'error' in result]
+    rows = sum(result.get('rows', 0) for result in results)
+    if failed:
+        raise RuntimeError(f"快照导出失败: {', '.join(failed)}")
+    return f"快照导出完成（{len(results)} 张表，写入 {rows} 行）"
+
+
+# 任务类型 -> 处理函数
+TASK_HANDLERS = {
+    'fetch_papers': run_fetch_papers,
+    'full_fetch_papers': run_full_fetch_papers,
+    'fetch_jobs': run_fetch_jobs,
+    'fetch_news': run_fetch_news,
+    'update_semantic': run_update_semantic,
+    'update_semantic_recent': run_update_semantic_recent,
+    'update_semantic_all': run_update_semantic_all,
+    'fetch_bilibili': run_fetch_bilibili,
+    'update_video_play_counts': run_update_video_play_counts,
+    'downsample_video_stats': run_downsample_video_stats,
+    'export_snapshot': run_export_snapshot,
+    'refresh_all': run_refresh_all,
+}
+
+# 一键刷新的数据源 -> 单独抓取该数据源的任务类型
+SOURCE_TASK_TYPES = {
+    'papers': 'fetch_papers',
+    'jobs': 'fetch_jobs',
+    'news': 'fetch_news',
+    'bilibili': 'fetch_bilibili',
+}
+
+# 任务类型 -> 互斥键（未列出的任务以自身类型为互斥键）
+# 论文增量/全量抓取写同一批数据，Semantic Scholar的几种更新共享API限额，不并发执行
+TASK_LOCK_KEYS = {
+    'fetch_papers': 'papers',
+    'full_fetch_papers': 'papers',
+    'update_semantic': 'semantic',
+    'update_semantic_recent': 'semantic',
+    'update_semantic_all': 'semantic',
+    'refresh_all': 'refresh',
+}
+
+# 任务类型 -> 覆盖它的任务互斥键：一键刷新排队/运行时再触发其中包含的数据源的抓取，直接返回一键刷新任务，不重复抓取
+TASK_COVERED_BY = {
+    'fetch_papers': 'refresh',
+    'full_fetch_papers': 'refresh',
+    'fetch_jobs': 'refresh',
+    'fetch_news': 'refresh',
+    'fetch_bilibili': 'refresh',
+}
+
+
+def covers_task(task: Dict, task_type: str) -> bool:
+    """
+    排队/运行中的一键刷新任务是否包含 task_type 的数据源
+    按互斥键判断：如论文全量抓取与一键刷新中的论文阶段共用 papers 互斥键，同样不能并发执行
+    """
+    from refresh_pipeline import DEFAULT_SOURCES
+    sources = task['params'].get('sources') or DEFAULT_SOURCES
+    return get_lock_key(task_type) in {get_lock_key(SOURCE_TASK_TYPES[source]) for source in sources}
+
+
+def _counters_message(message: str, progress) -> str:
+    """在完成消息后附上计数器（如 成功: 10, 失败: 1）"""
+    counters = progress.counters if progress is not None else {}
+    if not counters:
+        return message
+    labels = {'success': '成功', 'failed': '失败', 'skipped': '跳过', 'saved': '入库'}
+    detail = ', '.join(f"{labels.get(name, name)}: {value}" for name, value in counters.items())
+    return f"{message}（{detail}）"
+
+
+def get_lock_key(task_type: str) -> str:
+    """获取任务类型的互斥键"""
+    return TASK_LOCK_KEYS.get(task_type, task_type)
+
+
+def execute_task(task_id: int, task_type: str, params: Dict) -> str:
+    """
+    在 worker 子进程中执行任务，并把结果写回任务表
+
+    Returns:
+        任务最终状态（success/error）
+    """
+    from contextlib import nullcontext
+    from task_queue import finish_task, TaskProgress
+    from query_profiler import QUERY_PROFILER_ENABLED, profile_queries
+
+    handler = TASK_HANDLERS.get(task_type)
+    if handler is None:
+        finish_task(task_id, TASK_ERROR, error=f'未知任务类型: {task_type}')
+        return TASK_ERROR
+
+    logger.info("=" * 60)
+    logger.info(f"开始执行任务 #{task_id}: {task_type} {params or ''}")
+    logger.info("=" * 60)
+    progress = TaskProgress(task_id).start()
+    try:
+        progress.update(message='任务执行中...', force=True)
+        with (profile_queries(f"task:{task_type}") if QUERY_PROFILER_ENABLED else nullcontext()):
+            message = handler(params or {}, progress)
+        progress.close()
+        finish_task(task_id, TASK_SUCCESS, message=message)
+        logger.info(f"任务 #{task_id} ({task_type}) 完成")
+        return TASK_SUCCESS
+    except Exception as e:
+        if isinstance(e, FileNotFoundError):
+            error_msg = f"配置文件不存在: {str(e)}"
+        elif isinstance(e, ImportError):
+            error_msg = f"导入模块失败: {str(e)}，请检查依赖是否安装"
+        else:
+            error_msg = f"执行失败: {str(e)}"
+        error_detail = traceback.format_exc()
+    progress.close()
+    logger.error("=" * 60)
+    logger.error(f"任务 #{task_id} ({task_type}) 失败: {error_msg}")
+    logger.error("=" * 60)
+    logger.error(error_detail)
+    finish_task(task_id, TASK_ERROR, message=error_msg, error=error_detail)
+    return TASK_ERROR
+
+
+def run_task_process(task_id: int, task_type: str, params: Dict):
+    """任务子进程入口（spawn 出的子进程不继承日志配置）"""
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(process)d] %(levelname)s %(name)s: %(message)s')
+    # 设置了 HTTP_CASSETTE_MODE 时录制/回放外部接口响应（离线测试，见 http_cassette.py）
+    from http_cassette import install_from_env
+    install_from_env()
+    execute_task(task_id, task_type, params)
@@ -0,0 +1,179 @@
+"""
+后台任务表模型定义
+Web 进程只负责把抓取/更新任务写入任务表（入队），由独立的 worker.py 进程领取并在进程池中执行，
+各状态接口统一从任务表读取，任何 gunicorn worker 返回的结果都一致
+"""
+from sqlalchemy import create_engine, Column, String, Text, DateTime, Integer, Index, text
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker
+from datetime import datetime
+import json
+import os
+
+Base = declarative_base()
+
+# 任务状态
+TASK_QUEUED = 'queued'
+TASK_RUNNING = 'running'
+TASK_SUCCESS = 'success'
+TASK_ERROR = 'error'
+ACTIVE_STATES = (TASK_QUEUED, TASK_RUNNING)
+FINISHED_STATES = (TASK_SUCCESS, TASK_ERROR)
+
+# 同一互斥键同时只允许一个排队/运行中的任务（部分唯一索引条件）
+ACTIVE_LOCK_WHERE = text("state IN ('queued', 'running')")
+
+
+def _load_json(value):
+    if not value:
+        return {}
+    try:
+        return json.loads(value)
+    except (TypeError, ValueError):
+        return {}
+
+
+class TaskRun(Base):
+    """后台任务运行记录"""
+    __tablename__ = 'task_runs'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    task_type = Column(String(64), nullable=False)  # 任务类型，见 task_handlers.TASK_HANDLERS
+    lock_key = Column(String(64), nullable=False)  # 互斥键，同键任务不并发（如增量抓取与全量抓取）
+    params = Column(Text, nullable=True)  # 任务参数（JSON字符串）
+    state = Column(String(16), nullable=False, default=TASK_QUEUED)  # queued/running/success/error
+    source = Column(String(32), nullable=True)  # 触发来源：api/admin/schedule
+    message = Column(Text, nullable=True)  # 最近一条状态消息
+    error = Column(Text, nullable=True)  # 失败原因
+    worker = Column(String(128), nullable=True)  # 执行该任务的worker（主机名:进程号）
+    progress = Column(Integer, nullable=False, default=0)  # 已完成步数
+    total = Column(Integer, nullable=False, default=0)  # 总步数（0表示未知）
+    current_item = Column(String(255), nullable=True)  # 当前处理项（关键词/论文ID/UP主）
+    counters = Column(Text, nullable=True)  # 计数器（JSON字符串，如 {"success": 10, "failed": 1}）
+    version = Column(Integer, nullable=False, default=0)  # 状态版本号，每次写入+1（长轮询用）
+    heartbeat_at = Column(DateTime, nullable=True)  # 执行中任务的最近心跳
+    created_at = Column(DateTime, default=datetime.now)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    # 索引
+    __table_args__ = (
+        Index('idx_task_runs_type_state', 'task_type', 'state'),
+        Index('idx_task_runs_state_id', 'state', 'id'),
+        Index('uq_task_runs_active_lock', 'lock_key', unique=True,
+              sqlite_where=ACTIVE_LOCK_WHERE, postgresql_where=ACTIVE_LOCK_WHERE),
+    )
+
+    def get_params(self):
+        """解析任务参数"""
+        return _load_json(self.params)
+
+    def get_counters(self):
+        """解析计数器"""
+        return _load_json(self.counters)
+
+    def to_dict(self):
+        """转换为字典"""
+        def fmt(value):
+            return value.strftime('%Y-%m-%d %H:%M:%S') if value else ''
+
+        return {
+            'id': self.id,
+            'task_type': self.task_type,
+            'lock_key': self.lock_key,
+            'params': self.get_params(),
+            'state': self.state,
+            'source': self.source or '',
+            'message': self.message or '',
+            'error': self.error or '',
+            'worker': self.worker or '',
+            'progress': self.progress or 0,
+            'total': self.total or 0,
+            'current_item': self.current_item or '',
+            'counters': self.get_counters(),
+            'version': self.version or 0,
+            'heartbeat_at': fmt(self.heartbeat_at),
+            'created_at': fmt(self.created_at),
+            'started_at': fmt(self.started_at),
+            'finished_at': fmt(self.finished_at),
+        }
+
+
+class SchedulerLease(Base):
+    """定时任务调度器的领导者租约（SQLite等不支持advisory lock的数据库使用）"""
+    __tablename__ = 'scheduler_leases'
+
+    name = Column(String(64), primary_key=True)  # 租约名称（如 scheduler）
+    holder = Column(String(128), nullable=False)  # 持有者（主机名:进程号）
+    expires_at = Column(DateTime, nullable=False)  # 租约到期时间，到期未续约即可被其他节点接管
+    acquired_at = Column(DateTime, nullable=True)  # 当前持有者取得租约的时间
+    renewed_at = Column(DateTime, nullable=True)  # 最近一次续约时间
+
+    def to_dict(self):
+        """转换为字典"""
+        def fmt(value):
+            return value.strftime('%Y-%m-%d %H:%M:%S') if value else ''
+
+        return {
+            'name': self.name,
+            'holder': self.holder,
+            'expires_at': fmt(self.expires_at),
+            'acquired_at': fmt(self.acquired_at),
+            'renewed_at': fmt(self.renewed_at),
+        }
+
+
+# 任务表数据库配置（默认与主数据库相同）
+# 支持PostgreSQL和SQLite
+TASKS_DATABASE_URL = os.getenv('TASKS_DATABASE_URL', os.getenv('DATABASE_URL', 'sqlite:///./papers.db'))
+
+# 任务表会被状态接口和worker频繁轮询，引擎在进程内复用（每个进程一个连接池）
+_engine = None
+_engine_pid = None
+
+
+def get_tasks_engine():
+    """获取任务表数据库引擎（按进程缓存，fork出的子进程会重新创建）"""
+    global _engine, _engine_pid
+    if _engine is not None and _engine_pid == os.getpid():
+        return _engine
+    # PostgreSQL需要连接池配置
+    if TASKS_DATABASE_URL.startswith('postgresql://') or TASKS_DATABASE_URL.startswith('postgres://'):
+        _engine = create_engine(
+            TASKS_DATABASE_URL,
+            echo=False,
+            pool_size=5,
+            max_overflow=5,
+            pool_pre_ping=True  # 自动重连
+        )
+    else:
+        # SQLite配置（多进程读写，等待锁而不是立即报错）
+        _engine = create_engine(TASKS_DATABASE_URL, echo=False, connect_args={'timeout': 30})
+    _engine_pid = os.getpid()
+    # Web进程可能先于worker访问任务表，首次使用时自动建表
+    try:
+        Base.metadata.create_all(_engine, checkfirst=True)
+    except Exception as e:
+        if 'already exists' not in str(e).lower() and 'duplicate' not in str(e).lower():
+            raise
+    return _engine
+
+
+def get_tasks_session():
+    """获取任务表数据库会话"""
+    Session = sessionmaker(bind=get_tasks_engine())
+    return Session()
+
+
+def init_tasks_db():
+    """初始化任务表（创建表）"""
+    engine = get_tasks_engine()
+    try:
+        Base.metadata.create_all(engine, checkfirst=True)
+        print("任务表创建成功！")
+    except Exception as e:
+        # 如果索引已存在，忽略错误（PostgreSQL中索引可能已存在）
+        if 'already exists' in str(e).lower() or 'duplicate' in str(e).lower():
+            print(f"⚠️  部分索引已存在，跳过创建: {e}")
+        else:
+            raise
@@ -0,0 +1,439 @@
+"""
+后台任务队列与进度存储（基于 task_runs 表）
+Web 进程调用 enqueue_task 入队并通过 get_latest_task / wait_for_task_change 读取状态；
+worker.py 调用 claim_next_task 领取任务，任务执行中通过 TaskProgress 上报进度和心跳，
+执行结束后由 finish_task 写回结果
+"""
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from task_models import (
+    get_tasks_session, TaskRun,
+    TASK_QUEUED, TASK_RUNNING, TASK_SUCCESS, TASK_ERROR, ACTIVE_STATES, ACTIVE_LOCK_WHERE,
+)
+from task_handlers import TASK_HANDLERS, TASK_COVERED_BY, covers_task, get_lock_key
+from bulk_upsert import insert_on_conflict
+
+logger = logging.getLogger(__name__)
+
+# 进度写库的最小间隔（秒），抓取代码可以每处理一项就调用 update，由 TaskProgress 合并后批量写入
+TASK_PROGRESS_INTERVAL = float(os.getenv('TASK_PROGRESS_INTERVAL', '2'))
+# 执行中任务的心跳间隔（秒），单个步骤耗时很长时也能证明任务仍然存活
+TASK_HEARTBEAT_INTERVAL = float(os.getenv('TASK_HEARTBEAT_INTERVAL', '15'))
+# 心跳超过该时间（秒）未更新的 running 任务视为已中断
+TASK_STALE_SECONDS = int(os.getenv('TASK_STALE_SECONDS', '180'))
+# 长轮询时查询任务表的间隔（秒）
+LONG_POLL_INTERVAL = 1.0
+
+
+def worker_id() -> str:
+    """当前进程的worker标识（主机名:进程号）"""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue_task(task_type: str, params: Optional[Dict] = None, source: str = 'api') -> Tuple[Dict, bool]:
+    """
+    任务入队
+    同一互斥键已有排队/运行中的任务时不重复入队，直接返回该任务
+
+    Returns:
+        (任务字典, 是否新建)
+    """
+    if task_type not in TASK_HANDLERS:
+        raise ValueError(f"未知任务类型: {task_type}")
+
+    # 心跳超时的任务不再占用互斥键
+    fail_stale_tasks()
+
+    lock_key = get_lock_key(task_type)
+    covering = _active_task(TASK_COVERED_BY.get(task_type))
+    if covering is not None and covers_task(covering, task_type):
+        logger.info(f"任务 {task_type} 跳过入队：已包含在任务 #{covering['id']}（{covering['task_type']}）中")
+        return covering, False
+    row = {
+        'task_type': task_type,
+        'lock_key': lock_key,
+        'params': json.dumps(params or {}, ensure_ascii=False),
+        'state': TASK_QUEUED,
+        'source': source,
+        'message': '等待执行...',
+        'progress': 0,
+        'total': 0,
+        'version': 0,
+        'created_at': datetime.now(),
+    }
+    session = get_tasks_session()
+    try:
+        # 部分唯一索引保证并发入队时只有一个请求能插入成功
+        created = insert_on_conflict(session, TaskRun, [row], ['lock_key'], ACTIVE_LOCK_WHERE) > 0
+        session.commit()
+        task = session.query(TaskRun).filter(
+            TaskRun.lock_key == lock_key,
+            TaskRun.state.in_(ACTIVE_STATES)
+        ).order_by(TaskRun.id.desc()).first()
+        if task is None:
+            # 插入与查询之间任务恰好执行完毕，重新入队
+            return enqueue_task(task_type, params, source)
+        if created:
+            logger.info(f"任务已入队 #{task.id}: {task_type}（来源: {source}）")
+        else:
+            logger.info(f"任务 {task_type} 跳过入队：已有任务 #{task.id}（{task.task_type}）{task.state}")
+        return task.to_dict(), created
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def _active_task(lock_key: Optional[str]) -> Optional[Dict]:
+    """互斥键下排队/运行中的任务"""
+    if not lock_key:
+        return None
+    session = get_tasks_session()
+    try:
+        task = session.query(TaskRun).filter(
+            TaskRun.lock_key == lock_key,
+            TaskRun.state.in_(ACTIVE_STATES)
+        ).order_by(TaskRun.id.desc()).first()
+        return task.to_dict() if task else None
+    finally:
+        session.close()
+
+
+def get_active_lock_keys() -> Set[str]:
+    """所有排队/运行中任务的互斥键"""
+    session = get_tasks_session()
+    try:
+        return {key for (key,) in session.query(TaskRun.lock_key).filter(TaskRun.state.in_(ACTIVE_STATES)).distinct()}
+    finally:
+        session.close()
+
+
+def claim_next_task(worker: Optional[str] = None) -> Optional[Dict]:
+    """
+    领取最早入队的任务（原子地把 queued 改为 running，多个worker并发领取也不会重复执行）
+
+    Returns:
+        任务字典，没有待执行任务时返回None
+    """
+    worker = worker or worker_id()
+    session = get_tasks_session()
+    try:
+        candidate_ids = [
+            task_id for (task_id,) in session.query(TaskRun.id)
+            .filter(TaskRun.state == TASK_QUEUED)
+            .order_by(TaskRun.id)
+            .limit(5)
+        ]
+        for task_id in candidate_ids:
+            now = datetime.now()
+            claimed = session.query(TaskRun).filter(
+                TaskRun.id == task_id,
+                TaskRun.state == TASK_QUEUED
+            ).update({
+                TaskRun.state: TASK_RUNNING,
+                TaskRun.worker: worker,
+                TaskRun.started_at: now,
+                TaskRun.heartbeat_at: now,
+                TaskRun.message: '任务开始执行...',
+                TaskRun.version: TaskRun.version + 1,
+            }, synchronize_session=False)
+            session.commit()
+            if claimed:
+                return session.get(TaskRun, task_id).to_dict()
+        return None
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def _update_task(task_id: int, values: Dict, only_running: bool = False) -> bool:
+    """写入任务字段（每次写入版本号+1）"""
+    values = dict(values)
+    values[TaskRun.version] = TaskRun.version + 1
+    session = get_tasks_session()
+    try:
+        query = session.query(TaskRun).filter(TaskRun.id == task_id)
+        if only_running:
+            query = query.filter(TaskRun.state == TASK_RUNNING)
+        updated = query.update(values, synchronize_session=False)
+        session.commit()
+        return updated > 0
+    except Exception as e:
+        session.rollback()
+        logger.warning(f"更新任务 #{task_id} 失败: {e}")
+        return False
+    finally:
+        session.close()
+
+
+def update_task_message(task_id: int, message: str):
+    """更新任务的状态消息"""
+    _update_task(task_id, {TaskRun.message: message, TaskRun.heartbeat_at: datetime.now()})
+
+
+def finish_task(task_id: int, state: str, message: Optional[str] = None, error: Optional[str] = None):
+    """标记任务结束（success/error）"""
+    values = {TaskRun.state: state, TaskRun.finished_at: datetime.now(), TaskRun.current_item: None}
+    if message is not None:
+        values[TaskRun.message] = message
+    if error is not None:
+        values[TaskRun.error] = error
+        if message is None:
+            values[TaskRun.message] = error
+    if not _update_task(task_id, values):
+        logger.error(f"写回任务 #{task_id} 结果失败")
+
+
+class TaskProgress:
+    """
+    任务进度上报（由 task_handlers 创建并传给抓取代码）
+
+    抓取代码每处理一项调用一次 update/incr 即可，修改先在内存中合并，
+    距上次写库超过 TASK_PROGRESS_INTERVAL 秒才批量写入；后台心跳线程定期刷新 heartbeat_at，
+    并顺带写入尚未落库的进度
+    """
+
+    def __init__(self, task_id: int, interval: float = None, heartbeat_interval: float = None):
+        self.task_id = task_id
+        self.interval = TASK_PROGRESS_INTERVAL if interval is None else interval
+        self.heartbeat_interval = heartbeat_interval or TASK_HEARTBEAT_INTERVAL
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._counters = {}
+        self._last_flush = 0.0
+        self._stop = threading.Event()
+        self._heartbeat_thread = None
+
+    def update(self, progress: int = None, total: int = None, message: str = None,
+               current: str = None, force: bool = False):
+        """更新进度（progress/total 为步数，current 为当前处理项）"""
+        with self._lock:
+            if progress is not None:
+                self._pending[TaskRun.progress] = int(progress)
+            if total is not None:
+                self._pending[TaskRun.total] = int(total)
+            if message is not None:
+                self._pending[TaskRun.message] = message
+            if current is not None:
+                self._pending[TaskRun.current_item] = str(current)[:255]
+        self._maybe_flush(force)
+
+    def incr(self, counter: str, value: int = 1):
+        """累加计数器（如 success/failed/created）"""
+        with self._lock:
+            self._counters[counter] = self._counters.get(counter, 0) + value
+            self._pending[TaskRun.counters] = None  # 写库时填入最新计数
+        self._maybe_flush()
+
+    def _maybe_flush(self, force: bool = False):
+        if force or time.monotonic() - self._last_flush >= self.interval:
+            self.flush()
+
+    def flush(self):
+        """把未落库的进度写入任务表（同时刷新心跳）"""
+        with self._lock:
+            values = self._pending
+            self._pending = {}
+            if TaskRun.counters in values:
+                values[TaskRun.counters] = json.dumps(self._counters, ensure_ascii=False)
+            self._last_flush = time.monotonic()
+        values[TaskRun.heartbeat_at] = datetime.now()
+        _update_task(self.task_id, values, only_running=True)
+
+    def _heartbeat_loop(self):
+        while not self._stop.wait(self.heartbeat_interval):
+            self.flush()
+
+    def start(self):
+        """启动心跳线程"""
+        self._heartbeat_thread = threading.Thread(
+            target=self._heartbeat_loop, name=f'task-{self.task_id}-heartbeat', daemon=True
+        )
+        self._heartbeat_thread.start()
+        return self
+
+    def close(self):
+        """停止心跳并写入剩余进度"""
+        self._stop.set()
+        if self._heartbeat_thread is not None:
+            self._heartbeat_thread.join(timeout=5)
+        self.flush()
+
+    @property
+    def counters(self) -> Dict:
+        with self._lock:
+            return dict(self._counters)
+
+
+def fail_orphaned_tasks(alive_workers: Iterable[str] = ()) -> int:
+    """
+    把本机已退出的worker遗留的 running 任务标记为失败（worker重启时调用）
+
+    Args:
+        alive_workers: 仍在运行、不应清理的worker标识
+    """
+    hostname = socket.gethostname()
+    alive = set(alive_workers)
+    session = get_tasks_session()
+    failed = 0
+    try:
+        running = session.query(TaskRun).filter(TaskRun.state == TASK_RUNNING).all()
+        for task in running:
+            host, _, pid = (task.worker or '').rpartition(':')
+            if host != hostname or task.worker in alive or _pid_alive(pid):
+                continue
+            _mark_interrupted(task, 'worker进程已退出，任务中断', f'worker {task.worker} 已退出')
+            failed += 1
+        session.commit()
+        if failed:
+            logger.warning(f"已将 {failed} 个中断的任务标记为失败")
+        return failed
+    except Exception as e:
+        session.rollback()
+        logger.error(f"清理中断任务失败: {e}")
+        return 0
+    finally:
+        session.close()
+
+
+def fail_stale_tasks(stale_seconds: int = None) -> int:
+    """把心跳超时的 running 任务标记为失败（worker所在机器宕机、进程被强杀等情况）"""
+    cutoff = datetime.now() - timedelta(seconds=stale_seconds or TASK_STALE_SECONDS)
+    session = get_tasks_session()
+    failed = 0
+    try:
+        stale = session.query(TaskRun).filter(
+            TaskRun.state == TASK_RUNNING,
+            TaskRun.heartbeat_at < cutoff
+        ).all()
+        for task in stale:
+            _mark_interrupted(task, '任务心跳超时，已中断', f'最后心跳: {task.heartbeat_at}')
+            failed += 1
+        session.commit()
+        if failed:
+            logger.warning(f"已将 {failed} 个心跳超时的任务标记为失败")
+        return failed
+    except Exception as e:
+        session.rollback()
+        logger.error(f"清理心跳超时任务失败: {e}")
+        return 0
+    finally:
+        session.close()
+
+
+def _mark_interrupted(task: TaskRun, message: str, error: str):
+    task.state = TASK_ERROR
+    task.finished_at = datetime.now()
+    task.message = message
+    task.error = error
+    task.current_item = None
+    task.version = (task.version or 0) + 1
+
+
+def _pid_alive(pid: str) -> bool:
+    try:
+        os.kill(int(pid), 0)
+    except (ValueError, ProcessLookupError):
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def get_latest_task(task_types) -> Optional[Dict]:
+    """获取指定类型（一个或多个）最近一次任务，没有时返回None"""
+    if isinstance(task_types, str):
+        task_types = [task_types]
+    session = get_tasks_session()
+    try:
+        task = session.query(TaskRun).filter(
+            TaskRun.task_type.in_(list(task_types))
+        ).order_by(TaskRun.id.desc()).first()
+        return task.to_dict() if task else None
+    finally:
+        session.close()
+
+
+def task_revision(task: Optional[Dict]) -> str:
+    """任务状态修订号（任务ID:版本号），状态有任何变化时都会改变"""
+    if not task:
+        return '0:0'
+    return f"{task['id']}:{task['version']}"
+
+
+def wait_for_task_change(task_types, since: Optional[str], timeout: float) -> Optional[Dict]:
+    """
+    长轮询：等待最近一次任务的状态修订号与 since 不同，或超时后返回当前状态
+    since 为空时立即返回
+    """
+    deadline = time.monotonic() + max(timeout, 0)
+    while True:
+        task = get_latest_task(task_types)
+        if not since or task_revision(task) != since or time.monotonic() >= deadline:
+            return task
+        time.sleep(min(LONG_POLL_INTERVAL, max(deadline - time.monotonic(), 0)))
+
+
+def _is_stale(task: Dict) -> bool:
+    if task['state'] != TASK_RUNNING or not task['heartbeat_at']:
+        return False
+    heartbeat_at = datetime.strptime(task['heartbeat_at'], '%Y-%m-%d %H:%M:%S')
+    return datetime.now() - heartbeat_at > timedelta(seconds=TASK_STALE_SECONDS)
+
+
+def task_status(task: Optional[Dict], current_key: Optional[str] = None) -> Dict:
+    """
+    把任务记录转换为原有状态接口的格式
+    {'running', 'progress', 'total', 'message', 'last_update', ...}
+
+    Args:
+        current_key: 当前处理项在原接口中的字段名（如 current_keyword/current_paper）
+    """
+    status = {
+        'running': False,
+        'progress': 0,
+        'total': 0,
+        'message': '',
+        'last_update': None,
+        'state': 'idle',
+        'task_id': None,
+        'counters': {},
+        'revision': task_revision(task),
+    }
+    if current_key:
+        status[current_key] = ''
+    if not task:
+        return status
+
+    progress, total = task['progress'], task['total']
+    if task['state'] == TASK_SUCCESS and total == 0:
+        # 没有上报步数的单步任务
+        progress = total = 1
+    status.update({
+        'running': task['state'] in ACTIVE_STATES,
+        'progress': progress,
+        'total': total,
+        'message': task['message'] or task['error'],
+        'last_update': task['finished_at'] or task['heartbeat_at'] or task['started_at'] or task['created_at'],
+        'state': task['state'],
+        'task_id': task['id'],
+        'counters': task['counters'],
+    })
+    if current_key:
+        status[current_key] = task['current_item']
+    if _is_stale(task):
+        # 心跳超时：worker已不在运行，下次入队时会被标记为失败
+        status['running'] = False
+        status['state'] = TASK_ERROR
+        status['message'] = '任务心跳超时，已中断'
+    return status
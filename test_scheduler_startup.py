@@ -19,8 +19,8 @@ def test_direct_run():
     os.environ['AUTO_FETCH_JOBS_SCHEDULE'] = '0 * * * *'
     
     try:
-        # 模拟直接运行
-        from app import start_scheduler
+        # 定时任务调度器在 worker.py 中运行
+        from worker import start_scheduler
         scheduler = start_scheduler()
         if scheduler:
             print("✅ 直接运行模式：定时任务可以启动")
@@ -50,10 +50,11 @@ def test_gunicorn_mode():
     try:
         # 模拟Gunicorn启动
         from app import init_scheduler
-        scheduler = init_scheduler()
-        if scheduler:
-            print("✅ Gunicorn模式：定时任务可以启动")
-            scheduler.shutdown()
+        from worker import stop_embedded_worker
+        worker_process = init_scheduler()
+        if worker_process:
+            print("✅ Gunicorn模式：后台任务worker可以启动")
+            stop_embedded_worker()
             return True
         else:
             print("❌ Gunicorn模式：定时任务启动失败")
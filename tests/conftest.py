@@ -0,0 +1,71 @@
+"""
+pytest 共用 fixture
+"""
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+
+@pytest.fixture
+def query_budget():
+    """
+    查询预算断言（见 query_profiler.assert_query_budget）
+
+    用法：
+        def test_xxx(client, query_budget):
+            with query_budget(max_queries=5, max_repeats=1):
+                client.get('/api/papers')
+    """
+    from query_profiler import assert_query_budget
+    return assert_query_budget
+
+
+@pytest.fixture
+def temp_db(tmp_path):
+    """
+    临时 SQLite 库工厂，返回绑定该库的 sessionmaker（engine 为 Session.kw['bind']），测试结束后释放
+
+    用法：
+        def test_xxx(temp_db):
+            Session = temp_db(models.Base)                # 论文库
+            Session = temp_db(task_models.Base, 'tasks')  # 任务表
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    engines = []
+
+    def create(base, name='papers'):
+        engine = create_engine(f"sqlite:///{tmp_path / (name + '.db')}")
+        base.metadata.create_all(engine)
+        engines.append(engine)
+        return sessionmaker(bind=engine)
+
+    yield create
+    for engine in engines:
+        engine.dispose()
+
+
+@pytest.fixture
+def bilibili_db(temp_db, monkeypatch):
+    """
+    临时 SQLite 的B站数据库（表结构见 bilibili_models）
+
+    用法：
+        def test_xxx(bilibili_db):
+            Session = bilibili_db(fetch_bilibili_data)  # 这些模块的 get_bilibili_session 改为返回临时库的会话
+    """
+    from bilibili_models import Base
+
+    Session = temp_db(Base, 'bilibili')
+
+    def use(*modules):
+        for module in modules:
+            monkeypatch.setattr(module, 'get_bilibili_session', Session)
+        return Session
+
+    return use
@@ -69,6 +69,20 @@ def main():
         ("tests/test_api_endpoints.py", "API端点测试"),
         ("tests/test_database_connections.py", "数据库连接测试"),
         ("tests/test_functionality.py", "功能测试"),
+        ("tests/test_app_import_time.py", "启动耗时测试"),
+        ("tests/test_query_budget.py", "查询预算测试"),
+        ("tests/test_snapshot_export.py", "列式快照导出测试"),
+        ("tests/test_static_assets.py", "静态资源构建测试"),
+        ("tests/test_response_compression.py", "响应压缩测试"),
+        ("tests/test_serializers.py", "字段集序列化测试"),
+        ("tests/test_author_index.py", "论文作者索引测试"),
+        ("tests/test_bilibili_video_upsert.py", "B站视频批量写入测试"),
+        ("tests/test_bilibili_incremental_sync.py", "B站增量同步测试"),
+        ("tests/test_video_play_refresh.py", "视频播放量优先级刷新测试"),
+        ("tests/test_video_stats_history.py", "B站视频统计历史测试"),
+        ("tests/test_refresh_pipeline.py", "一键刷新编排测试"),
+        ("tests/test_http_cassette.py", "外部接口录制/回放测试"),
+        ("tests/test_dedup_keys.py", "新闻/招聘去重键测试"),
     ]
     
     results = []
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+app 导入耗时回归测试
+Web worker 冷启动（gunicorn 回收 worker、容器重启）都要重新导入 app：
+- 导入耗时不超过预算（APP_IMPORT_BUDGET_MS，默认1500毫秒）
+- 不加载只有 worker 才需要的抓取依赖（arxiv、bilibili_api 等）
+"""
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from startup_profile import measure_import, group_by_package, WORKER_ONLY_MODULES
+
+APP_IMPORT_BUDGET_MS = float(os.getenv('APP_IMPORT_BUDGET_MS', '1500'))
+
+_measured = {}
+
+
+def _measure_app():
+    """两个测试共用一次测量（每次测量都要启动子进程）"""
+    if 'app' not in _measured:
+        _measured['app'] = measure_import('app')
+    return _measured['app']
+
+
+def test_app_import_time_within_budget():
+    total_ms, rows = _measure_app()
+    top = ', '.join(f"{package} {self_ms:.0f}ms" for package, self_ms in group_by_package(rows)[:10])
+    assert total_ms <= APP_IMPORT_BUDGET_MS, (
+        f"导入 app 耗时 {total_ms:.0f} ms，超出预算 {APP_IMPORT_BUDGET_MS:.0f} ms；耗时最多的包: {top}"
+        "（运行 python startup_profile.py 查看详细报告）"
+    )
+
+
+def test_app_import_skips_worker_only_modules():
+    _, rows = _measure_app()
+    loaded = sorted({row['name'].split('.')[0] for row in rows} & set(WORKER_ONLY_MODULES))
+    assert not loaded, f"导入 app 时加载了仅 worker 需要的依赖: {', '.join(loaded)}，请改为在使用处导入"
+
+
+if __name__ == '__main__':
+    test_app_import_time_within_budget()
+    test_app_import_skips_worker_only_modules()
+    print(f"✅ app 导入耗时 {_measure_app()[0]:.0f} ms（预算 {APP_IMPORT_BUDGET_MS:.0f} ms）")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+论文作者索引测试
+在临时 SQLite 库中验证 paper_authors 随论文新增/修改/删除同步，
+以及 migrate_add_paper_authors 对 Core 批量写入（不触发 ORM 事件）的论文回填。
+"""
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from models import Base, Paper, PaperAuthor, split_authors
+
+
+@pytest.fixture
+def Session(temp_db):
+    return temp_db(Base)
+
+
+def _index(session, paper_id):
+    rows = session.query(PaperAuthor.position, PaperAuthor.author_norm).filter_by(
+        paper_id=paper_id).order_by(PaperAuthor.position).all()
+    return [author for _, author in rows]
+
+
+def test_split_authors():
+    assert split_authors('Alice, Bob Team；Carol et al.，李雷等; D') == ['Alice', 'Bob', 'Carol', '李雷等']
+    assert split_authors('OpenAI Team') == ['OpenAI']
+    assert split_authors(None) == []
+
+
+def test_index_follows_paper_changes(Session):
+    session = Session()
+    session.add(Paper(id='2601.00001', title='Paper', authors='Alice, Bob'))
+    session.commit()
+    assert _index(session, '2601.00001') == ['Alice', 'Bob']
+
+    paper = session.get(Paper, '2601.00001')
+    paper.authors = 'Carol et al.'
+    session.commit()
+    assert _index(session, '2601.00001') == ['Carol']
+
+    # 作者未变化时不重写索引
+    session.query(PaperAuthor).filter_by(paper_id='2601.00001').update({'author_norm': 'marker'})
+    session.commit()
+    paper = session.get(Paper, '2601.00001')
+    paper.title = 'Renamed'
+    paper.authors = 'Carol et al.'
+    session.commit()
+    assert _index(session, '2601.00001') == ['marker']
+
+    session.delete(session.get(Paper, '2601.00001'))
+    session.commit()
+    assert session.query(PaperAuthor).count() == 0
+    session.close()
+
+
+def test_reinsert_after_bulk_delete(Session):
+    session = Session()
+    session.add(Paper(id='2601.00002', title='Paper', authors='Alice, Bob'))
+    session.commit()
+    # Query.delete 不触发 after_delete，索引行残留；同ID论文再次写入时不应违反唯一约束
+    session.query(Paper).filter(Paper.id == '2601.00002').delete(synchronize_session=False)
+    session.commit()
+    session.add(Paper(id='2601.00002', title='Paper', authors='Carol'))
+    session.commit()
+    assert _index(session, '2601.00002') == ['Carol']
+    session.close()
+
+
+def test_backfill_core_inserted_papers(Session, monkeypatch):
+    import migrate_add_paper_authors
+
+    session = Session()
+    session.add(Paper(id='orm', title='ORM paper', authors='Alice'))
+    session.commit()
+    session.execute(Paper.__table__.insert(), [
+        {'id': f"core-{i}", 'title': f"Core paper {i}", 'authors': 'Alice, Bob'} for i in range(5)
+    ] + [{'id': 'no-authors', 'title': 'No authors', 'authors': None}])
+    session.commit()
+    session.close()
+
+    monkeypatch.setattr(migrate_add_paper_authors, 'get_session', Session)
+    assert migrate_add_paper_authors.backfill_paper_authors(batch_size=3) == 10
+    # 可重复执行：已有索引的论文不再写入
+    assert migrate_add_paper_authors.backfill_paper_authors() == 0
+
+    session = Session()
+    assert _index(session, 'core-4') == ['Alice', 'Bob']
+    assert session.query(PaperAuthor).filter_by(author_norm='Alice').count() == 6
+    session.close()
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+B站增量同步测试
+验证视频列表翻页在到达水位（上次同步的最新发布时间）时停止，
+以及 fetch_and_save_up_data(incremental=True) 使用并推进 bilibili_ups.latest_pubdate_raw。
+"""
+import sys
+import os
+import time
+from datetime import datetime
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import fetch_bilibili_data
+from bilibili_client import BilibiliClient
+from bilibili_models import BilibiliUp, BilibiliVideo
+
+UID = 1172054289
+PUBDATE = int(datetime(2026, 1, 1, 12, 0, 0).timestamp())
+
+
+def _video(i):
+    return {'bvid': f"BV{i:04d}", 'aid': i, 'title': f"video {i}", 'play': 100, 'pubdate': PUBDATE + i}
+
+
+@pytest.fixture
+def Session(bilibili_db):
+    return bilibili_db(fetch_bilibili_data)
+
+
+def test_paginated_stops_at_watermark(monkeypatch):
+    # 倒序的100个视频，每页20个
+    videos = [_video(i) for i in range(99, -1, -1)]
+    pages = []
+
+    async def fake_page(self, mid, page=1, page_size=10):
+        pages.append(page)
+        return videos[(page - 1) * page_size:page * page_size]
+
+    monkeypatch.setattr(BilibiliClient, '_get_user_videos_async', fake_page)
+    monkeypatch.setattr(time, 'sleep', lambda seconds: None)
+    client = BilibiliClient()
+
+    # 水位在第一页内：只请求一页，水位上的视频也返回
+    result = client.get_all_videos_paginated(UID, page_size=20, since_pubdate=PUBDATE + 95)
+    assert [v['bvid'] for v in result] == ['BV0099', 'BV0098', 'BV0097', 'BV0096', 'BV0095']
+    assert pages == [1]
+
+    pages.clear()
+    assert len(client.get_all_videos_paginated(UID, page_size=20, since_pubdate=PUBDATE + 50)) == 50
+    assert pages == [1, 2, 3]
+
+    pages.clear()
+    assert len(client.get_all_videos_paginated(UID, page_size=20)) == 100
+    assert pages == [1, 2, 3, 4, 5, 6]
+
+
+def test_incremental_fetch_uses_and_advances_watermark(Session, monkeypatch):
+    calls = []
+    returned = {'videos': [_video(i) for i in range(10)]}
+
+    def fake_get_all_data(self, uid, video_count=50, fetch_all=False, since_pubdate=None):
+        calls.append(since_pubdate)
+        return {'user_info': {'name': '逐际动力'}, 'user_stat': {'videos': 10, 'views': 1000},
+                'videos': returned['videos']}
+
+    monkeypatch.setattr(BilibiliClient, 'get_all_data', fake_get_all_data)
+
+    # 首次同步没有水位，按 video_count 抓取；写入后记录水位
+    assert fetch_bilibili_data.fetch_and_save_up_data(UID, incremental=True)
+    assert calls == [None]
+    session = Session()
+    assert session.get(BilibiliUp, UID).latest_pubdate_raw == PUBDATE + 9
+    session.close()
+
+    # 第二次只请求水位之后的视频
+    returned['videos'] = [_video(11), _video(10), _video(9)]
+    assert fetch_bilibili_data.fetch_and_save_up_data(UID, incremental=True)
+    assert calls[-1] == PUBDATE + 9
+    session = Session()
+    assert session.get(BilibiliUp, UID).latest_pubdate_raw == PUBDATE + 11
+    assert session.query(BilibiliVideo).count() == 12
+
+    # 水位未回填（迁移前已有的UP主）时取视频表中的最新发布时间；水位不后退
+    session.get(BilibiliUp, UID).latest_pubdate_raw = None
+    session.commit()
+    session.close()
+    returned['videos'] = [_video(3)]
+    assert fetch_bilibili_data.fetch_and_save_up_data(UID, incremental=True)
+    assert calls[-1] == PUBDATE + 11
+    session = Session()
+    assert session.get(BilibiliUp, UID).latest_pubdate_raw == PUBDATE + 11
+    session.close()
+
+    # 非增量模式不传水位
+    assert fetch_bilibili_data.fetch_and_save_up_data(UID)
+    assert calls[-1] is None
+
+
+def test_migration_backfills_watermark(Session, monkeypatch):
+    import migrate_add_bilibili_sync_watermark
+
+    session = Session()
+    session.add_all([BilibiliUp(uid=UID, name='逐际动力'), BilibiliUp(uid=2, name='无视频')])
+    for i in range(3):
+        session.add(BilibiliVideo(bvid=f"BV{i}", uid=UID, title='v', pubdate=datetime.fromtimestamp(PUBDATE + i),
+                                  pubdate_raw=PUBDATE + i))
+    session.commit()
+    session.close()
+
+    monkeypatch.setattr(migrate_add_bilibili_sync_watermark, 'get_bilibili_session', Session)
+    assert migrate_add_bilibili_sync_watermark.backfill_latest_pubdate() == 1
+    assert migrate_add_bilibili_sync_watermark.backfill_latest_pubdate() == 0
+    session = Session()
+    assert session.get(BilibiliUp, UID).latest_pubdate_raw == PUBDATE + 2
+    assert session.get(BilibiliUp, 2).latest_pubdate_raw is None
+    session.close()
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
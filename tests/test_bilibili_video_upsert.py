@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+B站视频批量写入测试
+用假的 BilibiliClient 代替B站API，在临时 SQLite 库中验证 fetch_and_save_up_data：
+视频多行 UPSERT（新增/更新计数、未返回的播放量保留原值、uid/created_at 不变）、
+UP主统计回退到视频表聚合，且不再逐个视频查询。
+"""
+import sys
+import os
+from datetime import datetime
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import fetch_bilibili_data
+from bilibili_models import BilibiliUp, BilibiliVideo, BilibiliVideoStat
+
+UID = 1172054289
+PUBDATE = int(datetime(2026, 1, 1, 12, 0, 0).timestamp())
+
+
+def _video(i, play=100):
+    return {
+        'bvid': f"BV{i:04d}", 'aid': i, 'title': f"video {i}", 'pic': '', 'description': '',
+        'length': '01:00', 'play': play, 'video_review': 1, 'favorites': 2, 'pubdate': PUBDATE + i,
+    }
+
+
+@pytest.fixture
+def Session(bilibili_db):
+    return bilibili_db(fetch_bilibili_data)
+
+
+def _fake_api(monkeypatch, videos, user_stat=None):
+    data = {
+        'user_info': {'name': '逐际动力', 'fans': 12345},
+        'user_stat': user_stat if user_stat is not None else {'videos': 0, 'views': 0, 'likes': 10},
+        'videos': videos,
+    }
+    monkeypatch.setattr(fetch_bilibili_data.BilibiliClient, 'get_all_data',
+                        lambda self, uid, video_count=50, fetch_all=False, since_pubdate=None: data)
+
+
+def test_upsert_videos_and_refresh_stats(Session, monkeypatch, query_budget):
+    _fake_api(monkeypatch, [_video(i) for i in range(120)])
+    # UP主查询 + 一次 IN 查询 + 每50个视频一条多行 UPSERT 和一条统计采样 INSERT + 一次聚合 + UP主写入，
+    # 不再逐个视频查询
+    with query_budget(max_queries=15, max_repeats=3, label='fetch_and_save_up_data'):
+        assert fetch_bilibili_data.fetch_and_save_up_data(UID)
+
+    session = Session()
+    up = session.get(BilibiliUp, UID)
+    assert (up.videos_count, up.views_count, up.views_formatted) == (120, 12000, '1.2万')
+    created_at = session.get(BilibiliVideo, 'BV0000').created_at
+    # 每个视频追加一个统计采样点
+    assert session.query(BilibiliVideoStat).filter_by(bvid='BV0000').one().play == 100
+    assert session.query(BilibiliVideoStat).count() == 120
+    session.close()
+
+    # 第二次：播放量增长、一个视频没有返回播放量、一个新视频；API给出统计时以API为准
+    videos = [_video(i, play=5000) for i in range(119)]
+    videos[1]['play'] = None
+    videos.append(_video(500, play=7))
+    _fake_api(monkeypatch, videos, {'videos': 300, 'views': 2000000, 'likes': 10})
+    assert fetch_bilibili_data.fetch_and_save_up_data(UID)
+
+    session = Session()
+    assert session.query(BilibiliVideo).count() == 121
+    first = session.get(BilibiliVideo, 'BV0000')
+    assert (first.play, first.play_formatted, first.uid, first.created_at) == (5000, '5000', UID, created_at)
+    assert session.get(BilibiliVideo, 'BV0001').play == 100
+    assert session.get(BilibiliVideo, 'BV0500').pubdate_raw == PUBDATE + 500
+    up = session.get(BilibiliUp, UID)
+    assert (up.videos_count, up.views_count, up.fetch_error) == (300, 2000000, None)
+    session.close()
+
+
+def test_failed_write_rolls_back_and_records_error(Session, monkeypatch):
+    _fake_api(monkeypatch, [_video(0)])
+    assert fetch_bilibili_data.fetch_and_save_up_data(UID)
+
+    def broken_save(session, uid, videos):
+        raise RuntimeError('写入失败')
+
+    _fake_api(monkeypatch, [_video(0, play=999)])
+    monkeypatch.setattr(fetch_bilibili_data, 'save_videos', broken_save)
+    assert not fetch_bilibili_data.fetch_and_save_up_data(UID)
+
+    session = Session()
+    up = session.get(BilibiliUp, UID)
+    assert '写入失败' in up.fetch_error
+    assert session.get(BilibiliVideo, 'BV0000').play == 100
+    session.close()
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+新闻/招聘去重键测试
+验证 canonical_url 只丢弃纯跟踪参数，以及没有日期的招聘信息同样按唯一索引去重
+（source_date 以空字符串代替 NULL，迁移脚本把历史 NULL 记录改为空字符串并去重）。
+"""
+import sys
+import os
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import save_jobs_to_db
+from jobs_models import Base, Job
+from utils import canonical_url
+
+
+@pytest.fixture
+def Session(temp_db, monkeypatch):
+    Session = temp_db(Base, 'jobs')
+    monkeypatch.setattr(save_jobs_to_db, 'get_jobs_session', Session)
+    return Session
+
+
+def test_canonical_url_strips_only_tracking_params():
+    assert canonical_url('http://www.Example.com/job/?utm_source=x&id=3&share_medium=app&fbclid=1#top') == \
+        'https://example.com/job?id=3'
+    # from/ref/source 在部分站点上决定页面内容，保留
+    assert canonical_url('https://example.com/list?source=github&ref=main&from=2') == \
+        'https://example.com/list?from=2&ref=main&source=github'
+
+
+def test_jobs_without_source_date_are_deduped(Session):
+    job = {'title': '公司 - 职位', 'link': 'https://example.com/job?utm_source=feed'}
+    assert save_jobs_to_db.save_job_to_db(job) == (True, 'created')
+    assert save_jobs_to_db.save_job_to_db({**job, 'source_date': None}) == (True, 'updated')
+    stats = save_jobs_to_db.batch_save_jobs([job, {'title': '无链接职位'}, {'title': '无链接职位'}])
+    assert (stats['created'], stats['error']) == (1, 0)
+    assert save_jobs_to_db.batch_save_jobs([{'title': '无链接职位'}])['created'] == 0
+
+    session = Session()
+    assert session.query(Job).count() == 2
+    assert {job.source_date for job in session.query(Job)} == {''}
+    session.close()
+
+
+def test_migration_normalizes_null_source_date(Session, monkeypatch):
+    import migrate_add_dedup_keys
+
+    session = Session()
+    # 唯一索引建立之前写入的历史数据：同一链接的 NULL 日期记录与空字符串记录
+    session.execute(Job.__table__.insert(), [
+        {'title': 'A', 'link': 'https://example.com/a', 'canonical_link': 'https://example.com/a',
+         'title_hash': 'x', 'source_date': date} for date in (None, None)
+    ] + [{'title': 'B', 'link': '', 'canonical_link': '', 'title_hash': 'y', 'source_date': None}])
+    session.commit()
+    session.close()
+
+    session = Session()
+    migrate_add_dedup_keys._backfill_and_dedup(
+        session, Job,
+        lambda v: ('link', v['canonical_link'], v['source_date']) if v['canonical_link']
+        else ('title', v['title_hash'], v['source_date'])
+    )
+    rows = session.query(Job.title, Job.source_date).order_by(Job.id).all()
+    session.close()
+    assert [(title, date) for title, date in rows] == [('A', ''), ('B', '')]
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+外部接口录制/回放测试
+用本地 HTTP 服务代替外网：录制一次新闻聚合（aiohttp 抓取 RSS）和一次 requests 请求，
+关闭服务后回放，验证结果与录制时一致且不再访问网络；未录制的请求按连接错误处理。
+"""
+import sys
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import asyncio
+
+import aiohttp
+import pytest
+import requests
+
+import news_aggregator
+from http_cassette import use_cassette
+
+RSS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0"><channel><title>Local</title>
+<item><title>Humanoid robot learns dexterous manipulation with embodied AI</title>
+<link>https://example.com/humanoid</link><pubDate>Mon, 19 Oct 2026 08:00:00 GMT</pubDate>
+<description>Embodied intelligence for humanoid robots.</description></item>
+</channel></rss>"""
+
+
+@pytest.fixture
+def server():
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits.append(self.path)
+            body = RSS if self.path.startswith('/feed') else b'{"ok": true}'
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/rss+xml' if self.path.startswith('/feed')
+                             else 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    httpd.hits = hits
+    httpd.url = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def aggregate(tmp_path, monkeypatch):
+    """只抓取本地 RSS 源的新闻聚合（NewsAPI/Orz.ai 返回空，解析在线程中进行）"""
+    monkeypatch.setattr(news_aggregator, 'FEED_CACHE_FILE', str(tmp_path / 'feed_cache.json'))
+    monkeypatch.setattr(news_aggregator, 'PARSE_PROCESSES', 0)
+    monkeypatch.setattr(news_aggregator, 'fetch_news_from_newsapi', lambda *args: [])
+    monkeypatch.setattr(news_aggregator, 'fetch_news_from_platform', lambda *args: [])
+    return lambda url: news_aggregator.fetch_all_sources(feeds=[{'url': url, 'name': 'Local'}])
+
+
+def test_news_aggregation_record_then_replay(server, aggregate, tmp_path):
+    feed_url = f"{server.url}/feed?lang=en"
+    with use_cassette(str(tmp_path / 'cassettes'), mode='record') as cassette:
+        recorded = aggregate(feed_url)
+    assert cassette.stats['recorded'] == 1
+    assert [news['title'] for news in recorded['rss']] == [
+        'Humanoid robot learns dexterous manipulation with embodied AI']
+
+    server.shutdown()
+    with use_cassette(str(tmp_path / 'cassettes'), mode='replay') as cassette:
+        replayed = aggregate(feed_url)
+    assert cassette.stats == {'recorded': 0, 'replayed': 1, 'missed': 0, 'injected_faults': 0}
+    assert replayed['rss'] == recorded['rss']
+    assert server.hits == ['/feed?lang=en']
+
+
+def test_replay_miss_and_injected_fault(tmp_path):
+    async def get(url):
+        async with aiohttp.ClientSession() as http:
+            async with http.get(url) as response:
+                return response.status, await response.text()
+
+    with use_cassette(str(tmp_path), mode='replay') as cassette:
+        with pytest.raises(aiohttp.ClientConnectionError):
+            asyncio.run(get('http://127.0.0.1:9/never-recorded'))
+        with pytest.raises(requests.exceptions.ConnectionError):
+            requests.get('http://127.0.0.1:9/never-recorded')
+    assert cassette.stats['missed'] == 2
+
+    with use_cassette(str(tmp_path), mode='replay', fault_rate=1.0, fault_status=429):
+        status, text = asyncio.run(get('http://127.0.0.1:9/never-recorded'))
+    assert status == 429 and '-429' in text
+
+
+def test_requests_record_then_replay(server, tmp_path):
+    with use_cassette(str(tmp_path), mode='record'):
+        assert requests.get(f"{server.url}/api", params={'q': 1, 'ts': 100}).json() == {'ok': True}
+    server.shutdown()
+    # 时间戳等易变参数不参与匹配
+    with use_cassette(str(tmp_path), mode='replay'):
+        assert requests.get(f"{server.url}/api", params={'q': 1, 'ts': 200}).json() == {'ok': True}
+    assert len(server.hits) == 1
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+热点接口查询预算测试
+在临时 SQLite 库中写入测试数据，断言每个接口的查询次数不超过预算，
+防止新增循环内逐条查询（N+1）等回归。超出预算时用 QUERY_PROFILER=true 运行服务查看具体语句。
+"""
+import sys
+import os
+from datetime import datetime, date, timedelta
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+N_UPS = 5
+VIDEOS_PER_UP = 4
+N_PAPERS = 30
+
+
+@pytest.fixture
+def client(temp_db, bilibili_db, monkeypatch):
+    """app 测试客户端，论文库和B站库替换为临时 SQLite 库"""
+    import app as app_module
+    import models
+
+    papers_session = temp_db(models.Base)
+    bilibili_session = bilibili_db(app_module)
+    _seed_papers(papers_session())
+    _seed_bilibili(bilibili_session())
+
+    monkeypatch.setattr(app_module, 'get_session', papers_session)
+    # 接口内存缓存会让第二次请求不查库
+    monkeypatch.setitem(app_module.bilibili_cache, 'all_data', None)
+    monkeypatch.setitem(app_module.bilibili_cache, 'all_expires_at', None)
+
+    # /api/bootstrap 的模块结果缓存
+    monkeypatch.setattr('bootstrap_api._section_cache', {})
+
+    return app_module.app.test_client()
+
+
+def _seed_papers(session):
+    from models import Paper
+    today = date.today()
+    categories = ['Manipulation', 'Locomotion', 'VLA']
+    for i in range(N_PAPERS):
+        session.add(Paper(
+            id=f"2601.{i:05d}",
+            title=f"Test paper {i}",
+            authors="Alice, Bob",
+            publish_date=today - timedelta(days=i % 20),
+            category=categories[i % len(categories)],
+        ))
+    session.commit()
+    session.close()
+
+
+def _seed_bilibili(session):
+    from bilibili_models import BilibiliUp, BilibiliVideo
+    now = datetime.now()
+    for u in range(N_UPS):
+        uid = 1000 + u
+        session.add(BilibiliUp(
+            uid=uid, name=f"UP{u}", is_active=True,
+            videos_count=VIDEOS_PER_UP, views_count=1000, last_fetch_at=now,
+        ))
+        for v in range(VIDEOS_PER_UP):
+            pubdate = now - timedelta(days=v)
+            session.add(BilibiliVideo(
+                bvid=f"BV{uid}{v}", uid=uid, title=f"video {v}", play=100 * (v + 1),
+                pubdate=pubdate, pubdate_raw=int(pubdate.timestamp()), is_deleted=False,
+            ))
+    session.commit()
+    session.close()
+
+
+def test_papers_query_budget(client, query_budget):
+    with query_budget(max_queries=5, max_repeats=1, label='GET /api/papers'):
+        response = client.get('/api/papers')
+    assert response.status_code == 200
+
+
+def test_trends_query_budget(client, query_budget):
+    # 论文列表1次 + 最近7天/之前7天按类别分组统计各1次
+    with query_budget(max_queries=3, max_repeats=2, label='GET /api/trends'):
+        response = client.get('/api/trends?days=30')
+    assert response.status_code == 200
+
+
+def test_authors_ranking_query_budget(client, query_budget):
+    # paper_authors 按作者分组取前N名 + 前N名的论文 + 上一周期数量，与论文数无关
+    with query_budget(max_queries=3, max_repeats=1, label='GET /api/authors/ranking'):
+        response = client.get('/api/authors/ranking?days=7&limit=20')
+    assert response.status_code == 200
+    data = response.get_json()['data']
+    recent = sum(1 for i in range(N_PAPERS) if i % 20 <= 7)
+    assert [(item['author'], item['count']) for item in data] == [('Alice', recent), ('Bob', recent)]
+    assert len(data[0]['papers']) == recent
+
+
+def test_bilibili_all_query_budget(client, query_budget):
+    # 目前按UP主逐个查询视频（每个UP主各一次），预算允许每种语句执行 N_UPS 次；
+    # 按视频逐条查询会超出预算
+    with query_budget(max_queries=1 + 2 * N_UPS, max_repeats=N_UPS, label='GET /api/bilibili/all'):
+        response = client.get('/api/bilibili/all?force=1')
+    assert response.status_code == 200
+    assert len(response.get_json()['data']) == N_UPS
+
+
+def test_bilibili_yearly_stats_query_budget(client, query_budget):
+    with query_budget(max_queries=1 + N_UPS, max_repeats=N_UPS, label='GET /api/bilibili/yearly_stats'):
+        response = client.get('/api/bilibili/yearly_stats')
+    assert response.status_code == 200
+
+
+def test_bootstrap_query_budget(client, query_budget):
+    # 批量接口并发调用各模块，查询次数不超过各接口单独请求之和，数据与单独请求一致
+    with query_budget(max_queries=5 + 3, max_repeats=2, label='GET /api/bootstrap'):
+        response = client.get('/api/bootstrap?sections=papers,trends&trends.days=30')
+    assert response.status_code == 200
+    sections = response.get_json()['sections']
+    assert sections['trends']['url'] == '/api/trends?days=30'
+    assert sections['papers']['data'] == client.get('/api/papers').get_json()
+    trends = client.get('/api/trends?days=30').get_json()
+    trends.pop('updated_at')  # 生成时间
+    assert {k: v for k, v in sections['trends']['data'].items() if k != 'updated_at'} == trends
+
+    etag = response.headers['ETag']
+    assert client.get('/api/bootstrap?sections=papers,trends&trends.days=30',
+                      headers={'If-None-Match': etag}).status_code == 304
+    known = f"papers:{sections['papers']['etag']}"
+    cached = client.get(f'/api/bootstrap?sections=papers,trends&trends.days=30&known={known}').get_json()
+    assert cached['sections']['papers']['status'] == 304
+    assert 'data' not in cached['sections']['papers']
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+一键刷新编排测试
+验证 refresh_pipeline.run_stages 的依赖顺序、资源并发上限、失败跳过与阶段耗时，
+以及任务表中一键刷新的去重（重复触发只有一个 refresh_all，单独抓取被一键刷新覆盖）。
+"""
+import sys
+import os
+import threading
+import time
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import refresh_pipeline
+from refresh_pipeline import Stage, build_refresh_stages, run_stages
+
+
+@pytest.fixture
+def tasks_db(temp_db, monkeypatch):
+    """临时任务表"""
+    import task_queue
+    from task_models import Base
+
+    monkeypatch.setattr(task_queue, 'get_tasks_session', temp_db(Base, 'tasks'))
+    return task_queue
+
+
+def test_stages_respect_dependencies_and_resource_limits():
+    order = []
+    active = {'db_writer': 0}
+    peak = {'db_writer': 0}
+    lock = threading.Lock()
+
+    def step(name, resource=None, result=None, fail=False):
+        def func(context):
+            with lock:
+                order.append(name)
+                if resource:
+                    active[resource] += 1
+                    peak[resource] = max(peak[resource], active[resource])
+            time.sleep(0.05)
+            with lock:
+                if resource:
+                    active[resource] -= 1
+            if fail:
+                raise RuntimeError(f"{name} 失败")
+            return result
+        return func
+
+    stages = [
+        Stage('a.fetch', step('a.fetch', result=[1, 2])),
+        Stage('a.write', lambda context: sum(context['a.fetch']), deps=['a.fetch']),
+        Stage('b.write', step('b.write', 'db_writer'), resources=['db_writer']),
+        Stage('c.write', step('c.write', 'db_writer'), resources=['db_writer']),
+        Stage('d.fetch', step('d.fetch', fail=True)),
+        Stage('d.write', step('d.write'), deps=['d.fetch']),
+        Stage('publish', step('publish'), deps=['a.write', 'b.write', 'c.write', 'd.write'], always=True),
+    ]
+    context = {}
+    results = run_stages(stages, context, limits={'db_writer': 1})
+
+    assert context['a.write'] == 3
+    assert peak['db_writer'] == 1
+    assert order[-1] == 'publish' and 'd.write' not in order
+    assert {name: result['state'] for name, result in results.items()} == {
+        'a.fetch': 'success', 'a.write': 'success', 'b.write': 'success', 'c.write': 'success',
+        'd.fetch': 'error', 'd.write': 'skipped', 'publish': 'success',
+    }
+    assert results['b.write']['seconds'] >= 0.05
+    assert 'd.fetch 失败' in refresh_pipeline.format_timings(results)
+
+
+def test_build_refresh_stages():
+    names = [stage.name for stage in build_refresh_stages(['jobs', 'news'])]
+    assert names == ['jobs.fetch', 'jobs.write', 'news.fetch', 'news.select', 'news.write', 'publish']
+    assert build_refresh_stages(['jobs'])[-1].deps == ('jobs.write',)
+    with pytest.raises(ValueError):
+        build_refresh_stages(['weather'])
+    with pytest.raises(ValueError):
+        run_stages([Stage('x', lambda c: None, deps=['y']), Stage('y', lambda c: None, deps=['x'])])
+
+
+def test_concurrent_triggers_share_one_run(tasks_db):
+    task, created = tasks_db.enqueue_task('refresh_all')
+    assert created
+    again, created = tasks_db.enqueue_task('refresh_all')
+    assert (again['id'], created) == (task['id'], False)
+    # 一键刷新排队时再触发论文/新闻抓取，直接返回一键刷新任务
+    covered, created = tasks_db.enqueue_task('fetch_news', source='schedule')
+    assert (covered['id'], covered['task_type'], created) == (task['id'], 'refresh_all', False)
+    # 论文全量抓取与论文阶段共用 papers 互斥键，同样被覆盖
+    covered, created = tasks_db.enqueue_task('full_fetch_papers', source='schedule')
+    assert (covered['id'], created) == (task['id'], False)
+    _, created = tasks_db.enqueue_task('fetch_bilibili')
+    assert created
+
+    tasks_db.finish_task(task['id'], 'success', message='done')
+    _, created = tasks_db.enqueue_task('fetch_news')
+    assert created
+
+    # 包含B站的一键刷新同样覆盖单独的B站抓取（共享B站请求额度）
+    tasks_db.finish_task(tasks_db.enqueue_task('fetch_bilibili')[0]['id'], 'success', message='done')
+    task, _ = tasks_db.enqueue_task('refresh_all', {'sources': ['bilibili']})
+    covered, created = tasks_db.enqueue_task('fetch_bilibili')
+    assert (covered['id'], created) == (task['id'], False)
+
+
+def test_refresh_all_skips_sources_with_running_tasks(tasks_db, monkeypatch):
+    import task_handlers
+
+    calls = []
+
+    def fake_run_refresh(sources, task_progress=None):
+        calls.append(list(sources))
+        return {'jobs.fetch': {'state': 'success', 'seconds': 1.0, 'error': None},
+                'publish': {'state': 'success', 'seconds': 0.0, 'error': None}}
+
+    monkeypatch.setattr(refresh_pipeline, 'run_refresh', fake_run_refresh)
+    tasks_db.enqueue_task('full_fetch_papers')
+    tasks_db.enqueue_task('fetch_news')
+    message = task_handlers.run_refresh_all({})
+    assert calls == [['jobs']]
+    assert message == '一键刷新完成（jobs.fetch 1.0s, publish 0.0s）'
+
+    monkeypatch.setattr(refresh_pipeline, 'run_refresh', lambda sources, task_progress=None: {
+        'jobs.fetch': {'state': 'error', 'seconds': 0.1, 'error': 'timeout'}})
+    with pytest.raises(RuntimeError):
+        task_handlers.run_refresh_all({'sources': ['jobs']})
+
+
+def test_news_outage_fails_refresh(monkeypatch):
+    import fetch_news
+    import news_models
+
+    monkeypatch.setattr(news_models, 'init_news_db', lambda: None)
+    monkeypatch.setattr(fetch_news, 'fetch_all_sources', lambda **kwargs: {
+        'rss': [], 'newsapi': [], 'orz': [], 'feed_cache': {}, 'rss_feeds': 12, 'rss_failed': 12})
+    results = refresh_pipeline.run_refresh(['news'])
+    assert [results[name]['state'] for name in ('news.fetch', 'news.select', 'news.write', 'publish')] == [
+        'error', 'skipped', 'skipped', 'success']
+    assert '所有RSS源抓取失败' in results['news.fetch']['error']
+
+    # 单独的新闻抓取任务仍然只记录错误，不中断
+    saved = []
+    monkeypatch.setattr(fetch_news, 'init_news_db', lambda: None)
+    monkeypatch.setattr(fetch_news, 'save_news', lambda news_list, feed_cache: saved.append(news_list))
+    fetch_news.fetch_and_save_news()
+    assert saved == [[]]
+
+
+def test_refresh_api_and_cache_publish(tasks_db, monkeypatch):
+    import app as app_module
+    import bootstrap_api
+
+    monkeypatch.setattr(app_module, '_last_published_task_id', 0)
+    client = app_module.app.test_client()
+    first = client.post('/api/refresh-all').get_json()
+    second = client.post('/api/refresh-all').get_json()
+    assert first['message'] == '刷新任务已启动' and second['message'] == '刷新任务已在运行中'
+    assert first['status']['running'] and first['status']['news']['status'] == 'pending'
+
+    # 刷新完成后，状态接口清理本进程的首屏模块缓存（每个任务只清理一次）
+    task = tasks_db.get_latest_task('refresh_all')
+    tasks_db.finish_task(task['id'], 'success', message='一键刷新完成')
+    monkeypatch.setitem(bootstrap_api._section_cache, '/api/news?limit=30', (time.monotonic() + 30, {}))
+    status = client.get('/api/refresh-status').get_json()
+    assert status['news']['status'] == 'success' and not status['running']
+    assert bootstrap_api._section_cache == {}
+
+    # 部分数据源失败：有发布标记时同样清理，没有任何数据源写入成功时不清理
+    for published, expected in ((False, 1), (True, 0)):
+        task, _ = tasks_db.enqueue_task('refresh_all')
+        tasks_db.claim_next_task()
+        if published:
+            progress = tasks_db.TaskProgress(task['id'])
+            progress.incr('published')
+            progress.flush()
+        tasks_db.finish_task(task['id'], 'error', error='刷新阶段未成功: news.fetch')
+        monkeypatch.setitem(bootstrap_api._section_cache, '/api/news?limit=30', (time.monotonic() + 30, {}))
+        client.get('/api/refresh-status')
+        assert len(bootstrap_api._section_cache) == expected
+
+
+class Progress:
+    """记录计数器与最后一次进度的 TaskProgress 替身"""
+
+    def __init__(self):
+        self.counters = {}
+        self.state = {}
+
+    def update(self, **kwargs):
+        self.state.update({key: value for key, value in kwargs.items() if value is not None and key != 'force'})
+
+    def incr(self, counter, value=1):
+        self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def flush(self):
+        pass
+
+
+def test_publish_marks_task_when_a_source_was_written(monkeypatch):
+    monkeypatch.setitem(refresh_pipeline.SOURCE_STAGES, 'jobs', [Stage('jobs.write', lambda context: None)])
+    monkeypatch.setitem(refresh_pipeline.SOURCE_STAGES, 'news', [Stage('news.write', lambda context: 1 / 0)])
+    progress = Progress()
+    results = refresh_pipeline.run_refresh(['jobs', 'news'], task_progress=progress)
+    assert results['news.write']['state'] == 'error' and progress.counters['published'] == 1
+
+    progress = Progress()
+    refresh_pipeline.run_refresh(['news'], task_progress=progress)
+    assert 'published' not in progress.counters
+
+
+
+def test_jobs_and_news_tasks_report_progress_and_counters(monkeypatch):
+    import fetch_jobs
+    import fetch_news
+    import news_models
+    import task_handlers
+
+    stats = {'total': 4, 'created': 2, 'updated': 1, 'skipped': 1, 'error': 0}
+    monkeypatch.setattr(fetch_jobs, 'init_jobs_db', lambda: None)
+    monkeypatch.setattr(fetch_jobs, 'fetch_all_jobs', lambda: [{}] * 4)
+    monkeypatch.setattr(fetch_jobs, 'batch_save_jobs', lambda jobs: stats)
+    progress = Progress()
+    message = task_handlers.run_fetch_jobs({}, progress)
+    assert progress.counters == {'saved': 3, 'skipped': 1}
+    assert progress.state['progress'] == progress.state['total'] == 2
+    assert message == '招聘信息刷新完成（入库: 3, 跳过: 1）'
+
+    monkeypatch.setattr(news_models, 'init_news_db', lambda: None)
+    monkeypatch.setattr(fetch_news, 'init_news_db', lambda: None)
+    monkeypatch.setattr(fetch_news, 'fetch_news_sources', lambda: {'feed_cache': None})
+    monkeypatch.setattr(fetch_news, 'select_recent_news', lambda sources: [{}] * 4)
+    monkeypatch.setattr(fetch_news, 'save_news', lambda news_list, feed_cache: dict(stats, error=1))
+    progress = Progress()
+    message = task_handlers.run_fetch_news({}, progress)
+    assert progress.counters == {'saved': 3, 'skipped': 1, 'failed': 1}
+    assert progress.state['progress'] == progress.state['total'] == 3
+    assert message == '新闻抓取完成！（入库: 3, 跳过: 1, 失败: 1）'
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
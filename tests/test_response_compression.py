@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+响应压缩测试
+在最小 Flask 应用上注册 response_compression，验证大小阈值、Accept-Encoding 协商、
+跳过已压缩内容，以及流式响应逐块压缩（每块都能立即解压）。
+"""
+import sys
+import os
+import gzip
+import zlib
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from flask import Flask, Response, jsonify
+
+import response_compression
+from response_compression import choose_encoding, init_response_compression
+
+LARGE_ITEMS = [{'id': i, 'title': f'Paper {i}', 'abstract': 'embodied intelligence ' * 10} for i in range(200)]
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    init_response_compression(app)
+
+    @app.route('/large')
+    def large():
+        return jsonify({'success': True, 'data': LARGE_ITEMS})
+
+    @app.route('/small')
+    def small():
+        return jsonify({'success': True})
+
+    @app.route('/encoded')
+    def encoded():
+        response = Response(gzip.compress(b'x' * 4096), mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+        return response
+
+    @app.route('/events')
+    def events():
+        def generate():
+            for i in range(3):
+                yield f"data: {{\"step\": {i}}}\n\n"
+        return Response(generate(), mimetype='text/event-stream')
+
+    return app.test_client()
+
+
+def test_choose_encoding(monkeypatch):
+    assert choose_encoding('') is None
+    assert choose_encoding('gzip;q=0') is None
+    assert choose_encoding('deflate, gzip;q=0.5') == 'gzip'
+    monkeypatch.setattr(response_compression, 'brotli', None)
+    assert choose_encoding('br, gzip') == 'gzip'
+
+
+def test_large_json_is_compressed(client):
+    response = client.get('/large', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    raw = gzip.decompress(response.data)
+    assert len(raw) > 5 * len(response.data)
+    assert int(response.headers['Content-Length']) == len(response.data)
+
+
+def test_skipped_responses(client):
+    assert 'Content-Encoding' not in client.get('/large').headers
+    assert 'Content-Encoding' not in client.get('/small', headers={'Accept-Encoding': 'gzip'}).headers
+    # 已压缩的内容不重复压缩
+    response = client.get('/encoded', headers={'Accept-Encoding': 'gzip'})
+    assert gzip.decompress(response.data) == b'x' * 4096
+
+
+def test_streamed_response_flushes_each_chunk(client):
+    response = client.get('/events', headers={'Accept-Encoding': 'gzip'}, buffered=False)
+    assert response.headers['Content-Encoding'] == 'gzip'
+    decompressor = zlib.decompressobj(31)
+    received = b''
+    for i, chunk in enumerate(response.response):
+        received += decompressor.decompress(chunk)
+        if i < 3:
+            assert received.endswith(f'data: {{"step": {i}}}\n\n'.encode())
+    assert decompressor.eof
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
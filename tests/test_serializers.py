@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+字段集投影序列化测试
+在临时 SQLite 库中写入论文和视频，验证 serializers 的 detail 字段集与模型 to_dict() 输出一致，
+list/card 只查询需要的列，以及 /api/papers 的 fields 参数。
+"""
+import sys
+import os
+import json
+from datetime import datetime, date, timedelta
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import serializers
+from serializers import fetch_dicts, get_projection
+
+# 各种格式的机构字段：JSON 列表、逗号分隔、JSON 字符串、无效 JSON、空值
+AFFILIATIONS = [
+    json.dumps(['MIT', 'Stanford University']),
+    'Tsinghua University, Peking University',
+    'tsinghua, pku',
+    json.dumps('CMU'),
+    '[broken',
+    '',
+    None,
+]
+
+
+@pytest.fixture
+def db(temp_db, bilibili_db):
+    """临时论文库和B站库，返回 (论文 Session, B站 Session)"""
+    from models import Base, Paper
+    from bilibili_models import BilibiliVideo
+
+    papers_session = temp_db(Base)
+    bilibili_session = bilibili_db()
+
+    session = papers_session()
+    for i, affiliations in enumerate(AFFILIATIONS):
+        session.add(Paper(
+            id=f"2601.{i:05d}",
+            title=f"Test paper {i}",
+            authors='Alice, Bob',
+            publish_date=date(2026, 1, 1) + timedelta(days=i) if i % 3 else None,
+            category='VLA',
+            abstract='robot manipulation' if i % 2 else None,
+            citation_count=i if i % 2 else None,
+            author_affiliations=affiliations,
+            venue='CoRL' if i == 1 else None,
+            publication_year=2026 if i == 1 else None,
+        ))
+    session.commit()
+    session.close()
+
+    session = bilibili_session()
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    for v in range(3):
+        session.add(BilibiliVideo(
+            bvid=f"BV{v}", uid=1, title=f"video {v}", play=[0, 12345, 150000000][v],
+            favorites_formatted='1.2万' if v else None, pubdate=now - timedelta(days=v),
+            pubdate_raw=int((now - timedelta(days=v)).timestamp()) if v else None,
+            url='https://b23.tv/x' if v == 2 else None, is_deleted=False,
+        ))
+    session.commit()
+    session.close()
+
+    return papers_session, bilibili_session
+
+
+def test_detail_matches_to_dict(db):
+    from models import Paper
+    from bilibili_models import BilibiliVideo
+
+    papers_session, bilibili_session = db
+    for get_session, model, order_by in ((papers_session, Paper, Paper.id),
+                                         (bilibili_session, BilibiliVideo, BilibiliVideo.bvid)):
+        session = get_session()
+        expected = [item.to_dict() for item in session.query(model).order_by(order_by).all()]
+        assert fetch_dicts(session, model, 'detail', order_by=[order_by]) == expected
+        session.close()
+
+
+def test_field_sets_select_only_needed_columns(db):
+    from models import Paper
+
+    projection = get_projection(Paper, 'list')
+    selected = {column.key for column in projection.columns}
+    assert 'abstract' not in selected and 'author_affiliations' not in selected
+    # pdf_id 与 id 共用一列
+    assert len(projection.columns) == len(serializers.PAPER_FIELD_SETS['list']) - 1
+
+    papers_session, _ = db
+    session = papers_session()
+    rows = fetch_dicts(session, Paper, 'list', Paper.id == '2601.00001')
+    session.close()
+    assert rows == [{
+        'id': '2601.00001', 'title': 'Test paper 1', 'authors': 'Alice, Bob', 'date': '2026-01-02',
+        'pdf_id': '2601.00001', 'pdf_url': None, 'code_url': None, 'category': 'VLA',
+    }]
+
+    with pytest.raises(ValueError):
+        get_projection(Paper, 'full')
+
+
+def test_video_card_matches_bilibili_all_format(db):
+    from bilibili_models import BilibiliVideo
+
+    _, bilibili_session = db
+    session = bilibili_session()
+    videos = {row['bvid']: row for row in fetch_dicts(session, BilibiliVideo, 'card')}
+    session.close()
+    assert set(videos['BV0']) == set(serializers.VIDEO_FIELD_SETS['card'])
+    assert videos['BV0']['play'] == '0' and videos['BV0']['play_raw'] == 0
+    assert videos['BV0']['pubdate'] == '' and videos['BV0']['pubdate_raw'] == 0
+    assert videos['BV0']['url'] == 'https://www.bilibili.com/video/BV0'
+    assert videos['BV1']['play'] == '1.2万' and videos['BV1']['favorites'] == '1.2万'
+    assert videos['BV2']['play'] == '1.5亿' and videos['BV2']['url'] == 'https://b23.tv/x'
+
+
+def test_papers_api_fields_param(db, monkeypatch):
+    import app as app_module
+
+    papers_session, _ = db
+    monkeypatch.setattr(app_module, 'get_session', papers_session)
+    monkeypatch.setattr('bootstrap_api._section_cache', {})
+    client = app_module.app.test_client()
+
+    def get_papers(url):
+        data = client.get(url).get_json()['data']
+        return [paper for papers in data.values() for paper in papers]
+
+    papers = get_papers('/api/papers?fields=list')
+    assert len(papers) == len(AFFILIATIONS)
+    assert set(papers[0]) == set(serializers.PAPER_FIELD_SETS['list'])
+    assert set(get_papers('/api/papers')[0]) == set(serializers.PAPER_FIELDS)
+    assert client.get('/api/papers?fields=full').status_code == 400
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
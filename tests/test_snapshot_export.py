@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+列式快照导出测试
+在临时 SQLite 库中写入论文，验证增量导出（updated_at 水位）、按主键去重、合并分片和全量重建，
+CSV 与 Arrow 两种格式结果一致（未安装 pyarrow 时跳过 Arrow）。
+"""
+import sys
+import os
+from datetime import datetime, date, timedelta
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import snapshot_export
+
+N_PAPERS = 50
+BASE_TIME = datetime(2026, 1, 1, 8, 0, 0)
+
+
+@pytest.fixture(params=['csv', 'arrow'])
+def fmt(request):
+    if request.param == 'arrow' and not snapshot_export.PYARROW_AVAILABLE:
+        pytest.skip('pyarrow 未安装')
+    return request.param
+
+
+@pytest.fixture
+def papers_db(temp_db):
+    """临时论文库，返回 (engine, Session)"""
+    from models import Base, Paper
+
+    Session = temp_db(Base)
+    session = Session()
+    for i in range(N_PAPERS):
+        session.add(Paper(
+            id=f"2601.{i:05d}",
+            title=f"Test paper {i}",
+            category='Manipulation' if i % 2 else 'VLA',
+            publish_date=date(2026, 1, 1) + timedelta(days=i % 10),
+            citation_count=i,
+            # 最后两篇更新时间相同，验证水位边界
+            updated_at=BASE_TIME + timedelta(minutes=min(i, N_PAPERS - 2)),
+        ))
+    session.commit()
+    session.close()
+    return Session.kw['bind'], Session
+
+
+def _export(engine, snapshot_dir, fmt, **kwargs):
+    return snapshot_export.export_table('papers', str(snapshot_dir), fmt=fmt, engine=engine,
+                                        chunk_size=16, **kwargs)
+
+
+def test_full_then_incremental(papers_db, tmp_path, fmt):
+    from models import Paper
+
+    engine, Session = papers_db
+    snapshot_dir = tmp_path / 'snapshots'
+
+    result = _export(engine, snapshot_dir, fmt)
+    assert result['full'] and result['rows'] == N_PAPERS
+    # 没有变化时不写新分片（水位时刻的行已导出过）
+    assert _export(engine, snapshot_dir, fmt)['rows'] == 0
+
+    session = Session()
+    paper = session.get(Paper, '2601.00003')
+    paper.category = 'Locomotion'
+    paper.updated_at = BASE_TIME + timedelta(days=1)
+    session.add(Paper(id='2601.99999', title='New paper', category='VLA',
+                      updated_at=BASE_TIME + timedelta(days=1)))
+    session.commit()
+    session.close()
+
+    result = _export(engine, snapshot_dir, fmt)
+    assert not result['full'] and result['rows'] == 2
+    assert result['parts'] == 2
+
+    rows = {row['id']: row for row in snapshot_export.iter_rows('papers', snapshot_dir=str(snapshot_dir))}
+    assert len(rows) == N_PAPERS + 1
+    assert rows['2601.00003']['category'] == 'Locomotion'
+    assert rows['2601.00007']['publish_date'] == date(2026, 1, 8)
+    assert rows['2601.00007']['citation_count'] == 7
+    assert rows['2601.00007']['abstract'] is None
+
+    counts = snapshot_export.group_count('papers', 'category', snapshot_dir=str(snapshot_dir))
+    assert counts['Locomotion'] == 1
+    assert sum(counts.values()) == N_PAPERS + 1
+    assert snapshot_export.max_value('papers', 'updated_at', snapshot_dir=str(snapshot_dir)) == \
+        BASE_TIME + timedelta(days=1)
+
+
+def test_compact_and_full_rebuild(papers_db, tmp_path, fmt):
+    from models import Paper
+
+    engine, Session = papers_db
+    snapshot_dir = tmp_path / 'snapshots'
+    _export(engine, snapshot_dir, fmt)
+
+    session = Session()
+    session.get(Paper, '2601.00001').updated_at = BASE_TIME + timedelta(days=2)
+    session.commit()
+    _export(engine, snapshot_dir, fmt)
+
+    assert snapshot_export.compact_table('papers', str(snapshot_dir)) == N_PAPERS
+    assert len(snapshot_export.read_manifest('papers', str(snapshot_dir))['parts']) == 1
+
+    # 删除的行只有全量重建才会从快照中移除
+    session.delete(session.get(Paper, '2601.00002'))
+    session.commit()
+    session.close()
+    assert snapshot_export.count_rows('papers', snapshot_dir=str(snapshot_dir)) == N_PAPERS
+    _export(engine, snapshot_dir, fmt, full=True)
+    assert snapshot_export.count_rows('papers', snapshot_dir=str(snapshot_dir)) == N_PAPERS - 1
+    part_files = [name for name in os.listdir(snapshot_dir / 'papers') if name.startswith('part-')]
+    assert len(part_files) == 1
+
+
+def test_read_arrow_table_dedupes(papers_db, tmp_path):
+    if not snapshot_export.PYARROW_AVAILABLE:
+        pytest.skip('pyarrow 未安装')
+    from models import Paper
+
+    engine, Session = papers_db
+    snapshot_dir = tmp_path / 'snapshots'
+    _export(engine, snapshot_dir, 'arrow')
+    session = Session()
+    session.get(Paper, '2601.00004').citation_count = 1000
+    session.commit()
+    session.close()
+    _export(engine, snapshot_dir, 'arrow')
+
+    table = snapshot_export.read_arrow_table('papers', ['id', 'citation_count'], snapshot_dir=str(snapshot_dir))
+    assert table.num_rows == N_PAPERS
+    citations = dict(zip(table.column('id').to_pylist(), table.column('citation_count').to_pylist()))
+    assert citations['2601.00004'] == 1000
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+静态资源构建测试
+在临时目录中构建静态资源，验证带哈希文件名、CSS 引用改写，
+以及 url_for 改写和按 Accept-Encoding 返回预压缩文件。
+"""
+import sys
+import os
+import gzip
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from flask import Flask, render_template_string
+
+import static_assets
+
+APP_JS = "// 注释会被去掉\nfunction hello(name) {\n    return 'hello ' + name;\n}\n" * 50
+STYLE_CSS = "body {\n    background: url('/static/images/bg.png') no-repeat;\n}\n" * 20
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    root = tmp_path / 'static'
+    (root / 'js').mkdir(parents=True)
+    (root / 'css').mkdir()
+    (root / 'images').mkdir()
+    (root / 'js' / 'app.js').write_text(APP_JS, encoding='utf-8')
+    (root / 'css' / 'style.css').write_text(STYLE_CSS, encoding='utf-8')
+    (root / 'images' / 'bg.png').write_bytes(b'\x89PNG' + os.urandom(256))
+    return root
+
+
+def test_build_manifest(static_dir):
+    manifest = static_assets.build(str(static_dir))
+    assert set(manifest) == {'js/app.js', 'css/style.css', 'images/bg.png'}
+    dist = static_dir / 'dist'
+    hashed_js = dist / manifest['js/app.js']
+    assert hashed_js.name.startswith('app.') and hashed_js.name.endswith('.js')
+    assert gzip.decompress((dist / (manifest['js/app.js'] + '.gz')).read_bytes()) == hashed_js.read_bytes()
+    # 图片不生成预压缩文件；CSS 引用改为带哈希的图片
+    assert not (dist / (manifest['images/bg.png'] + '.gz')).exists()
+    css = (dist / manifest['css/style.css']).read_text(encoding='utf-8')
+    assert f"/static/dist/{manifest['images/bg.png']}" in css
+    assert static_assets.load_manifest(str(static_dir)) == manifest
+
+    # 内容不变时重新构建，文件名不变
+    assert static_assets.build(str(static_dir)) == manifest
+
+
+def test_serve_hashed_assets(static_dir):
+    manifest = static_assets.build(str(static_dir))
+    app = Flask(__name__, static_folder=str(static_dir))
+    assert static_assets.init_static_assets(app)
+    client = app.test_client()
+
+    with app.test_request_context():
+        html = render_template_string("{{ url_for('static', filename='js/app.js') }}")
+    assert html == f"/static/dist/{manifest['js/app.js']}"
+
+    response = client.get(html, headers={'Accept-Encoding': 'gzip, deflate'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'immutable' in response.headers['Cache-Control']
+    assert response.mimetype == 'text/javascript'
+    assert b'function hello' in gzip.decompress(response.data)
+
+    plain = client.get(html, headers={'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in plain.headers
+    assert plain.data == (static_dir / 'dist' / manifest['js/app.js']).read_bytes()
+
+    if static_assets.brotli is not None:
+        assert client.get(html, headers={'Accept-Encoding': 'gzip, br'}).headers['Content-Encoding'] == 'br'
+    assert client.get(html + '.gz').status_code == 404
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+视频播放量优先级刷新测试
+在临时 SQLite 库中验证 scripts/update_video_play_counts.py：按预计陈旧程度排序、
+只请求预算内的视频、跳过刚刷新过的视频，并把每次刷新追加到 bilibili_video_stats。
+"""
+import sys
+import os
+import time
+from datetime import datetime, timedelta
+
+# 添加项目根目录和 scripts 目录到路径
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'scripts'))
+
+import pytest
+
+import update_video_play_counts as refresher
+from bilibili_models import BilibiliVideo, BilibiliVideoStat
+from video_stats_history import append_samples, sample_summary
+
+NOW = int(datetime(2026, 3, 1, 12, 0, 0).timestamp())
+HOUR = 3600
+
+
+@pytest.fixture
+def Session(bilibili_db, monkeypatch):
+    monkeypatch.setattr(time, 'sleep', lambda seconds: None)
+    return bilibili_db(refresher)
+
+
+def _add_video(session, bvid, play, published_hours_ago, refreshed_hours_ago):
+    session.add(BilibiliVideo(
+        bvid=bvid, uid=1, title=bvid, play=play,
+        pubdate=datetime.fromtimestamp(NOW - published_hours_ago * HOUR),
+        pubdate_raw=NOW - published_hours_ago * HOUR,
+        updated_at=datetime.fromtimestamp(NOW - refreshed_hours_ago * HOUR),
+    ))
+
+
+def test_sample_summary_velocity(Session):
+    session = Session()
+    append_samples(session, [{'bvid': 'BVa', 'play': 1000}], ts=NOW - 10 * 24 * HOUR)
+    append_samples(session, [{'bvid': 'BVa', 'play': 2000}, {'bvid': 'BVb', 'play': 5}], ts=NOW - 10 * HOUR)
+    append_samples(session, [{'bvid': 'BVa', 'play': 3000}], ts=NOW)
+    # 同一秒的重复采样忽略
+    assert append_samples(session, [{'bvid': 'BVa', 'play': 3001}], ts=NOW) == 0
+    session.commit()
+
+    summary = sample_summary(session, now_ts=NOW)
+    # 窗口（7天）外的采样点只用于最近采样时间，不参与速度估算
+    assert summary['BVa'] == (NOW, pytest.approx(100.0))
+    assert summary['BVb'] == (NOW - 10 * HOUR, None)
+    session.close()
+
+
+def test_priority_order_and_budget(Session):
+    session = Session()
+    _add_video(session, 'BVtrending', 50000, published_hours_ago=48, refreshed_hours_ago=6)
+    _add_video(session, 'BVold', 50000, published_hours_ago=3 * 365 * 24, refreshed_hours_ago=24 * 30)
+    _add_video(session, 'BVfresh', 100, published_hours_ago=2, refreshed_hours_ago=0.5)
+    _add_video(session, 'BVzero', 0, published_hours_ago=24, refreshed_hours_ago=0.5)
+    # 历史记录观测到的速度优先于按发布时间估算的平均速度
+    _add_video(session, 'BVsteady', 50000, published_hours_ago=24 * 400, refreshed_hours_ago=6)
+    append_samples(session, [{'bvid': 'BVsteady', 'play': 20000}], ts=NOW - 30 * HOUR)
+    append_samples(session, [{'bvid': 'BVsteady', 'play': 50000}], ts=NOW - 6 * HOUR)
+    session.commit()
+
+    order = refresher.select_videos_to_refresh(session, now_ts=NOW)
+    assert order == ['BVsteady', 'BVtrending', 'BVold', 'BVzero']
+    assert refresher.select_videos_to_refresh(session, budget=2, now_ts=NOW) == ['BVsteady', 'BVtrending']
+    assert 'BVfresh' in refresher.select_videos_to_refresh(session, force_update=True, now_ts=NOW)
+    session.close()
+
+
+def test_refresh_within_budget_records_samples(Session, monkeypatch):
+    session = Session()
+    for i in range(25):
+        _add_video(session, f"BV{i:02d}", 1000, published_hours_ago=24 * (i + 1), refreshed_hours_ago=48)
+    session.commit()
+    session.close()
+
+    requested = []
+
+    def fake_api(client, bvid, retry=0):
+        requested.append(bvid)
+        if bvid == 'BV01':
+            return None
+        return {'play': 2000, 'video_review': 3, 'favorites': 4}
+
+    monkeypatch.setattr(refresher, 'get_video_info_from_api', fake_api)
+    stats = refresher.update_video_play_counts(budget=12)
+    # 预算内按优先级（发布越晚平均速度越高）请求
+    assert requested == [f"BV{i:02d}" for i in range(12)]
+    assert stats == {'total': 12, 'updated': 11, 'skipped': 0, 'failed': 1}
+
+    session = Session()
+    assert session.get(BilibiliVideo, 'BV00').play == 2000
+    assert session.get(BilibiliVideo, 'BV12').play == 1000
+    assert session.query(BilibiliVideoStat).count() == 11
+    session.close()
+
+    # 第二次运行：刚刷新过的视频跳过，失败的视频仍在队列中
+    requested.clear()
+    refresher.update_video_play_counts(budget=100)
+    assert set(requested) == {'BV01'} | {f"BV{i:02d}" for i in range(12, 25)}
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
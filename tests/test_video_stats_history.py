@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+B站视频统计历史测试
+在临时 SQLite 库中验证 video_stats_history：按分层保留规则降采样（最近7天每小时、一年内每天、
+更早每周一个点）、时间序列的增量和播放速度、/api/bilibili/videos/<bvid>/history 接口。
+"""
+import sys
+import os
+from datetime import datetime
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import video_stats_history
+from bilibili_models import BilibiliVideoStat
+from video_stats_history import append_samples, downsample_history, stat_series
+
+HOUR = 3600
+DAY = 24 * HOUR
+# 对齐到周桶的起点，便于计算期望的点数
+NOW = 2900 * 7 * DAY
+
+
+@pytest.fixture
+def Session(bilibili_db):
+    return bilibili_db(video_stats_history)
+
+
+def _timestamps(session, bvid):
+    return [ts for ts, in session.query(BilibiliVideoStat.ts).filter_by(bvid=bvid).order_by(BilibiliVideoStat.ts)]
+
+
+def test_downsample_retention_tiers(Session):
+    session = Session()
+    # 过去两年每6小时一个采样点，最近8天每20分钟一个
+    timestamps = list(range(NOW - 2 * 365 * DAY, NOW - 8 * DAY, 6 * HOUR)) + list(range(NOW - 8 * DAY, NOW + 1, 20 * 60))
+    for ts in timestamps:
+        append_samples(session, [{'bvid': 'BVa', 'play': ts // 60}, {'bvid': 'BVb', 'play': 1}], ts=ts)
+    session.commit()
+    session.close()
+
+    assert downsample_history(now_ts=NOW) > 0
+    session = Session()
+    kept = _timestamps(session, 'BVa')
+    assert kept == _timestamps(session, 'BVb')
+    hourly = [ts for ts in kept if ts >= NOW - 7 * DAY]
+    daily = [ts for ts in kept if NOW - 365 * DAY <= ts < NOW - 7 * DAY]
+    weekly = [ts for ts in kept if ts < NOW - 365 * DAY]
+    assert len(hourly) == 7 * 24 + 1 and len(daily) == 358
+    assert 52 <= len(weekly) <= 54
+    # 每个桶保留最后一个点，最近一次采样一定保留
+    assert kept[-1] == NOW
+    assert daily[0] % DAY == 18 * HOUR and hourly[0] % HOUR == 40 * 60
+    session.close()
+
+    # 可重复执行
+    assert downsample_history(now_ts=NOW) == 0
+
+
+def test_stat_series_deltas_and_velocity(Session):
+    session = Session()
+    for ts, play, reply in ((NOW - 3 * DAY, 100, 1), (NOW - 2 * HOUR, 1000, 4), (NOW, 1600, 5)):
+        append_samples(session, [{'bvid': 'BVa', 'play': play, 'reply': reply, 'favorite': 2}], ts=ts)
+    session.commit()
+
+    points = stat_series(session, 'BVa')
+    assert [p['play'] for p in points] == [100, 1000, 1600]
+    assert points[0]['delta_play'] is None and points[0]['velocity'] is None
+    assert (points[2]['delta_play'], points[2]['delta_reply'], points[2]['delta_favorite']) == (600, 1, 0)
+    assert points[2]['velocity'] == pytest.approx(300.0)
+
+    # 只取最近一天：第一个点的增量相对于窗口之前最近的点
+    recent = stat_series(session, 'BVa', since_ts=NOW - DAY)
+    assert [p['delta_play'] for p in recent] == [900, 600]
+    assert stat_series(session, 'BVmissing') == []
+    session.close()
+
+
+def test_history_api(Session, monkeypatch):
+    import app as app_module
+
+    session = Session()
+    now = int(datetime.now().timestamp())
+    append_samples(session, [{'bvid': 'BVa', 'play': 10}], ts=now - 40 * DAY)
+    append_samples(session, [{'bvid': 'BVa', 'play': 20}], ts=now - HOUR)
+    session.commit()
+    session.close()
+
+    monkeypatch.setattr(app_module, 'get_bilibili_session', Session)
+    client = app_module.app.test_client()
+    data = client.get('/api/bilibili/videos/BVa/history').get_json()
+    assert data['success'] and data['total'] == 1
+    assert data['data'][0]['delta_play'] == 10 and data['data'][0]['time']
+    assert client.get('/api/bilibili/videos/BVa/history?days=0').get_json()['total'] == 2
+
+
+if __name__ == '__main__':
+    sys.exit(pytest.main([__file__, '-q']))
@@ -16,15 +16,14 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-def update_all_papers(limit=None, skip_existing=True, status=None, status_lock=None):
+def update_all_papers(limit=None, skip_existing=True, task_progress=None):
     """
     批量更新所有论文的Semantic Scholar数据
     
     Args:
         limit: 限制更新的论文数量（None表示全部）
         skip_existing: 是否跳过已有Semantic Scholar数据的论文
-        status: 用于更新状态的字典（可选）
-        status_lock: 用于线程安全更新的锁（可选）
+        task_progress: 任务进度上报器（task_queue.TaskProgress，可选）
     """
     session = get_session()
     
@@ -53,31 +52,13 @@ def update_all_papers(limit=None, skip_existing=True, status=None, status_lock=N
         logger.info(f"找到 {total} 篇需要更新的论文")
         
         # 更新状态
-        if status is not None:
-            if status_lock:
-                with status_lock:
-                    status['total'] = total
-                    status['progress'] = 0
-                    status['message'] = f'找到 {total} 篇需要更新的论文'
-                    status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            else:
-                status['total'] = total
-                status['progress'] = 0
-                status['message'] = f'找到 {total} 篇需要更新的论文'
-                status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        if task_progress is not None:
+            task_progress.update(progress=0, total=total, message=f'找到 {total} 篇需要更新的论文', force=True)
         
         if total == 0:
             logger.info("没有需要更新的论文")
-            if status is not None:
-                if status_lock:
-                    with status_lock:
-                        status['message'] = '没有需要更新的论文'
-                        status['running'] = False
-                        status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                else:
-                    status['message'] = '没有需要更新的论文'
-                    status['running'] = False
-                    status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            if task_progress is not None:
+                task_progress.update(message='没有需要更新的论文', force=True)
             return
         
         success_count = 0
@@ -87,25 +68,18 @@ def update_all_papers(limit=None, skip_existing=True, status=None, status_lock=N
             try:
                 logger.info(f"[{idx}/{total}] 更新论文: {paper.id} - {paper.title[:50]}...")
                 
-                # 更新状态
-                if status is not None:
-                    if status_lock:
-                        with status_lock:
-                            status['progress'] = idx
-                            status['current_paper'] = paper.id
-                            status['message'] = f'正在更新: {paper.title[:50]}... ({idx}/{total})'
-                            status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                    else:
-                        status['progress'] = idx
-                        status['current_paper'] = paper.id
-                        status['message'] = f'正在更新: {paper.title[:50]}... ({idx}/{total})'
-                        status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                # 更新状态（按时间间隔节流写入任务表）
+                if task_progress is not None:
+                    task_progress.update(progress=idx, current=paper.id,
+                                         message=f'正在更新: {paper.title[:50]}... ({idx}/{total})')
                 
                 # 获取ArXiv ID（确保格式正确）
                 arxiv_id = paper.id
                 if not arxiv_id:
                     logger.warning(f"  ⚠️  论文ID为空，跳过")
                     fail_count += 1
+                    if task_progress is not None:
+                        task_progress.incr('failed')
                     continue
                 
                 logger.info(f"  正在获取Semantic Scholar数据: {arxiv_id}")
@@ -143,9 +117,13 @@ def update_all_papers(limit=None, skip_existing=True, status=None, status_lock=N
                     
                     session.commit()
                     success_count += 1
+                    if task_progress is not None:
+                        task_progress.incr('success')
                     logger.info(f"  ✅ 成功更新: 引用数={paper.citation_count}, 高影响力引用={paper.influential_citation_count}, 期刊={paper.venue or 'N/A'}, 机构数={len(affiliations)}")
                 else:
                     fail_count += 1
+                    if task_progress is not None:
+                        task_progress.incr('failed')
                     logger.warning(f"  ⚠️  未获取到Semantic Scholar数据 (可能论文不在Semantic Scholar数据库中)")
                 
                 # 添加延迟以避免速率限制
@@ -154,6 +132,8 @@ def update_all_papers(limit=None, skip_existing=True, status=None, status_lock=N
                     
             except Exception as e:
                 fail_count += 1
+                if task_progress is not None:
+                    task_progress.incr('failed')
                 import traceback
                 error_detail = traceback.format_exc()
                 logger.error(f"  ❌ 更新失败: {e}")
@@ -167,37 +147,17 @@ def update_all_papers(limit=None, skip_existing=True, status=None, status_lock=N
         logger.info(final_message)
         logger.info("=" * 60)
         
-        if status is not None:
-            if status_lock:
-                with status_lock:
-                    status['message'] = final_message
-                    status['progress'] = total
-                    status['current_paper'] = ''
-                    status['running'] = False
-                    status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            else:
-                status['message'] = final_message
-                status['progress'] = total
-                status['current_paper'] = ''
-                status['running'] = False
-                status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        if task_progress is not None:
+            task_progress.update(progress=total, message=final_message, force=True)
         
     except Exception as e:
         error_msg = f"批量更新失败: {e}"
         logger.error(error_msg)
         session.rollback()
         
-        # 更新错误状态
-        if status is not None:
-            if status_lock:
-                with status_lock:
-                    status['message'] = error_msg
-                    status['running'] = False
-                    status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            else:
-                status['message'] = error_msg
-                status['running'] = False
-                status['last_update'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        # 作为后台任务运行时向上抛出，由任务表记录失败状态
+        if task_progress is not None:
+            raise
     finally:
         session.close()
 
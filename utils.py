@@ -2,9 +2,16 @@
 工具函数：智能去重、相似度计算等
 """
 import re
+import hashlib
+import unicodedata
 from difflib import SequenceMatcher
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# 规范化URL时丢弃的跟踪参数（只列纯跟踪用途的参数；from/ref/source 等在部分站点上决定页面内容，不能丢弃）
+TRACKING_PARAM_PREFIXES = ('utm_', 'share_')
+TRACKING_PARAMS = {'fbclid', 'gclid', 'spm', 'chksm'}
 
 def calculate_title_similarity(title1: str, title2: str) -> float:
     """
@@ -52,6 +59,52 @@ def is_duplicate_title(new_title: str, existing_titles: List[str], threshold: fl
             return True
     return False
 
+def canonical_url(url: Optional[str]) -> str:
+    """
+    规范化URL（用于去重）：
+    - scheme/host 小写，去掉 www. 前缀和默认端口，http 统一为 https
+    - 去掉 fragment、跟踪参数（utm_*、share_*、fbclid、gclid、spm、chksm），其余参数按名称排序
+    - 去掉路径末尾的斜杠
+    
+    Returns:
+        规范化后的URL；空URL返回空字符串
+    """
+    if not url:
+        return ''
+    url = url.strip()
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url.lower()
+    if not parts.netloc:
+        return url.lower()
+    
+    scheme = parts.scheme.lower()
+    if scheme == 'http':
+        scheme = 'https'
+    host = parts.hostname or ''
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip('/') or ''
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if k.lower() not in TRACKING_PARAMS and not k.lower().startswith(TRACKING_PARAM_PREFIXES)
+    )
+    return urlunsplit((scheme, host, path, urlencode(query), ''))
+
+def normalize_title(title: Optional[str]) -> str:
+    """标题规范化：全角转半角、转小写、合并空白"""
+    if not title:
+        return ''
+    title = unicodedata.normalize('NFKC', title).lower()
+    return ' '.join(title.split())
+
+def title_hash(title: Optional[str]) -> str:
+    """规范化标题的SHA1（40位十六进制），用于唯一索引"""
+    return hashlib.sha1(normalize_title(title).encode('utf-8')).hexdigest()
+
 def get_latest_paper_date(category: Optional[str] = None) -> Optional[datetime]:
     """
     获取数据库中指定类别的最新论文日期（用于增量更新）
@@ -61,8 +61,9 @@ def verify_scheduler():
     if auto_fetch_enabled:
         print("\n5. 测试定时任务启动...")
         try:
-            from app import init_scheduler
-            scheduler = init_scheduler()
+            # 定时任务调度器在 worker.py 中运行（只检查配置，不启动worker主循环）
+            from worker import start_scheduler
+            scheduler = start_scheduler()
             if scheduler:
                 jobs = scheduler.get_jobs()
                 print(f"✅ 定时任务启动成功，共 {len(jobs)} 个任务")
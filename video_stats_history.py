@@ -0,0 +1,162 @@
+"""
+B站视频统计历史（bilibili_video_stats）
+视频表中的播放量每次抓取都被原地覆盖，无法得知增长速度；这里把每次获取到的
+(播放量, 评论数, 收藏数) 追加为一个采样点（抓取视频列表和刷新播放量时都会写入），
+供播放量刷新调度估算播放速度、趋势图计算增量。
+
+每行只有 BV号 + 4 个整数（时间为 Unix 秒），由 downsample_history 定期降采样：
+最近 7 天每小时保留一个点，一年内每天一个，更早的每周一个，每个视频的行数有上限。
+
+用法:
+    from video_stats_history import append_samples, sample_summary, stat_series
+    append_samples(session, [{'bvid': 'BV1xx', 'play': 1200, 'reply': 3, 'favorite': 8}])
+    summary = sample_summary(session)  # {bvid: (最近采样时间, 窗口内播放速度 次/小时 或 None)}
+    points = stat_series(session, 'BV1xx', since_ts=...)  # 每个点附带与上一个点的增量和播放速度
+"""
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, case, delete, exists, func, select
+from sqlalchemy.orm import aliased
+
+from bilibili_models import BilibiliVideoStat, get_bilibili_session
+from bulk_upsert import insert_on_conflict
+
+logger = logging.getLogger(__name__)
+
+# 估算播放速度使用的时间窗口（天）
+VELOCITY_WINDOW_DAYS = 7
+
+# 降采样分层：(距今多少天以内, 每个视频每个时间桶保留一个点的桶宽/秒)，最后一层覆盖更早的全部数据
+RETENTION_TIERS = (
+    (7, 3600),
+    (365, 86400),
+    (None, 7 * 86400),
+)
+
+
+def append_samples(session, samples: Iterable[Dict], ts: int = None) -> int:
+    """
+    追加采样点（不提交事务）；同一视频同一秒的重复采样忽略
+
+    Args:
+        samples: dict 列表，包含 bvid、play，可选 reply、favorite
+        ts: 采样时间（Unix 秒），默认当前时间
+
+    Returns:
+        写入的采样点数
+    """
+    ts = int(ts if ts is not None else time.time())
+    rows = [{
+        'bvid': sample['bvid'],
+        'ts': ts,
+        'play': sample.get('play') or 0,
+        'reply': sample.get('reply') or 0,
+        'favorite': sample.get('favorite') or 0,
+    } for sample in samples if sample.get('bvid') and sample.get('play') is not None]
+    return insert_on_conflict(session, BilibiliVideoStat, rows, ['bvid', 'ts'])
+
+
+def sample_summary(session, window_days: int = VELOCITY_WINDOW_DAYS,
+                   now_ts: int = None) -> Dict[str, Tuple[int, Optional[float]]]:
+    """
+    一次聚合查询：每个视频的最近采样时间，以及时间窗口内的播放速度（次/小时）
+
+    播放量只增不减，窗口内首末采样点的差值除以时间差即为平均速度；
+    窗口内不足两个时间点的视频速度为 None。
+    """
+    now_ts = int(now_ts if now_ts is not None else time.time())
+    in_window = BilibiliVideoStat.ts >= now_ts - window_days * 86400
+    stat = BilibiliVideoStat
+    rows = session.execute(
+        select(
+            stat.bvid,
+            func.max(stat.ts),
+            func.min(case((in_window, stat.ts))),
+            func.min(case((in_window, stat.play))),
+            func.max(case((in_window, stat.play))),
+        ).group_by(stat.bvid)
+    )
+    summary = {}
+    for bvid, last_ts, first_ts, min_play, max_play in rows:
+        velocity = None
+        if first_ts is not None and last_ts > first_ts:
+            velocity = (max_play - min_play) * 3600 / (last_ts - first_ts)
+        summary[bvid] = (last_ts, velocity)
+    return summary
+
+
+def stat_series(session, bvid: str, since_ts: int = None) -> List[Dict]:
+    """
+    单个视频的统计时间序列（按时间升序），每个点附带与上一个点相比的增量和播放速度（次/小时）
+
+    第一个点的增量相对于 since_ts 之前最近的一个点（没有则为 None）。
+    """
+    stat = BilibiliVideoStat
+    columns = (stat.ts, stat.play, stat.reply, stat.favorite)
+    query = select(*columns).where(stat.bvid == bvid).order_by(stat.ts)
+    previous = None
+    if since_ts is not None:
+        query = query.where(stat.ts >= since_ts)
+        previous = session.execute(
+            select(*columns).where(stat.bvid == bvid, stat.ts < since_ts).order_by(stat.ts.desc()).limit(1)
+        ).first()
+
+    points = []
+    for row in session.execute(query):
+        ts, play, reply, favorite = row
+        point = {'ts': ts, 'play': play, 'reply': reply, 'favorite': favorite,
+                 'delta_play': None, 'delta_reply': None, 'delta_favorite': None, 'velocity': None}
+        if previous is not None:
+            prev_ts, prev_play, prev_reply, prev_favorite = previous
+            point['delta_play'] = play - prev_play
+            point['delta_reply'] = reply - prev_reply
+            point['delta_favorite'] = favorite - prev_favorite
+            point['velocity'] = (play - prev_play) * 3600 / (ts - prev_ts) if ts > prev_ts else None
+        points.append(point)
+        previous = row
+    return points
+
+
+def _downsample_tier(session, start_ts: Optional[int], end_ts: Optional[int], bucket_seconds: int) -> int:
+    """[start_ts, end_ts) 范围内，每个视频每个时间桶只保留最后一个点"""
+    stat = BilibiliVideoStat
+    newer = aliased(BilibiliVideoStat)
+    newer_in_bucket = [newer.bvid == stat.bvid, newer.ts > stat.ts,
+                       newer.ts // bucket_seconds == stat.ts // bucket_seconds]
+    criteria = []
+    if start_ts is not None:
+        criteria.append(stat.ts >= start_ts)
+    if end_ts is not None:
+        criteria.append(stat.ts < end_ts)
+        newer_in_bucket.append(newer.ts < end_ts)
+    criteria.append(exists().where(and_(*newer_in_bucket)))
+    result = session.execute(delete(stat).where(*criteria).execution_options(synchronize_session=False))
+    return max(result.rowcount or 0, 0)
+
+
+def downsample_history(now_ts: int = None) -> int:
+    """
+    按 RETENTION_TIERS 降采样统计历史（可重复执行），返回删除的采样点数
+
+    每个时间桶保留最后一个点，最近一次采样总是保留（刷新调度依赖它判断上次刷新时间）。
+    """
+    now_ts = int(now_ts if now_ts is not None else time.time())
+    session = get_bilibili_session()
+    deleted = 0
+    try:
+        end_ts = None
+        for days, bucket_seconds in RETENTION_TIERS:
+            start_ts = now_ts - days * 86400 if days is not None else None
+            deleted += _downsample_tier(session, start_ts, end_ts, bucket_seconds)
+            end_ts = start_ts
+        session.commit()
+        logger.info(f"✅ 统计历史降采样完成：删除 {deleted} 个采样点")
+    except Exception as e:
+        session.rollback()
+        logger.error(f"统计历史降采样失败: {e}")
+        raise
+    finally:
+        session.close()
+    return deleted
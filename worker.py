@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+后台任务 worker
+独立于 Web 进程运行，负责所有定时任务和手动触发的抓取/更新任务：
+- 定时任务（APScheduler）只负责按 cron 把任务写入任务表；多个 worker 同时运行时，
+  只有选举出的领导者触发定时任务（见 leader_election.py），其余 worker 只执行任务
+- 主循环从任务表领取任务，每个任务在独立子进程（spawn）中执行，Web 请求不再和抓取任务争抢 GIL 与内存
+
+运行方式：
+    python worker.py                    # 独立进程运行（docker-compose 中的 worker 服务）
+    EMBEDDED_WORKER=true（默认）时 gunicorn 主进程启动后会自动拉起一个 worker 子进程
+"""
+import argparse
+import logging
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from multiprocessing import get_context
+
+from task_models import init_tasks_db, TASK_ERROR
+from task_queue import enqueue_task, claim_next_task, finish_task, fail_orphaned_tasks, fail_stale_tasks, worker_id
+from task_handlers import run_task_process
+from leader_election import LeaderElection
+
+logger = logging.getLogger(__name__)
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 并行执行的任务数（进程池大小）
+WORKER_PROCESSES = int(os.getenv('WORKER_PROCESSES', '2'))
+# 任务表轮询间隔（秒）
+WORKER_POLL_INTERVAL = float(os.getenv('WORKER_POLL_INTERVAL', '2'))
+# 心跳超时任务的检查间隔（秒）
+STALE_CHECK_INTERVAL = 60
+
+# 任务子进程使用 spawn 方式启动，不继承父进程的数据库连接和调度器线程
+_mp_context = get_context('spawn')
+
+
+def _enqueue_scheduled(task_type, params=None):
+    """定时任务：只入队，由worker主循环执行"""
+    try:
+        enqueue_task(task_type, params, source='schedule')
+    except Exception as e:
+        logger.error(f"定时任务入队失败（{task_type}）: {e}")
+
+
+def _add_cron_jobs(scheduler, schedule_cron, task_type, job_id, job_name, params=None):
+    """
+    按 cron 表达式添加定时任务
+    支持多个表达式，用分号分隔，如 "0 * * * *;30 12 * * *"
+    """
+    from apscheduler.triggers.cron import CronTrigger
+
+    if not schedule_cron:
+        return
+    for idx, cron_expr in enumerate(schedule_cron.split(';')):
+        cron_expr = cron_expr.strip()
+        if not cron_expr:
+            continue
+        parts = cron_expr.split()
+        if len(parts) != 5:
+            logger.warning(f"定时任务配置无效 ({job_name}): {cron_expr}")
+            continue
+        minute, hour, day, month, weekday = parts
+        scheduler.add_job(
+            _enqueue_scheduled,
+            args=[task_type, params],
+            trigger=CronTrigger(
+                minute=minute,
+                hour=hour,
+                day=day,
+                month=month,
+                day_of_week=weekday
+            ),
+            id=job_id.format(idx=idx),
+            name=job_name.format(n=idx + 1),
+            replace_existing=True
+        )
+        logger.info(f"定时任务已配置 ({job_name.format(n=idx + 1)}): {cron_expr}")
+
+
+def start_scheduler(paused=False):
+    """
+    启动定时任务调度器（各任务到点后写入任务表）
+
+    Args:
+        paused: 以暂停状态启动，取得领导权后再 resume（见 leader_election）
+    """
+    try:
+        from apscheduler.schedulers.background import BackgroundScheduler
+        from apscheduler.triggers.cron import CronTrigger
+
+        scheduler = BackgroundScheduler()
+
+        # 论文抓取，默认每小时整点执行
+        _add_cron_jobs(
+            scheduler, os.getenv('AUTO_FETCH_SCHEDULE', '0 * * * *'),
+            'fetch_papers', 'hourly_fetch_papers_{idx}', '每小时论文抓取_{n}'
+        )
+        # 全量抓取，默认每天凌晨2点（与关键词抓取互斥，见 task_handlers.TASK_LOCK_KEYS）
+        _add_cron_jobs(
+            scheduler, os.getenv('AUTO_FETCH_FULL_SCHEDULE', '0 2 * * *'),
+            'full_fetch_papers', 'daily_full_fetch_papers_{idx}', '每天全量论文抓取_{n}',
+            {'days_back': 3, 'max_results_per_query': 100}
+        )
+        # 招聘信息抓取，未单独配置时与论文抓取一致
+        _add_cron_jobs(
+            scheduler, os.getenv('AUTO_FETCH_JOBS_SCHEDULE', os.getenv('AUTO_FETCH_SCHEDULE', '0 * * * *')),
+            'fetch_jobs', 'hourly_fetch_jobs_{idx}', '招聘信息抓取_{n}'
+        )
+        # 新闻抓取，默认每小时整点执行
+        _add_cron_jobs(
+            scheduler, os.getenv('AUTO_FETCH_NEWS_SCHEDULE', '0 * * * *'),
+            'fetch_news', 'hourly_fetch_news_{idx}', '新闻信息抓取_{n}'
+        )
+        # B站数据抓取，默认每6小时执行一次（避免触发风控）；默认增量同步，只翻页到上次同步的最新视频
+        _add_cron_jobs(
+            scheduler, os.getenv('AUTO_FETCH_BILIBILI_SCHEDULE', '0 */6 * * *'),
+            'fetch_bilibili', 'hourly_fetch_bilibili_{idx}', 'B站数据抓取_{n}',
+            {'video_count': 50, 'delay_between_requests': 2.0,
+             'incremental': os.getenv('BILIBILI_INCREMENTAL_SYNC', 'true').lower() == 'true'}
+        )
+
+        # Semantic Scholar数据更新（增量更新）
+        update_limit = int(os.getenv('SEMANTIC_UPDATE_LIMIT', 200))
+        scheduler.add_job(
+            _enqueue_scheduled,
+            args=['update_semantic_recent', {'days': 30, 'limit': update_limit}],
+            trigger=CronTrigger(hour=3, minute=0),
+            id='daily_update_semantic_scholar_recent',
+            name='每天Semantic Scholar数据更新（最近30天）',
+            replace_existing=True
+        )
+        scheduler.add_job(
+            _enqueue_scheduled,
+            args=['update_semantic_recent', {'days': 90, 'limit': 500}],
+            trigger=CronTrigger(day_of_week=6, hour=3, minute=0),  # 周日 = 6
+            id='weekly_update_semantic_scholar',
+            name='每周Semantic Scholar数据更新（最近90天）',
+            replace_existing=True
+        )
+        scheduler.add_job(
+            _enqueue_scheduled,
+            args=['update_semantic_all', {'limit': 1000, 'skip_recent': True}],
+            trigger=CronTrigger(day=1, hour=3, minute=0),
+            id='monthly_update_semantic_scholar',
+            name='每月Semantic Scholar数据更新（所有论文）',
+            replace_existing=True
+        )
+        logger.info(f"Semantic Scholar数据更新定时任务已配置:")
+        logger.info(f"  - 每天凌晨3点：更新最近30天的论文（每次{update_limit}篇）")
+        logger.info(f"  - 每周日凌晨3点：更新最近90天的论文（每次500篇）")
+        logger.info(f"  - 每月1日凌晨3点：更新所有论文（每次1000篇，跳过7天内已更新的）")
+
+        # 视频播放量更新，默认每天凌晨2点（按刷新优先级，每次最多 BILIBILI_PLAY_REFRESH_BUDGET 个视频，避免触发风控）
+        if os.getenv('AUTO_UPDATE_VIDEO_PLAYS_ENABLED', 'true').lower() == 'true':
+            _add_cron_jobs(
+                scheduler, os.getenv('AUTO_UPDATE_VIDEO_PLAYS_SCHEDULE', '0 2 * * *'),
+                'update_video_play_counts', 'daily_update_video_play_counts_{idx}', '视频播放量更新（定时）_{n}',
+                {'force_update': False}
+            )
+        else:
+            logger.info("视频播放量自动更新未启用（设置 AUTO_UPDATE_VIDEO_PLAYS_ENABLED=true 启用）")
+
+        # B站视频统计历史降采样，默认每天凌晨4点（最近7天每小时、一年内每天、更早每周保留一个点）
+        _add_cron_jobs(
+            scheduler, os.getenv('AUTO_DOWNSAMPLE_VIDEO_STATS_SCHEDULE', '0 4 * * *'),
+            'downsample_video_stats', 'daily_downsample_video_stats_{idx}', '视频统计历史降采样_{n}'
+        )
+
+        # 列式快照导出（增量），供分析脚本和数据检查读取，默认不启用（如设置为 "30 4 * * *"）
+        _add_cron_jobs(
+            scheduler, os.getenv('AUTO_SNAPSHOT_SCHEDULE', ''),
+            'export_snapshot', 'daily_export_snapshot_{idx}', '列式快照导出_{n}'
+        )
+
+        scheduler.start(paused=paused)
+        return scheduler
+    except ImportError:
+        logger.warning("APScheduler 未安装，定时任务功能不可用")
+        logger.warning("安装命令: pip install apscheduler")
+        return None
+    except Exception as e:
+        logger.error(f"启动定时任务失败: {e}")
+        return None
+
+
+def _start_task_process(task):
+    """在独立子进程（spawn）中执行任务，任务结束后子进程退出、内存全部归还"""
+    process = _mp_context.Process(
+        target=run_task_process,
+        args=(task['id'], task['task_type'], task['params']),
+        name=f"task-{task['id']}-{task['task_type']}"
+    )
+    process.start()
+    return process
+
+
+def _reap_finished(inflight):
+    """回收已结束的任务（正常结束时子进程已写回结果，这里只处理子进程异常退出）"""
+    for task_id in [tid for tid, (process, _) in inflight.items() if not process.is_alive()]:
+        process, task = inflight.pop(task_id)
+        process.join()
+        if process.exitcode != 0:
+            logger.error(f"任务 #{task_id} ({task['task_type']}) 的子进程异常退出，退出码: {process.exitcode}")
+            finish_task(task_id, TASK_ERROR, message=f'执行任务的子进程异常退出（退出码 {process.exitcode}）')
+
+
+def run_worker(processes=None, with_scheduler=True, poll_interval=None, stop_event=None):
+    """
+    worker主循环：领取任务 -> 子进程执行 -> 回收结果
+    每个任务一个子进程，同时运行的子进程数不超过 processes，单个任务崩溃不影响其他任务
+
+    Args:
+        processes: 并行执行的任务数
+        with_scheduler: 是否同时运行定时任务调度器（还需 AUTO_FETCH_ENABLED=true）
+        poll_interval: 任务表轮询间隔（秒）
+        stop_event: 外部停止信号（默认响应 SIGTERM/SIGINT）
+    """
+    processes = max(processes or WORKER_PROCESSES, 1)
+    poll_interval = poll_interval or WORKER_POLL_INTERVAL
+    stop_event = stop_event or threading.Event()
+    me = worker_id()
+
+    init_tasks_db()
+    fail_orphaned_tasks(alive_workers=[me])
+
+    scheduler = None
+    election = None
+    if with_scheduler:
+        if os.getenv('AUTO_FETCH_ENABLED', 'false').lower() == 'true':
+            # 多个worker同时运行时只有领导者触发定时任务，调度器先以暂停状态启动
+            scheduler = start_scheduler(paused=True)
+            if scheduler:
+                election = LeaderElection(me)
+                logger.info("✅ 定时任务调度器已启动（取得领导权后开始触发）")
+            else:
+                logger.warning("⚠️  定时任务调度器启动失败（需要安装 APScheduler）")
+        else:
+            logger.info("ℹ️  自动定时抓取未启用（设置 AUTO_FETCH_ENABLED=true 启用）")
+
+    if threading.current_thread() is threading.main_thread():
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(sig, lambda signum, frame: stop_event.set())
+
+    inflight = {}  # 任务ID -> (子进程, 任务字典)
+    last_stale_check = 0.0
+    last_election = 0.0
+    logger.info(f"worker {me} 已启动（并行任务数: {processes}，轮询间隔: {poll_interval}s）")
+    try:
+        while not stop_event.is_set():
+            _reap_finished(inflight)
+
+            # 定期续约领导权，领导权变化时恢复/暂停定时任务
+            if election and time.monotonic() - last_election >= election.renew_interval:
+                last_election = time.monotonic()
+                was_leader = election.is_leader
+                if election.refresh() and not was_leader:
+                    scheduler.resume()
+                elif was_leader and not election.is_leader:
+                    scheduler.pause()
+
+            # 定期清理心跳超时的任务（其他主机上的worker已退出）
+            if time.monotonic() - last_stale_check >= STALE_CHECK_INTERVAL:
+                last_stale_check = time.monotonic()
+                try:
+                    fail_stale_tasks()
+                except Exception as e:
+                    logger.error(f"清理心跳超时任务失败: {e}")
+
+            # 有空闲名额时领取新任务
+            while len(inflight) < processes and not stop_event.is_set():
+                try:
+                    task = claim_next_task(me)
+                except Exception as e:
+                    logger.error(f"领取任务失败: {e}")
+                    break
+                if not task:
+                    break
+                logger.info(f"领取任务 #{task['id']}: {task['task_type']}（来源: {task['source']}）")
+                try:
+                    inflight[task['id']] = (_start_task_process(task), task)
+                except Exception as e:
+                    logger.error(f"启动任务子进程失败: {e}")
+                    finish_task(task['id'], TASK_ERROR, message=f'启动任务子进程失败: {str(e)}')
+
+            stop_event.wait(poll_interval)
+    finally:
+        logger.info("worker正在退出...")
+        if scheduler:
+            scheduler.shutdown(wait=False)
+        if election:
+            election.release()
+        _reap_finished(inflight)
+        for process, task in inflight.values():
+            process.terminate()
+            process.join(timeout=5)
+            finish_task(task['id'], TASK_ERROR, message='worker已停止，任务中断')
+        logger.info("worker已退出")
+
+
+# ==================== 嵌入式 worker（gunicorn 主进程拉起） ====================
+
+_embedded_process = None
+
+
+def start_embedded_worker():
+    """
+    以子进程方式启动 worker（单容器部署时由 gunicorn 主进程调用）
+    设置 EMBEDDED_WORKER=false 时不启动（使用独立的 worker 服务）
+    """
+    global _embedded_process
+    if os.getenv('EMBEDDED_WORKER', 'true').lower() != 'true':
+        logger.info("ℹ️  EMBEDDED_WORKER=false，后台任务由独立的 worker 进程执行")
+        return None
+    if _embedded_process is not None and _embedded_process.poll() is None:
+        return _embedded_process
+    _embedded_process = subprocess.Popen(
+        [sys.executable, os.path.join(BASE_DIR, 'worker.py')],
+        cwd=BASE_DIR
+    )
+    logger.info(f"✅ 后台任务worker已启动（pid: {_embedded_process.pid}）")
+    return _embedded_process
+
+
+def stop_embedded_worker(timeout=10):
+    """停止嵌入式 worker 子进程"""
+    global _embedded_process
+    if _embedded_process is None or _embedded_process.poll() is not None:
+        _embedded_process = None
+        return
+    _embedded_process.terminate()
+    try:
+        _embedded_process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        _embedded_process.kill()
+    logger.info("后台任务worker已关闭")
+    _embedded_process = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description='后台任务 worker')
+    parser.add_argument('--processes', type=int, default=WORKER_PROCESSES, help='并行执行的任务数')
+    parser.add_argument('--poll-interval', type=float, default=WORKER_POLL_INTERVAL, help='任务表轮询间隔（秒）')
+    parser.add_argument('--no-scheduler', action='store_true', help='不运行定时任务调度器，只执行任务表中的任务')
+    parser.add_argument('--enqueue', metavar='TASK_TYPE', help='只把指定任务写入任务表后退出')
+    args = parser.parse_args()
+
+    if args.enqueue:
+        init_tasks_db()
+        task, created = enqueue_task(args.enqueue, source='cli')
+        print(f"{'已入队' if created else '已有任务在队列中'}: #{task['id']} {task['task_type']} ({task['state']})")
+        return
+
+    run_worker(
+        processes=args.processes,
+        with_scheduler=not args.no_scheduler,
+        poll_interval=args.poll_interval
+    )
+
+
+if __name__ == '__main__':
+    # 确保加载.env文件
+    try:
+        from dotenv import load_dotenv
+        load_dotenv(os.path.join(BASE_DIR, '.env'))
+    except ImportError:
+        pass
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s [%(process)d] %(levelname)s %(name)s: %(message)s')
+    main()